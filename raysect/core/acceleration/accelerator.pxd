@@ -32,10 +32,13 @@
 from raysect.core.ray cimport Ray
 from raysect.core.math cimport Point3D
 from raysect.core.intersection cimport Intersection
+from raysect.core.scenegraph._nodebase cimport _NodeBase
 
 
 cdef class Accelerator:
 
     cpdef build(self, list primitives)
+    cpdef update(self, list primitives)
+    cpdef object notify(self, _NodeBase node)
     cpdef Intersection hit(self, Ray ray)
     cpdef list contains(self, Point3D point)
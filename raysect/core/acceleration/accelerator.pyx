@@ -34,6 +34,30 @@ cdef class Accelerator:
     cpdef build(self, list primitives):
         pass
 
+    cpdef update(self, list primitives):
+        """
+        Updates the acceleration structure following a change to the scene-graph.
+
+        Accelerators that can reuse parts of their existing structure should
+        override this method, by default the structure is rebuilt.
+
+        :param list primitives: The primitives in the scene-graph.
+        """
+
+        self.build(primitives)
+
+    cpdef object notify(self, _NodeBase node):
+        """
+        Informs the accelerator of a change to the geometry of a scene-graph node.
+
+        Called by the World for each node on which a geometry change occurs,
+        before the structure is updated. By default this method does nothing.
+
+        :param _NodeBase node: The node on which the change occurred.
+        """
+
+        pass
+
     cpdef Intersection hit(self, Ray ray):
         raise NotImplementedError("Accelerator virtual method hit() has not been implemented.")
 
@@ -0,0 +1,100 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+from raysect.core.acceleration.accelerator cimport Accelerator
+from raysect.core.math.spatial.kdtree3d cimport KDTree3DCore
+from raysect.core.scenegraph._nodebase cimport _NodeBase
+from raysect.core.scenegraph.primitive cimport Primitive
+from raysect.core.scenegraph.assembly cimport Assembly
+from raysect.core.boundingbox cimport BoundingBox3D
+from raysect.core.intersection cimport Intersection
+from raysect.core.math cimport Point3D, AffineMatrix3D
+from raysect.core.ray cimport Ray
+
+
+cdef class _Entry:
+
+    cdef BoundingBox3D box
+
+    cdef Intersection hit(self, Ray ray)
+    cdef list contains(self, Point3D point)
+
+
+cdef class _PrimitiveEntry(_Entry):
+
+    cdef Primitive primitive
+
+
+cdef class _BottomLevelKDTree(KDTree3DCore):
+
+    cdef:
+        list boxes
+        list transforms
+        list primitives
+        Ray world_ray
+        Point3D world_point
+        Intersection hit_intersection
+
+    cdef bint matches(self, list transforms)
+
+
+cdef class _AssemblyEntry(_Entry):
+
+    cdef:
+        Assembly assembly
+        _BottomLevelKDTree tree
+        list primitives
+        list transforms
+        dict indices
+
+    cdef object update_box(self)
+
+
+cdef class _TopLevelKDTree(KDTree3DCore):
+
+    cdef:
+        list entries
+        Intersection hit_intersection
+
+
+cdef class AssemblyKDTree(Accelerator):
+
+    cdef:
+        _TopLevelKDTree _top
+        dict _entries
+        dict _shared
+        dict _dirty
+        dict _checks
+        dict _modified
+        readonly int bottom_level_builds
+
+    cdef _AssemblyEntry _build_entry(self, Assembly assembly, list primitives)
+    cdef bint _entry_valid(self, _AssemblyEntry entry, list primitives)
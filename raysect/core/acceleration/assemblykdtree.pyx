@@ -0,0 +1,510 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+from raysect.core.math.spatial.kdtree3d cimport Item3D
+from raysect.core.scenegraph.world cimport World
+from raysect.core.boundingbox cimport new_boundingbox3d
+from raysect.core.math cimport new_point3d
+from raysect.core.ray cimport new_ray
+from libc.stdint cimport int32_t
+cimport cython
+
+# bottom-level bounding boxes are padded by a small amount, relative to the assembly size, to absorb rounding errors
+cdef const double BOX_PADDING = 1e-9
+
+# relative transforms are compared to detect primitives moved inside an assembly
+cdef const double TRANSFORM_TOLERANCE = 1e-12
+
+
+cdef Assembly _nearest_assembly(_NodeBase node, bint *propagated):
+    """
+    Returns the nearest assembly above the node, or None.
+
+    The propagated flag is set if any assembly above the node is updating its
+    sub-tree following a change to the assembly's transform or parent.
+    """
+
+    cdef:
+        object parent
+        Assembly nearest = None
+
+    propagated[0] = False
+    parent = node._parent
+    while parent is not None:
+        if isinstance(parent, Assembly):
+            if nearest is None:
+                nearest = <Assembly> parent
+            if (<Assembly> parent)._propagating:
+                propagated[0] = True
+        parent = (<_NodeBase> parent)._parent
+    return nearest
+
+
+cdef AffineMatrix3D _relative_transform(_NodeBase node, Assembly assembly):
+    """
+    Returns the transform from the node's space to the space of an assembly above it.
+    """
+
+    cdef AffineMatrix3D transform = node._transform
+
+    node = <_NodeBase> node._parent
+    while node is not assembly:
+        transform = node._transform.mul(transform)
+        node = <_NodeBase> node._parent
+    return transform
+
+
+cdef BoundingBox3D _transform_box(BoundingBox3D box, AffineMatrix3D transform):
+    """
+    Returns an axis aligned box enclosing the transformed box.
+    """
+
+    cdef:
+        Point3D vertex
+        BoundingBox3D result = BoundingBox3D()
+
+    for vertex in box.vertices():
+        result.extend(vertex.transform(transform))
+    return result
+
+
+cdef class _Entry:
+    """
+    An item in the top-level kd-tree.
+    """
+
+    cdef Intersection hit(self, Ray ray):
+        raise NotImplementedError("Virtual method hit() has not been implemented.")
+
+    cdef list contains(self, Point3D point):
+        raise NotImplementedError("Virtual method contains() has not been implemented.")
+
+
+cdef class _PrimitiveEntry(_Entry):
+    """
+    A primitive that does not belong to an assembly.
+    """
+
+    def __init__(self, Primitive primitive not None):
+        self.primitive = primitive
+        self.box = primitive.bounding_box()
+
+    cdef Intersection hit(self, Ray ray):
+        if self.box.hit(ray):
+            return self.primitive.hit(ray)
+        return None
+
+    cdef list contains(self, Point3D point):
+        if self.box.contains(point) and self.primitive.contains(point):
+            return [self.primitive]
+        return []
+
+
+cdef class _BottomLevelKDTree(KDTree3DCore):
+    """
+    A kd-tree over the primitives of an assembly, built in the assembly's co-ordinate space.
+
+    The tree only holds the primitive bounding boxes, it may be shared between
+    assemblies with identical geometry. The primitives of the assembly being
+    traced and the world space ray or point are assigned before each query.
+
+    The relative transforms of the primitives used to build the tree are kept
+    so instances of the assembly can be checked for compatibility.
+    """
+
+    def __init__(self, list boxes, list transforms):
+
+        self.boxes = boxes
+        self.transforms = transforms
+        super().__init__([Item3D(id, box) for id, box in enumerate(boxes)], hit_cost=80.0)
+
+    cdef bint matches(self, list transforms):
+        """
+        Returns True if the primitives are arranged identically to those used to build the tree.
+        """
+
+        cdef int32_t index
+
+        if len(transforms) != len(self.transforms):
+            return False
+
+        for index in range(len(transforms)):
+            if not (<AffineMatrix3D> transforms[index]).is_close(self.transforms[index], TRANSFORM_TOLERANCE):
+                return False
+        return True
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef bint _trace_leaf(self, int32_t id, Ray ray, double max_range):
+
+        cdef:
+            int32_t item, index
+            double distance
+            Intersection intersection, closest_intersection
+            Primitive primitive
+
+        # the local space ray is not normalised, so distances are identical in both spaces
+        distance = min(self.world_ray.max_distance, max_range)
+        closest_intersection = None
+        for item in range(self._nodes[id].count):
+
+            index = self._nodes[id].items[item]
+            if not (<BoundingBox3D> self.boxes[index]).hit(ray):
+                continue
+
+            primitive = <Primitive> self.primitives[index]
+            intersection = primitive.hit(self.world_ray)
+            if intersection is not None and intersection.ray_distance <= distance:
+                distance = intersection.ray_distance
+                closest_intersection = intersection
+
+        self.hit_intersection = closest_intersection
+        return closest_intersection is not None
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef list _items_containing_leaf(self, int32_t id, Point3D point):
+
+        cdef:
+            int32_t item, index
+            list enclosing_primitives
+            Primitive primitive
+
+        enclosing_primitives = []
+        for item in range(self._nodes[id].count):
+            index = self._nodes[id].items[item]
+            primitive = <Primitive> self.primitives[index]
+            if (<BoundingBox3D> self.boxes[index]).contains(point) and primitive.contains(self.world_point):
+                enclosing_primitives.append(primitive)
+        return enclosing_primitives
+
+
+cdef class _AssemblyEntry(_Entry):
+    """
+    The primitives of an assembly and their bottom-level kd-tree.
+    """
+
+    def __init__(self, Assembly assembly not None, list primitives not None, list transforms not None, _BottomLevelKDTree tree not None):
+
+        self.assembly = assembly
+        self.primitives = primitives
+        self.transforms = transforms
+        self.indices = {primitive: index for index, primitive in enumerate(primitives)}
+        self.tree = tree
+        self.update_box()
+
+    cdef object update_box(self):
+        """
+        Recalculates the world space bounding box following a move of the assembly.
+        """
+
+        self.box = _transform_box(self.tree.bounds, self.assembly._root_transform)
+
+    cdef Intersection hit(self, Ray ray):
+
+        cdef:
+            AffineMatrix3D to_local
+            Ray local_ray
+
+        if not self.box.hit(ray):
+            return None
+
+        to_local = self.assembly._root_transform_inverse
+        local_ray = new_ray(ray.origin.transform(to_local), ray.direction.transform(to_local), ray.max_distance)
+
+        self.tree.primitives = self.primitives
+        self.tree.world_ray = ray
+        if self.tree._trace(local_ray):
+            return self.tree.hit_intersection
+        return None
+
+    cdef list contains(self, Point3D point):
+
+        if not self.box.contains(point):
+            return []
+
+        self.tree.primitives = self.primitives
+        self.tree.world_point = point
+        return self.tree._items_containing(point.transform(self.assembly._root_transform_inverse))
+
+
+cdef class _TopLevelKDTree(KDTree3DCore):
+    """
+    A kd-tree over the assemblies and the primitives that do not belong to an assembly.
+    """
+
+    def __init__(self, list entries):
+
+        self.entries = entries
+        self.hit_intersection = None
+        super().__init__([Item3D(id, (<_Entry> entry).box) for id, entry in enumerate(entries)], hit_cost=80.0)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef bint _trace_leaf(self, int32_t id, Ray ray, double max_range):
+
+        cdef:
+            int32_t item
+            double distance
+            Intersection intersection, closest_intersection
+
+        distance = min(ray.max_distance, max_range)
+        closest_intersection = None
+        for item in range(self._nodes[id].count):
+            intersection = (<_Entry> self.entries[self._nodes[id].items[item]]).hit(ray)
+            if intersection is not None and intersection.ray_distance <= distance:
+                distance = intersection.ray_distance
+                closest_intersection = intersection
+
+        self.hit_intersection = closest_intersection
+        return closest_intersection is not None
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef list _items_containing_leaf(self, int32_t id, Point3D point):
+
+        cdef:
+            int32_t item
+            list enclosing_primitives
+
+        enclosing_primitives = []
+        for item in range(self._nodes[id].count):
+            enclosing_primitives.extend((<_Entry> self.entries[self._nodes[id].items[item]]).contains(point))
+        return enclosing_primitives
+
+
+cdef class AssemblyKDTree(Accelerator):
+    """
+    A two-level kd-tree acceleration structure that is aware of scene-graph assemblies.
+
+    The primitives below each Assembly node are held in a bottom-level kd-tree
+    built in the assembly's co-ordinate space. A top-level kd-tree is built
+    over the assemblies and any primitives that do not belong to an assembly.
+
+    When the scene-graph changes, only the bottom-level trees of assemblies
+    whose contents have changed are rebuilt. Moving an assembly as a whole only
+    requires the inexpensive top-level tree to be rebuilt. Assemblies created
+    with Assembly.instance() share the bottom-level tree of the original
+    assembly. If the contents of an instance, or of an assembly that has been
+    instanced, are altered the assembly is given its own bottom-level tree.
+
+    Without any assemblies in the scene-graph this accelerator behaves like the
+    KDTree accelerator.
+
+    .. code-block:: pycon
+
+        >>> from raysect.core import World
+        >>> from raysect.core.acceleration import AssemblyKDTree
+        >>>
+        >>> world = World()
+        >>> world.accelerator = AssemblyKDTree()
+
+    :ivar int bottom_level_builds: The number of bottom-level kd-trees built by
+      this accelerator, useful for diagnosing unexpected rebuilds.
+    """
+
+    def __init__(self):
+
+        self._top = None
+        self._entries = {}
+        self._shared = {}
+        self._dirty = {}
+        self._checks = {}
+        self._modified = {}
+        self.bottom_level_builds = 0
+
+    cpdef build(self, list primitives):
+
+        # discard all cached trees, the modification records of the assemblies
+        # still in the scene are retained by update() as instances must not share
+        # the tree of an assembly they no longer match
+        self._entries = {}
+        self._shared = {}
+        self._top = None
+        self.update(primitives)
+
+    cpdef update(self, list primitives):
+
+        cdef:
+            Primitive primitive
+            Assembly assembly
+            _AssemblyEntry entry
+            bint propagated
+            dict groups, entries, live
+            list loose, members
+
+        # group the primitives by their nearest assembly
+        groups = {}
+        loose = []
+        for primitive in primitives:
+            assembly = _nearest_assembly(primitive, &propagated)
+            if assembly is None:
+                loose.append(_PrimitiveEntry(primitive))
+            else:
+                members = groups.get(assembly)
+                if members is None:
+                    groups[assembly] = [primitive]
+                else:
+                    members.append(primitive)
+
+        # reuse the bottom-level trees of unchanged assemblies
+        entries = {}
+        for assembly, members in groups.items():
+            entry = self._entries.get(assembly)
+            if entry is not None and self._entry_valid(entry, members):
+                entry.update_box()
+            else:
+                entry = self._build_entry(assembly, members)
+            entries[assembly] = entry
+
+        # forget assemblies that have left the scene, the sources of the remaining instances are still required
+        live = dict.fromkeys(groups)
+        for assembly in groups:
+            if assembly.source is not None:
+                live[assembly.source] = None
+        self._shared = {source: tree for source, tree in self._shared.items() if source in live}
+        self._modified = {assembly: None for assembly in self._modified if assembly in live}
+
+        self._entries = entries
+        self._dirty = {}
+        self._checks = {}
+        self._top = _TopLevelKDTree(list(entries.values()) + loose)
+
+    cpdef object notify(self, _NodeBase node):
+        """
+        Records a change to a node so the affected bottom-level trees can be rebuilt.
+        """
+
+        cdef:
+            Assembly assembly
+            bint propagated
+            list checks
+
+        # assembly moves and changes to primitives outside assemblies only affect the top-level tree
+        if isinstance(node, Assembly) or not isinstance(node, Primitive):
+            return
+
+        assembly = _nearest_assembly(node, &propagated)
+        if assembly is None:
+            return
+
+        if propagated:
+
+            # the primitive moved with an assembly, so its position in the assembly is unchanged, unless
+            # it was also moved during a batch update and its own update was absorbed by the assembly's
+            if not isinstance(node.root, World) or not (<World> node.root)._flushing:
+                return
+
+            checks = self._checks.get(assembly)
+            if checks is None:
+                self._checks[assembly] = [node]
+            else:
+                checks.append(node)
+            return
+
+        self._dirty[assembly] = None
+
+        # once instanced, a modified assembly no longer matches its instances
+        if assembly.source is not None or assembly._instanced:
+            self._modified[assembly] = None
+
+    cdef bint _entry_valid(self, _AssemblyEntry entry, list primitives):
+        """
+        Returns True if an assembly's bottom-level tree is unaffected by the recorded changes.
+        """
+
+        cdef:
+            Primitive primitive
+            int32_t index
+
+        if entry.assembly in self._dirty or entry.primitives != primitives:
+            return False
+
+        for primitive in self._checks.get(entry.assembly, []):
+            index = entry.indices[primitive]
+            if not _relative_transform(primitive, entry.assembly).is_close(entry.transforms[index], TRANSFORM_TOLERANCE):
+                return False
+
+        return True
+
+    cdef _AssemblyEntry _build_entry(self, Assembly assembly, list primitives):
+        """
+        Builds or shares the bottom-level tree of an assembly.
+        """
+
+        cdef:
+            Primitive primitive
+            BoundingBox3D box, bounds
+            list boxes, transforms
+            Assembly source
+            _BottomLevelKDTree tree
+            bint shareable
+
+        transforms = [_relative_transform(primitive, assembly) for primitive in primitives]
+
+        # unmodified instances share the tree of their source assembly
+        source = assembly.source if assembly.source is not None else assembly
+        shareable = assembly not in self._modified and source not in self._modified
+        if shareable and assembly is not source:
+            tree = self._shared.get(source)
+            if tree is not None and tree.matches(transforms):
+                return _AssemblyEntry(assembly, primitives, transforms, tree)
+
+        # primitive bounding boxes in the assembly space, padded to absorb rounding errors
+        bounds = BoundingBox3D()
+        boxes = []
+        for primitive in primitives:
+            box = _transform_box(primitive.bounding_box(), assembly._root_transform_inverse)
+            bounds.union(box)
+            boxes.append(box)
+
+        for box in boxes:
+            box.pad(BOX_PADDING * max(1.0, bounds.largest_extent()))
+
+        tree = _BottomLevelKDTree(boxes, transforms)
+        self.bottom_level_builds += 1
+
+        if shareable:
+            self._shared[source] = tree
+
+        return _AssemblyEntry(assembly, primitives, transforms, tree)
+
+    cpdef Intersection hit(self, Ray ray):
+
+        if self._top is not None and self._top._trace(ray):
+            return self._top.hit_intersection
+        return None
+
+    cpdef list contains(self, Point3D point):
+
+        if self._top is None:
+            return []
+        return self._top._items_containing(point)
@@ -0,0 +1,220 @@
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+
+import gc
+import unittest
+import numpy as np
+from raysect.core import World, Node, Assembly, Observer, Point3D, Vector3D, translate, rotate, rotate_z
+from raysect.core.acceleration import AssemblyKDTree
+from raysect.core.ray import Ray
+from raysect.primitive import Sphere, Box
+
+
+def _closest_hit(world, ray):
+    """Brute force ray trace against every primitive in the world."""
+
+    closest = None
+    for primitive in world.primitives:
+        intersection = primitive.hit(ray)
+        if intersection is not None and (closest is None or intersection.ray_distance < closest.ray_distance):
+            closest = intersection
+    return closest
+
+
+def _tile_row(parent, count=20, transform=None):
+
+    row = Assembly(parent, transform)
+    for i in range(count):
+        Box(Point3D(-0.4, -0.4, -0.1), Point3D(0.4, 0.4, 0.1), parent=row, transform=translate(i, 0, 0))
+        Sphere(0.2, parent=row, transform=translate(i, 0, 0.3))
+    return row
+
+
+class TestAssemblyKDTree(unittest.TestCase):
+
+    def setUp(self):
+
+        self.rng = np.random.default_rng(23)
+
+        self.world = World()
+        self.accelerator = AssemblyKDTree()
+        self.world.accelerator = self.accelerator
+
+        self.row = _tile_row(self.world)
+        self.loose = Sphere(1.0, parent=self.world, transform=translate(5, 5, 0))
+
+    def assert_consistent(self, count=300):
+        """Compares the accelerated hits and containment queries with a brute force search."""
+
+        for _ in range(count):
+
+            origin = Point3D(*self.rng.uniform(-10, 30, 3))
+            target = Point3D(*self.rng.uniform([-1, -1, -1], [20, 10, 1]))
+            ray = Ray(origin, origin.vector_to(target).normalise())
+
+            expected = _closest_hit(self.world, ray)
+            intersection = self.world.hit(ray)
+            if expected is None:
+                self.assertIsNone(intersection)
+            else:
+                self.assertIsNotNone(intersection)
+                self.assertIs(intersection.primitive, expected.primitive)
+                self.assertAlmostEqual(intersection.ray_distance, expected.ray_distance, delta=1e-9)
+
+            point = Point3D(*self.rng.uniform([-1, -1, -1], [20, 10, 1]))
+            expected = {primitive for primitive in self.world.primitives if primitive.contains(point)}
+            self.assertEqual(set(self.world.contains(point)), expected)
+
+    def test_hit_and_contains(self):
+
+        nested = _tile_row(self.row, 5, translate(0, 2, 0))
+        Node(nested, translate(0, 1, 0))
+        self.assert_consistent()
+
+        # the outer row and the nested row each have their own tree
+        self.assertEqual(self.accelerator.bottom_level_builds, 2)
+
+    def test_move_assembly(self):
+
+        self.world.build_accelerator()
+        builds = self.accelerator.bottom_level_builds
+
+        self.row.transform = rotate(10, 20, 30) * translate(0, 1, 0)
+        self.loose.transform = translate(3, 3, 0)
+        self.assert_consistent()
+
+        # moving an assembly or a loose primitive only rebuilds the top-level tree
+        self.assertEqual(self.accelerator.bottom_level_builds, builds)
+
+        # re-parenting also moves the assembly as a whole
+        node = Node(self.world, translate(0, 4, 0))
+        self.row.parent = node
+        with self.world.batch_update():
+            node.transform = rotate_z(45)
+            self.row.transform = translate(1, 0, 0)
+        self.assert_consistent()
+        self.assertEqual(self.accelerator.bottom_level_builds, builds)
+
+    def test_modify_assembly(self):
+
+        self.world.build_accelerator()
+        builds = self.accelerator.bottom_level_builds
+
+        # moving a primitive inside an assembly invalidates the assembly's tree
+        self.row.children[0].transform = translate(0, 0, 5)
+        self.assert_consistent()
+        self.assertEqual(self.accelerator.bottom_level_builds, builds + 1)
+
+        # moving the assembly and a primitive within it in one batch
+        with self.world.batch_update():
+            self.row.transform = translate(0, 1, 0)
+            self.row.children[1].transform = translate(0, 0, -3)
+        self.assert_consistent()
+        self.assertEqual(self.accelerator.bottom_level_builds, builds + 2)
+
+        # changing the geometry of a primitive
+        self.row.children[3].radius = 0.35
+        self.assert_consistent()
+        self.assertEqual(self.accelerator.bottom_level_builds, builds + 3)
+
+        # adding and removing primitives
+        Sphere(0.3, parent=self.row, transform=translate(3, 0, -0.5))
+        self.row.children[5].parent = None
+        self.assert_consistent()
+        self.assertEqual(self.accelerator.bottom_level_builds, builds + 4)
+
+    def test_instance(self):
+
+        instances = [self.row.instance(self.world, rotate_z(5 * i) * translate(0, 2 * i, 0)) for i in range(1, 5)]
+        for instance in instances:
+            self.assertIs(instance.source, self.row)
+            self.assertEqual(len(instance.children), len(self.row.children))
+
+        # an instance of an instance refers back to the original assembly
+        instances.append(instances[0].instance(self.world, translate(0, -3, 0)))
+        self.assertIs(instances[-1].source, self.row)
+
+        self.assert_consistent()
+
+        # all instances share the tree of the original assembly
+        self.assertEqual(self.accelerator.bottom_level_builds, 1)
+
+        # moving instances does not rebuild any bottom-level trees
+        instances[1].transform = translate(0, -6, 0)
+        self.assert_consistent()
+        self.assertEqual(self.accelerator.bottom_level_builds, 1)
+
+        # a modified instance is given its own tree, the other assemblies are unaffected
+        instances[2].children[0].transform = translate(0, 0, 2)
+        self.assert_consistent()
+        self.assertEqual(self.accelerator.bottom_level_builds, 2)
+
+        # a forced rebuild discards the cached trees, the modified instance must not share
+        self.world.build_accelerator(force=True)
+        self.assertEqual(self.accelerator.bottom_level_builds, 4)
+        self.assert_consistent()
+
+    def test_removed_assemblies_released(self):
+
+        instance = self.row.instance(self.world, translate(0, 2, 0))
+        self.world.build_accelerator()
+        instance.children[0].transform = translate(0, 0, 2)
+        self.world.build_accelerator()
+
+        # the accelerator must not keep any record of an assembly removed from the scene
+        instance.parent = None
+        for force in (False, True):
+            self.world.build_accelerator(force=force)
+            self.assertFalse(any(isinstance(referrer, dict) and instance in referrer for referrer in gc.get_referrers(instance)))
+        self.assert_consistent()
+
+    def test_instance_invalid_node(self):
+
+        Observer(self.row)
+        with self.assertRaises(TypeError):
+            self.row.instance()
+
+    def test_without_assemblies(self):
+
+        world = World()
+        world.accelerator = AssemblyKDTree()
+        spheres = [Sphere(0.5, parent=world, transform=translate(i, i % 3, 0)) for i in range(10)]
+
+        ray = Ray(Point3D(4, 1, -5), Vector3D(0, 0, 1))
+        intersection = world.hit(ray)
+        self.assertIs(intersection.primitive, spheres[4])
+        self.assertAlmostEqual(intersection.ray_distance, 4.5)
+        self.assertEqual(world.contains(Point3D(7, 1, 0)), [spheres[7]])
+
+        world.accelerator.build([])
+        self.assertIsNone(world.accelerator.hit(ray))
+        self.assertEqual(world.accelerator.contains(Point3D(7, 1, 0)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
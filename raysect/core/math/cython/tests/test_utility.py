@@ -35,10 +35,67 @@ import unittest
 import numpy as np
 from raysect.core.math.cython.utility import _minimum as minimum, _maximum as maximum, _peak_to_peak as peak_to_peak
 from raysect.core.math.cython.utility import _test_winding2d as winding2d, _point_inside_polygon as point_inside_polygon
+from raysect.core.math.cython.utility import _find_index as find_index, _find_spacing as find_spacing, \
+    _find_index_spaced as find_index_spaced, _find_index_hunt as find_index_hunt
+
+
+# values of the spacing classifications returned by find_spacing
+SPACING_IRREGULAR = 0
+SPACING_UNIFORM = 1
+SPACING_LOG_UNIFORM = 2
 
 
 class TestUtility(unittest.TestCase):
 
+    def _assert_spaced_search(self, x, spacing):
+        """Checks the spaced index search agrees with the bisection search."""
+
+        detected, scale = find_spacing(x)
+        self.assertEqual(detected, spacing)
+
+        # random samples, the knots themselves, values just either side of the knots and values outside the range
+        rng = np.random.default_rng(1234)
+        samples = np.concatenate((
+            rng.uniform(x[0] - 1, x[-1] + 1, 1000),
+            x, np.nextafter(x, -np.inf), np.nextafter(x, np.inf),
+            [x[0] - 10, x[-1] + 10]
+        ))
+        for v in samples:
+            self.assertEqual(find_index_spaced(x, v, detected, scale), find_index(x, v), msg=f'Index mismatch for v={v!r}.')
+
+    def test_find_index_uniform(self):
+        """Tests the direct index calculation for uniformly spaced arrays."""
+
+        self._assert_spaced_search(np.linspace(-3.2, 7.9, 51), SPACING_UNIFORM)
+        self._assert_spaced_search(np.linspace(0, 1, 2), SPACING_UNIFORM)
+        self._assert_spaced_search(np.arange(0, 1, 0.1), SPACING_UNIFORM)
+
+    def test_find_index_log_uniform(self):
+        """Tests the direct index calculation for logarithmically spaced arrays."""
+
+        self._assert_spaced_search(np.logspace(-3, 4, 64), SPACING_LOG_UNIFORM)
+        self._assert_spaced_search(np.geomspace(0.5, 2.5, 7), SPACING_LOG_UNIFORM)
+
+    def test_find_index_hunt(self):
+        """Tests the hinted index search agrees with the bisection search for every starting hint."""
+
+        x = np.array([-1.0, 0.0, 0.5, 3.0, 3.1, 10.0, 10.5, 11.0, 20.0, 21.0, 40.0])
+        samples = np.concatenate((np.linspace(-2, 41, 173), x, np.nextafter(x, -np.inf)))
+        for hint in range(-3, x.shape[0] + 3):
+            for v in samples:
+                index, new_hint = find_index_hunt(x, v, hint)
+                self.assertEqual(index, find_index(x, v), msg=f'Index mismatch for v={v!r} with hint={hint}.')
+                if 0 <= index < x.shape[0] - 1:
+                    self.assertEqual(new_hint, index)
+                else:
+                    self.assertEqual(new_hint, hint)
+
+    def test_find_index_irregular(self):
+        """Tests irregularly spaced arrays fall back to the bisection search."""
+
+        self._assert_spaced_search(np.array([-1.0, 0.0, 0.5, 3.0, 3.1, 10.0]), SPACING_IRREGULAR)
+        self._assert_spaced_search(np.array([-2.0, -1.0, 0.0, 1.5]), SPACING_IRREGULAR)
+
     def test_maximum(self):
         """Tests the maximum value calculation for memoryviews."""
 
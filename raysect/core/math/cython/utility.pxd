@@ -33,10 +33,33 @@ cimport cython
 
 DEF EQN_EPS = 1.0e-9
 
+# knot spacing classifications returned by find_spacing()
+cdef enum:
+    SPACING_IRREGULAR = 0
+    SPACING_UNIFORM = 1
+    SPACING_LOG_UNIFORM = 2
+
 cdef int find_index(double[::1] x, double v) nogil
 
+cdef int find_spacing(double[::1] x, double *scale)
+
+cdef int find_index_uniform(double[::1] x, double v, double scale) nogil
+
+cdef int find_index_log_uniform(double[::1] x, double v, double scale) nogil
+
+cdef int find_index_hunt(double[::1] x, double v, int *hint) nogil
+
+cdef inline int find_index_spaced(double[::1] x, double v, int spacing, double scale, int *hint) nogil:
+    if spacing == SPACING_UNIFORM:
+        return find_index_uniform(x, v, scale)
+    if spacing == SPACING_LOG_UNIFORM:
+        return find_index_log_uniform(x, v, scale)
+    return find_index_hunt(x, v, hint)
+
 cdef double interpolate(double[::1] x, double[::1] y, double p) nogil
 
+cdef double interpolate_hunt(double[::1] x, double[::1] y, double p, int *hint) nogil
+
 cdef double integrate(double[::1] x, double[::1] y, double x0, double x1) nogil
 
 cdef double average(double[::1] x, double[::1] y, double x0, double x1) nogil
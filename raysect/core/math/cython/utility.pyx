@@ -29,7 +29,7 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
-from libc.math cimport sqrt, fabs, cbrt, acos, cos, M_PI
+from libc.math cimport sqrt, fabs, cbrt, acos, cos, log, M_PI
 cimport cython
 
 #TODO: Write unit tests!
@@ -92,6 +92,241 @@ cdef int find_index(double[::1] x, double v) nogil:
     return bottom_index
 
 
+# the largest deviation of a knot from a uniform grid, as a fraction of the knot spacing, permitted by find_spacing()
+cdef const double SPACING_TOLERANCE = 1e-6
+
+
+@cython.cdivision(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef int find_spacing(double[::1] x, double *scale):
+    """
+    Identifies arrays with uniformly or logarithmically uniformly spaced values.
+
+    Returns SPACING_UNIFORM if the values of x are uniformly spaced (such as an
+    array generated by numpy.linspace()), SPACING_LOG_UNIFORM if the logarithms
+    of the values are uniformly spaced (such as an array generated by
+    numpy.logspace()) or SPACING_IRREGULAR otherwise. For uniform spacings, the
+    reciprocal of the spacing (of the logarithms) is written to scale, ready
+    to be passed to find_index_uniform() or find_index_log_uniform().
+
+    This function expects a monotonically increasing array for x with at least
+    two values.
+
+    :param double[::1] x: A memory view to a double array containing monotonically increasing values.
+    :param double *scale: Pointer to a double that receives the reciprocal of the spacing.
+    :return: The spacing of the array.
+    :rtype: int
+    """
+
+    cdef:
+        int i, n
+        double spacing, log_x0
+
+    n = x.shape[0]
+    scale[0] = 0.0
+
+    spacing = (x[n - 1] - x[0]) / (n - 1)
+    for i in range(n):
+        if fabs(x[i] - (x[0] + i * spacing)) > SPACING_TOLERANCE * spacing:
+            break
+    else:
+        scale[0] = 1.0 / spacing
+        return SPACING_UNIFORM
+
+    if x[0] <= 0:
+        return SPACING_IRREGULAR
+
+    log_x0 = log(x[0])
+    spacing = (log(x[n - 1]) - log_x0) / (n - 1)
+    for i in range(n):
+        if fabs(log(x[i]) - (log_x0 + i * spacing)) > SPACING_TOLERANCE * spacing:
+            return SPACING_IRREGULAR
+
+    scale[0] = 1.0 / spacing
+    return SPACING_LOG_UNIFORM
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline int _correct_index(double[::1] x, double v, double estimate) nogil:
+    """
+    Converts an estimated fractional index into the lower index of the bin containing v.
+
+    The value must lie in the range [x[0], x[-1]). The estimate is corrected for
+    rounding errors and small deviations of the array from the assumed spacing.
+    """
+
+    cdef:
+        int index
+        int last_bin = x.shape[0] - 2
+
+    # the comparison also catches NaN estimates
+    if not estimate < last_bin:
+        index = last_bin
+    elif estimate > 0:
+        index = <int> estimate
+    else:
+        index = 0
+
+    while index > 0 and v < x[index]:
+        index -= 1
+
+    while index < last_bin and v >= x[index + 1]:
+        index += 1
+
+    return index
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef int find_index_uniform(double[::1] x, double v, double scale) nogil:
+    """
+    Locates the lower index of the range that contains the specified value in a uniformly spaced array.
+
+    Identical to find_index(), but the index is calculated directly rather
+    than by a bisection search. The array must have been identified as
+    uniformly spaced by find_spacing(), which also supplies the scale.
+
+    .. WARNING:: For speed, this function does not perform any type or bounds
+       checking. Supplying malformed data may result in data corruption or a
+       segmentation fault.
+
+    :param double[::1] x: A memory view to a double array containing uniformly spaced, increasing values.
+    :param double v: The value to search for.
+    :param double scale: The reciprocal of the array spacing.
+    :return: The lower index of the bin containing the search value.
+    :rtype: int
+    """
+
+    cdef int top_index
+
+    if v < x[0]:
+        return -1
+
+    top_index = x.shape[0] - 1
+    if v >= x[top_index]:
+        return top_index
+
+    return _correct_index(x, v, (v - x[0]) * scale)
+
+
+@cython.cdivision(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef int find_index_log_uniform(double[::1] x, double v, double scale) nogil:
+    """
+    Locates the lower index of the range that contains the specified value in a logarithmically spaced array.
+
+    Identical to find_index(), but the index is calculated directly rather
+    than by a bisection search. The array must have been identified as
+    logarithmically uniformly spaced by find_spacing(), which also supplies
+    the scale.
+
+    .. WARNING:: For speed, this function does not perform any type or bounds
+       checking. Supplying malformed data may result in data corruption or a
+       segmentation fault.
+
+    :param double[::1] x: A memory view to a double array containing positive, logarithmically spaced, increasing values.
+    :param double v: The value to search for.
+    :param double scale: The reciprocal of the spacing of the logarithms of the array values.
+    :return: The lower index of the bin containing the search value.
+    :rtype: int
+    """
+
+    cdef int top_index
+
+    if v < x[0]:
+        return -1
+
+    top_index = x.shape[0] - 1
+    if v >= x[top_index]:
+        return top_index
+
+    return _correct_index(x, v, log(v / x[0]) * scale)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef int find_index_hunt(double[::1] x, double v, int *hint) nogil:
+    """
+    Locates the lower index of the range that contains the specified value, starting the search from a hint.
+
+    Identical to find_index(), but the search starts from the bin index held
+    by hint and expands outwards, doubling the step each time, until the value
+    is bracketed. The search is then completed by bisection. When successive
+    values lie in the same or nearby bins, such as points sampled along a ray,
+    this requires far fewer comparisons than a full bisection search. The
+    located bin is written back to hint, ready for the next search.
+
+    Any hint value gives the correct result, a poor hint only slows the
+    search. A hint may therefore be shared between callers without locking.
+
+    .. WARNING:: For speed, this function does not perform any type or bounds
+       checking. Supplying malformed data may result in data corruption or a
+       segmentation fault.
+
+    :param double[::1] x: A memory view to a double array containing monotonically increasing values.
+    :param double v: The value to search for.
+    :param int *hint: Pointer to the bin index at which to start the search, updated with the located bin.
+    :return: The lower index of the bin containing the search value.
+    :rtype: int
+    """
+
+    cdef int top_index, lower, upper, step, mid
+
+    if v < x[0]:
+        return -1
+
+    top_index = x.shape[0] - 1
+    if v >= x[top_index]:
+        return top_index
+
+    # the hint may be out of date, clamp it to a valid bin
+    lower = hint[0]
+    if lower < 0:
+        lower = 0
+    elif lower > top_index - 1:
+        lower = top_index - 1
+
+    step = 1
+    if v >= x[lower]:
+
+        # hunt upwards, maintaining x[lower] <= v
+        upper = lower + 1
+        while v >= x[upper]:
+            lower = upper
+            step <<= 1
+            upper = lower + step
+            if upper >= top_index:
+                upper = top_index
+                break
+
+    else:
+
+        # hunt downwards, maintaining v < x[upper]
+        upper = lower
+        lower = upper - 1
+        while v < x[lower]:
+            upper = lower
+            step <<= 1
+            lower = upper - step
+            if lower <= 0:
+                lower = 0
+                break
+
+    # bisect the bracketing range
+    while upper - lower > 1:
+        mid = (lower + upper) >> 1
+        if v >= x[mid]:
+            lower = mid
+        else:
+            upper = mid
+
+    hint[0] = lower
+    return lower
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 cdef double interpolate(double[::1] x, double[::1] y, double p) nogil:
@@ -114,9 +349,37 @@ cdef double interpolate(double[::1] x, double[::1] y, double p) nogil:
     :rtype: double
     """
 
-    cdef int index, top_index
+    return _interpolate_bin(x, y, p, find_index(x, p))
+
+
+cdef double interpolate_hunt(double[::1] x, double[::1] y, double p, int *hint) nogil:
+    """
+    Linearly interpolates sampled data onto the specified point, starting the bin search from a hint.
+
+    Identical to interpolate(), but the bin containing p is located with
+    find_index_hunt(). This is faster when successive points are close
+    together. See find_index_hunt() for details of the hint.
+
+    .. WARNING:: For speed, this function does not perform any type or bounds
+       checking. Supplying malformed data may result in data corruption or a
+       segmentation fault.
+
+    :param double[::1] x: A memory view to a double array containing monotonically increasing values.
+    :param double[::1] y: A memory view to a double array of sample values corresponding to the x array points.
+    :param double p: The x point for which an interpolated y value is required.
+    :param int *hint: Pointer to the bin index at which to start the search, updated with the located bin.
+    :return: The linearly interpolated y value at point p.
+    :rtype: double
+    """
+
+    return _interpolate_bin(x, y, p, find_index_hunt(x, p, hint))
+
 
-    index = find_index(x, p)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline double _interpolate_bin(double[::1] x, double[::1] y, double p, int index) nogil:
+
+    cdef int top_index
 
     # point is below array limits
     if index == -1:
@@ -843,6 +1106,31 @@ cdef int factorial(int n):
         return n * factorial(n - 1)
 
 
+def _find_index(x, v):
+    """Expose cython function for testing."""
+    return find_index(x, v)
+
+
+def _find_spacing(x):
+    """Expose cython function for testing."""
+    scale = 0.0
+    spacing = find_spacing(x, &scale)
+    return spacing, scale
+
+
+def _find_index_spaced(x, v, spacing, scale):
+    """Expose cython function for testing."""
+    cdef int hint = 0
+    return find_index_spaced(x, v, spacing, scale, &hint)
+
+
+def _find_index_hunt(x, v, hint):
+    """Expose cython function for testing."""
+    cdef int c_hint = hint
+    index = find_index_hunt(x, v, &c_hint)
+    return index, c_hint
+
+
 def _maximum(data):
     """Expose cython function for testing."""
     return maximum(data)
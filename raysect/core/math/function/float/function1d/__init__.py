@@ -33,6 +33,7 @@ from .base import Function1D
 from .constant import Constant1D
 from .blend import Blend1D
 from .arg import Arg1D
+from .autowrap import PythonFunction1D
 from .cmath import *
 from .samplers import *
 from .interpolate import Interpolator1DArray
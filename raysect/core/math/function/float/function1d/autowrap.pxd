@@ -33,5 +33,6 @@ from raysect.core.math.function.float.function1d.base cimport Function1D
 
 cdef class PythonFunction1D(Function1D):
     cdef public object function
+    cdef public bint vectorised
 
 cdef Function1D autowrap_function1d(object obj)
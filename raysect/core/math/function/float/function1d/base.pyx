@@ -30,6 +30,7 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 import numbers
+import numpy as np
 from cpython.object cimport Py_LT, Py_EQ, Py_GT, Py_LE, Py_NE, Py_GE
 cimport cython
 from libc.math cimport floor
@@ -62,6 +63,37 @@ cdef class Function1D(FloatFunction):
         """
         return self.evaluate(x)
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def evaluate_array(self, object x):
+        """
+        Evaluates the function at an array of points.
+
+        The function is evaluated at every point in a single compiled loop,
+        avoiding the overhead of a Python call per point.
+
+        :param object x: An array of x coordinates.
+        :return: An array of function values with the shape of the x array.
+        :rtype: ndarray
+        """
+
+        cdef:
+            const double[::1] x_mv
+            double[::1] f_mv
+            Py_ssize_t i
+
+        x = np.asarray(x, dtype=np.float64)
+        shape = x.shape
+        x_mv = np.ascontiguousarray(x).ravel()
+
+        f = np.empty(x_mv.shape[0], dtype=np.float64)
+        f_mv = f
+
+        for i in range(f_mv.shape[0]):
+            f_mv[i] = self.evaluate(x_mv[i])
+
+        return f.reshape(shape)
+
     def __repr__(self):
         return 'Function1D(x)'
 
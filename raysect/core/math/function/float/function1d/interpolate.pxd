@@ -42,6 +42,11 @@ cdef class Interpolator1DArray(Function1D):
         _Extrapolator1D _extrapolator
         int _last_index
         double _extrapolation_range
+        int _spacing
+        double _scale
+        int _hint
+
+    cdef double _evaluate_gradient(self, double px, double *gradient) except? -1e999
 
 
 cdef class _Interpolator1D:
@@ -51,7 +56,8 @@ cdef class _Interpolator1D:
         int _last_index
 
     cdef double evaluate(self, double px, int index) except? -1e999
-    # cdef double _analytic_gradient(self, double px, int index, int order)
+    cdef double _analytic_gradient(self, double px, int index, int order) except? -1e999
+    cdef double evaluate_gradient(self, double px, int index, double *gradient) except? -1e999
 
 
 cdef class _Interpolator1DLinear(_Interpolator1D):
@@ -65,6 +71,8 @@ cdef class _Interpolator1DCubic(_Interpolator1D):
         int _n
         _ArrayDerivative1D _array_derivative
 
+    cdef void _cache_coefficients(self, int index, double[4] a)
+
 
 cdef class _Extrapolator1D:
 
@@ -73,7 +81,8 @@ cdef class _Extrapolator1D:
         int _last_index
 
     cdef double evaluate(self, double px, int index) except? -1e999
-    # cdef double _analytic_gradient(self, double px, int index, int order)
+    cdef double _analytic_gradient(self, double px, int index, int order) except? -1e999
+    cdef double evaluate_gradient(self, double px, int index, double *gradient) except? -1e999
 
 
 cdef class _Extrapolator1DNone(_Extrapolator1D):
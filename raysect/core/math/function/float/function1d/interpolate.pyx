@@ -39,7 +39,7 @@ import numpy as np
 cimport cython
 from raysect.core.math.cython.interpolation.linear cimport linear1d
 from raysect.core.math.cython.interpolation.cubic cimport calc_coefficients_1d, evaluate_cubic_1d
-from raysect.core.math.cython.utility cimport find_index, lerp
+from raysect.core.math.cython.utility cimport find_index_spaced, find_spacing, lerp
 
 
 cdef class Interpolator1DArray(Function1D):
@@ -123,6 +123,9 @@ cdef class Interpolator1DArray(Function1D):
         self._x_mv = x
         self._f_mv = f
 
+        # uniformly spaced knots permit the bin to be located without a search
+        self._spacing = find_spacing(self._x_mv, &self._scale)
+
         # prevent users being able to change the data arrays
         self.x.flags.writeable = False
         self.f.flags.writeable = False
@@ -158,6 +161,7 @@ cdef class Interpolator1DArray(Function1D):
 
         # Rebuild memory views.
         self._x_mv, self._f_mv = self.x, self.f
+        self._spacing = find_spacing(self._x_mv, &self._scale)
 
         # Recreate the interpolator and extrapolator objects.
         self._interpolator = id_to_interpolator[interpolation_type](self._x_mv, self._f_mv)
@@ -177,7 +181,7 @@ cdef class Interpolator1DArray(Function1D):
         :return: the interpolated value at point x.
         """
 
-        cdef int index = find_index(self._x_mv, px)
+        cdef int index = find_index_spaced(self._x_mv, px, self._spacing, self._scale, &self._hint)
 
         # find_index returns -1 in the lower extrapolation region, the index of the bin lower than px. The last index
         # is returned if greater than or equal to the largest bin edge, greater is handled by the extrapolator, equal is handled by the interpolator.
@@ -197,6 +201,91 @@ cdef class Interpolator1DArray(Function1D):
         else:
             return self._interpolator.evaluate(px, index)
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double _evaluate_gradient(self, double px, double *gradient) except? -1e999:
+        """
+        Evaluates the interpolating function and its gradient.
+
+        The spline knot search is performed once and shared by the value and
+        gradient calculations. Dispatch to the interpolator or extrapolator
+        follows evaluate().
+
+        :param double px: the point for which an interpolated value is required.
+        :param double *gradient: receives df/dx.
+        :return: the interpolated value at point x.
+        """
+
+        cdef int index = find_index_spaced(self._x_mv, px, self._spacing, self._scale, &self._hint)
+
+        if index == -1:
+            if px < self._x_mv[0] - self._extrapolation_range:
+                raise ValueError(f'The specified value (x={px}) is outside of extrapolation range.')
+            return self._extrapolator.evaluate_gradient(px, index, gradient)
+
+        elif index == self._last_index and px > self._x_mv[self._last_index]:
+            if px > self._x_mv[self._last_index] + self._extrapolation_range:
+                raise ValueError(f'The specified value (x={px}) is outside of extrapolation range.')
+            return self._extrapolator.evaluate_gradient(px, index, gradient)
+
+        elif px == self._x_mv[self._last_index]:
+            return self._interpolator.evaluate_gradient(px, index - 1, gradient)
+
+        else:
+            return self._interpolator.evaluate_gradient(px, index, gradient)
+
+    def evaluate_gradient(self, double x):
+        """
+        Evaluates the interpolating function and its gradient at a point.
+
+        The value and the analytic gradient of the interpolant are calculated
+        together, so the spline knot search and the cubic coefficients are
+        only computed once.
+
+        :param float x: The x coordinate.
+        :return: A tuple of (f, df/dx).
+        :rtype: tuple
+        """
+
+        cdef double f, df_dx
+
+        f = self._evaluate_gradient(x, &df_dx)
+        return f, df_dx
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    def evaluate_gradient_array(self, object x):
+        """
+        Evaluates the interpolating function and its gradient at an array of points.
+
+        Every point is evaluated in a single compiled loop.
+
+        :param object x: An array of x coordinates.
+        :return: A tuple of arrays (f, df/dx) with the shape of the coordinate array.
+        :rtype: tuple
+        """
+
+        cdef:
+            const double[::1] x_mv
+            double[::1] f_mv, dfdx_mv
+            Py_ssize_t i
+
+        x = np.asarray(x, dtype=np.float64)
+        shape = x.shape
+        x_mv = np.ascontiguousarray(x).ravel()
+
+        f = np.empty(x_mv.shape[0], dtype=np.float64)
+        dfdx = np.empty(x_mv.shape[0], dtype=np.float64)
+        f_mv = f
+        dfdx_mv = dfdx
+
+        for i in range(f_mv.shape[0]):
+            f_mv[i] = self._evaluate_gradient(x_mv[i], &dfdx_mv[i])
+
+        return f.reshape(shape), dfdx.reshape(shape)
+
     @property
     def domain(self):
         """
@@ -230,14 +319,28 @@ cdef class _Interpolator1D:
         """
         raise NotImplementedError('_Interpolator is an abstract base class.')
 
-    # cdef double _analytic_gradient(self, double px, int index, int order):
-    #     """
-    #     Calculates the interpolator's derivative of a valid order at a requested point.
-    #
-    #     :param double px: the point for which an interpolated value is required.
-    #     :param int index: the lower index of the bin containing point px. (Result of bisection search).
-    #     """
-    #     raise NotImplementedError('_Interpolator is an abstract base class.')
+    cdef double _analytic_gradient(self, double px, int index, int order) except? -1e999:
+        """
+        Calculates the interpolator's derivative of a valid order at a requested point.
+
+        :param double px: the point for which an interpolated value is required.
+        :param int index: the lower index of the bin containing point px. (Result of bisection search).
+        :param int order: the derivative order.
+        """
+        raise NotImplementedError('_Interpolator is an abstract base class.')
+
+    cdef double evaluate_gradient(self, double px, int index, double *gradient) except? -1e999:
+        """
+        Calculates the interpolated value and its gradient at a requested point.
+
+        :param double px: the point for which an interpolated value is required.
+        :param int index: the lower index of the bin containing point px. (Result of bisection search).
+        :param double *gradient: receives df/dx.
+        :return: the interpolated value.
+        """
+
+        gradient[0] = self._analytic_gradient(px, index, 1)
+        return self.evaluate(px, index)
 
 
 cdef class _Interpolator1DLinear(_Interpolator1D):
@@ -259,22 +362,22 @@ cdef class _Interpolator1DLinear(_Interpolator1D):
     cdef double evaluate(self, double px, int index) except? -1e999:
         return linear1d(self._x[index], self._x[index + 1], self._f[index], self._f[index + 1], px)
 
-    # @cython.cdivision(True)
-    # @cython.boundscheck(False)
-    # @cython.wraparound(False)
-    # @cython.initializedcheck(False)
-    # cdef double _analytic_gradient(self, double px, int index, int order):
-    #
-    #     cdef double grad
-    #
-    #     if order == 1:
-    #         grad = (self._f[index + 1] - self._f[index]) / (self._x[index + 1] - self._x[index])
-    #     elif order > 1:
-    #         grad = 0
-    #     else:
-    #         raise ValueError('The derivative order must be 1 for the linear interpolator, order = 0 should be an evaluation, greater values return.')
-    #
-    #     return grad
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double _analytic_gradient(self, double px, int index, int order) except? -1e999:
+
+        cdef double grad
+
+        if order == 1:
+            grad = (self._f[index + 1] - self._f[index]) / (self._x[index + 1] - self._x[index])
+        elif order > 1:
+            grad = 0
+        else:
+            raise ValueError('The derivative order must be 1 for the linear interpolator, order = 0 should be an evaluation, greater values return.')
+
+        return grad
 
 
 cdef class _Interpolator1DCubic(_Interpolator1D):
@@ -310,8 +413,24 @@ cdef class _Interpolator1DCubic(_Interpolator1D):
 
         # rescale x between 0 and 1
         cdef double nx
-        cdef double[2] f, dfdx
         cdef double[4] a
+
+        self._cache_coefficients(index, a)
+
+        # obtain normalised x coordinate inside cell
+        nx = (px - self._x[index]) / (self._x[index + 1] - self._x[index])
+
+        return evaluate_cubic_1d(a, nx)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef void _cache_coefficients(self, int index, double[4] a):
+        """
+        Returns the spline coefficients for the cell, calculating them on first use.
+        """
+
+        cdef double[2] f, dfdx
         cdef int i
 
         # Calculate the coefficients (and gradients at each spline point) if they dont exist
@@ -333,54 +452,58 @@ cdef class _Interpolator1DCubic(_Interpolator1D):
             for i in range(4):
                 a[i] = self._a[index, i]
 
-        # obtain normalised x coordinate inside cell
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double _analytic_gradient(self, double px, int index, int order) except? -1e999:
+
+        cdef double grad
+        cdef double nx
+        cdef double rdx
+        cdef double[4] a
+
+        rdx = 1.0 / (self._x[index + 1] - self._x[index])
+        nx = (px - self._x[index]) * rdx
+
+        self._cache_coefficients(index, a)
+
+        if order == 1:
+            grad = 3*a[0]*nx*nx + 2*a[1]*nx + a[2]
+            grad *= rdx
+
+        elif order == 2:
+            grad = 6*a[0]*nx + 2*a[1]
+            grad *= rdx*rdx
+
+        elif order == 3:
+            grad = 6*a[0]
+            grad *= rdx*rdx*rdx
+
+        elif order > 3:
+            grad = 0
+
+        else:
+            raise ValueError('Order must be an integer greater than or equal to 1.')
+
+        return grad
+
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double evaluate_gradient(self, double px, int index, double *gradient) except? -1e999:
+
+        cdef double nx
+        cdef double[4] a
+
+        self._cache_coefficients(index, a)
+
         nx = (px - self._x[index]) / (self._x[index + 1] - self._x[index])
+        gradient[0] = (3*a[0]*nx*nx + 2*a[1]*nx + a[2]) / (self._x[index + 1] - self._x[index])
 
         return evaluate_cubic_1d(a, nx)
 
-    # @cython.cdivision(True)
-    # @cython.boundscheck(False)
-    # @cython.wraparound(False)
-    # @cython.initializedcheck(False)
-    # cdef double _analytic_gradient(self, double px, int index, int order):
-    #
-    #     cdef double grad
-    #     cdef double nx
-    #     cdef double[2] f, dfdx
-    #     cdef double rdx
-    #     cdef double[4] a
-    #
-    #     rdx = 1.0 / (self._x[index + 1] - self._x[index])
-    #     nx = (px - self._x[index]) * rdx
-    #
-    #     f[0] = self._f[index]
-    #     f[1] = self._f[index + 1]
-    #
-    #     dfdx[0] = self._array_derivative.evaluate(index, rescale_norm=False)
-    #     dfdx[1] = self._array_derivative.evaluate(index + 1, rescale_norm=True)
-    #
-    #     calc_coefficients_1d(f, dfdx, a)
-    #
-    #     if order == 1:
-    #         grad = 3*a[0]*nx*nx + 2*a[1]*nx + a[2]
-    #         grad *= rdx
-    #
-    #     elif order == 2:
-    #         grad = 6*a[0]*nx + 2*a[1]
-    #         grad *= rdx*rdx
-    #
-    #     elif order == 3:
-    #         grad = 6*a[0]
-    #         grad *= rdx*rdx*rdx
-    #
-    #     elif order > 3:
-    #         grad = 0
-    #
-    #     else:
-    #         raise ValueError('Order must be an integer greater than or equal to 1.')
-    #
-    #     return grad
-
 
 cdef class _Extrapolator1D:
     """
@@ -400,8 +523,24 @@ cdef class _Extrapolator1D:
     cdef double evaluate(self, double px, int index) except? -1e999:
         raise NotImplementedError(f'{self.__class__} not implemented.')
 
-    # cdef double _analytic_gradient(self, double px, int index, int order):
-    #     raise NotImplementedError(f'{self.__class__} not implemented.')
+    cdef double _analytic_gradient(self, double px, int index, int order) except? -1e999:
+        raise NotImplementedError(f'{self.__class__} not implemented.')
+
+    cdef double evaluate_gradient(self, double px, int index, double *gradient) except? -1e999:
+        """
+        Calculates the extrapolated value and its gradient at a requested point.
+
+        :param double px: the point for which an extrapolated value is required.
+        :param int index: the index returned by the bisection search for point px.
+        :param double *gradient: receives df/dx.
+        :return: the extrapolated value.
+        """
+
+        cdef double f
+
+        f = self.evaluate(px, index)
+        gradient[0] = self._analytic_gradient(px, index, 1)
+        return f
 
 
 cdef class _Extrapolator1DNone(_Extrapolator1D):
@@ -417,8 +556,8 @@ cdef class _Extrapolator1DNone(_Extrapolator1D):
     cdef double evaluate(self, double px, int index)  except? -1e999:
         raise ValueError(f'Extrapolation not available. Interpolate within function range {self._x[0]}-{self._x[self._last_index]}.')
 
-    # cdef double _analytic_gradient(self, double px, int index, int order):
-    #     raise ValueError(f'Extrapolation not available. Interpolate within function range {self._x[0]}-{self._x[self._last_index]}.')
+    cdef double _analytic_gradient(self, double px, int index, int order) except? -1e999:
+        raise ValueError(f'Extrapolation not available. Interpolate within function range {self._x[0]}-{self._x[self._last_index]}.')
 
 
 cdef class _Extrapolator1DNearest(_Extrapolator1D):
@@ -443,9 +582,9 @@ cdef class _Extrapolator1DNearest(_Extrapolator1D):
         else:
             raise ValueError(f'Cannot evaluate value of function at point {px}. Bad data?')
 
-    # @cython.initializedcheck(False)
-    # cdef double _analytic_gradient(self, double px, int index, int order):
-    #     return 0.0
+    @cython.initializedcheck(False)
+    cdef double _analytic_gradient(self, double px, int index, int order) except? -1e999:
+        return 0.0
 
 
 cdef class _Extrapolator1DLinear(_Extrapolator1D):
@@ -474,26 +613,26 @@ cdef class _Extrapolator1DLinear(_Extrapolator1D):
         # Use a linear interpolator function to extrapolate instead
         return lerp(self._x[index], self._x[index + 1], self._f[index], self._f[index + 1], px)
 
-    # @cython.cdivision(True)
-    # @cython.boundscheck(False)
-    # @cython.wraparound(False)
-    # @cython.initializedcheck(False)
-    # cdef double _analytic_gradient(self, double px, int index, int order):
-    #
-    #     # The index returned from find_index is -1 at the array start or the length of the array at the end of array.
-    #     if index == -1:
-    #         index = 0
-    #     elif index == self._last_index:
-    #         index = self._last_index - 1
-    #     else:
-    #         raise ValueError('Invalid extrapolator index. Must be -1 for lower and shape-1 for upper extrapolation.')
-    #
-    #     if order == 1:
-    #         return (self._f[index + 1] - self._f[index]) / (self._x[index + 1] - self._x[index])
-    #     elif order > 1:
-    #         return 0.0
-    #     else:
-    #         raise ValueError('order must be an integer greater than or equal to 1.')
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double _analytic_gradient(self, double px, int index, int order) except? -1e999:
+
+        # The index returned from find_index is -1 at the array start or the length of the array at the end of array.
+        if index == -1:
+            index = 0
+        elif index == self._last_index:
+            index = self._last_index - 1
+        else:
+            raise ValueError('Invalid extrapolator index. Must be -1 for lower and shape-1 for upper extrapolation.')
+
+        if order == 1:
+            return (self._f[index + 1] - self._f[index]) / (self._x[index + 1] - self._x[index])
+        elif order > 1:
+            return 0.0
+        else:
+            raise ValueError('order must be an integer greater than or equal to 1.')
 
 
 cdef class _Extrapolator1DQuadratic(_Extrapolator1D):
@@ -570,58 +709,58 @@ cdef class _Extrapolator1DQuadratic(_Extrapolator1D):
         else:
             raise ValueError('Invalid extrapolator index. Must be -1 for lower and shape-1 for upper extrapolation.')
 
-    # @cython.cdivision(True)
-    # @cython.boundscheck(False)
-    # @cython.wraparound(False)
-    # @cython.initializedcheck(False)
-    # cdef double _analytic_gradient(self, double px, int index, int order):
-    #
-    #     cdef double rdx, nx
-    #     cdef double grad
-    #
-    #     # The index returned from find_index is -1 at the array start or the length of the array at the end of array.
-    #     if index == -1:
-    #
-    #         rdx = 1.0 / (self._x[1] - self._x[0])
-    #         nx =  (px - self._x[0]) * rdx
-    #
-    #         if order == 1:
-    #             grad = 2.0*self._a_first[0]*nx + self._a_first[1]
-    #             grad *= rdx
-    #
-    #         elif order == 2:
-    #             grad = 2.0*self._a_first[0]
-    #             grad *= rdx*rdx
-    #
-    #         elif order > 2:
-    #             grad = 0
-    #
-    #         else:
-    #             raise ValueError('order must be an integer greater than or equal to 1.')
-    #
-    #     elif index == self._last_index:
-    #
-    #         rdx = 1.0 / (self._x[self._last_index] - self._x[self._last_index - 1])
-    #         nx = (px - self._x[self._last_index - 1]) * rdx
-    #
-    #         if order == 1:
-    #             grad = 2.0*self._a_last[0]*nx + self._a_last[1]
-    #             grad *= rdx
-    #
-    #         elif order == 2:
-    #             grad = 2.0*self._a_last[0]
-    #             grad *= rdx*rdx
-    #
-    #         elif order > 2:
-    #             grad = 0
-    #
-    #         else:
-    #             raise ValueError('order must be an integer greater than or equal to 1.')
-    #
-    #     else:
-    #         raise ValueError('Invalid extrapolator index. Must be -1 for lower and shape-1 for upper extrapolation.')
-    #
-    #     return grad
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double _analytic_gradient(self, double px, int index, int order) except? -1e999:
+
+        cdef double rdx, nx
+        cdef double grad
+
+        # The index returned from find_index is -1 at the array start or the length of the array at the end of array.
+        if index == -1:
+
+            rdx = 1.0 / (self._x[1] - self._x[0])
+            nx =  (px - self._x[0]) * rdx
+
+            if order == 1:
+                grad = 2.0*self._a_first[0]*nx + self._a_first[1]
+                grad *= rdx
+
+            elif order == 2:
+                grad = 2.0*self._a_first[0]
+                grad *= rdx*rdx
+
+            elif order > 2:
+                grad = 0
+
+            else:
+                raise ValueError('order must be an integer greater than or equal to 1.')
+
+        elif index == self._last_index:
+
+            rdx = 1.0 / (self._x[self._last_index] - self._x[self._last_index - 1])
+            nx = (px - self._x[self._last_index - 1]) * rdx
+
+            if order == 1:
+                grad = 2.0*self._a_last[0]*nx + self._a_last[1]
+                grad *= rdx
+
+            elif order == 2:
+                grad = 2.0*self._a_last[0]
+                grad *= rdx*rdx
+
+            elif order > 2:
+                grad = 0
+
+            else:
+                raise ValueError('order must be an integer greater than or equal to 1.')
+
+        else:
+            raise ValueError('Invalid extrapolator index. Must be -1 for lower and shape-1 for upper extrapolation.')
+
+        return grad
 
 
 cdef class _ArrayDerivative1D:
@@ -31,7 +31,7 @@
 
 from numpy import asarray, ascontiguousarray, empty, linspace
 from .base cimport Function1D
-from .autowrap cimport autowrap_function1d
+from .autowrap cimport autowrap_function1d, PythonFunction1D
 cimport cython
 cimport numpy as np
 
@@ -64,6 +64,11 @@ cpdef tuple sample1d(object function, double x_min, double x_max, int x_samples)
     func = autowrap_function1d(function)
 
     x = linspace(x_min, x_max, x_samples)
+
+    # vectorised python functions are evaluated with a single call
+    if isinstance(func, PythonFunction1D) and (<PythonFunction1D> func).vectorised:
+        return x, func.evaluate_array(x)
+
     f = empty(x_samples)
 
     # use memory views
@@ -96,6 +101,11 @@ cpdef np.ndarray sample1d_points(object function, object x_points):
     # ensures that func is of type Function1D. I.e. if 'function' argument was Python function, it'll get autowrapped
     # into Function1D object
     fun = autowrap_function1d(function)
+
+    # vectorised python functions are evaluated with a single call
+    if isinstance(fun, PythonFunction1D) and (<PythonFunction1D> fun).vectorised:
+        return fun.evaluate_array(x_points)
+
     num_samples = len(x_points)
 
     f = empty(num_samples)
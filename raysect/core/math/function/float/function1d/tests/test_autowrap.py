@@ -32,6 +32,7 @@ Unit tests for the autowrap_1d function
 """
 
 import unittest
+import numpy as np
 from raysect.core.math.function.float.function1d.autowrap import _autowrap_function1d, PythonFunction1D
 from raysect.core.math.function.float.function1d.constant import Constant1D
 
@@ -45,3 +46,37 @@ class TestAutowrap1D(unittest.TestCase):
     def test_python_function(self):
         function = _autowrap_function1d(lambda x: 10*x)
         self.assertIsInstance(function, PythonFunction1D, "Autowrapped function is not a PythonFunction1D.")
+
+    def test_vectorised_python_function(self):
+        calls = []
+
+        def vectorised(x):
+            calls.append(x)
+            return np.sin(x) * x
+
+        function = PythonFunction1D(vectorised, vectorised=True)
+        x = np.linspace(-2, 2, 11)
+        np.testing.assert_array_equal(function.evaluate_array(x), np.sin(x) * x)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(function(0.5), np.sin(0.5) * 0.5)
+
+        # a constant result is broadcast to the shape of the input
+        function = PythonFunction1D(lambda x: 2.0, vectorised=True)
+        np.testing.assert_array_equal(function.evaluate_array(x), np.full(11, 2.0))
+
+        # results that can not be broadcast are rejected
+        function = PythonFunction1D(lambda x: np.zeros(3), vectorised=True)
+        with self.assertRaises(ValueError):
+            function.evaluate_array(x)
+
+    def test_scalar_python_function(self):
+        calls = []
+
+        def scalar(x):
+            calls.append(x)
+            return 2 * x
+
+        function = PythonFunction1D(scalar)
+        self.assertFalse(function.vectorised)
+        np.testing.assert_array_equal(function.evaluate_array([1, 2, 3]), [2, 4, 6])
+        self.assertEqual(len(calls), 3)
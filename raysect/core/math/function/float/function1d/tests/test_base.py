@@ -33,6 +33,7 @@ Unit tests for the Function1D class.
 
 import math
 import unittest
+import numpy as np
 from raysect.core.math.function.float.function1d.autowrap import PythonFunction1D
 
 # TODO: expand tests to cover the cython interface
@@ -51,6 +52,16 @@ class TestFunction1D(unittest.TestCase):
         for x in v:
             self.assertEqual(self.f1(x), self.ref1(x), "Function1D call did not match reference function value.")
 
+    def test_evaluate_array(self):
+        v = [-1e10, -7, -0.001, 0.0, 0.00003, 10, 2.3e49]
+        r = 2 * self.f1 + 3
+        x = np.array(v).reshape(7, 1)
+        f = r.evaluate_array(x)
+        self.assertEqual(f.shape, (7, 1))
+        for i, xi in enumerate(v):
+            self.assertEqual(f[i, 0], r(xi), "Function1D evaluate_array did not match the scalar evaluation.")
+        self.assertEqual(r.evaluate_array([]).shape, (0,))
+
     def test_negate(self):
         v = [-1e10, -7, -0.001, 0.0, 0.00003, 10, 2.3e49]
         r = -self.f1
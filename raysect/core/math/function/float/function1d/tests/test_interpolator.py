@@ -584,3 +584,40 @@ class TestInterpolators1D(unittest.TestCase):
         self.initialise_tests_on_interpolators(
             x_wrong, f_wrong, problem_str='accidentally supplying 2D data'
         )
+
+    def test_evaluate_gradient(self):
+        """
+        The gradient must match a finite difference of the interpolator and the value must match a plain evaluation.
+        """
+
+        f = np.sin(3 * self.x_uneven) + self.x_uneven ** 2
+
+        # points inside each cell (away from the knots), and in the extrapolation regions
+        knots = self.x_uneven
+        xsamples = np.concatenate(([knots[0] - 0.3], knots[:-1] + 0.37 * np.diff(knots), [knots[-1] + 0.3]))
+        delta = 1e-6
+
+        for interpolation_type, extrapolation_types in permitted_interpolation_combinations.items():
+            for extrapolation_type in extrapolation_types:
+                if extrapolation_type == 'none':
+                    continue
+                interpolator = Interpolator1DArray(knots, f, interpolation_type, extrapolation_type, EXTRAPOLATION_RANGE)
+                values, df_dx = interpolator.evaluate_gradient_array(xsamples)
+                for i, px in enumerate(xsamples):
+                    msg = f'Gradient ({interpolation_type}, {extrapolation_type}) differs at {px}.'
+                    self.assertEqual(interpolator.evaluate_gradient(px), (values[i], df_dx[i]), msg=msg)
+                    self.assertEqual(values[i], interpolator(px), msg=msg)
+                    fd_x = (interpolator(px + delta) - interpolator(px - delta)) / (2 * delta)
+                    self.assertAlmostEqual(df_dx[i], fd_x, places=5, msg=msg)
+
+                # the last knot is evaluated by the interpolator
+                self.assertEqual(interpolator.evaluate_gradient(knots[-1])[0], interpolator(knots[-1]))
+
+        # the array shape is preserved
+        values, df_dx = interpolator.evaluate_gradient_array(xsamples[:6].reshape(2, 3))
+        self.assertEqual(values.shape, (2, 3))
+        self.assertEqual(df_dx.shape, (2, 3))
+
+        interpolator = Interpolator1DArray(knots, f, 'cubic', 'none', 0.0)
+        with self.assertRaises(ValueError):
+            interpolator.evaluate_gradient(knots[0] - 0.1)
@@ -29,6 +29,7 @@
 
 import unittest
 from raysect.core.math.function.float.function1d.samplers import sample1d, sample1d_points
+from raysect.core.math.function.float.function1d.autowrap import PythonFunction1D
 import numpy as np
 
 
@@ -58,6 +59,13 @@ class TestSamplers(unittest.TestCase):
         np.testing.assert_array_almost_equal(self.power_series, f_values, decimal=10)
         np.testing.assert_array_almost_equal(self.power_sampling, x_points, decimal=10)
 
+    def test_sample1d_vectorised(self):
+        function = PythonFunction1D(lambda x: x ** x, vectorised=True)
+        x_points, f_values = sample1d(function, 0, 1, 20)
+        np.testing.assert_array_almost_equal(self.power_series, f_values, decimal=10)
+        f_values = sample1d_points(function, self.power_sampling)
+        np.testing.assert_array_almost_equal(self.power_series, f_values, decimal=10)
+
     def test_sample1d_points(self):
         f_values = sample1d_points(self.power_fun, self.power_sampling)
         np.testing.assert_array_almost_equal(self.power_series, f_values, decimal=10)
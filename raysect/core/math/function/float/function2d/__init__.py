@@ -34,4 +34,6 @@ from .constant import Constant2D
 from .blend import Blend2D
 from .interpolate import *
 from .arg import Arg2D
+from .autowrap import PythonFunction2D
 from .cmath import *
+from .samplers import *
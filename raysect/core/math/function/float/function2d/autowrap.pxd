@@ -33,5 +33,6 @@ from raysect.core.math.function.float.function2d.base cimport Function2D
 
 cdef class PythonFunction2D(Function2D):
     cdef public object function
+    cdef public bint vectorised
 
 cdef Function2D autowrap_function2d(object obj)
@@ -30,6 +30,7 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 import numbers
+import numpy as np
 from cpython.object cimport Py_LT, Py_EQ, Py_GT, Py_LE, Py_NE, Py_GE
 cimport cython
 from libc.math cimport floor
@@ -63,6 +64,42 @@ cdef class Function2D(FloatFunction):
         """
         return self.evaluate(x, y)
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def evaluate_array(self, object x, object y):
+        """
+        Evaluates the function at an array of points.
+
+        The function is evaluated at every point in a single compiled loop,
+        avoiding the overhead of a Python call per point. The coordinate
+        arrays are broadcast against each other following the numpy
+        broadcasting rules.
+
+        :param object x: An array of x coordinates.
+        :param object y: An array of y coordinates.
+        :return: An array of function values with the broadcast shape of the coordinate arrays.
+        :rtype: ndarray
+        """
+
+        cdef:
+            const double[::1] x_mv, y_mv
+            double[::1] f_mv
+            Py_ssize_t i
+
+        # broadcast the coordinate arrays to a common shape
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+        shape = x.shape
+        x_mv = np.ascontiguousarray(x).ravel()
+        y_mv = np.ascontiguousarray(y).ravel()
+
+        f = np.empty(x_mv.shape[0], dtype=np.float64)
+        f_mv = f
+
+        for i in range(f_mv.shape[0]):
+            f_mv[i] = self.evaluate(x_mv[i], y_mv[i])
+
+        return f.reshape(shape)
+
     def __add__(self, object b):
 
         if is_callable(b):
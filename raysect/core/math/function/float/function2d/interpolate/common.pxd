@@ -31,6 +31,7 @@
 
 cimport numpy as np
 from raysect.core.boundingbox cimport BoundingBox2D
+from raysect.core.math.point cimport Point2D
 from raysect.core.math.spatial.kdtree2d cimport KDTree2DCore
 
 
@@ -49,4 +50,6 @@ cdef class MeshKDTree2D(KDTree2DCore):
         double _cached_y
         bint _cached_result
 
-    cdef BoundingBox2D _generate_bounding_box(self, np.int32_t triangle)
\ No newline at end of file
+    cdef BoundingBox2D _generate_bounding_box(self, np.int32_t triangle)
+
+    cdef bint _is_contained_item(self, np.int32_t triangle, Point2D point)
@@ -176,38 +176,48 @@ cdef class MeshKDTree2D(KDTree2DCore):
     @cython.initializedcheck(False)
     cdef bint _is_contained_leaf(self, np.int32_t id, Point2D point):
 
-        cdef:
-            np.int32_t index, triangle, i1, i2, i3
-            double alpha, beta, gamma
+        cdef np.int32_t index
 
         # identify the first triangle that contains the point, if any
         for index in range(self._nodes[id].count):
+            if self._is_contained_item(self._nodes[id].items[index], point):
+                return True
 
-            # obtain vertex indices
-            triangle = self._nodes[id].items[index]
-            i1 = self._triangles_mv[triangle, V1]
-            i2 = self._triangles_mv[triangle, V2]
-            i3 = self._triangles_mv[triangle, V3]
+        return False
 
-            barycentric_coords(self._vertices_mv[i1, X], self._vertices_mv[i1, Y],
-                               self._vertices_mv[i2, X], self._vertices_mv[i2, Y],
-                               self._vertices_mv[i3, X], self._vertices_mv[i3, Y],
-                               point.x, point.y, &alpha, &beta, &gamma)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef bint _is_contained_item(self, np.int32_t triangle, Point2D point):
 
-            if barycentric_inside_triangle(alpha, beta, gamma):
+        cdef:
+            np.int32_t i1, i2, i3
+            double alpha, beta, gamma
+
+        # obtain vertex indices
+        i1 = self._triangles_mv[triangle, V1]
+        i2 = self._triangles_mv[triangle, V2]
+        i3 = self._triangles_mv[triangle, V3]
 
-                # store id of triangle hit
-                self.triangle_id = triangle
+        barycentric_coords(self._vertices_mv[i1, X], self._vertices_mv[i1, Y],
+                           self._vertices_mv[i2, X], self._vertices_mv[i2, Y],
+                           self._vertices_mv[i3, X], self._vertices_mv[i3, Y],
+                           point.x, point.y, &alpha, &beta, &gamma)
 
-                # store vertex indices and barycentric coords
-                self.i1 = i1
-                self.i2 = i2
-                self.i3 = i3
-                self.alpha = alpha
-                self.beta = beta
-                self.gamma = gamma
+        if barycentric_inside_triangle(alpha, beta, gamma):
 
-                return True
+            # store id of triangle hit
+            self.triangle_id = triangle
+
+            # store vertex indices and barycentric coords
+            self.i1 = i1
+            self.i2 = i2
+            self.i3 = i3
+            self.alpha = alpha
+            self.beta = beta
+            self.gamma = gamma
+
+            return True
 
         return False
 
@@ -223,7 +233,11 @@ cdef class MeshKDTree2D(KDTree2DCore):
         if self._cache_available and point.x == self._cached_x and point.y == self._cached_y:
             return self._cached_result
 
-        result = self._is_contained(point)
+        # sequential lookups usually land in the triangle found by the previous lookup, test it before the kd-tree
+        if self._cache_available and self._cached_result and self._is_contained_item(self.triangle_id, point):
+            result = True
+        else:
+            result = self._is_contained(point)
 
         # add cache
         self._cache_available = True
@@ -29,6 +29,7 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+cimport cython
 cimport numpy as np
 from raysect.core.math.function.float.function2d cimport Function2D
 from numpy cimport ndarray
@@ -44,24 +45,38 @@ cdef class Interpolator2DArray(Function2D):
     cdef:
         ndarray x, y, f
         double[::1] _x_mv, _y_mv
-        double[:, ::1] _f_mv
         _Interpolator2D _interpolator
         _Extrapolator2D _extrapolator
         int _last_index_x, _last_index_y
         double _extrapolation_range_x ,_extrapolation_range_y
+        int _spacing_x, _spacing_y
+        double _scale_x, _scale_y
+        int _hint_x, _hint_y
+        str _cache_type
+        int _cache_size
 
     cdef double evaluate(self, double px, double py) except? -1e999
 
+    cdef double _evaluate_gradient(self, double px, double py, double[2] gradient) except? -1e999
+
+    cdef object _create_interpolator(self, str interpolation_type, str extrapolation_type)
+
 
 cdef class _Interpolator2D:
 
     cdef:
         double [::1] _x, _y
-        double [:, ::1] _f
+        const double [:, ::1] _f
+        const float [:, ::1] _f32
+        bint _float32
         int _last_index_x, _last_index_y
 
+    @cython.final
+    cdef inline double _value(self, int ix, int iy)
+
     cdef double evaluate(self, double px, double py, int index_x, int index_y) except? -1e999
     cdef double analytic_gradient(self, double px, double py, int index_x, int index_y, int order_x, int order_y)
+    cdef double evaluate_gradient(self, double px, double py, int index_x, int index_y, double[2] gradient) except? -1e999
 
 
 cdef class _Interpolator2DLinear(_Interpolator2D):
@@ -75,23 +90,31 @@ cdef class _Interpolator2DLinear(_Interpolator2D):
 cdef class _Interpolator2DCubic(_Interpolator2D):
 
     cdef:
+        int _cache_mode
         double[:, :, :, ::1] _a
         np.uint8_t[:, ::1] _calculated
+        np.int64_t[::1] _cache_keys, _cache_stamps
+        np.int64_t _cache_clock
+        int _cache_sets
+        double[:, :, ::1] _cache
         _ArrayDerivative2D _array_derivative
 
-    cdef _calc_coefficients(self, int index_x, int index_y, double[4][4] a)
+    cdef _cache_coefficients(self, int index_x, int index_y, double[4][4] a)
+    cdef _lookup_coefficients(self, int index_x, int index_y, double[4][4] a)
+    cdef _calculate_coefficients(self, int index_x, int index_y, double[4][4] a)
 
 
 cdef class _Extrapolator2D:
 
     cdef:
         double [::1] _x, _y
-        double [:, ::1] _f
         _Interpolator2D _interpolator
         int _last_index_x, _last_index_y
         double _extrapolation_range_x, _extrapolation_range_y
 
     cdef double evaluate(self, double px, double py, int index_x, int index_y) except? -1e999
+    cdef double evaluate_gradient(self, double px, double py, int index_x, int index_y, double[2] gradient) except? -1e999
+    cdef int _evaluate_gradient_edge(self, double px, double py, int index_x, int index_y, int edge_x_index, int edge_y_index, bint outside_x, bint outside_y, double[2] gradient) except -1
     cdef double _evaluate_edge_x(self, double px, double py, int index_x, int index_y, int edge_x_index) except? -1e999
     cdef double _evaluate_edge_y(self, double px, double py, int index_x, int index_y, int edge_y_index) except? -1e999
     cdef double _evaluate_edge_xy(self, double px, double py, int index_x, int index_y, int edge_x_index, int edge_y_index) except? -1e999
@@ -113,9 +136,14 @@ cdef class _ArrayDerivative2D:
 
     cdef:
         double [::1] _x, _y
-        double [:, ::1] _f
+        const double [:, ::1] _f
+        const float [:, ::1] _f32
+        bint _float32
         int _last_index_x, _last_index_y
 
+    @cython.final
+    cdef inline double _value(self, int ix, int iy)
+
     cdef double evaluate_df_dx(self, int index_x, int index_y, bint rescale_norm_x) except? -1e999
     cdef double _derivative_dfdx_edge(self, int lower_index_x, int slice_index_y) except? -1e999
     cdef double _derivative_dfdx(self, int lower_index_x, int slice_index_y) except? -1e999
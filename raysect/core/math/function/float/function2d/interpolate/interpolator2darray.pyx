@@ -32,8 +32,8 @@
 import numpy as np
 from libc.math cimport fabs
 cimport cython
-from raysect.core.math.cython.utility cimport find_index
-from raysect.core.math.cython.interpolation.linear cimport linear2d
+from raysect.core.math.cython.utility cimport find_index_spaced, find_spacing
+from raysect.core.math.cython.interpolation.linear cimport linear1d
 from raysect.core.math.cython.interpolation.cubic cimport calc_coefficients_2d, evaluate_cubic_2d
 
 
@@ -43,6 +43,16 @@ FACTORIAL[1] = 1.
 FACTORIAL[2] = 2.
 FACTORIAL[3] = 6.
 
+# cubic coefficient cache policies
+cdef enum:
+    CACHE_LAZY = 0
+    CACHE_LRU = 1
+    CACHE_EAGER = 2
+    CACHE_NONE = 3
+
+# the number of cells in each set of the bounded (lru) coefficient cache
+cdef const int CACHE_WAYS = 4
+
 
 @cython.cdivision(True)
 cdef double rescale_lower_normalisation(double dfdn, double x_lower, double x, double x_upper):
@@ -106,6 +116,11 @@ cdef class Interpolator2DArray(Function2D):
     The resulting Numpy arrays are stored as read only. I.e. `writeable` flag of self.x, self.y and self.f
     is set to False. Alteration of the flag may result in unwanted behaviour.
 
+    The data array is copied unless it is a read only, C contiguous array of the storage type, such as a numpy
+    memmap opened in read only mode. Such arrays are used directly, so a large data set mapped from disk is shared by
+    all the processes of a render rather than copied into the memory of each process. The data may be stored in
+    single precision to halve the memory required, the interpolation is always calculated in double precision.
+
     :param object x: 1D array-like object of real values storing the x spline knot positions.
     :param object y: 1D array-like object of real values storing the y spline knot positions.
     :param object f: 2D array-like object of real values storing the spline knot function value at x, y.
@@ -122,6 +137,20 @@ cdef class Interpolator2DArray(Function2D):
     :param double extrapolation_range_y: Limits the range where extrapolation is permitted. Requesting data beyond the
         extrapolation range results in ValueError. Extrapolation range will be applied as padding symmetrically to both
         ends of the interpolation range (y).
+    :param str cache_type: The storage policy for the cubic polynomial coefficients of each cell (default='lazy').
+        Options are:
+        `lazy`: Coefficients are calculated on first use and stored. Storage for every cell (128 bytes per cell) is
+        allocated on construction.
+        `lru`: Coefficients are stored in a bounded cache holding up to cache_size cells, the least recently used
+        cells are discarded.
+        `eager`: Coefficients of every cell are calculated on construction. The coefficient array is not modified
+        during evaluation, so it remains shared by processes forked by a render engine.
+        `none`: Coefficients are recalculated for every evaluation, no storage is required.
+        The cache type has no effect on linear interpolation.
+    :param int cache_size: The maximum number of cells held by the `lru` cache (default=65536).
+    :param str storage_type: The precision used to store the data array (default='float64'). Options are:
+        `float64`: The data is stored in double precision.
+        `float32`: The data is stored in single precision.
 
     .. code-block:: python
 
@@ -150,11 +179,22 @@ cdef class Interpolator2DArray(Function2D):
     """
 
     def __init__(self, object x, object y, object f, str interpolation_type, str extrapolation_type,
-                 double extrapolation_range_x, double extrapolation_range_y):
+                 double extrapolation_range_x, double extrapolation_range_y, str cache_type='lazy',
+                 int cache_size=65536, str storage_type='float64'):
+
+        # Check the requested storage type exists.
+        storage_type = storage_type.lower()
+        if storage_type not in id_to_storage:
+            raise ValueError(f'Storage type {storage_type} not found. Options are {id_to_storage.keys()}.')
 
         x = np.array(x, dtype=np.float64, order='c')
         y = np.array(y, dtype=np.float64, order='c')
-        f = np.array(f, dtype=np.float64, order='c')
+
+        # read only data that does not require conversion, e.g. a read only memmap, can not change and is not copied
+        if isinstance(f, np.ndarray) and not f.flags.writeable and f.flags.c_contiguous and f.dtype == id_to_storage[storage_type]:
+            f = f.view(np.ndarray)
+        else:
+            f = np.array(f, dtype=id_to_storage[storage_type], order='c')
 
         # extrapolation_ranges must be greater than or equal to 0.
         if extrapolation_range_x < 0:
@@ -200,7 +240,10 @@ cdef class Interpolator2DArray(Function2D):
         # obtain memory views for fast data access
         self._x_mv = x
         self._y_mv = y
-        self._f_mv = f
+
+        # uniformly spaced knots permit the bins to be located without a search
+        self._spacing_x = find_spacing(self._x_mv, &self._scale_x)
+        self._spacing_y = find_spacing(self._y_mv, &self._scale_y)
 
         # prevent users being able to change the data arrays
         x.flags.writeable = False
@@ -226,10 +269,30 @@ cdef class Interpolator2DArray(Function2D):
         if extrapolation_type not in permitted_interpolation_combinations[interpolation_type]:
             raise ValueError(f'Extrapolation type {extrapolation_type} not compatible with interpolation type {interpolation_type}.')
 
+        # Check the requested cache type exists.
+        cache_type = cache_type.lower()
+        if cache_type not in id_to_cache:
+            raise ValueError(f'Cache type {cache_type} not found. Options are {id_to_cache.keys()}.')
+
+        if cache_size < 1:
+            raise ValueError('The cache size must be greater than 0.')
+
+        self._cache_type = cache_type
+        self._cache_size = cache_size
+
         # Create the interpolator and extrapolator objects.
-        self._interpolator = id_to_interpolator[interpolation_type](self._x_mv, self._y_mv, self._f_mv)
+        self._create_interpolator(interpolation_type, extrapolation_type)
+
+    cdef object _create_interpolator(self, str interpolation_type, str extrapolation_type):
+
+        if interpolation_type == _Interpolator2DCubic.ID:
+            self._interpolator = _Interpolator2DCubic(self._x_mv, self._y_mv, self.f, self._cache_type, self._cache_size)
+        else:
+            self._interpolator = id_to_interpolator[interpolation_type](self._x_mv, self._y_mv, self.f)
+
         self._extrapolator = id_to_extrapolator[extrapolation_type](
-            self._x_mv, self._y_mv, self._f_mv, self._interpolator, extrapolation_range_x, extrapolation_range_y
+            self._x_mv, self._y_mv, self._interpolator,
+            self._extrapolation_range_x, self._extrapolation_range_y
         )
 
     def __getstate__(self):
@@ -237,7 +300,8 @@ cdef class Interpolator2DArray(Function2D):
             self.x, self.y, self.f,
             self._interpolator.ID, self._extrapolator.ID,
             self._last_index_x, self._last_index_y,
-            self._extrapolation_range_x, self._extrapolation_range_y
+            self._extrapolation_range_x, self._extrapolation_range_y,
+            self._cache_type, self._cache_size
         )
 
     def __setstate__(self, state):
@@ -247,18 +311,17 @@ cdef class Interpolator2DArray(Function2D):
             self.x, self.y, self.f,
             interpolation_type, extrapolation_type,
             self._last_index_x, self._last_index_y,
-            self._extrapolation_range_x, self._extrapolation_range_y
+            self._extrapolation_range_x, self._extrapolation_range_y,
+            self._cache_type, self._cache_size
         ) = state
 
         # Rebuild memory views.
-        self._x_mv, self._y_mv, self._f_mv = self.x, self.y, self.f
+        self._x_mv, self._y_mv = self.x, self.y
+        self._spacing_x = find_spacing(self._x_mv, &self._scale_x)
+        self._spacing_y = find_spacing(self._y_mv, &self._scale_y)
 
         # Recreate the interpolator and extrapolator objects.
-        self._interpolator = id_to_interpolator[interpolation_type](self._x_mv, self._y_mv, self._f_mv)
-        self._extrapolator = id_to_extrapolator[extrapolation_type](
-            self._x_mv, self._y_mv, self._f_mv, self._interpolator,
-            self._extrapolation_range_x, self._extrapolation_range_y
-        )
+        self._create_interpolator(interpolation_type, extrapolation_type)
 
     def __reduce__(self):
         return self.__new__, (self.__class__, ), self.__getstate__()
@@ -282,8 +345,8 @@ cdef class Interpolator2DArray(Function2D):
         """
 
         # Find index assuming the grid is the same in x and y
-        cdef int index_x = find_index(self._x_mv, px)
-        cdef int index_y = find_index(self._y_mv, py)
+        cdef int index_x = find_index_spaced(self._x_mv, px, self._spacing_x, self._scale_x, &self._hint_x)
+        cdef int index_y = find_index_spaced(self._y_mv, py, self._spacing_y, self._scale_y, &self._hint_y)
         cdef int index_lower_x = to_cell_index(index_x, self._last_index_x)
         cdef int index_lower_y = to_cell_index(index_y, self._last_index_y)
         cdef bint outside_domain_x = index_x == -1 or (index_x == self._last_index_x and px != self._x_mv[self._last_index_x])
@@ -293,6 +356,98 @@ cdef class Interpolator2DArray(Function2D):
             return self._extrapolator.evaluate(px, py, index_x, index_y)
         return self._interpolator.evaluate(px, py, index_lower_x, index_lower_y)
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double _evaluate_gradient(self, double px, double py, double[2] gradient) except? -1e999:
+        """
+        Evaluates the interpolating function and its gradient.
+
+        The spline knot search is performed once and shared by the value and
+        gradient calculations. Dispatch to the interpolator or extrapolator
+        follows evaluate().
+
+        :param double px: the point for which an interpolated value is required.
+        :param double py: the point for which an interpolated value is required.
+        :param double[2] gradient: array that receives df/dx and df/dy.
+        :return: the interpolated value at point x, y.
+        """
+
+        cdef int index_x = find_index_spaced(self._x_mv, px, self._spacing_x, self._scale_x, &self._hint_x)
+        cdef int index_y = find_index_spaced(self._y_mv, py, self._spacing_y, self._scale_y, &self._hint_y)
+        cdef int index_lower_x = to_cell_index(index_x, self._last_index_x)
+        cdef int index_lower_y = to_cell_index(index_y, self._last_index_y)
+        cdef bint outside_domain_x = index_x == -1 or (index_x == self._last_index_x and px != self._x_mv[self._last_index_x])
+        cdef bint outside_domain_y = index_y == -1 or (index_y == self._last_index_y and py != self._y_mv[self._last_index_y])
+
+        if outside_domain_x or outside_domain_y:
+            return self._extrapolator.evaluate_gradient(px, py, index_x, index_y, gradient)
+        return self._interpolator.evaluate_gradient(px, py, index_lower_x, index_lower_y, gradient)
+
+    def evaluate_gradient(self, double x, double y):
+        """
+        Evaluates the interpolating function and its gradient at a point.
+
+        The value and the analytic gradient of the interpolant are calculated
+        together, so the spline knot search and the cubic coefficients are
+        only computed once.
+
+        :param float x: The x coordinate.
+        :param float y: The y coordinate.
+        :return: A tuple of (f, df/dx, df/dy).
+        :rtype: tuple
+        """
+
+        cdef:
+            double f
+            double[2] gradient
+
+        f = self._evaluate_gradient(x, y, gradient)
+        return f, gradient[0], gradient[1]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    def evaluate_gradient_array(self, object x, object y):
+        """
+        Evaluates the interpolating function and its gradient at an array of points.
+
+        The coordinate arrays are broadcast against each other following the
+        numpy broadcasting rules and every point is evaluated in a single
+        compiled loop.
+
+        :param object x: An array of x coordinates.
+        :param object y: An array of y coordinates.
+        :return: A tuple of arrays (f, df/dx, df/dy) with the broadcast shape of the coordinate arrays.
+        :rtype: tuple
+        """
+
+        cdef:
+            const double[::1] x_mv, y_mv
+            double[::1] f_mv, dfdx_mv, dfdy_mv
+            double[2] gradient
+            Py_ssize_t i
+
+        # broadcast the coordinate arrays to a common shape
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+        shape = x.shape
+        x_mv = np.ascontiguousarray(x).ravel()
+        y_mv = np.ascontiguousarray(y).ravel()
+
+        f = np.empty(x_mv.shape[0], dtype=np.float64)
+        dfdx = np.empty(x_mv.shape[0], dtype=np.float64)
+        dfdy = np.empty(x_mv.shape[0], dtype=np.float64)
+        f_mv = f
+        dfdx_mv = dfdx
+        dfdy_mv = dfdy
+
+        for i in range(f_mv.shape[0]):
+            f_mv[i] = self._evaluate_gradient(x_mv[i], y_mv[i], gradient)
+            dfdx_mv[i] = gradient[0]
+            dfdy_mv[i] = gradient[1]
+
+        return f.reshape(shape), dfdx.reshape(shape), dfdy.reshape(shape)
+
     @property
     def domain(self):
         """
@@ -308,19 +463,36 @@ cdef class _Interpolator2D:
 
     :param x: 1D memory view of the spline point x positions.
     :param y: 1D memory view of the spline point y positions.
-    :param f: 2D memory view of the function value at spline point x, y positions.
+    :param f: 2D array of the function value at spline point x, y positions, stored as float64 or float32.
     """
 
     ID = None
 
-    def __init__(self, double[::1] x, double[::1] y, double[:, ::1] f):
+    def __init__(self, double[::1] x, double[::1] y, ndarray f):
 
         self._x = x
         self._y = y
-        self._f = f
+        self._float32 = f.dtype == np.float32
+        if self._float32:
+            self._f32 = f
+        else:
+            self._f = f
         self._last_index_x = self._x.shape[0] - 1
         self._last_index_y = self._y.shape[0] - 1
 
+    @cython.final
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef inline double _value(self, int ix, int iy):
+        """
+        Returns the function value at a spline knot in double precision.
+        """
+
+        if self._float32:
+            return self._f32[ix, iy]
+        return self._f[ix, iy]
+
     cdef double evaluate(self, double px, double py, int index_x, int index_y) except? -1e999:
         """
         Calculates interpolated value at a requested point.
@@ -344,6 +516,29 @@ cdef class _Interpolator2D:
 
         raise NotImplementedError('_Interpolator is an abstract base class.')
 
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double evaluate_gradient(self, double px, double py, int index_x, int index_y, double[2] gradient) except? -1e999:
+        """
+        Calculates the interpolated value and its gradient at a requested point.
+
+        The normalised first derivatives from analytic_gradient() are rescaled by the cell widths. Subclasses may
+        override this to share work between the value and the gradient.
+
+        :param double px: the x position of the point for which an interpolated value is required.
+        :param double py: the y position of the point for which an interpolated value is required.
+        :param int index_x: the lower index of the bin containing point px. (Result of bisection search).
+        :param int index_y: the lower index of the bin containing point py. (Result of bisection search).
+        :param double[2] gradient: array that receives df/dx and df/dy.
+        :return: the interpolated value.
+        """
+
+        gradient[0] = self.analytic_gradient(px, py, index_x, index_y, 1, 0) / (self._x[index_x + 1] - self._x[index_x])
+        gradient[1] = self.analytic_gradient(px, py, index_x, index_y, 0, 1) / (self._y[index_y + 1] - self._y[index_y])
+        return self.evaluate(px, py, index_x, index_y)
+
 
 cdef class _Interpolator2DLinear(_Interpolator2D):
     """
@@ -360,12 +555,16 @@ cdef class _Interpolator2DLinear(_Interpolator2D):
     @cython.wraparound(False)
     @cython.initializedcheck(False)
     cdef double evaluate(self, double px, double py, int index_x, int index_y) except? -1e999:
-        return linear2d(
-            self._x[index_x], self._x[index_x + 1],
-            self._y[index_y], self._y[index_y + 1],
-            self._f[index_x:index_x + 2, index_y:index_y + 2],
-            px, py
-        )
+        cdef:
+            double x0 = self._x[index_x], x1 = self._x[index_x + 1]
+            double k0, k1
+
+        # interpolate along x
+        k0 = linear1d(x0, x1, self._value(index_x, index_y), self._value(index_x + 1, index_y), px)
+        k1 = linear1d(x0, x1, self._value(index_x, index_y + 1), self._value(index_x + 1, index_y + 1), px)
+
+        # interpolate along y
+        return linear1d(self._y[index_y], self._y[index_y + 1], k0, k1, py)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -431,7 +630,7 @@ cdef class _Interpolator2DLinear(_Interpolator2D):
         :param int ix: the lower index of the bin containing point px. (Result of bisection search).   
         :param int iy: the lower index of the bin containing point py. (Result of bisection search). 
         """
-        return self._f[ix, iy]
+        return self._value(ix, iy)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -440,7 +639,7 @@ cdef class _Interpolator2DLinear(_Interpolator2D):
         """
         Calculate the bilinear coefficients in a unit square. This function returns coefficient 1 (of the range 0-3).
         """
-        return self._f[ix + 1, iy] - self._f[ix, iy]
+        return self._value(ix + 1, iy) - self._value(ix, iy)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -449,7 +648,7 @@ cdef class _Interpolator2DLinear(_Interpolator2D):
         """
         Calculate the bilinear coefficients in a unit square. This function returns coefficient 2 (of the range 0-3).
         """
-        return self._f[ix, iy + 1] - self._f[ix, iy]
+        return self._value(ix, iy + 1) - self._value(ix, iy)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -458,7 +657,7 @@ cdef class _Interpolator2DLinear(_Interpolator2D):
         """
         Calculate the bilinear coefficients in a unit square. This function returns coefficient 3 (of the range 0-3).
         """
-        return self._f[ix, iy] - self._f[ix, iy + 1] - self._f[ix + 1, iy] + self._f[ix + 1, iy + 1]
+        return self._value(ix, iy) - self._value(ix, iy + 1) - self._value(ix + 1, iy) + self._value(ix + 1, iy + 1)
 
 
 cdef class _Interpolator2DCubic(_Interpolator2D):
@@ -469,23 +668,62 @@ cdef class _Interpolator2DCubic(_Interpolator2D):
     neighbouring spline knots using _ArrayDerivative2D object. The polynomial coefficients and gradients are calculated
     between each spline knots in a unit square.
 
+    The storage of the coefficients is controlled by the cache type, see Interpolator2DArray for the options.
+
     :param x: 1D memory view of the spline point x positions.
     :param y: 1D memory view of the spline point y positions.
-    :param f: 2D memory view of the function value at spline point x, y positions.
+    :param f: 2D array of the function value at spline point x, y positions, stored as float64 or float32.
+    :param str cache_type: The coefficient cache policy (default='lazy').
+    :param int cache_size: The maximum number of cells held by the lru cache (default=65536).
     """
 
     ID = 'cubic'
 
-    def __init__(self, double[::1] x, double[::1] y, double[:, ::1] f):
+    def __init__(self, double[::1] x, double[::1] y, ndarray f, str cache_type='lazy', int cache_size=65536):
+
+        cdef:
+            int i, j, index_x, index_y
+            double[4][4] a
 
         super().__init__(x, y, f)
+        self._array_derivative = _ArrayDerivative2D(self._x, self._y, f)
+
+        if cache_type not in id_to_cache:
+            raise ValueError(f'Cache type {cache_type} not found. Options are {id_to_cache.keys()}.')
+
+        if cache_size < 1:
+            raise ValueError('The cache size must be greater than 0.')
+
+        self._cache_mode = id_to_cache[cache_type]
+
+        if self._cache_mode == CACHE_LAZY:
+
+            # where the spline coefficients (a) have been calculated the value is set to 1, 0 otherwise
+            self._calculated = np.zeros((self._last_index_x, self._last_index_y), dtype=np.uint8)
+
+            # Store the cubic spline coefficients, where increasing index values are the coefficients for the coefficients of higher powers of x, y in the last 2 dimensions.
+            self._a = np.zeros((self._last_index_x, self._last_index_y, 4, 4), dtype=np.float64)
 
-        # where the spline coefficients (a) have been calculated the value is set to 1, 0 otherwise
-        self._calculated = np.zeros((self._last_index_x, self._last_index_y), dtype=np.uint8)
+        elif self._cache_mode == CACHE_EAGER:
 
-        # Store the cubic spline coefficients, where increasing index values are the coefficients for the coefficients of higher powers of x, y in the last 2 dimensions.
-        self._a = np.zeros((self._last_index_x, self._last_index_y, 4, 4), dtype=np.float64)
-        self._array_derivative = _ArrayDerivative2D(self._x, self._y, self._f)
+            # the coefficients of every cell are calculated up front, evaluation only reads the array
+            self._a = np.empty((self._last_index_x, self._last_index_y, 4, 4), dtype=np.float64)
+            for index_x in range(self._last_index_x):
+                for index_y in range(self._last_index_y):
+                    self._calculate_coefficients(index_x, index_y, a)
+                    for i in range(4):
+                        for j in range(4):
+                            self._a[index_x, index_y, i, j] = a[i][j]
+
+        elif self._cache_mode == CACHE_LRU:
+
+            # a set associative cache, each cell maps to a set of CACHE_WAYS slots
+            cache_size = min(cache_size, self._last_index_x * self._last_index_y)
+            self._cache_sets = (cache_size + CACHE_WAYS - 1) // CACHE_WAYS
+            self._cache_keys = np.full(self._cache_sets * CACHE_WAYS, -1, dtype=np.int64)
+            self._cache_stamps = np.zeros(self._cache_sets * CACHE_WAYS, dtype=np.int64)
+            self._cache = np.empty((self._cache_sets * CACHE_WAYS, 4, 4), dtype=np.float64)
+            self._cache_clock = 0
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -501,14 +739,14 @@ cdef class _Interpolator2DCubic(_Interpolator2D):
         ny = (py - self._y[index_y]) / (self._y[index_y + 1] - self._y[index_y])
 
         # calculate the coefficients (and gradients at each spline point) if they dont exist
-        self._calc_coefficients(index_x, index_y, a)
+        self._cache_coefficients(index_x, index_y, a)
 
         return evaluate_cubic_2d(a, nx, ny)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
-    cdef _calc_coefficients(self, int index_x, int index_y, double[4][4] a):
+    cdef _cache_coefficients(self, int index_x, int index_y, double[4][4] a):
         """
         Calculates and stores, or loads previously stored cubic coefficients.
         
@@ -517,43 +755,114 @@ cdef class _Interpolator2DCubic(_Interpolator2D):
         :param double[4][4] a: The coefficients of the bicubic equation.
         """
 
-        cdef double[2][2] f, dfdx, dfdy, d2fdxdy
         cdef int i, j
 
-        # Calculate the coefficients (and gradients at each spline point) if they dont exist
-        if not self._calculated[index_x, index_y]:
+        if self._cache_mode == CACHE_LAZY:
 
-            f[0][0] = self._f[index_x, index_y]
-            f[1][0] = self._f[index_x + 1, index_y]
-            f[0][1] = self._f[index_x, index_y + 1]
-            f[1][1] = self._f[index_x + 1, index_y + 1]
+            # Calculate the coefficients (and gradients at each spline point) if they dont exist
+            if not self._calculated[index_x, index_y]:
+                self._calculate_coefficients(index_x, index_y, a)
+                for i in range(4):
+                    for j in range(4):
+                        self._a[index_x, index_y, i, j] = a[i][j]
+                self._calculated[index_x, index_y] = 1
+                return
 
-            dfdx[0][0] = self._array_derivative.evaluate_df_dx(index_x, index_y, False)
-            dfdx[0][1] = self._array_derivative.evaluate_df_dx(index_x, index_y + 1, False)
-            dfdx[1][0] = self._array_derivative.evaluate_df_dx(index_x + 1, index_y, True)
-            dfdx[1][1] = self._array_derivative.evaluate_df_dx(index_x + 1, index_y + 1, True)
+        elif self._cache_mode == CACHE_LRU:
+            self._lookup_coefficients(index_x, index_y, a)
+            return
 
-            dfdy[0][0] = self._array_derivative.evaluate_df_dy(index_x, index_y, False)
-            dfdy[0][1] = self._array_derivative.evaluate_df_dy(index_x, index_y + 1, True)
-            dfdy[1][0] = self._array_derivative.evaluate_df_dy(index_x + 1, index_y, False)
-            dfdy[1][1] = self._array_derivative.evaluate_df_dy(index_x + 1, index_y + 1, True)
+        elif self._cache_mode == CACHE_NONE:
+            self._calculate_coefficients(index_x, index_y, a)
+            return
 
-            d2fdxdy[0][0] = self._array_derivative.evaluate_d2f_dxdy(index_x, index_y, False, False)
-            d2fdxdy[0][1] = self._array_derivative.evaluate_d2f_dxdy(index_x, index_y + 1, False, True)
-            d2fdxdy[1][0] = self._array_derivative.evaluate_d2f_dxdy(index_x + 1, index_y, True, False)
-            d2fdxdy[1][1] = self._array_derivative.evaluate_d2f_dxdy(index_x + 1, index_y + 1, True, True)
+        for i in range(4):
+            for j in range(4):
+                a[i][j] = self._a[index_x, index_y, i, j]
 
-            calc_coefficients_2d(f, dfdx, dfdy, d2fdxdy, a)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef _lookup_coefficients(self, int index_x, int index_y, double[4][4] a):
+        """
+        Loads the cubic coefficients from the bounded cache, calculating them on a cache miss.
 
-            for i in range(4):
-                for j in range(4):
-                    self._a[index_x, index_y, i, j] = a[i][j]
-            self._calculated[index_x, index_y] = 1
+        A cell may be stored in any slot of the set selected by a hash of the
+        cell index. On a miss the least recently used slot of the set is
+        replaced.
 
-        else:
-            for i in range(4):
-                for j in range(4):
-                    a[i][j] = self._a[index_x, index_y, i, j]
+        :param int index_x: the lower index of the bin containing point px (result of bisection search).
+        :param int index_y: the lower index of the bin containing point py (result of bisection search).
+        :param double[4][4] a: The coefficients of the bicubic equation.
+        """
+
+        cdef:
+            np.int64_t key
+            np.uint64_t hash_value
+            int first, slot, oldest, i, j
+
+        key = <np.int64_t> index_x * self._last_index_y + index_y
+
+        # a multiplicative (Fibonacci) hash spreads neighbouring cells over the sets
+        hash_value = (<np.uint64_t> key) * <np.uint64_t> 11400714819323198485ULL
+        first = <int> ((hash_value >> 32) % <np.uint64_t> self._cache_sets) * CACHE_WAYS
+
+        self._cache_clock += 1
+        oldest = first
+        for slot in range(first, first + CACHE_WAYS):
+
+            if self._cache_keys[slot] == key:
+                self._cache_stamps[slot] = self._cache_clock
+                for i in range(4):
+                    for j in range(4):
+                        a[i][j] = self._cache[slot, i, j]
+                return
+
+            if self._cache_stamps[slot] < self._cache_stamps[oldest]:
+                oldest = slot
+
+        self._calculate_coefficients(index_x, index_y, a)
+        for i in range(4):
+            for j in range(4):
+                self._cache[oldest, i, j] = a[i][j]
+        self._cache_keys[oldest] = key
+        self._cache_stamps[oldest] = self._cache_clock
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef _calculate_coefficients(self, int index_x, int index_y, double[4][4] a):
+        """
+        Calculates the cubic coefficients of a cell.
+
+        :param int index_x: the lower index of the bin containing point px (result of bisection search).
+        :param int index_y: the lower index of the bin containing point py (result of bisection search).
+        :param double[4][4] a: The coefficients of the bicubic equation.
+        """
+
+        cdef double[2][2] f, dfdx, dfdy, d2fdxdy
+
+        f[0][0] = self._value(index_x, index_y)
+        f[1][0] = self._value(index_x + 1, index_y)
+        f[0][1] = self._value(index_x, index_y + 1)
+        f[1][1] = self._value(index_x + 1, index_y + 1)
+
+        dfdx[0][0] = self._array_derivative.evaluate_df_dx(index_x, index_y, False)
+        dfdx[0][1] = self._array_derivative.evaluate_df_dx(index_x, index_y + 1, False)
+        dfdx[1][0] = self._array_derivative.evaluate_df_dx(index_x + 1, index_y, True)
+        dfdx[1][1] = self._array_derivative.evaluate_df_dx(index_x + 1, index_y + 1, True)
+
+        dfdy[0][0] = self._array_derivative.evaluate_df_dy(index_x, index_y, False)
+        dfdy[0][1] = self._array_derivative.evaluate_df_dy(index_x, index_y + 1, True)
+        dfdy[1][0] = self._array_derivative.evaluate_df_dy(index_x + 1, index_y, False)
+        dfdy[1][1] = self._array_derivative.evaluate_df_dy(index_x + 1, index_y + 1, True)
+
+        d2fdxdy[0][0] = self._array_derivative.evaluate_d2f_dxdy(index_x, index_y, False, False)
+        d2fdxdy[0][1] = self._array_derivative.evaluate_d2f_dxdy(index_x, index_y + 1, False, True)
+        d2fdxdy[1][0] = self._array_derivative.evaluate_d2f_dxdy(index_x + 1, index_y, True, False)
+        d2fdxdy[1][1] = self._array_derivative.evaluate_d2f_dxdy(index_x + 1, index_y + 1, True, True)
+
+        calc_coefficients_2d(f, dfdx, dfdy, d2fdxdy, a)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -592,7 +901,7 @@ cdef class _Interpolator2DCubic(_Interpolator2D):
         ny = (py - self._y[index_y]) / (self._y[index_y + 1] - self._y[index_y])
 
         # Calculate the coefficients (and gradients at each spline point) if they dont exist
-        self._calc_coefficients(index_x, index_y, a)
+        self._cache_coefficients(index_x, index_y, a)
 
         # x and y powers
         x_powers[0] = 1
@@ -611,6 +920,67 @@ cdef class _Interpolator2DCubic(_Interpolator2D):
                 df_dn += a[i][j] * (FACTORIAL[i] / FACTORIAL[i - order_x]) * x_powers[i - order_x] * (FACTORIAL[j] / FACTORIAL[j - order_y]) * y_powers[j-order_y]
         return df_dn
 
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double evaluate_gradient(self, double px, double py, int index_x, int index_y, double[2] gradient) except? -1e999:
+        """
+        Calculates the interpolated value and its gradient at a requested point.
+
+        The bicubic coefficients are fetched once and used for both the value and the first derivatives.
+
+        :param double px: the x position of the point for which an interpolated value is required.
+        :param double py: the y position of the point for which an interpolated value is required.
+        :param int index_x: the lower index of the bin containing point px. (Result of bisection search).
+        :param int index_y: the lower index of the bin containing point py. (Result of bisection search).
+        :param double[2] gradient: array that receives df/dx and df/dy.
+        :return: the interpolated value.
+        """
+
+        cdef double[4][4] a
+        cdef double[4] x_powers, y_powers, dx_powers, dy_powers
+        cdef double nx, ny, df_dx, df_dy
+        cdef int i, j
+
+        # normalise x and y to a unit cell
+        nx = (px - self._x[index_x]) / (self._x[index_x + 1] - self._x[index_x])
+        ny = (py - self._y[index_y]) / (self._y[index_y + 1] - self._y[index_y])
+
+        self._cache_coefficients(index_x, index_y, a)
+
+        # powers and their first derivatives
+        x_powers[0] = 1
+        x_powers[1] = nx
+        x_powers[2] = nx * nx
+        x_powers[3] = nx * x_powers[2]
+
+        y_powers[0] = 1
+        y_powers[1] = ny
+        y_powers[2] = ny * ny
+        y_powers[3] = ny * y_powers[2]
+
+        dx_powers[0] = 0
+        dx_powers[1] = 1
+        dx_powers[2] = 2 * nx
+        dx_powers[3] = 3 * x_powers[2]
+
+        dy_powers[0] = 0
+        dy_powers[1] = 1
+        dy_powers[2] = 2 * ny
+        dy_powers[3] = 3 * y_powers[2]
+
+        df_dx = 0.0
+        df_dy = 0.0
+        for i in range(4):
+            for j in range(4):
+                df_dx += a[i][j] * dx_powers[i] * y_powers[j]
+                df_dy += a[i][j] * x_powers[i] * dy_powers[j]
+
+        gradient[0] = df_dx / (self._x[index_x + 1] - self._x[index_x])
+        gradient[1] = df_dy / (self._y[index_y + 1] - self._y[index_y])
+        return evaluate_cubic_2d(a, nx, ny)
+
 
 cdef class _Extrapolator2D:
     """
@@ -618,17 +988,15 @@ cdef class _Extrapolator2D:
 
     :param x: 1D memory view of the spline point x positions.
     :param y: 1D memory view of the spline point y positions.
-    :param f: 2D memory view of the function value at spline point x, y positions.
     :param interpolator: stored _Interpolator2D object that is being used.
     """
 
     ID = None
 
-    def __init__(self, double[::1] x, double[::1] y, double[:, ::1] f, _Interpolator2D interpolator, double extrapolation_range_x, double extrapolation_range_y):
+    def __init__(self, double[::1] x, double[::1] y, _Interpolator2D interpolator, double extrapolation_range_x, double extrapolation_range_y):
 
         self._x = x
         self._y = y
-        self._f = f
         self._last_index_x = self._x.shape[0] - 1
         self._last_index_y = self._y.shape[0] - 1
         self._interpolator = interpolator
@@ -671,6 +1039,36 @@ cdef class _Extrapolator2D:
 
         raise ValueError('Interpolated index parsed to extrapolator.')
 
+    cdef double evaluate_gradient(self, double px, double py, int index_x, int index_y, double[2] gradient) except? -1e999:
+        """
+        Calculates the extrapolated value and its gradient at a requested point.
+
+        The value and the extrapolation range checks are handled by evaluate(). The gradient is calculated by
+        _evaluate_gradient_edge() for the directions in which the point lies outside the spline knots.
+
+        :param double px: the point for which an extrapolated value is required.
+        :param double py: the point for which an extrapolated value is required.
+        :param int index_x: the index returned by the bisection search for point px.
+        :param int index_y: the index returned by the bisection search for point py.
+        :param double[2] gradient: array that receives df/dx and df/dy.
+        :return: the extrapolated value.
+        """
+
+        cdef double f
+
+        f = self.evaluate(px, py, index_x, index_y)
+        self._evaluate_gradient_edge(
+            px, py,
+            to_cell_index(index_x, self._last_index_x), to_cell_index(index_y, self._last_index_y),
+            to_knot_index(index_x, self._last_index_x), to_knot_index(index_y, self._last_index_y),
+            index_x == -1 or index_x == self._last_index_x, index_y == -1 or index_y == self._last_index_y,
+            gradient
+        )
+        return f
+
+    cdef int _evaluate_gradient_edge(self, double px, double py, int index_x, int index_y, int edge_x_index, int edge_y_index, bint outside_x, bint outside_y, double[2] gradient) except -1:
+        raise NotImplementedError(f'{self.__class__} not implemented.')
+
     cdef double _evaluate_edge_x(self, double px, double py, int index_x, int index_y, int edge_x_index) except? -1e999:
         raise NotImplementedError(f'{self.__class__} not implemented.')
 
@@ -763,6 +1161,31 @@ cdef class _Extrapolator2DNearest(_Extrapolator2D):
         """
         return self._interpolator.evaluate(self._x[edge_x_index], self._y[edge_y_index], index_x, index_y)
 
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef int _evaluate_gradient_edge(self, double px, double py, int index_x, int index_y, int edge_x_index, int edge_y_index, bint outside_x, bint outside_y, double[2] gradient) except -1:
+        """
+        The extrapolated value is constant outside the spline knots, so the gradient is zero in the extrapolated
+        directions and equal to the interpolator gradient at the nearest edge in the others.
+        """
+
+        cdef double cx = self._x[edge_x_index] if outside_x else px
+        cdef double cy = self._y[edge_y_index] if outside_y else py
+
+        if outside_x:
+            gradient[0] = 0.0
+        else:
+            gradient[0] = self._interpolator.analytic_gradient(cx, cy, index_x, index_y, 1, 0) / (self._x[index_x + 1] - self._x[index_x])
+
+        if outside_y:
+            gradient[1] = 0.0
+        else:
+            gradient[1] = self._interpolator.analytic_gradient(cx, cy, index_x, index_y, 0, 1) / (self._y[index_y + 1] - self._y[index_y])
+
+        return 0
+
 
 cdef class _Extrapolator2DLinear(_Extrapolator2D):
     """
@@ -867,6 +1290,35 @@ cdef class _Extrapolator2DLinear(_Extrapolator2D):
                  + df_dy * (py - self._y[edge_y_index]) \
                  + d2f_dxdy * (py - self._y[edge_y_index]) * (px - self._x[edge_x_index])
 
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef int _evaluate_gradient_edge(self, double px, double py, int index_x, int index_y, int edge_x_index, int edge_y_index, bint outside_x, bint outside_y, double[2] gradient) except -1:
+        """
+        Differentiates the expansion f(edge) + Dx*df(edge)/dx + Dy*df(edge)/dy + Dx*Dy*d2f(edge)/dxdy used by the
+        _evaluate_edge methods.
+
+        Dx and Dy are zero in the directions lying inside the spline knot domain, which gives
+        df/dx = df(edge)/dx + Dy*d2f(edge)/dxdy and df/dy = df(edge)/dy + Dx*d2f(edge)/dxdy for every edge.
+        """
+
+        cdef double rdx, rdy, cx, cy, df_dx, df_dy, d2f_dxdy
+
+        rdx = 1.0 / (self._x[index_x + 1] - self._x[index_x])
+        rdy = 1.0 / (self._y[index_y + 1] - self._y[index_y])
+
+        cx = self._x[edge_x_index] if outside_x else px
+        cy = self._y[edge_y_index] if outside_y else py
+
+        df_dx = self._interpolator.analytic_gradient(cx, cy, index_x, index_y, 1, 0) * rdx
+        df_dy = self._interpolator.analytic_gradient(cx, cy, index_x, index_y, 0, 1) * rdy
+        d2f_dxdy = self._interpolator.analytic_gradient(cx, cy, index_x, index_y, 1, 1) * rdx * rdy
+
+        gradient[0] = df_dx + d2f_dxdy * (py - cy)
+        gradient[1] = df_dy + d2f_dxdy * (px - cx)
+        return 0
+
 
 cdef class _ArrayDerivative2D:
     """
@@ -877,17 +1329,34 @@ cdef class _ArrayDerivative2D:
 
     :param x: 1D memory view of the spline point x positions.
     :param y: 1D memory view of the spline point y positions.
-    :param f: 2D memory view of the function value at spline point x, y positions.
+    :param f: 2D array of the function value at spline point x, y positions, stored as float64 or float32.
     """
 
-    def __init__(self, double[::1] x, double[::1] y, double[:, ::1] f):
+    def __init__(self, double[::1] x, double[::1] y, ndarray f):
 
         self._x = x
         self._y = y
-        self._f = f
+        self._float32 = f.dtype == np.float32
+        if self._float32:
+            self._f32 = f
+        else:
+            self._f = f
         self._last_index_x = self._x.shape[0] - 1
         self._last_index_y = self._y.shape[0] - 1
 
+    @cython.final
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef inline double _value(self, int ix, int iy):
+        """
+        Returns the function value at a spline knot in double precision.
+        """
+
+        if self._float32:
+            return self._f32[ix, iy]
+        return self._f[ix, iy]
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
@@ -1025,7 +1494,7 @@ cdef class _ArrayDerivative2D:
         :param slice_index_y: The index of the y grid cell to evaluate.
         """
 
-        return self._f[lower_index_x + 1, slice_index_y] - self._f[lower_index_x, slice_index_y]
+        return self._value(lower_index_x + 1, slice_index_y) - self._value(lower_index_x, slice_index_y)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -1058,8 +1527,8 @@ cdef class _ArrayDerivative2D:
 
         x1_n = (self._x[lower_index_x + 1] - self._x[lower_index_x]) / (self._x[lower_index_x + 2] - self._x[lower_index_x + 1])
         x1_n2 = x1_n * x1_n
-        return (self._f[lower_index_x + 2, slice_index_y] * x1_n2 - self._f[lower_index_x, slice_index_y]
-                - self._f[lower_index_x + 1, slice_index_y] * (x1_n2 - 1.)) / (x1_n + x1_n2)
+        return (self._value(lower_index_x + 2, slice_index_y) * x1_n2 - self._value(lower_index_x, slice_index_y)
+                - self._value(lower_index_x + 1, slice_index_y) * (x1_n2 - 1.)) / (x1_n + x1_n2)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -1081,7 +1550,7 @@ cdef class _ArrayDerivative2D:
         :param lower_index_y: The lower index of the y grid cell to evaluate.
         """
 
-        return self._f[slice_index_x, lower_index_y + 1] - self._f[slice_index_x, lower_index_y]
+        return self._value(slice_index_x, lower_index_y + 1) - self._value(slice_index_x, lower_index_y)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -1114,8 +1583,8 @@ cdef class _ArrayDerivative2D:
 
         y1_n = (self._y[lower_index_y + 1] - self._y[lower_index_y]) / (self._y[lower_index_y + 2] - self._y[lower_index_y + 1])
         y1_n2 = y1_n * y1_n
-        return (self._f[slice_index_x, lower_index_y + 2] * y1_n2 - self._f[slice_index_x, lower_index_y]
-                - self._f[slice_index_x, lower_index_y + 1] * (y1_n2 - 1.)) / (y1_n + y1_n2)
+        return (self._value(slice_index_x, lower_index_y + 2) * y1_n2 - self._value(slice_index_x, lower_index_y)
+                - self._value(slice_index_x, lower_index_y + 1) * (y1_n2 - 1.)) / (y1_n + y1_n2)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -1143,8 +1612,8 @@ cdef class _ArrayDerivative2D:
         :param lower_index_y: The lower index of the y grid cell to evaluate.
         """
 
-        return self._f[lower_index_x + 1, lower_index_y + 1] - self._f[lower_index_x, lower_index_y + 1] \
-               - self._f[lower_index_x + 1, lower_index_y] + self._f[lower_index_x, lower_index_y]
+        return self._value(lower_index_x + 1, lower_index_y + 1) - self._value(lower_index_x, lower_index_y + 1) \
+               - self._value(lower_index_x + 1, lower_index_y) + self._value(lower_index_x, lower_index_y)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -1184,8 +1653,8 @@ cdef class _ArrayDerivative2D:
         cdef double dy1
 
         dy1 = (self._y[lower_index_y + 1] - self._y[lower_index_y]) / (self._y[lower_index_y + 2] - self._y[lower_index_y + 1])
-        return (self._f[lower_index_x + 1, lower_index_y + 2] - self._f[lower_index_x, lower_index_y + 2]
-                - self._f[lower_index_x + 1, lower_index_y] + self._f[lower_index_x, lower_index_y] )/ (1. + dy1)
+        return (self._value(lower_index_x + 1, lower_index_y + 2) - self._value(lower_index_x, lower_index_y + 2)
+                - self._value(lower_index_x + 1, lower_index_y) + self._value(lower_index_x, lower_index_y) )/ (1. + dy1)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -1214,8 +1683,8 @@ cdef class _ArrayDerivative2D:
         cdef double dx1
 
         dx1 = (self._x[lower_index_x + 1] - self._x[lower_index_x]) / (self._x[lower_index_x + 2] - self._x[lower_index_x + 1])
-        return (self._f[lower_index_x + 2, lower_index_y + 1] - self._f[lower_index_x, lower_index_y + 1]
-                - self._f[lower_index_x + 2, lower_index_y] + self._f[lower_index_x, lower_index_y] ) / (1. + dx1)
+        return (self._value(lower_index_x + 2, lower_index_y + 1) - self._value(lower_index_x, lower_index_y + 1)
+                - self._value(lower_index_x + 2, lower_index_y) + self._value(lower_index_x, lower_index_y) ) / (1. + dx1)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -1254,9 +1723,21 @@ cdef class _ArrayDerivative2D:
 
         dx1 = (self._x[lower_index_x + 1] - self._x[lower_index_x]) / (self._x[lower_index_x + 2] - self._x[lower_index_x + 1])
         dy1 = (self._y[lower_index_y + 1] - self._y[lower_index_y]) / (self._y[lower_index_y + 2] - self._y[lower_index_y + 1])
-        return (self._f[lower_index_x + 2, lower_index_y + 2] - self._f[lower_index_x, lower_index_y + 2]
-                - self._f[lower_index_x + 2, lower_index_y] + self._f[lower_index_x, lower_index_y]) / (1. + dx1 + dy1 + dx1*dy1)
+        return (self._value(lower_index_x + 2, lower_index_y + 2) - self._value(lower_index_x, lower_index_y + 2)
+                - self._value(lower_index_x + 2, lower_index_y) + self._value(lower_index_x, lower_index_y)) / (1. + dx1 + dy1 + dx1*dy1)
+
 
+id_to_cache = {
+    'lazy': CACHE_LAZY,
+    'lru': CACHE_LRU,
+    'eager': CACHE_EAGER,
+    'none': CACHE_NONE
+}
+
+id_to_storage = {
+    'float64': np.float64,
+    'float32': np.float32
+}
 
 id_to_interpolator = {
     _Interpolator2DLinear.ID: _Interpolator2DLinear,
@@ -33,6 +33,7 @@ Unit tests for array interpolation (not mesh) from within Interpolate2DArray,
 including interaction with internal extrapolators.
 """
 import unittest
+import pickle
 import numpy as np
 from raysect.core.math.function.float.function2d.interpolate.interpolator2darray import Interpolator2DArray, \
     id_to_extrapolator, id_to_interpolator, permitted_interpolation_combinations
@@ -811,3 +812,117 @@ class TestInterpolators2D(unittest.TestCase):
                                       f'{y_str_long}, {fx_str_long}, {fy_str_long}), too short in : ({x_str_short}, ' \
                                       f'{y_str_short}, {fx_str_short}, {fy_str_short})'
                         self.initialise_tests_on_interpolators(x[i], y[j], f[k], problem_str=problem_str)
+
+    def test_cubic_cache_types(self):
+        """
+        The cubic coefficient cache types must reproduce the results of the default lazy cache exactly.
+        """
+
+        x, y = np.meshgrid(self.x_uneven, self.y_uneven, indexing='ij')
+        f = np.sin(3 * x) * np.cos(2 * y) + x * y
+        reference = Interpolator2DArray(self.x_uneven, self.y_uneven, f, 'cubic', 'linear', EXTRAPOLATION_RANGE,
+                                        EXTRAPOLATION_RANGE)
+
+        # samples inside the domain and in the extrapolation region, evaluated twice to exercise cache hits
+        xsamples = np.concatenate((np.repeat(self.xsamples, len(self.ysamples)), self.xsamples_in_bounds))
+        ysamples = np.concatenate((np.tile(self.ysamples, len(self.xsamples)), self.ysamples_in_bounds))
+        order = np.random.default_rng(7).permutation(len(xsamples))
+        xsamples = np.concatenate((xsamples, xsamples[order]))
+        ysamples = np.concatenate((ysamples, ysamples[order]))
+        expected = [reference(px, py) for px, py in zip(xsamples, ysamples)]
+
+        for cache_type, cache_size in [('lazy', 65536), ('eager', 65536), ('none', 65536), ('lru', 1), ('lru', 10), ('lru', 65536)]:
+            interpolator = Interpolator2DArray(self.x_uneven, self.y_uneven, f, 'cubic', 'linear', EXTRAPOLATION_RANGE,
+                                               EXTRAPOLATION_RANGE, cache_type=cache_type, cache_size=cache_size)
+            restored = pickle.loads(pickle.dumps(interpolator))
+            for interpolator in (interpolator, restored):
+                for px, py, value in zip(xsamples, ysamples, expected):
+                    self.assertEqual(interpolator(px, py), value, msg=f'Cache type {cache_type} ({cache_size}) differs at ({px}, {py}).')
+
+        # the cache type is ignored by the linear interpolator
+        Interpolator2DArray(self.x_uneven, self.y_uneven, f, 'linear', 'none', 0.0, 0.0, cache_type='none')
+
+        with self.assertRaises(ValueError):
+            Interpolator2DArray(self.x_uneven, self.y_uneven, f, 'cubic', 'none', 0.0, 0.0, cache_type='unknown')
+
+        with self.assertRaises(ValueError):
+            Interpolator2DArray(self.x_uneven, self.y_uneven, f, 'cubic', 'none', 0.0, 0.0, cache_type='lru', cache_size=0)
+
+    def test_storage_types(self):
+        """
+        Single precision storage must match double precision storage of the rounded data, read only data must not be copied.
+        """
+
+        x, y = np.meshgrid(self.x_uneven, self.y_uneven, indexing='ij')
+        f = np.sin(3 * x) * np.cos(2 * y) + x * y
+        f_rounded = f.astype(np.float32).astype(np.float64)
+
+        xsamples = np.concatenate((np.repeat(self.xsamples, len(self.ysamples)), self.xsamples_in_bounds))
+        ysamples = np.concatenate((np.tile(self.ysamples, len(self.xsamples)), self.ysamples_in_bounds))
+
+        for interpolation_type in ('linear', 'cubic'):
+            reference = Interpolator2DArray(self.x_uneven, self.y_uneven, f_rounded, interpolation_type, 'linear',
+                                            EXTRAPOLATION_RANGE, EXTRAPOLATION_RANGE)
+            interpolator = Interpolator2DArray(self.x_uneven, self.y_uneven, f, interpolation_type, 'linear',
+                                               EXTRAPOLATION_RANGE, EXTRAPOLATION_RANGE, storage_type='float32')
+            restored = pickle.loads(pickle.dumps(interpolator))
+            for interpolator in (interpolator, restored):
+                for px, py in zip(xsamples, ysamples):
+                    self.assertEqual(interpolator(px, py), reference(px, py), msg=f'Storage type float32 ({interpolation_type}) differs at ({px}, {py}).')
+
+        # writeable data is copied, read only data of the storage type is used directly
+        for dtype, storage_type in ((np.float64, 'float64'), (np.float32, 'float32')):
+            data = f.astype(dtype)
+            interpolator_copy = Interpolator2DArray(self.x_uneven, self.y_uneven, data, 'linear', 'none', 0.0, 0.0, storage_type=storage_type)
+            view = data.view()
+            view.flags.writeable = False
+            interpolator_view = Interpolator2DArray(self.x_uneven, self.y_uneven, view, 'linear', 'none', 0.0, 0.0, storage_type=storage_type)
+            original = float(data[0, 0])
+            data[0, 0] += 1.0
+            self.assertEqual(interpolator_copy(self.x_uneven[0], self.y_uneven[0]), original)
+            self.assertEqual(interpolator_view(self.x_uneven[0], self.y_uneven[0]), float(data[0, 0]))
+            self.assertTrue(data.flags.writeable)
+
+        with self.assertRaises(ValueError):
+            Interpolator2DArray(self.x_uneven, self.y_uneven, f, 'linear', 'none', 0.0, 0.0, storage_type='float16')
+
+    def test_evaluate_gradient(self):
+        """
+        The gradient must match a finite difference of the interpolator and the value must match a plain evaluation.
+        """
+
+        x, y = np.meshgrid(self.x_uneven, self.y_uneven, indexing='ij')
+        f = np.sin(3 * x) * np.cos(2 * y) + x * y
+
+        # points inside each cell (away from the knots) and in the extrapolation regions
+        def sample_points(knots):
+            return np.concatenate(([knots[0] - 0.3], knots[:-1] + 0.37 * np.diff(knots), [knots[-1] + 0.3]))
+
+        xsamples, ysamples = np.meshgrid(sample_points(self.x_uneven), sample_points(self.y_uneven), indexing='ij')
+        xsamples = xsamples.ravel()
+        ysamples = ysamples.ravel()
+        delta = 1e-6
+
+        for interpolation_type in ('linear', 'cubic'):
+            for extrapolation_type in ('nearest', 'linear'):
+                interpolator = Interpolator2DArray(self.x_uneven, self.y_uneven, f, interpolation_type, extrapolation_type,
+                                                   EXTRAPOLATION_RANGE, EXTRAPOLATION_RANGE)
+                values, df_dx, df_dy = interpolator.evaluate_gradient_array(xsamples, ysamples)
+                for i, (px, py) in enumerate(zip(xsamples, ysamples)):
+                    msg = f'Gradient ({interpolation_type}, {extrapolation_type}) differs at ({px}, {py}).'
+                    self.assertEqual(interpolator.evaluate_gradient(px, py), (values[i], df_dx[i], df_dy[i]), msg=msg)
+                    self.assertEqual(values[i], interpolator(px, py), msg=msg)
+                    fd_x = (interpolator(px + delta, py) - interpolator(px - delta, py)) / (2 * delta)
+                    fd_y = (interpolator(px, py + delta) - interpolator(px, py - delta)) / (2 * delta)
+                    self.assertAlmostEqual(df_dx[i], fd_x, places=5, msg=msg)
+                    self.assertAlmostEqual(df_dy[i], fd_y, places=5, msg=msg)
+
+        # coordinate arrays are broadcast
+        values, df_dx, df_dy = interpolator.evaluate_gradient_array(xsamples[:5, np.newaxis], ysamples[np.newaxis, :4])
+        for array in (values, df_dx, df_dy):
+            self.assertEqual(array.shape, (5, 4))
+        self.assertEqual(values[2, 3], interpolator(xsamples[2], ysamples[3]))
+
+        interpolator = Interpolator2DArray(self.x_uneven, self.y_uneven, f, 'cubic', 'none', 0.0, 0.0)
+        with self.assertRaises(ValueError):
+            interpolator.evaluate_gradient(self.x_uneven[0] - 0.1, 0.0)
@@ -0,0 +1,93 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+from numpy import empty, linspace
+from .base cimport Function2D
+from .autowrap cimport autowrap_function2d, PythonFunction2D
+cimport cython
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef tuple sample2d(object function, double x_min, double x_max, int x_samples, double y_min, double y_max, int y_samples):
+    """
+    Samples Function2D over a regular grid.
+
+    :param function: the function to sample. a Function2D object, or a Python function
+    :param x_min: minimum value for x sample range
+    :param x_max: maximum value for x sample range
+    :param x_samples: number of samples between x_min and x_max, where endpoints are included
+    :param y_min: minimum value for y sample range
+    :param y_max: maximum value for y sample range
+    :param y_samples: number of samples between y_min and y_max, where endpoints are included
+    :return: a tuple of sampled x points, y points and the function samples (x, y, f), f has shape (x_samples, y_samples)
+    """
+    cdef:
+        double[::1] x_v, y_v
+        double[:, ::1] f_v
+        int i, j
+        Function2D func
+
+    if x_min > x_max:
+        raise ValueError(f"x_min ({x_min}) argument cannot be greater than x_max ({x_max})")
+
+    if y_min > y_max:
+        raise ValueError(f"y_min ({y_min}) argument cannot be greater than y_max ({y_max})")
+
+    if x_samples < 1:
+        raise ValueError("The argument x_samples must be >= 1")
+
+    if y_samples < 1:
+        raise ValueError("The argument y_samples must be >= 1")
+
+    # ensures that func is of type Function2D. I.e. if 'function' argument was Python function, it'll get autowrapped
+    # into Function2D object
+    func = autowrap_function2d(function)
+
+    x = linspace(x_min, x_max, x_samples)
+    y = linspace(y_min, y_max, y_samples)
+
+    # vectorised python functions are evaluated with a single call
+    if isinstance(func, PythonFunction2D) and (<PythonFunction2D> func).vectorised:
+        return x, y, func.evaluate_array(x[:, None], y[None, :])
+
+    f = empty((x_samples, y_samples))
+
+    # use memory views
+    x_v = x
+    y_v = y
+    f_v = f
+
+    for i in range(x_samples):
+        for j in range(y_samples):
+            f_v[i, j] = func.evaluate(x_v[i], y_v[j])
+
+    return x, y, f
@@ -32,6 +32,7 @@ Unit tests for the autowrap_2d function
 """
 
 import unittest
+import numpy as np
 from raysect.core.math.function.float.function2d.autowrap import _autowrap_function2d, PythonFunction2D
 from raysect.core.math.function.float.function2d.constant import Constant2D
 
@@ -44,3 +45,19 @@ class TestAutowrap2D(unittest.TestCase):
     def test_python_function(self):
         function = _autowrap_function2d(lambda x, y: 10*x + 5*y)
         self.assertIsInstance(function, PythonFunction2D, "Autowrapped function is not a PythonFunction2D.")
+
+    def test_vectorised_python_function(self):
+        calls = []
+
+        def vectorised(x, y):
+            calls.append((x, y))
+            return x * np.cos(y)
+
+        function = PythonFunction2D(vectorised, vectorised=True)
+        x = np.linspace(-2, 2, 11)[:, None]
+        y = np.linspace(0, 1, 5)[None, :]
+        f = function.evaluate_array(x, y)
+        self.assertEqual(f.shape, (11, 5))
+        np.testing.assert_array_equal(f, x * np.cos(y))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(function(0.5, 0.25), 0.5 * np.cos(0.25))
@@ -33,6 +33,7 @@ Unit tests for the Function2D class.
 
 import math
 import unittest
+import numpy as np
 from raysect.core.math.function.float.function2d.autowrap import PythonFunction2D
 
 # TODO: expand tests to cover the cython interface
@@ -52,6 +53,19 @@ class TestFunction2D(unittest.TestCase):
             for y in v:
                 self.assertEqual(self.f1(x, y), self.ref1(x, y), "Function2D call did not match reference function value.")
 
+    def test_evaluate_array(self):
+        v = [-1e10, -7, -0.001, 0.0, 0.00003, 10, 2.3e49]
+        r = 2 * self.f1 + 3
+        x = np.array(v).reshape(7, 1)
+        y = np.array(v)
+        f = r.evaluate_array(x, y)
+        self.assertEqual(f.shape, (7, 7))
+        for i, xi in enumerate(v):
+            for j, yj in enumerate(v):
+                self.assertEqual(f[i, j], r(xi, yj), "Function2D evaluate_array did not match the scalar evaluation.")
+        with self.assertRaises(ValueError):
+            r.evaluate_array([1, 2, 3], [1, 2])
+
     def test_negate(self):
         v = [-1e10, -7, -0.001, 0.0, 0.00003, 10, 2.3e49]
         r = -self.f1
@@ -0,0 +1,58 @@
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+from raysect.core.math.function.float.function2d.samplers import sample2d
+from raysect.core.math.function.float.function2d.autowrap import PythonFunction2D
+import numpy as np
+
+
+class TestSamplers(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.fun = lambda x, y: x * x + 3 * y
+
+    def test_sample2d(self):
+        x_points, y_points, f_values = sample2d(self.fun, -1, 2, 7, 0, 1, 5)
+        np.testing.assert_array_equal(x_points, np.linspace(-1, 2, 7))
+        np.testing.assert_array_equal(y_points, np.linspace(0, 1, 5))
+        self.assertEqual(f_values.shape, (7, 5))
+        for i, x in enumerate(x_points):
+            for j, y in enumerate(y_points):
+                self.assertAlmostEqual(f_values[i, j], self.fun(x, y), places=12)
+
+    def test_sample2d_vectorised(self):
+        x_points, y_points, f_values = sample2d(PythonFunction2D(self.fun, vectorised=True), -1, 2, 7, 0, 1, 5)
+        np.testing.assert_array_almost_equal(f_values, sample2d(self.fun, -1, 2, 7, 0, 1, 5)[2], decimal=12)
+
+    def test_sample2d_invalid_range(self):
+        with self.assertRaises(ValueError):
+            sample2d(self.fun, 1, 0, 5, 0, 1, 5)
+        with self.assertRaises(ValueError):
+            sample2d(self.fun, 0, 1, 5, 0, 1, 0)
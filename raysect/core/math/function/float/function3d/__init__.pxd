@@ -36,3 +36,4 @@ from raysect.core.math.function.float.function3d.autowrap cimport autowrap_funct
 from raysect.core.math.function.float.function3d.interpolate cimport *
 from raysect.core.math.function.float.function3d.arg cimport Arg3D
 from raysect.core.math.function.float.function3d.cmath cimport *
+from raysect.core.math.function.float.function3d.compiled cimport CompiledFunction3D
@@ -34,4 +34,7 @@ from .constant import Constant3D
 from .blend import Blend3D
 from .interpolate import *
 from .arg import Arg3D
+from .autowrap import PythonFunction3D
 from .cmath import *
+from .compiled import CompiledFunction3D
+from .samplers import *
@@ -33,5 +33,6 @@ from raysect.core.math.function.float.function3d.base cimport Function3D
 
 cdef class PythonFunction3D(Function3D):
     cdef public object function
+    cdef public bint vectorised
 
 cdef Function3D autowrap_function3d(object obj)
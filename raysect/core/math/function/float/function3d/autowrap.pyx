@@ -30,6 +30,7 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 import numbers
+import numpy as np
 from raysect.core.math.function.base cimport Function
 from raysect.core.math.function.float.function3d.base cimport Function3D
 from raysect.core.math.function.float.function3d.constant cimport Constant3D
@@ -51,15 +52,52 @@ cdef class PythonFunction3D(Function3D):
     determine if it is an instance of Function3D. If the object is not a
     Function3D object it should be wrapped using this class for internal use.
 
+    If the python object accepts numpy arrays and evaluates them element-wise
+    (a vectorised function), this can be declared by setting vectorised to
+    True. Methods that evaluate the function at many points, such as
+    evaluate_array() and the samplers, then pass all the points to the python
+    object as arrays in a single call. Calls with a single point are
+    unchanged.
+
     See also: autowrap_function3d()
+
+    :param object function: the python function to wrap, __call__() function must
+    be implemented on the object.
+    :param bool vectorised: True if the python object evaluates numpy arrays element-wise
+      (default=False).
     """
 
-    def __init__(self, object function):
+    def __init__(self, object function, bint vectorised=False):
         self.function = function
+        self.vectorised = vectorised
 
     cdef double evaluate(self, double x, double y, double z) except? -1e999:
         return self.function(x, y, z)
 
+    def evaluate_array(self, object x, object y, object z):
+
+        if not self.vectorised:
+            return super().evaluate_array(x, y, z)
+
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        z = np.asarray(z, dtype=np.float64)
+        return _vectorised_result(self.function(x, y, z), np.broadcast_shapes(x.shape, y.shape, z.shape))
+
+
+cdef object _vectorised_result(object f, tuple shape):
+    """
+    Converts the value returned by a vectorised python function to an array of the required shape.
+    """
+
+    f = np.asarray(f, dtype=np.float64)
+    if f.shape != shape:
+        try:
+            f = np.array(np.broadcast_to(f, shape))
+        except ValueError:
+            raise ValueError(f"The vectorised function returned an array with shape {f.shape}, an array with shape {shape} was expected.")
+    return f
+
 
 cdef Function3D autowrap_function3d(object obj):
     """
@@ -0,0 +1,61 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+cimport numpy as np
+from raysect.core.math.function.float.function3d.base cimport Function3D
+
+
+cdef class CompiledFunction3D(Function3D):
+
+    cdef:
+        Function3D _function
+        list _instructions, _constant_list, _callables
+        np.ndarray _opcodes, _operands, _constants
+        np.int32_t[::1] _opcodes_mv
+        np.int32_t[:, ::1] _operands_mv
+        double[::1] _constants_mv
+        int _count, _constant_count, _register_count, _result
+
+    cdef object _assemble(self, tuple result)
+
+    cdef tuple _compile(self, Function3D f)
+
+    cdef tuple _constant(self, double value)
+
+    cdef tuple _call(self, Function3D f)
+
+    cdef tuple _binary(self, int opcode, Function3D f1, Function3D f2)
+
+    cdef tuple _unary(self, int opcode, Function3D f)
+
+    cdef Function3D _compile_branch(self, Function3D f)
+
+    cdef double _execute(self, double x, double y, double z, double *registers) except? -1e999
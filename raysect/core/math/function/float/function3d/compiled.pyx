@@ -0,0 +1,477 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import numpy as np
+cimport numpy as np
+cimport cython
+cimport libc.math as cmath
+from libc.math cimport floor
+from libc.stdlib cimport malloc, free
+from raysect.core.math.function.float.function3d.base cimport *
+from raysect.core.math.function.float.function3d.autowrap cimport autowrap_function3d
+from raysect.core.math.function.float.function3d.constant cimport Constant3D
+from raysect.core.math.function.float.function3d.arg cimport Arg3D, X, Y, Z
+from raysect.core.math.function.float.function3d.blend cimport Blend3D
+from raysect.core.math.function.float.function3d.cmath cimport *
+
+
+# operand register groups
+cdef enum:
+    ARGUMENT, CONSTANT, RESULT
+
+# instruction opcodes
+cdef enum Opcode:
+    OP_CALL,
+    OP_ADD, OP_SUBTRACT, OP_MULTIPLY, OP_DIVIDE, OP_MODULO, OP_POW,
+    OP_EQUALS, OP_NOT_EQUALS, OP_LESS_THAN, OP_GREATER_THAN, OP_LESS_EQUALS, OP_GREATER_EQUALS, OP_ATAN4Q,
+    OP_ABS, OP_EXP, OP_SIN, OP_COS, OP_TAN, OP_ASIN, OP_ACOS, OP_ATAN, OP_SQRT, OP_ERF
+
+# the registers hold the function arguments, followed by the constants and the instruction results
+cdef enum:
+    ARGUMENT_REGISTERS = 3
+    REGISTER_BUFFER_SIZE = 64
+
+
+@cython.cdivision(True)
+cdef inline double _apply(int opcode, double a, double b) except? -1e999:
+    """
+    Applies an operation to the operands a and b, unary operations ignore b.
+    """
+
+    if opcode == OP_ADD:
+        return a + b
+
+    elif opcode == OP_SUBTRACT:
+        return a - b
+
+    elif opcode == OP_MULTIPLY:
+        return a * b
+
+    elif opcode == OP_DIVIDE:
+        if b == 0.0:
+            raise ZeroDivisionError("Function used as the denominator of the division returned a zero value.")
+        return a / b
+
+    elif opcode == OP_MODULO:
+        if b == 0.0:
+            raise ZeroDivisionError("Function used as the divisor of the modulo returned a zero value.")
+        return a % b
+
+    elif opcode == OP_POW:
+        if a < 0 and floor(b) != b:
+            raise ValueError("Negative base and non-integral exponent is not supported")
+        if a == 0 and b < 0:
+            raise ZeroDivisionError("0.0 cannot be raised to a negative power")
+        return a ** b
+
+    elif opcode == OP_EQUALS:
+        return a == b
+
+    elif opcode == OP_NOT_EQUALS:
+        return a != b
+
+    elif opcode == OP_LESS_THAN:
+        return a < b
+
+    elif opcode == OP_GREATER_THAN:
+        return a > b
+
+    elif opcode == OP_LESS_EQUALS:
+        return a <= b
+
+    elif opcode == OP_GREATER_EQUALS:
+        return a >= b
+
+    elif opcode == OP_ATAN4Q:
+        return cmath.atan2(a, b)
+
+    elif opcode == OP_ABS:
+        return cmath.fabs(a)
+
+    elif opcode == OP_EXP:
+        return cmath.exp(a)
+
+    elif opcode == OP_SIN:
+        return cmath.sin(a)
+
+    elif opcode == OP_COS:
+        return cmath.cos(a)
+
+    elif opcode == OP_TAN:
+        return cmath.tan(a)
+
+    elif opcode == OP_ASIN:
+        if not -1.0 <= a <= 1.0:
+            raise ValueError("The function returned a value outside of the arcsine domain of [-1, 1].")
+        return cmath.asin(a)
+
+    elif opcode == OP_ACOS:
+        if not -1.0 <= a <= 1.0:
+            raise ValueError("The function returned a value outside of the arccosine domain of [-1, 1].")
+        return cmath.acos(a)
+
+    elif opcode == OP_ATAN:
+        return cmath.atan(a)
+
+    elif opcode == OP_SQRT:
+        if a < 0:  # complex values are not supported
+            raise ValueError("Math domain error in sqrt({0}). Sqrt of a negative value is not supported.".format(a))
+        return cmath.sqrt(a)
+
+    else:
+        return cmath.erf(a)
+
+
+@cython.final
+cdef class CompiledFunction3D(Function3D):
+    """
+    Evaluates a tree of Function3D objects as a flat list of instructions.
+
+    Combining Function3D objects with operators and the cmath functions builds
+    a tree of function objects. Evaluating the tree requires a call to the
+    evaluate() method of every node. CompiledFunction3D walks the tree once and
+    flattens the arithmetic, comparison and cmath nodes into a list of
+    instructions, which is then evaluated in a single loop. Each instruction
+    reads its operands directly from the function arguments, a table of
+    constants or the results of earlier instructions. Any branch of the tree
+    that only depends on constants is folded into a single constant.
+
+    Nodes that can not be flattened, such as interpolators or wrapped Python
+    functions, remain in the tape and are called via their evaluate() method.
+    The branches of a Blend3D are compiled separately.
+
+    The compiled function returns the same values and raises the same
+    exceptions as the original function. Function3D.compile() is a shortcut
+    for creating a compiled function.
+
+    .. code-block:: pycon
+
+        >>> from raysect.core.math.function.float import Arg3D, Exp3D
+        >>>
+        >>> x = Arg3D('x')
+        >>> f = (3 * Exp3D(-(x - 2) ** 2)).compile()
+        >>> f(2, 0, 0)
+        3.0
+
+    :param object function: A Function3D object or Python callable.
+    """
+
+    def __init__(self, object function):
+
+        self._function = autowrap_function3d(function)
+
+        # operands are referenced with tuples of (register group, index) until the register layout is known
+        self._constant_list = []
+        self._instructions = []
+        self._callables = []
+        result = self._compile(self._function)
+        self._assemble(result)
+
+    def __reduce__(self):
+        return CompiledFunction3D, (self._function, )
+
+    cdef object _assemble(self, tuple result):
+        """
+        Converts the compiled instructions into the instruction arrays.
+        """
+
+        cdef:
+            int i, opcode
+            list offsets
+
+        count = len(self._instructions)
+        offsets = [0, ARGUMENT_REGISTERS, ARGUMENT_REGISTERS + len(self._constant_list)]
+
+        self._opcodes = np.empty(count, dtype=np.int32)
+        self._operands = np.zeros((count, 2), dtype=np.int32)
+        for i, (opcode, a, b) in enumerate(self._instructions):
+            self._opcodes[i] = opcode
+            if opcode == OP_CALL:
+                self._operands[i, 0] = a
+            else:
+                self._operands[i, 0] = offsets[a[0]] + a[1]
+                self._operands[i, 1] = offsets[b[0]] + b[1]
+
+        self._constants = np.array(self._constant_list, dtype=np.float64)
+        self._constant_list = None
+        self._instructions = None
+
+        self._opcodes_mv = self._opcodes
+        self._operands_mv = self._operands
+        self._constants_mv = self._constants
+        self._count = count
+        self._constant_count = len(self._constants)
+        self._register_count = offsets[2] + count
+        self._result = offsets[result[0]] + result[1]
+
+    cdef tuple _compile(self, Function3D f):
+        """
+        Appends the instructions that evaluate a function and returns the operand holding the result.
+        """
+
+        cdef type t = type(f)
+
+        # leaf nodes
+        if t is Constant3D:
+            return self._constant((<Constant3D> f)._value)
+
+        if t is Arg3D:
+            if (<Arg3D> f)._argument == X:
+                return ARGUMENT, 0
+            if (<Arg3D> f)._argument == Y:
+                return ARGUMENT, 1
+            return ARGUMENT, 2
+
+        if t is CompiledFunction3D:
+            return self._compile((<CompiledFunction3D> f)._function)
+
+        # operations between two functions
+        if t is AddFunction3D:
+            return self._binary(OP_ADD, (<AddFunction3D> f)._function1, (<AddFunction3D> f)._function2)
+
+        if t is SubtractFunction3D:
+            return self._binary(OP_SUBTRACT, (<SubtractFunction3D> f)._function1, (<SubtractFunction3D> f)._function2)
+
+        if t is MultiplyFunction3D:
+            return self._binary(OP_MULTIPLY, (<MultiplyFunction3D> f)._function1, (<MultiplyFunction3D> f)._function2)
+
+        if t is DivideFunction3D:
+            return self._binary(OP_DIVIDE, (<DivideFunction3D> f)._function1, (<DivideFunction3D> f)._function2)
+
+        if t is ModuloFunction3D:
+            return self._binary(OP_MODULO, (<ModuloFunction3D> f)._function1, (<ModuloFunction3D> f)._function2)
+
+        if t is PowFunction3D:
+            return self._binary(OP_POW, (<PowFunction3D> f)._function1, (<PowFunction3D> f)._function2)
+
+        if t is EqualsFunction3D:
+            return self._binary(OP_EQUALS, (<EqualsFunction3D> f)._function1, (<EqualsFunction3D> f)._function2)
+
+        if t is NotEqualsFunction3D:
+            return self._binary(OP_NOT_EQUALS, (<NotEqualsFunction3D> f)._function1, (<NotEqualsFunction3D> f)._function2)
+
+        if t is LessThanFunction3D:
+            return self._binary(OP_LESS_THAN, (<LessThanFunction3D> f)._function1, (<LessThanFunction3D> f)._function2)
+
+        if t is GreaterThanFunction3D:
+            return self._binary(OP_GREATER_THAN, (<GreaterThanFunction3D> f)._function1, (<GreaterThanFunction3D> f)._function2)
+
+        if t is LessEqualsFunction3D:
+            return self._binary(OP_LESS_EQUALS, (<LessEqualsFunction3D> f)._function1, (<LessEqualsFunction3D> f)._function2)
+
+        if t is GreaterEqualsFunction3D:
+            return self._binary(OP_GREATER_EQUALS, (<GreaterEqualsFunction3D> f)._function1, (<GreaterEqualsFunction3D> f)._function2)
+
+        if t is Atan4Q3D:
+            return self._binary(OP_ATAN4Q, (<Atan4Q3D> f)._numerator, (<Atan4Q3D> f)._denominator)
+
+        # operations between a scalar and a function
+        if t is AddScalar3D:
+            return self._binary(OP_ADD, Constant3D((<AddScalar3D> f)._value), (<AddScalar3D> f)._function)
+
+        if t is SubtractScalar3D:
+            return self._binary(OP_SUBTRACT, Constant3D((<SubtractScalar3D> f)._value), (<SubtractScalar3D> f)._function)
+
+        if t is MultiplyScalar3D:
+            return self._binary(OP_MULTIPLY, Constant3D((<MultiplyScalar3D> f)._value), (<MultiplyScalar3D> f)._function)
+
+        if t is DivideScalar3D:
+            return self._binary(OP_DIVIDE, Constant3D((<DivideScalar3D> f)._value), (<DivideScalar3D> f)._function)
+
+        if t is ModuloScalarFunction3D:
+            return self._binary(OP_MODULO, Constant3D((<ModuloScalarFunction3D> f)._value), (<ModuloScalarFunction3D> f)._function)
+
+        if t is ModuloFunctionScalar3D:
+            return self._binary(OP_MODULO, (<ModuloFunctionScalar3D> f)._function, Constant3D((<ModuloFunctionScalar3D> f)._value))
+
+        if t is PowScalarFunction3D:
+            return self._binary(OP_POW, Constant3D((<PowScalarFunction3D> f)._value), (<PowScalarFunction3D> f)._function)
+
+        if t is PowFunctionScalar3D:
+            return self._binary(OP_POW, (<PowFunctionScalar3D> f)._function, Constant3D((<PowFunctionScalar3D> f)._value))
+
+        if t is EqualsScalar3D:
+            return self._binary(OP_EQUALS, Constant3D((<EqualsScalar3D> f)._value), (<EqualsScalar3D> f)._function)
+
+        if t is NotEqualsScalar3D:
+            return self._binary(OP_NOT_EQUALS, Constant3D((<NotEqualsScalar3D> f)._value), (<NotEqualsScalar3D> f)._function)
+
+        if t is LessThanScalar3D:
+            return self._binary(OP_LESS_THAN, Constant3D((<LessThanScalar3D> f)._value), (<LessThanScalar3D> f)._function)
+
+        if t is GreaterThanScalar3D:
+            return self._binary(OP_GREATER_THAN, Constant3D((<GreaterThanScalar3D> f)._value), (<GreaterThanScalar3D> f)._function)
+
+        if t is LessEqualsScalar3D:
+            return self._binary(OP_LESS_EQUALS, Constant3D((<LessEqualsScalar3D> f)._value), (<LessEqualsScalar3D> f)._function)
+
+        if t is GreaterEqualsScalar3D:
+            return self._binary(OP_GREATER_EQUALS, Constant3D((<GreaterEqualsScalar3D> f)._value), (<GreaterEqualsScalar3D> f)._function)
+
+        # operations on a single function
+        if t is AbsFunction3D:
+            return self._unary(OP_ABS, (<AbsFunction3D> f)._function)
+
+        if t is Exp3D:
+            return self._unary(OP_EXP, (<Exp3D> f)._function)
+
+        if t is Sin3D:
+            return self._unary(OP_SIN, (<Sin3D> f)._function)
+
+        if t is Cos3D:
+            return self._unary(OP_COS, (<Cos3D> f)._function)
+
+        if t is Tan3D:
+            return self._unary(OP_TAN, (<Tan3D> f)._function)
+
+        if t is Asin3D:
+            return self._unary(OP_ASIN, (<Asin3D> f)._function)
+
+        if t is Acos3D:
+            return self._unary(OP_ACOS, (<Acos3D> f)._function)
+
+        if t is Atan3D:
+            return self._unary(OP_ATAN, (<Atan3D> f)._function)
+
+        if t is Sqrt3D:
+            return self._unary(OP_SQRT, (<Sqrt3D> f)._function)
+
+        if t is Erf3D:
+            return self._unary(OP_ERF, (<Erf3D> f)._function)
+
+        # the blend only evaluates the functions it requires, so its branches are compiled independently
+        if t is Blend3D:
+            return self._call(Blend3D(
+                self._compile_branch((<Blend3D> f)._f1),
+                self._compile_branch((<Blend3D> f)._f2),
+                self._compile_branch((<Blend3D> f)._mask)
+            ))
+
+        # any other function is called directly
+        return self._call(f)
+
+    cdef tuple _constant(self, double value):
+        self._constant_list.append(value)
+        return CONSTANT, len(self._constant_list) - 1
+
+    cdef tuple _call(self, Function3D f):
+        self._callables.append(f)
+        self._instructions.append((OP_CALL, len(self._callables) - 1, None))
+        return RESULT, len(self._instructions) - 1
+
+    cdef tuple _binary(self, int opcode, Function3D f1, Function3D f2):
+
+        cdef tuple a = self._compile(f1)
+        cdef tuple b = self._compile(f2)
+
+        # fold operations on constants, unless the operation raises an exception which must be raised on evaluation
+        if a[0] == CONSTANT and b[0] == CONSTANT:
+            try:
+                return self._constant(_apply(opcode, self._constant_list[a[1]], self._constant_list[b[1]]))
+            except Exception:
+                pass
+
+        self._instructions.append((opcode, a, b))
+        return RESULT, len(self._instructions) - 1
+
+    cdef tuple _unary(self, int opcode, Function3D f):
+
+        cdef tuple a = self._compile(f)
+
+        if a[0] == CONSTANT:
+            try:
+                return self._constant(_apply(opcode, self._constant_list[a[1]], 0.0))
+            except Exception:
+                pass
+
+        self._instructions.append((opcode, a, a))
+        return RESULT, len(self._instructions) - 1
+
+    cdef Function3D _compile_branch(self, Function3D f):
+
+        cdef CompiledFunction3D compiled = CompiledFunction3D(f)
+
+        # avoid wrapping functions that do not benefit from compilation
+        if compiled._count == 1 and compiled._opcodes_mv[0] == OP_CALL:
+            return compiled._callables[0]
+        return compiled
+
+    cdef double evaluate(self, double x, double y, double z) except? -1e999:
+
+        cdef:
+            double buffer[REGISTER_BUFFER_SIZE]
+            double *registers
+
+        if self._register_count <= REGISTER_BUFFER_SIZE:
+            return self._execute(x, y, z, buffer)
+
+        registers = <double *> malloc(self._register_count * sizeof(double))
+        if registers == NULL:
+            raise MemoryError()
+
+        try:
+            return self._execute(x, y, z, registers)
+        finally:
+            free(registers)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double _execute(self, double x, double y, double z, double *registers) except? -1e999:
+
+        cdef:
+            int i, opcode
+            np.int32_t *operands
+            double *results
+
+        registers[0] = x
+        registers[1] = y
+        registers[2] = z
+        for i in range(self._constant_count):
+            registers[ARGUMENT_REGISTERS + i] = self._constants_mv[i]
+
+        results = registers + ARGUMENT_REGISTERS + self._constant_count
+        for i in range(self._count):
+            opcode = self._opcodes_mv[i]
+            operands = &self._operands_mv[i, 0]
+            # the most common operations are handled inline, avoiding the dispatch in _apply()
+            if opcode == OP_ADD:
+                results[i] = registers[operands[0]] + registers[operands[1]]
+            elif opcode == OP_SUBTRACT:
+                results[i] = registers[operands[0]] - registers[operands[1]]
+            elif opcode == OP_MULTIPLY:
+                results[i] = registers[operands[0]] * registers[operands[1]]
+            elif opcode == OP_CALL:
+                results[i] = (<Function3D> self._callables[operands[0]]).evaluate(x, y, z)
+            else:
+                results[i] = _apply(opcode, registers[operands[0]], registers[operands[1]])
+
+        return registers[self._result]
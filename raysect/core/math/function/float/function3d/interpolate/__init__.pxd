@@ -28,4 +28,5 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 from raysect.core.math.function.float.function3d.interpolate.discrete3dmesh cimport Discrete3DMesh
+from raysect.core.math.function.float.function3d.interpolate.interpolator3dmesh cimport Interpolator3DMesh
 from raysect.core.math.function.float.function3d.interpolate.interpolator3darray cimport Interpolator3DArray
@@ -30,4 +30,5 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 from .discrete3dmesh import Discrete3DMesh
+from .interpolator3dmesh import Interpolator3DMesh
 from .interpolator3darray import Interpolator3DArray
@@ -31,6 +31,7 @@
 
 cimport numpy as np
 from raysect.core.boundingbox cimport BoundingBox3D
+from raysect.core.math.point cimport Point3D
 from raysect.core.math.spatial.kdtree3d cimport KDTree3DCore
 
 
@@ -50,4 +51,6 @@ cdef class MeshKDTree3D(KDTree3DCore):
         double _cached_z
         bint _cached_result
 
-    cdef BoundingBox3D _generate_bounding_box(self, np.int32_t tetrahedra)
\ No newline at end of file
+    cdef BoundingBox3D _generate_bounding_box(self, np.int32_t tetrahedra)
+
+    cdef bint _is_contained_item(self, np.int32_t tetrahedra, Point3D point)
@@ -187,42 +187,52 @@ cdef class MeshKDTree3D(KDTree3DCore):
     @cython.initializedcheck(False)
     cdef bint _is_contained_leaf(self, np.int32_t id, Point3D point):
 
-        cdef:
-            np.int32_t index, tetrahedra, i1, i2, i3, i4
-            double alpha, beta, gamma, delta
+        cdef np.int32_t index
 
         # identify the first tetrahedra that contains the point, if any
         for index in range(self._nodes[id].count):
+            if self._is_contained_item(self._nodes[id].items[index], point):
+                return True
 
-            # obtain vertex indices
-            tetrahedra = self._nodes[id].items[index]
-            i1 = self._tetrahedra_mv[tetrahedra, V1]
-            i2 = self._tetrahedra_mv[tetrahedra, V2]
-            i3 = self._tetrahedra_mv[tetrahedra, V3]
-            i4 = self._tetrahedra_mv[tetrahedra, V4]
-
-            barycentric_coords_tetra(self._vertices_mv[i1, X], self._vertices_mv[i1, Y], self._vertices_mv[i1, Z],
-                                     self._vertices_mv[i2, X], self._vertices_mv[i2, Y], self._vertices_mv[i2, Z],
-                                     self._vertices_mv[i3, X], self._vertices_mv[i3, Y], self._vertices_mv[i3, Z],
-                                     self._vertices_mv[i4, X], self._vertices_mv[i4, Y], self._vertices_mv[i4, Z],
-                                     point.x, point.y, point.z, &alpha, &beta, &gamma, &delta)
-
-            if barycentric_inside_tetrahedra(alpha, beta, gamma, delta):
-
-                # store id of tetrahedra hit
-                self.tetrahedra_id = tetrahedra
-
-                # store vertex indices and barycentric coords
-                self.i1 = i1
-                self.i2 = i2
-                self.i3 = i3
-                self.i4 = i4
-                self.alpha = alpha
-                self.beta = beta
-                self.gamma = gamma
-                self.delta = delta
+        return False
 
-                return True
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef bint _is_contained_item(self, np.int32_t tetrahedra, Point3D point):
+
+        cdef:
+            np.int32_t i1, i2, i3, i4
+            double alpha, beta, gamma, delta
+
+        # obtain vertex indices
+        i1 = self._tetrahedra_mv[tetrahedra, V1]
+        i2 = self._tetrahedra_mv[tetrahedra, V2]
+        i3 = self._tetrahedra_mv[tetrahedra, V3]
+        i4 = self._tetrahedra_mv[tetrahedra, V4]
+
+        barycentric_coords_tetra(self._vertices_mv[i1, X], self._vertices_mv[i1, Y], self._vertices_mv[i1, Z],
+                                 self._vertices_mv[i2, X], self._vertices_mv[i2, Y], self._vertices_mv[i2, Z],
+                                 self._vertices_mv[i3, X], self._vertices_mv[i3, Y], self._vertices_mv[i3, Z],
+                                 self._vertices_mv[i4, X], self._vertices_mv[i4, Y], self._vertices_mv[i4, Z],
+                                 point.x, point.y, point.z, &alpha, &beta, &gamma, &delta)
+
+        if barycentric_inside_tetrahedra(alpha, beta, gamma, delta):
+
+            # store id of tetrahedra hit
+            self.tetrahedra_id = tetrahedra
+
+            # store vertex indices and barycentric coords
+            self.i1 = i1
+            self.i2 = i2
+            self.i3 = i3
+            self.i4 = i4
+            self.alpha = alpha
+            self.beta = beta
+            self.gamma = gamma
+            self.delta = delta
+
+            return True
 
         return False
 
@@ -238,7 +248,11 @@ cdef class MeshKDTree3D(KDTree3DCore):
         if self._cache_available and point.x == self._cached_x and point.y == self._cached_y and point.z == self._cached_z:
             return self._cached_result
 
-        result = self._is_contained(point)
+        # sequential lookups usually land in the tetrahedra found by the previous lookup, test it before the kd-tree
+        if self._cache_available and self._cached_result and self._is_contained_item(self.tetrahedra_id, point):
+            result = True
+        else:
+            result = self._is_contained(point)
 
         # add cache
         self._cache_available = True
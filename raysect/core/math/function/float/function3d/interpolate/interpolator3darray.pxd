@@ -30,6 +30,7 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 from raysect.core.math.function.float.function3d cimport Function3D
+cimport cython
 cimport numpy as np
 
 
@@ -43,26 +44,41 @@ cdef class Interpolator3DArray(Function3D):
     cdef:
         np.ndarray x, y, z, f
         double[::1] _x_mv, _y_mv, _z_mv
-        double [:, :, ::1] _f_mv
         _Interpolator3D _interpolator
         _Extrapolator3D _extrapolator
         int _last_index_x, _last_index_y, _last_index_z
         double _extrapolation_range_x, _extrapolation_range_y, _extrapolation_range_z
+        int _spacing_x, _spacing_y, _spacing_z
+        double _scale_x, _scale_y, _scale_z
+        int _hint_x, _hint_y, _hint_z
+        str _cache_type
+        int _cache_size
 
     cdef double evaluate(self, double px, double py, double pz) except? -1e999
 
+    cdef double _evaluate_gradient(self, double px, double py, double pz, double[3] gradient) except? -1e999
+
+    cdef object _create_interpolator(self, str interpolation_type, str extrapolation_type)
+
 
 cdef class _Interpolator3D:
 
     cdef:
         double [::1] _x, _y, _z
-        double [:, :, ::1] _f
+        const double [:, :, ::1] _f
+        const float [:, :, ::1] _f32
+        bint _float32
         int _last_index_x, _last_index_y, _last_index_z
 
+    @cython.final
+    cdef inline double _value(self, int ix, int iy, int iz)
+
     cdef double evaluate(self, double px, double py, double pz, int index_x, int index_y, int index_z) except? -1e999
 
     cdef double analytic_gradient(self, double px, double py, double pz, int index_x, int index_y, int index_z, int order_x, int order_y, int order_z)
 
+    cdef double evaluate_gradient(self, double px, double py, double pz, int index_x, int index_y, int index_z, double[3] gradient) except? -1e999
+
 
 cdef class _Interpolator3DLinear(_Interpolator3D):
 
@@ -79,23 +95,32 @@ cdef class _Interpolator3DLinear(_Interpolator3D):
 cdef class _Interpolator3DCubic(_Interpolator3D):
 
     cdef:
+        int _cache_mode
         np.uint8_t[:, :, ::1] _calculated
         double[:, :, :, :, :, ::1] _a
+        np.int64_t[::1] _cache_keys, _cache_stamps
+        np.int64_t _cache_clock
+        int _cache_sets
+        double[:, :, :, ::1] _cache
         _ArrayDerivative3D _array_derivative
 
     cdef _cache_coefficients(self, int index_x, int index_y, int index_z, double[4][4][4] a)
+    cdef _lookup_coefficients(self, int index_x, int index_y, int index_z, double[4][4][4] a)
+    cdef _calculate_coefficients(self, int index_x, int index_y, int index_z, double[4][4][4] a)
 
 
 cdef class _Extrapolator3D:
 
     cdef:
         double [::1] _x, _y, _z
-        double [:, :, ::1] _f
         _Interpolator3D _interpolator
         int _last_index_x, _last_index_y, _last_index_z
         double _extrapolation_range_x, _extrapolation_range_y, _extrapolation_range_z
 
     cdef double evaluate(self, double px, double py, double pz, int index_x, int index_y, int index_z) except? -1e999
+    cdef double evaluate_gradient(self, double px, double py, double pz, int index_x, int index_y, int index_z, double[3] gradient) except? -1e999
+    cdef int _evaluate_gradient_edge(self, double px, double py, double pz, int index_x, int index_y, int index_z, int edge_x_index, int edge_y_index, int edge_z_index, int edge_mask, double[3] gradient) except -1
+    cdef double _edge_derivative(self, double px, double py, double pz, int index_x, int index_y, int index_z, int order_mask) except? -1e999
     cdef double _evaluate_edge_x(self, double px, double py, double pz, int index_x, int index_y, int index_z, int edge_x_index, int edge_y_index, int edge_z_index) except? -1e999
     cdef double _evaluate_edge_y(self, double px, double py, double pz, int index_x, int index_y, int index_z, int edge_x_index, int edge_y_index, int edge_z_index) except? -1e999
     cdef double _evaluate_edge_z(self, double px, double py, double pz, int index_x, int index_y, int index_z, int edge_x_index, int edge_y_index, int edge_z_index) except? -1e999
@@ -117,9 +142,14 @@ cdef class _ArrayDerivative3D:
 
     cdef:
         double [::1] _x, _y, _z
-        double [:, :, ::1] _f
+        const double [:, :, ::1] _f
+        const float [:, :, ::1] _f32
+        bint _float32
         int _last_index_x, _last_index_y, _last_index_z
 
+    @cython.final
+    cdef inline double _value(self, int ix, int iy, int iz)
+
     cdef double evaluate_df_dx(self, int index_x, int index_y, int index_z, bint rescale_norm_x) except? -1e999
     cdef double _derivative_dfdx(self, int lower_index_x, int slice_index_y, int slice_index_z) except? -1e999
     cdef double _derivative_dfdx_edge(self, int lower_index_x, int slice_index_y, int slice_index_z) except? -1e999
@@ -32,8 +32,8 @@
 import numpy as np
 from libc.math cimport fabs
 cimport cython
-from raysect.core.math.cython.utility cimport find_index
-from raysect.core.math.cython.interpolation.linear cimport linear3d
+from raysect.core.math.cython.utility cimport find_index_spaced, find_spacing
+from raysect.core.math.cython.interpolation.linear cimport linear1d
 from raysect.core.math.cython.interpolation.cubic cimport calc_coefficients_3d, evaluate_cubic_3d
 
 
@@ -43,6 +43,16 @@ FACTORIAL[1] = 1.
 FACTORIAL[2] = 2.
 FACTORIAL[3] = 6.
 
+# cubic coefficient cache policies
+cdef enum:
+    CACHE_LAZY = 0
+    CACHE_LRU = 1
+    CACHE_EAGER = 2
+    CACHE_NONE = 3
+
+# the number of cells in each set of the bounded (lru) coefficient cache
+cdef const int CACHE_WAYS = 4
+
 
 @cython.cdivision(True)
 cdef double rescale_lower_normalisation(double dfdn, double x_lower, double x, double x_upper):
@@ -104,6 +114,11 @@ cdef class Interpolator3DArray(Function3D):
     The resulting Numpy arrays are stored as read only. I.e. `writeable` flag of self.x, self.y, self.z and self.f
     is set to False. Alteration of the flag may result in unwanted behaviour.
 
+    The data array is copied unless it is a read only, C contiguous array of the storage type, such as a numpy
+    memmap opened in read only mode. Such arrays are used directly, so a large data set mapped from disk is shared by
+    all the processes of a render rather than copied into the memory of each process. The data may be stored in
+    single precision to halve the memory required, the interpolation is always calculated in double precision.
+
     :param object x: 1D array-like object of real values storing the x spline knot positions.
     :param object y: 1D array-like object of real values storing the y spline knot positions.
     :param object z: 1D array-like object of real values storing the z spline knot positions.
@@ -124,6 +139,20 @@ cdef class Interpolator3DArray(Function3D):
     :param double extrapolation_range_z: Limits the range where extrapolation is permitted. Requesting data beyond the
         extrapolation range results in ValueError. Extrapolation range will be applied as padding symmetrically to both
         ends of the interpolation range (z).
+    :param str cache_type: The storage policy for the cubic polynomial coefficients of each cell (default='lazy').
+        Options are:
+        `lazy`: Coefficients are calculated on first use and stored. Storage for every cell (512 bytes per cell) is
+        allocated on construction.
+        `lru`: Coefficients are stored in a bounded cache holding up to cache_size cells, the least recently used
+        cells are discarded.
+        `eager`: Coefficients of every cell are calculated on construction. The coefficient array is not modified
+        during evaluation, so it remains shared by processes forked by a render engine.
+        `none`: Coefficients are recalculated for every evaluation, no storage is required.
+        The cache type has no effect on linear interpolation.
+    :param int cache_size: The maximum number of cells held by the `lru` cache (default=65536).
+    :param str storage_type: The precision used to store the data array (default='float64'). Options are:
+        `float64`: The data is stored in double precision.
+        `float32`: The data is stored in single precision.
 
     .. code-block:: python
 
@@ -153,12 +182,23 @@ cdef class Interpolator3DArray(Function3D):
     """
 
     def __init__(self, object x, object y, object z, object f, str interpolation_type, str extrapolation_type,
-                 double extrapolation_range_x, double extrapolation_range_y, double extrapolation_range_z):
+                 double extrapolation_range_x, double extrapolation_range_y, double extrapolation_range_z,
+                 str cache_type='lazy', int cache_size=65536, str storage_type='float64'):
+
+        # Check the requested storage type exists.
+        storage_type = storage_type.lower()
+        if storage_type not in id_to_storage:
+            raise ValueError(f'Storage type {storage_type} not found. Options are {id_to_storage.keys()}.')
 
         x = np.array(x, dtype=np.float64, order='c')
         y = np.array(y, dtype=np.float64, order='c')
         z = np.array(z, dtype=np.float64, order='c')
-        f = np.array(f, dtype=np.float64, order='c')
+
+        # read only data that does not require conversion, e.g. a read only memmap, can not change and is not copied
+        if isinstance(f, np.ndarray) and not f.flags.writeable and f.flags.c_contiguous and f.dtype == id_to_storage[storage_type]:
+            f = f.view(np.ndarray)
+        else:
+            f = np.array(f, dtype=id_to_storage[storage_type], order='c')
 
         # extrapolation_ranges must be greater than or equal to 0.
         if extrapolation_range_x < 0:
@@ -220,7 +260,11 @@ cdef class Interpolator3DArray(Function3D):
         self._x_mv = x
         self._y_mv = y
         self._z_mv = z
-        self._f_mv = f
+
+        # uniformly spaced knots permit the bins to be located without a search
+        self._spacing_x = find_spacing(self._x_mv, &self._scale_x)
+        self._spacing_y = find_spacing(self._y_mv, &self._scale_y)
+        self._spacing_z = find_spacing(self._z_mv, &self._scale_z)
 
         # prevent users being able to change the data arrays
         x.flags.writeable = False
@@ -253,11 +297,32 @@ cdef class Interpolator3DArray(Function3D):
             raise ValueError(
                 f'Extrapolation type {extrapolation_type} not compatible with interpolation type {interpolation_type}.')
 
+        # Check the requested cache type exists.
+        cache_type = cache_type.lower()
+        if cache_type not in id_to_cache:
+            raise ValueError(f'Cache type {cache_type} not found. Options are {id_to_cache.keys()}.')
+
+        if cache_size < 1:
+            raise ValueError('The cache size must be greater than 0.')
+
+        self._cache_type = cache_type
+        self._cache_size = cache_size
+
         # Create the interpolator and extrapolator objects.
-        self._interpolator = id_to_interpolator[interpolation_type](self._x_mv, self._y_mv, self._z_mv, self._f_mv)
+        self._create_interpolator(interpolation_type, extrapolation_type)
+
+    cdef object _create_interpolator(self, str interpolation_type, str extrapolation_type):
+
+        if interpolation_type == _Interpolator3DCubic.ID:
+            self._interpolator = _Interpolator3DCubic(
+                self._x_mv, self._y_mv, self._z_mv, self.f, self._cache_type, self._cache_size
+            )
+        else:
+            self._interpolator = id_to_interpolator[interpolation_type](self._x_mv, self._y_mv, self._z_mv, self.f)
+
         self._extrapolator = id_to_extrapolator[extrapolation_type](
-            self._x_mv, self._y_mv, self._z_mv, self._f_mv, self._interpolator, extrapolation_range_x,
-            extrapolation_range_y, extrapolation_range_z
+            self._x_mv, self._y_mv, self._z_mv, self._interpolator,
+            self._extrapolation_range_x, self._extrapolation_range_y, self._extrapolation_range_z
         )
 
     def __getstate__(self):
@@ -265,7 +330,8 @@ cdef class Interpolator3DArray(Function3D):
             self.x, self.y, self.z, self.f,
             self._interpolator.ID, self._extrapolator.ID,
             self._last_index_x, self._last_index_y, self._last_index_z,
-            self._extrapolation_range_x, self._extrapolation_range_y, self._extrapolation_range_z
+            self._extrapolation_range_x, self._extrapolation_range_y, self._extrapolation_range_z,
+            self._cache_type, self._cache_size
         )
 
     def __setstate__(self, state):
@@ -275,18 +341,18 @@ cdef class Interpolator3DArray(Function3D):
             self.x, self.y, self.z, self.f,
             interpolation_type, extrapolation_type,
             self._last_index_x, self._last_index_y, self._last_index_z,
-            self._extrapolation_range_x, self._extrapolation_range_y, self._extrapolation_range_z
+            self._extrapolation_range_x, self._extrapolation_range_y, self._extrapolation_range_z,
+            self._cache_type, self._cache_size
         ) = state
 
         # Rebuild memory views.
-        self._x_mv, self._y_mv, self._z_mv, self._f_mv = self.x, self.y, self.z, self.f
+        self._x_mv, self._y_mv, self._z_mv = self.x, self.y, self.z
+        self._spacing_x = find_spacing(self._x_mv, &self._scale_x)
+        self._spacing_y = find_spacing(self._y_mv, &self._scale_y)
+        self._spacing_z = find_spacing(self._z_mv, &self._scale_z)
 
         # Recreate the interpolator and extrapolator objects.
-        self._interpolator = id_to_interpolator[interpolation_type](self._x_mv, self._y_mv, self._z_mv, self._f_mv)
-        self._extrapolator = id_to_extrapolator[extrapolation_type](
-            self._x_mv, self._y_mv, self._z_mv, self._f_mv, self._interpolator,
-            self._extrapolation_range_x, self._extrapolation_range_y, self._extrapolation_range_z
-        )
+        self._create_interpolator(interpolation_type, extrapolation_type)
 
     def __reduce__(self):
         return self.__new__, (self.__class__, ), self.__getstate__()
@@ -311,9 +377,9 @@ cdef class Interpolator3DArray(Function3D):
         """
 
         # Find index assuming the grid is the same in x, y and z
-        cdef int index_x = find_index(self._x_mv, px)
-        cdef int index_y = find_index(self._y_mv, py)
-        cdef int index_z = find_index(self._z_mv, pz)
+        cdef int index_x = find_index_spaced(self._x_mv, px, self._spacing_x, self._scale_x, &self._hint_x)
+        cdef int index_y = find_index_spaced(self._y_mv, py, self._spacing_y, self._scale_y, &self._hint_y)
+        cdef int index_z = find_index_spaced(self._z_mv, pz, self._spacing_z, self._scale_z, &self._hint_z)
         cdef int index_lower_x = to_cell_index(index_x, self._last_index_x)
         cdef int index_lower_y = to_cell_index(index_y, self._last_index_y)
         cdef int index_lower_z = to_cell_index(index_z, self._last_index_z)
@@ -325,6 +391,108 @@ cdef class Interpolator3DArray(Function3D):
             return self._extrapolator.evaluate(px, py, pz, index_x, index_y, index_z)
         return self._interpolator.evaluate(px, py, pz, index_lower_x, index_lower_y, index_lower_z)
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double _evaluate_gradient(self, double px, double py, double pz, double[3] gradient) except? -1e999:
+        """
+        Evaluates the interpolating function and its gradient.
+
+        The spline knot search is performed once and shared by the value and
+        gradient calculations. Dispatch to the interpolator or extrapolator
+        follows evaluate().
+
+        :param double px: the point for which an interpolated value is required.
+        :param double py: the point for which an interpolated value is required.
+        :param double pz: the point for which an interpolated value is required.
+        :param double[3] gradient: array that receives df/dx, df/dy and df/dz.
+        :return: the interpolated value at point x, y, z.
+        """
+
+        cdef int index_x = find_index_spaced(self._x_mv, px, self._spacing_x, self._scale_x, &self._hint_x)
+        cdef int index_y = find_index_spaced(self._y_mv, py, self._spacing_y, self._scale_y, &self._hint_y)
+        cdef int index_z = find_index_spaced(self._z_mv, pz, self._spacing_z, self._scale_z, &self._hint_z)
+        cdef int index_lower_x = to_cell_index(index_x, self._last_index_x)
+        cdef int index_lower_y = to_cell_index(index_y, self._last_index_y)
+        cdef int index_lower_z = to_cell_index(index_z, self._last_index_z)
+        cdef bint outside_domain_x = index_x == -1 or (index_x == self._last_index_x and px != self._x_mv[self._last_index_x])
+        cdef bint outside_domain_y = index_y == -1 or (index_y == self._last_index_y and py != self._y_mv[self._last_index_y])
+        cdef bint outside_domain_z = index_z == -1 or (index_z == self._last_index_z and pz != self._z_mv[self._last_index_z])
+
+        if outside_domain_x or outside_domain_y or outside_domain_z:
+            return self._extrapolator.evaluate_gradient(px, py, pz, index_x, index_y, index_z, gradient)
+        return self._interpolator.evaluate_gradient(px, py, pz, index_lower_x, index_lower_y, index_lower_z, gradient)
+
+    def evaluate_gradient(self, double x, double y, double z):
+        """
+        Evaluates the interpolating function and its gradient at a point.
+
+        The value and the analytic gradient of the interpolant are calculated
+        together, so the spline knot search and the cubic coefficients are
+        only computed once.
+
+        :param float x: The x coordinate.
+        :param float y: The y coordinate.
+        :param float z: The z coordinate.
+        :return: A tuple of (f, df/dx, df/dy, df/dz).
+        :rtype: tuple
+        """
+
+        cdef:
+            double f
+            double[3] gradient
+
+        f = self._evaluate_gradient(x, y, z, gradient)
+        return f, gradient[0], gradient[1], gradient[2]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    def evaluate_gradient_array(self, object x, object y, object z):
+        """
+        Evaluates the interpolating function and its gradient at an array of points.
+
+        The coordinate arrays are broadcast against each other following the
+        numpy broadcasting rules and every point is evaluated in a single
+        compiled loop.
+
+        :param object x: An array of x coordinates.
+        :param object y: An array of y coordinates.
+        :param object z: An array of z coordinates.
+        :return: A tuple of arrays (f, df/dx, df/dy, df/dz) with the broadcast shape of the coordinate arrays.
+        :rtype: tuple
+        """
+
+        cdef:
+            const double[::1] x_mv, y_mv, z_mv
+            double[::1] f_mv, dfdx_mv, dfdy_mv, dfdz_mv
+            double[3] gradient
+            Py_ssize_t i
+
+        # broadcast the coordinate arrays to a common shape
+        x, y, z = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64), np.asarray(z, dtype=np.float64))
+        shape = x.shape
+        x_mv = np.ascontiguousarray(x).ravel()
+        y_mv = np.ascontiguousarray(y).ravel()
+        z_mv = np.ascontiguousarray(z).ravel()
+
+        f = np.empty(x_mv.shape[0], dtype=np.float64)
+        dfdx = np.empty(x_mv.shape[0], dtype=np.float64)
+        dfdy = np.empty(x_mv.shape[0], dtype=np.float64)
+        dfdz = np.empty(x_mv.shape[0], dtype=np.float64)
+        f_mv = f
+        dfdx_mv = dfdx
+        dfdy_mv = dfdy
+        dfdz_mv = dfdz
+
+        for i in range(f_mv.shape[0]):
+            f_mv[i] = self._evaluate_gradient(x_mv[i], y_mv[i], z_mv[i], gradient)
+            dfdx_mv[i] = gradient[0]
+            dfdy_mv[i] = gradient[1]
+            dfdz_mv[i] = gradient[2]
+
+        return f.reshape(shape), dfdx.reshape(shape), dfdy.reshape(shape), dfdz.reshape(shape)
+
     @property
     def domain(self):
         """
@@ -341,21 +509,38 @@ cdef class _Interpolator3D:
     :param x: 1D memory view of the spline point x positions.
     :param y: 1D memory view of the spline point y positions.
     :param z: 1D memory view of the spline point y positions.
-    :param f: 3D memory view of the function value at spline point x, y, z positions.
+    :param f: 3D array of the function value at spline point x, y, z positions, stored as float64 or float32.
     """
 
     ID = None
 
-    def __init__(self, double[::1] x, double[::1] y, double[::1] z, double[:, :, ::1] f):
+    def __init__(self, double[::1] x, double[::1] y, double[::1] z, np.ndarray f):
 
         self._x = x
         self._y = y
         self._z = z
-        self._f = f
+        self._float32 = f.dtype == np.float32
+        if self._float32:
+            self._f32 = f
+        else:
+            self._f = f
         self._last_index_x = self._x.shape[0] - 1
         self._last_index_y = self._y.shape[0] - 1
         self._last_index_z = self._z.shape[0] - 1
 
+    @cython.final
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef inline double _value(self, int ix, int iy, int iz):
+        """
+        Returns the function value at a spline knot in double precision.
+        """
+
+        if self._float32:
+            return self._f32[ix, iy, iz]
+        return self._f[ix, iy, iz]
+
     cdef double evaluate(self, double px, double py, double pz, int index_x, int index_y, int index_z) except? -1e999:
         """
         Calculates interpolated value at a requested point.
@@ -383,6 +568,32 @@ cdef class _Interpolator3D:
 
         raise NotImplementedError('_Interpolator is an abstract base class.')
 
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double evaluate_gradient(self, double px, double py, double pz, int index_x, int index_y, int index_z, double[3] gradient) except? -1e999:
+        """
+        Calculates the interpolated value and its gradient at a requested point.
+
+        The normalised first derivatives from analytic_gradient() are rescaled by the cell widths. Subclasses may
+        override this to share work between the value and the gradient.
+
+        :param double px: the x position of the point for which an interpolated value is required.
+        :param double py: the y position of the point for which an interpolated value is required.
+        :param double pz: the z position of the point for which an interpolated value is required.
+        :param int index_x: the lower index of the bin containing point px. (Result of bisection search).
+        :param int index_y: the lower index of the bin containing point py. (Result of bisection search).
+        :param int index_z: the lower index of the bin containing point pz. (Result of bisection search).
+        :param double[3] gradient: array that receives df/dx, df/dy and df/dz.
+        :return: the interpolated value.
+        """
+
+        gradient[0] = self.analytic_gradient(px, py, pz, index_x, index_y, index_z, 1, 0, 0) / (self._x[index_x + 1] - self._x[index_x])
+        gradient[1] = self.analytic_gradient(px, py, pz, index_x, index_y, index_z, 0, 1, 0) / (self._y[index_y + 1] - self._y[index_y])
+        gradient[2] = self.analytic_gradient(px, py, pz, index_x, index_y, index_z, 0, 0, 1) / (self._z[index_z + 1] - self._z[index_z])
+        return self.evaluate(px, py, pz, index_x, index_y, index_z)
+
 
 cdef class _Interpolator3DLinear(_Interpolator3D):
     """
@@ -401,13 +612,24 @@ cdef class _Interpolator3DLinear(_Interpolator3D):
     @cython.initializedcheck(False)
     cdef double evaluate(self, double px, double py, double pz, int index_x, int index_y, int index_z) except? -1e999:
 
-        return linear3d(
-            self._x[index_x], self._x[index_x + 1],
-            self._y[index_y], self._y[index_y + 1],
-            self._z[index_z], self._z[index_z + 1],
-            self._f[index_x:index_x + 2, index_y:index_y + 2, index_z:index_z + 2],
-            px, py, pz
-        )
+        cdef:
+            double x0 = self._x[index_x], x1 = self._x[index_x + 1]
+            double y0 = self._y[index_y], y1 = self._y[index_y + 1]
+            double z0 = self._z[index_z], z1 = self._z[index_z + 1]
+            double k00, k01, k10, k11, m0, m1
+
+        # interpolate along x
+        k00 = linear1d(x0, x1, self._value(index_x, index_y, index_z), self._value(index_x + 1, index_y, index_z), px)
+        k01 = linear1d(x0, x1, self._value(index_x, index_y, index_z + 1), self._value(index_x + 1, index_y, index_z + 1), px)
+        k10 = linear1d(x0, x1, self._value(index_x, index_y + 1, index_z), self._value(index_x + 1, index_y + 1, index_z), px)
+        k11 = linear1d(x0, x1, self._value(index_x, index_y + 1, index_z + 1), self._value(index_x + 1, index_y + 1, index_z + 1), px)
+
+        # interpolate along y
+        m0 = linear1d(y0, y1, k00, k10, py)
+        m1 = linear1d(y0, y1, k01, k11, py)
+
+        # interpolate along z
+        return linear1d(z0, z1, m0, m1, pz)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -515,7 +737,7 @@ cdef class _Interpolator3DLinear(_Interpolator3D):
         :param int iz: the lower index of the bin containing point pz (result of bisection search).
         """
 
-        return self._f[ix, iy, iz]
+        return self._value(ix, iy, iz)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -527,7 +749,7 @@ cdef class _Interpolator3DLinear(_Interpolator3D):
         See _calculate_a0 for a full description.
         """
 
-        return -self._f[ix, iy, iz] + self._f[ix + 1, iy, iz]
+        return -self._value(ix, iy, iz) + self._value(ix + 1, iy, iz)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -539,7 +761,7 @@ cdef class _Interpolator3DLinear(_Interpolator3D):
         See _calculate_a0 for a full description.
         """
 
-        return -self._f[ix, iy, iz] + self._f[ix, iy + 1, iz]
+        return -self._value(ix, iy, iz) + self._value(ix, iy + 1, iz)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -551,7 +773,7 @@ cdef class _Interpolator3DLinear(_Interpolator3D):
         See _calculate_a0 for a full description.
         """
 
-        return -self._f[ix, iy, iz] + self._f[ix, iy, iz + 1]
+        return -self._value(ix, iy, iz) + self._value(ix, iy, iz + 1)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -563,8 +785,8 @@ cdef class _Interpolator3DLinear(_Interpolator3D):
         See _calculate_a0 for a full description.
         """
 
-        return self._f[ix, iy, iz] - self._f[ix, iy + 1, iz] \
-               - self._f[ix + 1, iy, iz] + self._f[ix + 1, iy + 1, iz]
+        return self._value(ix, iy, iz) - self._value(ix, iy + 1, iz) \
+               - self._value(ix + 1, iy, iz) + self._value(ix + 1, iy + 1, iz)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -575,8 +797,8 @@ cdef class _Interpolator3DLinear(_Interpolator3D):
 
         See _calculate_a0 for a full description.
         """
-        return self._f[ix, iy, iz] - self._f[ix, iy, iz + 1] \
-               - self._f[ix + 1, iy, iz] + self._f[ix + 1, iy, iz + 1]
+        return self._value(ix, iy, iz) - self._value(ix, iy, iz + 1) \
+               - self._value(ix + 1, iy, iz) + self._value(ix + 1, iy, iz + 1)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -587,8 +809,8 @@ cdef class _Interpolator3DLinear(_Interpolator3D):
 
         See _calculate_a0 for a full description.
         """
-        return self._f[ix, iy, iz] - self._f[ix, iy, iz + 1] \
-               - self._f[ix, iy + 1, iz] + self._f[ix, iy + 1, iz + 1]
+        return self._value(ix, iy, iz) - self._value(ix, iy, iz + 1) \
+               - self._value(ix, iy + 1, iz) + self._value(ix, iy + 1, iz + 1)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -599,10 +821,10 @@ cdef class _Interpolator3DLinear(_Interpolator3D):
 
         See _calculate_a0 for a full description.
         """
-        return - self._f[ix, iy, iz] + self._f[ix, iy, iz + 1] \
-               + self._f[ix, iy + 1, iz] - self._f[ix, iy + 1, iz + 1] \
-               + self._f[ix + 1, iy, iz] - self._f[ix + 1, iy, iz + 1] \
-               - self._f[ix + 1, iy + 1, iz] + self._f[ix + 1, iy + 1, iz + 1]
+        return - self._value(ix, iy, iz) + self._value(ix, iy, iz + 1) \
+               + self._value(ix, iy + 1, iz) - self._value(ix, iy + 1, iz + 1) \
+               + self._value(ix + 1, iy, iz) - self._value(ix + 1, iy, iz + 1) \
+               - self._value(ix + 1, iy + 1, iz) + self._value(ix + 1, iy + 1, iz + 1)
 
 
 cdef class _Interpolator3DCubic(_Interpolator3D):
@@ -613,24 +835,65 @@ cdef class _Interpolator3DCubic(_Interpolator3D):
     d2f/dxdz , d2f/dydz and d3f/dxdydz at the neighbouring spline knots using _ArrayDerivative3D object.
     The polynomial coefficients and gradients are calculated between each spline knots in a unit square.
 
+    The storage of the coefficients is controlled by the cache type, see Interpolator3DArray for the options.
+
     :param x: 1D memory view of the spline point x positions.
     :param y: 1D memory view of the spline point y positions.
     :param z: 1D memory view of the spline point z positions.
-    :param f: 3D memory view of the function value at spline point x, y, z positions.
+    :param f: 3D array of the function value at spline point x, y, z positions, stored as float64 or float32.
+    :param str cache_type: The coefficient cache policy (default='lazy').
+    :param int cache_size: The maximum number of cells held by the lru cache (default=65536).
     """
 
     ID = 'cubic'
 
-    def __init__(self, double[::1] x, double[::1] y, double[::1] z, double[:, :, ::1] f):
+    def __init__(self, double[::1] x, double[::1] y, double[::1] z, np.ndarray f, str cache_type='lazy', int cache_size=65536):
+
+        cdef:
+            int i, j, k, index_x, index_y, index_z
+            double[4][4][4] a
 
         super().__init__(x, y, z, f)
+        self._array_derivative = _ArrayDerivative3D(self._x, self._y, self._z, f)
+
+        if cache_type not in id_to_cache:
+            raise ValueError(f'Cache type {cache_type} not found. Options are {id_to_cache.keys()}.')
 
-        # where the spline coefficients (a) have been calculated the value is set to 1, 0 otherwise
-        self._calculated = np.zeros((self._last_index_x, self._last_index_y, self._last_index_z), dtype=np.uint8)
+        if cache_size < 1:
+            raise ValueError('The cache size must be greater than 0.')
 
-        # Store the cubic spline coefficients, where increasing index values are the coefficients for the coefficients of higher powers of x, y, z in the last 3 dimensions.
-        self._a = np.zeros((self._last_index_x, self._last_index_y, self._last_index_z, 4, 4, 4), dtype=np.float64)
-        self._array_derivative = _ArrayDerivative3D(self._x, self._y, self._z, self._f)
+        self._cache_mode = id_to_cache[cache_type]
+
+        if self._cache_mode == CACHE_LAZY:
+
+            # where the spline coefficients (a) have been calculated the value is set to 1, 0 otherwise
+            self._calculated = np.zeros((self._last_index_x, self._last_index_y, self._last_index_z), dtype=np.uint8)
+
+            # Store the cubic spline coefficients, where increasing index values are the coefficients for the coefficients of higher powers of x, y, z in the last 3 dimensions.
+            self._a = np.zeros((self._last_index_x, self._last_index_y, self._last_index_z, 4, 4, 4), dtype=np.float64)
+
+        elif self._cache_mode == CACHE_EAGER:
+
+            # the coefficients of every cell are calculated up front, evaluation only reads the array
+            self._a = np.empty((self._last_index_x, self._last_index_y, self._last_index_z, 4, 4, 4), dtype=np.float64)
+            for index_x in range(self._last_index_x):
+                for index_y in range(self._last_index_y):
+                    for index_z in range(self._last_index_z):
+                        self._calculate_coefficients(index_x, index_y, index_z, a)
+                        for i in range(4):
+                            for j in range(4):
+                                for k in range(4):
+                                    self._a[index_x, index_y, index_z, i, j, k] = a[i][j][k]
+
+        elif self._cache_mode == CACHE_LRU:
+
+            # a set associative cache, each cell maps to a set of CACHE_WAYS slots
+            cache_size = min(cache_size, self._last_index_x * self._last_index_y * self._last_index_z)
+            self._cache_sets = (cache_size + CACHE_WAYS - 1) // CACHE_WAYS
+            self._cache_keys = np.full(self._cache_sets * CACHE_WAYS, -1, dtype=np.int64)
+            self._cache_stamps = np.zeros(self._cache_sets * CACHE_WAYS, dtype=np.int64)
+            self._cache = np.empty((self._cache_sets * CACHE_WAYS, 4, 4, 4), dtype=np.float64)
+            self._cache_clock = 0
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -665,96 +928,172 @@ cdef class _Interpolator3DCubic(_Interpolator3D):
         :param double[4][4][4] a: The coefficients of the tricubic equation.
         """
 
-        cdef double[2][2][2] f, dfdx, dfdy, dfdz, d2fdxdy, d2fdxdz, d2fdydz, d3fdxdydz
         cdef int i, j, k
 
-        # Calculate the coefficients (and gradients at each spline point) if they dont exist
-        if not self._calculated[index_x, index_y, index_z]:
-
-            f[0][0][0] = self._f[index_x, index_y, index_z]
-            f[0][1][0] = self._f[index_x, index_y + 1, index_z]
-            f[0][1][1] = self._f[index_x, index_y + 1, index_z + 1]
-            f[0][0][1] = self._f[index_x, index_y, index_z + 1]
-            f[1][0][0] = self._f[index_x + 1, index_y, index_z]
-            f[1][1][0] = self._f[index_x + 1, index_y + 1, index_z]
-            f[1][0][1] = self._f[index_x + 1, index_y, index_z + 1]
-            f[1][1][1] = self._f[index_x + 1, index_y + 1, index_z + 1]
-
-            dfdx[0][0][0] = self._array_derivative.evaluate_df_dx(index_x, index_y, index_z, False)
-            dfdx[0][1][0] = self._array_derivative.evaluate_df_dx(index_x, index_y + 1, index_z, False)
-            dfdx[0][1][1] = self._array_derivative.evaluate_df_dx(index_x, index_y + 1, index_z + 1, False)
-            dfdx[0][0][1] = self._array_derivative.evaluate_df_dx(index_x, index_y, index_z + 1, False)
-            dfdx[1][0][0] = self._array_derivative.evaluate_df_dx(index_x + 1, index_y, index_z, True)
-            dfdx[1][1][0] = self._array_derivative.evaluate_df_dx(index_x + 1, index_y + 1, index_z, True)
-            dfdx[1][0][1] = self._array_derivative.evaluate_df_dx(index_x + 1, index_y, index_z + 1, True)
-            dfdx[1][1][1] = self._array_derivative.evaluate_df_dx(index_x + 1, index_y + 1, index_z + 1, True)
-
-            dfdy[0][0][0] = self._array_derivative.evaluate_df_dy(index_x, index_y, index_z, False)
-            dfdy[0][1][0] = self._array_derivative.evaluate_df_dy(index_x, index_y + 1, index_z, True)
-            dfdy[0][1][1] = self._array_derivative.evaluate_df_dy(index_x, index_y + 1, index_z + 1, True)
-            dfdy[0][0][1] = self._array_derivative.evaluate_df_dy(index_x, index_y, index_z + 1, False)
-            dfdy[1][0][0] = self._array_derivative.evaluate_df_dy(index_x + 1, index_y, index_z, False)
-            dfdy[1][1][0] = self._array_derivative.evaluate_df_dy(index_x + 1, index_y + 1, index_z, True)
-            dfdy[1][0][1] = self._array_derivative.evaluate_df_dy(index_x + 1, index_y, index_z + 1, False)
-            dfdy[1][1][1] = self._array_derivative.evaluate_df_dy(index_x + 1, index_y + 1, index_z + 1, True)
-
-            dfdz[0][0][0] = self._array_derivative.evaluate_df_dz(index_x, index_y, index_z, False)
-            dfdz[0][1][0] = self._array_derivative.evaluate_df_dz(index_x, index_y + 1, index_z, False)
-            dfdz[0][1][1] = self._array_derivative.evaluate_df_dz(index_x, index_y + 1, index_z + 1, True)
-            dfdz[0][0][1] = self._array_derivative.evaluate_df_dz(index_x, index_y, index_z + 1, True)
-            dfdz[1][0][0] = self._array_derivative.evaluate_df_dz(index_x + 1, index_y, index_z, False)
-            dfdz[1][1][0] = self._array_derivative.evaluate_df_dz(index_x + 1, index_y + 1, index_z, False)
-            dfdz[1][0][1] = self._array_derivative.evaluate_df_dz(index_x + 1, index_y, index_z + 1, True)
-            dfdz[1][1][1] = self._array_derivative.evaluate_df_dz(index_x + 1, index_y + 1, index_z + 1, True)
-
-            d2fdxdy[0][0][0] = self._array_derivative.evaluate_d2fdxdy(index_x, index_y, index_z, False, False)
-            d2fdxdy[0][1][0] = self._array_derivative.evaluate_d2fdxdy(index_x, index_y + 1, index_z, False, True)
-            d2fdxdy[0][1][1] = self._array_derivative.evaluate_d2fdxdy(index_x, index_y + 1, index_z + 1, False, True)
-            d2fdxdy[0][0][1] = self._array_derivative.evaluate_d2fdxdy(index_x, index_y, index_z + 1, False, False)
-            d2fdxdy[1][0][0] = self._array_derivative.evaluate_d2fdxdy(index_x + 1, index_y, index_z, True, False)
-            d2fdxdy[1][1][0] = self._array_derivative.evaluate_d2fdxdy(index_x + 1, index_y + 1, index_z, True, True)
-            d2fdxdy[1][0][1] = self._array_derivative.evaluate_d2fdxdy(index_x + 1, index_y, index_z + 1, True, False)
-            d2fdxdy[1][1][1] = self._array_derivative.evaluate_d2fdxdy(index_x + 1, index_y + 1, index_z + 1, True, True)
-
-            d2fdxdz[0][0][0] = self._array_derivative.evaluate_d2fdxdz(index_x, index_y, index_z, False, False)
-            d2fdxdz[0][1][0] = self._array_derivative.evaluate_d2fdxdz(index_x, index_y + 1, index_z, False, False)
-            d2fdxdz[0][1][1] = self._array_derivative.evaluate_d2fdxdz(index_x, index_y + 1, index_z + 1, False, True)
-            d2fdxdz[0][0][1] = self._array_derivative.evaluate_d2fdxdz(index_x, index_y, index_z + 1, False, True)
-            d2fdxdz[1][0][0] = self._array_derivative.evaluate_d2fdxdz(index_x + 1, index_y, index_z, True, False)
-            d2fdxdz[1][1][0] = self._array_derivative.evaluate_d2fdxdz(index_x + 1, index_y + 1, index_z, True, False)
-            d2fdxdz[1][0][1] = self._array_derivative.evaluate_d2fdxdz(index_x + 1, index_y, index_z + 1, True, True)
-            d2fdxdz[1][1][1] = self._array_derivative.evaluate_d2fdxdz(index_x + 1, index_y + 1, index_z + 1, True, True)
-
-            d2fdydz[0][0][0] = self._array_derivative.evaluate_d2fdydz(index_x, index_y, index_z, False, False)
-            d2fdydz[0][1][0] = self._array_derivative.evaluate_d2fdydz(index_x, index_y + 1, index_z, True, False)
-            d2fdydz[0][1][1] = self._array_derivative.evaluate_d2fdydz(index_x, index_y + 1, index_z + 1, True, True)
-            d2fdydz[0][0][1] = self._array_derivative.evaluate_d2fdydz(index_x, index_y, index_z + 1, False, True)
-            d2fdydz[1][0][0] = self._array_derivative.evaluate_d2fdydz(index_x + 1, index_y, index_z, False, False)
-            d2fdydz[1][1][0] = self._array_derivative.evaluate_d2fdydz(index_x + 1, index_y + 1, index_z, True, False)
-            d2fdydz[1][0][1] = self._array_derivative.evaluate_d2fdydz(index_x + 1, index_y, index_z + 1, False, True)
-            d2fdydz[1][1][1] = self._array_derivative.evaluate_d2fdydz(index_x + 1, index_y + 1, index_z + 1, True, True)
-
-            d3fdxdydz[0][0][0] = self._array_derivative.evaluate_d3fdxdydz(index_x, index_y, index_z, False, False, False)
-            d3fdxdydz[0][1][0] = self._array_derivative.evaluate_d3fdxdydz(index_x, index_y + 1, index_z, False, True, False)
-            d3fdxdydz[0][1][1] = self._array_derivative.evaluate_d3fdxdydz(index_x, index_y + 1, index_z + 1, False, True, True)
-            d3fdxdydz[0][0][1] = self._array_derivative.evaluate_d3fdxdydz(index_x, index_y, index_z + 1, False, False, True)
-            d3fdxdydz[1][0][0] = self._array_derivative.evaluate_d3fdxdydz(index_x + 1, index_y, index_z, True, False, False)
-            d3fdxdydz[1][1][0] = self._array_derivative.evaluate_d3fdxdydz(index_x + 1, index_y + 1, index_z, True, True, False)
-            d3fdxdydz[1][0][1] = self._array_derivative.evaluate_d3fdxdydz(index_x + 1, index_y, index_z + 1, True, False, True)
-            d3fdxdydz[1][1][1] = self._array_derivative.evaluate_d3fdxdydz(index_x + 1, index_y + 1, index_z + 1, True, True, True)
-
-            calc_coefficients_3d(f, dfdx, dfdy, dfdz, d2fdxdy, d2fdxdz, d2fdydz, d3fdxdydz, a)
-            for i in range(4):
-                for j in range(4):
-                    for k in range(4):
-                        self._a[index_x, index_y, index_z, i, j, k] = a[i][j][k]
-            self._calculated[index_x, index_y, index_z] = 1
+        if self._cache_mode == CACHE_LAZY:
 
-        else:
-            for i in range(4):
-                for j in range(4):
-                    for k in range(4):
-                        a[i][j][k] = self._a[index_x, index_y, index_z, i, j, k]
+            # Calculate the coefficients (and gradients at each spline point) if they dont exist
+            if not self._calculated[index_x, index_y, index_z]:
+                self._calculate_coefficients(index_x, index_y, index_z, a)
+                for i in range(4):
+                    for j in range(4):
+                        for k in range(4):
+                            self._a[index_x, index_y, index_z, i, j, k] = a[i][j][k]
+                self._calculated[index_x, index_y, index_z] = 1
+                return
+
+        elif self._cache_mode == CACHE_LRU:
+            self._lookup_coefficients(index_x, index_y, index_z, a)
+            return
+
+        elif self._cache_mode == CACHE_NONE:
+            self._calculate_coefficients(index_x, index_y, index_z, a)
+            return
+
+        for i in range(4):
+            for j in range(4):
+                for k in range(4):
+                    a[i][j][k] = self._a[index_x, index_y, index_z, i, j, k]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef _lookup_coefficients(self, int index_x, int index_y, int index_z, double[4][4][4] a):
+        """
+        Loads the cubic coefficients from the bounded cache, calculating them on a cache miss.
+
+        A cell may be stored in any slot of the set selected by a hash of the
+        cell index. On a miss the least recently used slot of the set is
+        replaced.
+
+        :param int index_x: the lower index of the bin containing point px. (Result of bisection search).
+        :param int index_y: the lower index of the bin containing point py. (Result of bisection search).
+        :param int index_z: the lower index of the bin containing point pz. (Result of bisection search).
+        :param double[4][4][4] a: The coefficients of the tricubic equation.
+        """
+
+        cdef:
+            np.int64_t key
+            np.uint64_t hash_value
+            int first, slot, oldest, i, j, k
+
+        key = (<np.int64_t> index_x * self._last_index_y + index_y) * self._last_index_z + index_z
+
+        # a multiplicative (Fibonacci) hash spreads neighbouring cells over the sets
+        hash_value = (<np.uint64_t> key) * <np.uint64_t> 11400714819323198485ULL
+        first = <int> ((hash_value >> 32) % <np.uint64_t> self._cache_sets) * CACHE_WAYS
+
+        self._cache_clock += 1
+        oldest = first
+        for slot in range(first, first + CACHE_WAYS):
+
+            if self._cache_keys[slot] == key:
+                self._cache_stamps[slot] = self._cache_clock
+                for i in range(4):
+                    for j in range(4):
+                        for k in range(4):
+                            a[i][j][k] = self._cache[slot, i, j, k]
+                return
+
+            if self._cache_stamps[slot] < self._cache_stamps[oldest]:
+                oldest = slot
+
+        self._calculate_coefficients(index_x, index_y, index_z, a)
+        for i in range(4):
+            for j in range(4):
+                for k in range(4):
+                    self._cache[oldest, i, j, k] = a[i][j][k]
+        self._cache_keys[oldest] = key
+        self._cache_stamps[oldest] = self._cache_clock
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef _calculate_coefficients(self, int index_x, int index_y, int index_z, double[4][4][4] a):
+        """
+        Calculates the cubic coefficients of a cell.
+
+        :param int index_x: the lower index of the bin containing point px. (Result of bisection search).
+        :param int index_y: the lower index of the bin containing point py. (Result of bisection search).
+        :param int index_z: the lower index of the bin containing point pz. (Result of bisection search).
+        :param double[4][4][4] a: The coefficients of the tricubic equation.
+        """
+
+        cdef double[2][2][2] f, dfdx, dfdy, dfdz, d2fdxdy, d2fdxdz, d2fdydz, d3fdxdydz
+
+        f[0][0][0] = self._value(index_x, index_y, index_z)
+        f[0][1][0] = self._value(index_x, index_y + 1, index_z)
+        f[0][1][1] = self._value(index_x, index_y + 1, index_z + 1)
+        f[0][0][1] = self._value(index_x, index_y, index_z + 1)
+        f[1][0][0] = self._value(index_x + 1, index_y, index_z)
+        f[1][1][0] = self._value(index_x + 1, index_y + 1, index_z)
+        f[1][0][1] = self._value(index_x + 1, index_y, index_z + 1)
+        f[1][1][1] = self._value(index_x + 1, index_y + 1, index_z + 1)
+
+        dfdx[0][0][0] = self._array_derivative.evaluate_df_dx(index_x, index_y, index_z, False)
+        dfdx[0][1][0] = self._array_derivative.evaluate_df_dx(index_x, index_y + 1, index_z, False)
+        dfdx[0][1][1] = self._array_derivative.evaluate_df_dx(index_x, index_y + 1, index_z + 1, False)
+        dfdx[0][0][1] = self._array_derivative.evaluate_df_dx(index_x, index_y, index_z + 1, False)
+        dfdx[1][0][0] = self._array_derivative.evaluate_df_dx(index_x + 1, index_y, index_z, True)
+        dfdx[1][1][0] = self._array_derivative.evaluate_df_dx(index_x + 1, index_y + 1, index_z, True)
+        dfdx[1][0][1] = self._array_derivative.evaluate_df_dx(index_x + 1, index_y, index_z + 1, True)
+        dfdx[1][1][1] = self._array_derivative.evaluate_df_dx(index_x + 1, index_y + 1, index_z + 1, True)
+
+        dfdy[0][0][0] = self._array_derivative.evaluate_df_dy(index_x, index_y, index_z, False)
+        dfdy[0][1][0] = self._array_derivative.evaluate_df_dy(index_x, index_y + 1, index_z, True)
+        dfdy[0][1][1] = self._array_derivative.evaluate_df_dy(index_x, index_y + 1, index_z + 1, True)
+        dfdy[0][0][1] = self._array_derivative.evaluate_df_dy(index_x, index_y, index_z + 1, False)
+        dfdy[1][0][0] = self._array_derivative.evaluate_df_dy(index_x + 1, index_y, index_z, False)
+        dfdy[1][1][0] = self._array_derivative.evaluate_df_dy(index_x + 1, index_y + 1, index_z, True)
+        dfdy[1][0][1] = self._array_derivative.evaluate_df_dy(index_x + 1, index_y, index_z + 1, False)
+        dfdy[1][1][1] = self._array_derivative.evaluate_df_dy(index_x + 1, index_y + 1, index_z + 1, True)
+
+        dfdz[0][0][0] = self._array_derivative.evaluate_df_dz(index_x, index_y, index_z, False)
+        dfdz[0][1][0] = self._array_derivative.evaluate_df_dz(index_x, index_y + 1, index_z, False)
+        dfdz[0][1][1] = self._array_derivative.evaluate_df_dz(index_x, index_y + 1, index_z + 1, True)
+        dfdz[0][0][1] = self._array_derivative.evaluate_df_dz(index_x, index_y, index_z + 1, True)
+        dfdz[1][0][0] = self._array_derivative.evaluate_df_dz(index_x + 1, index_y, index_z, False)
+        dfdz[1][1][0] = self._array_derivative.evaluate_df_dz(index_x + 1, index_y + 1, index_z, False)
+        dfdz[1][0][1] = self._array_derivative.evaluate_df_dz(index_x + 1, index_y, index_z + 1, True)
+        dfdz[1][1][1] = self._array_derivative.evaluate_df_dz(index_x + 1, index_y + 1, index_z + 1, True)
+
+        d2fdxdy[0][0][0] = self._array_derivative.evaluate_d2fdxdy(index_x, index_y, index_z, False, False)
+        d2fdxdy[0][1][0] = self._array_derivative.evaluate_d2fdxdy(index_x, index_y + 1, index_z, False, True)
+        d2fdxdy[0][1][1] = self._array_derivative.evaluate_d2fdxdy(index_x, index_y + 1, index_z + 1, False, True)
+        d2fdxdy[0][0][1] = self._array_derivative.evaluate_d2fdxdy(index_x, index_y, index_z + 1, False, False)
+        d2fdxdy[1][0][0] = self._array_derivative.evaluate_d2fdxdy(index_x + 1, index_y, index_z, True, False)
+        d2fdxdy[1][1][0] = self._array_derivative.evaluate_d2fdxdy(index_x + 1, index_y + 1, index_z, True, True)
+        d2fdxdy[1][0][1] = self._array_derivative.evaluate_d2fdxdy(index_x + 1, index_y, index_z + 1, True, False)
+        d2fdxdy[1][1][1] = self._array_derivative.evaluate_d2fdxdy(index_x + 1, index_y + 1, index_z + 1, True, True)
+
+        d2fdxdz[0][0][0] = self._array_derivative.evaluate_d2fdxdz(index_x, index_y, index_z, False, False)
+        d2fdxdz[0][1][0] = self._array_derivative.evaluate_d2fdxdz(index_x, index_y + 1, index_z, False, False)
+        d2fdxdz[0][1][1] = self._array_derivative.evaluate_d2fdxdz(index_x, index_y + 1, index_z + 1, False, True)
+        d2fdxdz[0][0][1] = self._array_derivative.evaluate_d2fdxdz(index_x, index_y, index_z + 1, False, True)
+        d2fdxdz[1][0][0] = self._array_derivative.evaluate_d2fdxdz(index_x + 1, index_y, index_z, True, False)
+        d2fdxdz[1][1][0] = self._array_derivative.evaluate_d2fdxdz(index_x + 1, index_y + 1, index_z, True, False)
+        d2fdxdz[1][0][1] = self._array_derivative.evaluate_d2fdxdz(index_x + 1, index_y, index_z + 1, True, True)
+        d2fdxdz[1][1][1] = self._array_derivative.evaluate_d2fdxdz(index_x + 1, index_y + 1, index_z + 1, True, True)
+
+        d2fdydz[0][0][0] = self._array_derivative.evaluate_d2fdydz(index_x, index_y, index_z, False, False)
+        d2fdydz[0][1][0] = self._array_derivative.evaluate_d2fdydz(index_x, index_y + 1, index_z, True, False)
+        d2fdydz[0][1][1] = self._array_derivative.evaluate_d2fdydz(index_x, index_y + 1, index_z + 1, True, True)
+        d2fdydz[0][0][1] = self._array_derivative.evaluate_d2fdydz(index_x, index_y, index_z + 1, False, True)
+        d2fdydz[1][0][0] = self._array_derivative.evaluate_d2fdydz(index_x + 1, index_y, index_z, False, False)
+        d2fdydz[1][1][0] = self._array_derivative.evaluate_d2fdydz(index_x + 1, index_y + 1, index_z, True, False)
+        d2fdydz[1][0][1] = self._array_derivative.evaluate_d2fdydz(index_x + 1, index_y, index_z + 1, False, True)
+        d2fdydz[1][1][1] = self._array_derivative.evaluate_d2fdydz(index_x + 1, index_y + 1, index_z + 1, True, True)
+
+        d3fdxdydz[0][0][0] = self._array_derivative.evaluate_d3fdxdydz(index_x, index_y, index_z, False, False, False)
+        d3fdxdydz[0][1][0] = self._array_derivative.evaluate_d3fdxdydz(index_x, index_y + 1, index_z, False, True, False)
+        d3fdxdydz[0][1][1] = self._array_derivative.evaluate_d3fdxdydz(index_x, index_y + 1, index_z + 1, False, True, True)
+        d3fdxdydz[0][0][1] = self._array_derivative.evaluate_d3fdxdydz(index_x, index_y, index_z + 1, False, False, True)
+        d3fdxdydz[1][0][0] = self._array_derivative.evaluate_d3fdxdydz(index_x + 1, index_y, index_z, True, False, False)
+        d3fdxdydz[1][1][0] = self._array_derivative.evaluate_d3fdxdydz(index_x + 1, index_y + 1, index_z, True, True, False)
+        d3fdxdydz[1][0][1] = self._array_derivative.evaluate_d3fdxdydz(index_x + 1, index_y, index_z + 1, True, False, True)
+        d3fdxdydz[1][1][1] = self._array_derivative.evaluate_d3fdxdydz(index_x + 1, index_y + 1, index_z + 1, True, True, True)
+
+        calc_coefficients_3d(f, dfdx, dfdy, dfdz, d2fdxdy, d2fdxdz, d2fdydz, d3fdxdydz, a)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -824,6 +1163,85 @@ cdef class _Interpolator3DCubic(_Interpolator3D):
                               * (FACTORIAL[k] / FACTORIAL[k - order_z]) * z_powers[k - order_z])
         return df_dn
 
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double evaluate_gradient(self, double px, double py, double pz, int index_x, int index_y, int index_z, double[3] gradient) except? -1e999:
+        """
+        Calculates the interpolated value and its gradient at a requested point.
+
+        The tricubic coefficients are fetched once and used for both the value and the first derivatives.
+
+        :param double px: the x position of the point for which an interpolated value is required.
+        :param double py: the y position of the point for which an interpolated value is required.
+        :param double pz: the z position of the point for which an interpolated value is required.
+        :param int index_x: the lower index of the bin containing point px. (Result of bisection search).
+        :param int index_y: the lower index of the bin containing point py. (Result of bisection search).
+        :param int index_z: the lower index of the bin containing point pz. (Result of bisection search).
+        :param double[3] gradient: array that receives df/dx, df/dy and df/dz.
+        :return: the interpolated value.
+        """
+
+        cdef double nx, ny, nz
+        cdef double[4][4][4] a
+        cdef double[4] x_powers, y_powers, z_powers, dx_powers, dy_powers, dz_powers
+        cdef double df_dx, df_dy, df_dz
+        cdef int i, j, k
+
+        # normalise x, y and z to a unit cell
+        nx = (px - self._x[index_x]) / (self._x[index_x + 1] - self._x[index_x])
+        ny = (py - self._y[index_y]) / (self._y[index_y + 1] - self._y[index_y])
+        nz = (pz - self._z[index_z]) / (self._z[index_z + 1] - self._z[index_z])
+
+        self._cache_coefficients(index_x, index_y, index_z, a)
+
+        # powers and their first derivatives
+        x_powers[0] = 1
+        x_powers[1] = nx
+        x_powers[2] = nx * nx
+        x_powers[3] = nx * x_powers[2]
+
+        y_powers[0] = 1
+        y_powers[1] = ny
+        y_powers[2] = ny * ny
+        y_powers[3] = ny * y_powers[2]
+
+        z_powers[0] = 1
+        z_powers[1] = nz
+        z_powers[2] = nz * nz
+        z_powers[3] = nz * z_powers[2]
+
+        dx_powers[0] = 0
+        dx_powers[1] = 1
+        dx_powers[2] = 2 * nx
+        dx_powers[3] = 3 * x_powers[2]
+
+        dy_powers[0] = 0
+        dy_powers[1] = 1
+        dy_powers[2] = 2 * ny
+        dy_powers[3] = 3 * y_powers[2]
+
+        dz_powers[0] = 0
+        dz_powers[1] = 1
+        dz_powers[2] = 2 * nz
+        dz_powers[3] = 3 * z_powers[2]
+
+        df_dx = 0.0
+        df_dy = 0.0
+        df_dz = 0.0
+        for i in range(4):
+            for j in range(4):
+                for k in range(4):
+                    df_dx += a[i][j][k] * dx_powers[i] * y_powers[j] * z_powers[k]
+                    df_dy += a[i][j][k] * x_powers[i] * dy_powers[j] * z_powers[k]
+                    df_dz += a[i][j][k] * x_powers[i] * y_powers[j] * dz_powers[k]
+
+        gradient[0] = df_dx / (self._x[index_x + 1] - self._x[index_x])
+        gradient[1] = df_dy / (self._y[index_y + 1] - self._y[index_y])
+        gradient[2] = df_dz / (self._z[index_z + 1] - self._z[index_z])
+        return evaluate_cubic_3d(a, nx, ny, nz)
+
 
 cdef class _Extrapolator3D:
     """
@@ -832,18 +1250,16 @@ cdef class _Extrapolator3D:
     :param x: 1D memory view of the spline point x positions.
     :param y: 1D memory view of the spline point y positions.
     :param z: 1D memory view of the spline point z positions.
-    :param f: 3D memory view of the function value at spline point x, y, z positions.
     :param interpolator: stored _Interpolator2D object that is being used.
     """
 
     ID = None
 
-    def __init__(self, double[::1] x, double[::1] y, double[::1] z, double[:, :, ::1] f, _Interpolator3D interpolator, double extrapolation_range_x, double extrapolation_range_y, double extrapolation_range_z):
+    def __init__(self, double[::1] x, double[::1] y, double[::1] z, _Interpolator3D interpolator, double extrapolation_range_x, double extrapolation_range_y, double extrapolation_range_z):
 
         self._x = x
         self._y = y
         self._z = z
-        self._f = f
         self._last_index_x = self._x.shape[0] - 1
         self._last_index_y = self._y.shape[0] - 1
         self._last_index_z = self._z.shape[0] - 1
@@ -932,6 +1348,74 @@ cdef class _Extrapolator3D:
         else:
             raise ValueError('Interpolated index parsed to extrapolator.')
 
+    cdef double evaluate_gradient(self, double px, double py, double pz, int index_x, int index_y, int index_z, double[3] gradient) except? -1e999:
+        """
+        Calculates the extrapolated value and its gradient at a requested point.
+
+        The value and the extrapolation range checks are handled by evaluate(). The gradient is calculated by
+        _evaluate_gradient_edge() for the combination of directions in which the point lies outside the spline knots.
+
+        :param double px: the point for which an extrapolated value is required.
+        :param double py: the point for which an extrapolated value is required.
+        :param double pz: the point for which an extrapolated value is required.
+        :param int index_x: the index returned by the bisection search for point px.
+        :param int index_y: the index returned by the bisection search for point py.
+        :param int index_z: the index returned by the bisection search for point pz.
+        :param double[3] gradient: array that receives df/dx, df/dy and df/dz.
+        :return: the extrapolated value.
+        """
+
+        cdef double f
+        cdef int edge_mask = 0
+
+        f = self.evaluate(px, py, pz, index_x, index_y, index_z)
+
+        if index_x == -1 or index_x == self._last_index_x:
+            edge_mask |= 1
+        if index_y == -1 or index_y == self._last_index_y:
+            edge_mask |= 2
+        if index_z == -1 or index_z == self._last_index_z:
+            edge_mask |= 4
+
+        self._evaluate_gradient_edge(
+            px, py, pz,
+            to_cell_index(index_x, self._last_index_x), to_cell_index(index_y, self._last_index_y), to_cell_index(index_z, self._last_index_z),
+            to_knot_index(index_x, self._last_index_x), to_knot_index(index_y, self._last_index_y), to_knot_index(index_z, self._last_index_z),
+            edge_mask, gradient
+        )
+        return f
+
+    cdef int _evaluate_gradient_edge(self, double px, double py, double pz, int index_x, int index_y, int index_z, int edge_x_index, int edge_y_index, int edge_z_index, int edge_mask, double[3] gradient) except -1:
+        raise NotImplementedError(f'{self.__class__} not implemented.')
+
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double _edge_derivative(self, double px, double py, double pz, int index_x, int index_y, int index_z, int order_mask) except? -1e999:
+        """
+        Returns the un-normalised interpolator derivative selected by the bits of order_mask (x = 1, y = 2, z = 4).
+
+        An order_mask of 0 returns the interpolated value.
+        """
+
+        cdef int order_x = order_mask & 1
+        cdef int order_y = (order_mask >> 1) & 1
+        cdef int order_z = (order_mask >> 2) & 1
+        cdef double df
+
+        if order_mask == 0:
+            return self._interpolator.evaluate(px, py, pz, index_x, index_y, index_z)
+
+        df = self._interpolator.analytic_gradient(px, py, pz, index_x, index_y, index_z, order_x, order_y, order_z)
+        if order_x:
+            df /= self._x[index_x + 1] - self._x[index_x]
+        if order_y:
+            df /= self._y[index_y + 1] - self._y[index_y]
+        if order_z:
+            df /= self._z[index_z + 1] - self._z[index_z]
+        return df
+
     cdef double _evaluate_edge_x(self, double px, double py, double pz, int index_x, int index_y, int index_z, int edge_x_index, int edge_y_index, int edge_z_index) except? -1e999:
         raise NotImplementedError(f'{self.__class__} not implemented.')
 
@@ -1044,6 +1528,27 @@ cdef class _Extrapolator3DNearest(_Extrapolator3D):
     cdef double _evaluate_edge_xyz(self, double px, double py, double pz, int index_x, int index_y, int index_z, int edge_x_index, int edge_y_index, int edge_z_index) except? -1e999:
         return self._interpolator.evaluate(self._x[edge_x_index], self._y[edge_y_index], self._z[edge_z_index], index_x, index_y, index_z)
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef int _evaluate_gradient_edge(self, double px, double py, double pz, int index_x, int index_y, int index_z, int edge_x_index, int edge_y_index, int edge_z_index, int edge_mask, double[3] gradient) except -1:
+        """
+        The extrapolated value is constant outside the spline knots, so the gradient is zero in the extrapolated
+        directions and equal to the interpolator gradient at the nearest edge in the others.
+        """
+
+        cdef double cx = self._x[edge_x_index] if edge_mask & 1 else px
+        cdef double cy = self._y[edge_y_index] if edge_mask & 2 else py
+        cdef double cz = self._z[edge_z_index] if edge_mask & 4 else pz
+        cdef int axis
+
+        for axis in range(3):
+            if edge_mask & (1 << axis):
+                gradient[axis] = 0.0
+            else:
+                gradient[axis] = self._edge_derivative(cx, cy, cz, index_x, index_y, index_z, 1 << axis)
+        return 0
+
 
 cdef class _Extrapolator3DLinear(_Extrapolator3D):
     """
@@ -1210,6 +1715,61 @@ cdef class _Extrapolator3DLinear(_Extrapolator3D):
                  + d2f_dydz * (pz - self._z[edge_z_index]) * (py - self._y[edge_y_index]) \
                  + d3f_dxdydz * (px - self._x[edge_x_index]) * (py - self._y[edge_y_index]) * (pz - self._z[edge_z_index])
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef int _evaluate_gradient_edge(self, double px, double py, double pz, int index_x, int index_y, int index_z, int edge_x_index, int edge_y_index, int edge_z_index, int edge_mask, double[3] gradient) except -1:
+        """
+        Differentiates the Taylor expansion used by the _evaluate_edge methods.
+
+        The extrapolated function is a sum over the subsets T of the extrapolated directions of the derivative
+        d^T f(edge) multiplied by the distances from the edge along T. Differentiating along an extrapolated
+        direction keeps the terms of T containing that direction and removes its distance, differentiating along an
+        interpolated direction raises the derivative order of every term in that direction.
+        """
+
+        cdef double[3] distance
+        cdef double[8] derivative
+        cdef double cx, cy, cz, term
+        cdef int axis, subset, order_mask, distance_mask, inside, i
+
+        cx = self._x[edge_x_index] if edge_mask & 1 else px
+        cy = self._y[edge_y_index] if edge_mask & 2 else py
+        cz = self._z[edge_z_index] if edge_mask & 4 else pz
+        distance[0] = px - cx
+        distance[1] = py - cy
+        distance[2] = pz - cz
+
+        # only derivatives of at most first order in the interpolated directions are required
+        for order_mask in range(8):
+            inside = order_mask & ~edge_mask
+            if inside & (inside - 1) == 0:
+                derivative[order_mask] = self._edge_derivative(cx, cy, cz, index_x, index_y, index_z, order_mask)
+
+        for axis in range(3):
+            gradient[axis] = 0.0
+            for subset in range(8):
+
+                # subsets of the extrapolated directions
+                if subset & ~edge_mask:
+                    continue
+
+                if edge_mask & (1 << axis):
+                    if not subset & (1 << axis):
+                        continue
+                    order_mask = subset
+                    distance_mask = subset & ~(1 << axis)
+                else:
+                    order_mask = subset | (1 << axis)
+                    distance_mask = subset
+
+                term = derivative[order_mask]
+                for i in range(3):
+                    if distance_mask & (1 << i):
+                        term *= distance[i]
+                gradient[axis] += term
+        return 0
+
 
 cdef class _ArrayDerivative3D:
     """
@@ -1221,19 +1781,36 @@ cdef class _ArrayDerivative3D:
     :param x: 1D memory view of the spline point x positions.
     :param y: 1D memory view of the spline point y positions.
     :param z: 1D memory view of the spline point z positions.
-    :param f: 3D memory view of the function value at spline point x, y, z positions.
+    :param f: 3D array of the function value at spline point x, y, z positions, stored as float64 or float32.
     """
 
-    def __init__(self, double[::1] x, double[::1] y, double[::1] z, double[:, :, ::1] f):
+    def __init__(self, double[::1] x, double[::1] y, double[::1] z, np.ndarray f):
 
         self._x = x
         self._y = y
         self._z = z
-        self._f = f
+        self._float32 = f.dtype == np.float32
+        if self._float32:
+            self._f32 = f
+        else:
+            self._f = f
         self._last_index_x = self._x.shape[0] - 1
         self._last_index_y = self._y.shape[0] - 1
         self._last_index_z = self._z.shape[0] - 1
 
+    @cython.final
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef inline double _value(self, int ix, int iy, int iz):
+        """
+        Returns the function value at a spline knot in double precision.
+        """
+
+        if self._float32:
+            return self._f32[ix, iy, iz]
+        return self._f[ix, iy, iz]
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
@@ -1663,9 +2240,9 @@ cdef class _ArrayDerivative3D:
 
         x1_n = (self._x[lower_index_x + 1] - self._x[lower_index_x]) / (self._x[lower_index_x + 2] - self._x[lower_index_x + 1])
         x1_n2 = x1_n * x1_n
-        return (self._f[lower_index_x + 2, slice_index_y, slice_index_z] * x1_n2
-                - self._f[lower_index_x, slice_index_y, slice_index_z]
-                - self._f[lower_index_x + 1, slice_index_y, slice_index_z] * (x1_n2 - 1.)) / (x1_n + x1_n2)
+        return (self._value(lower_index_x + 2, slice_index_y, slice_index_z) * x1_n2
+                - self._value(lower_index_x, slice_index_y, slice_index_z)
+                - self._value(lower_index_x + 1, slice_index_y, slice_index_z) * (x1_n2 - 1.)) / (x1_n + x1_n2)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -1680,7 +2257,7 @@ cdef class _ArrayDerivative3D:
         For unit square normalisation, dx0 = 1, the denominator simplifies.
         """
 
-        return self._f[lower_index_x + 1, slice_index_y, slice_index_z] - self._f[lower_index_x, slice_index_y, slice_index_z]
+        return self._value(lower_index_x + 1, slice_index_y, slice_index_z) - self._value(lower_index_x, slice_index_y, slice_index_z)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -1702,9 +2279,9 @@ cdef class _ArrayDerivative3D:
 
         x1_n = (self._y[lower_index_y + 1] - self._y[lower_index_y]) / (self._y[lower_index_y + 2] - self._y[lower_index_y + 1])
         x1_n2 = x1_n * x1_n
-        return (self._f[slice_index_x, lower_index_y + 2, slice_index_z] * x1_n2
-                - self._f[slice_index_x, lower_index_y, slice_index_z]
-                - self._f[slice_index_x, lower_index_y + 1, slice_index_z] * (x1_n2 - 1.)) / (x1_n + x1_n2)
+        return (self._value(slice_index_x, lower_index_y + 2, slice_index_z) * x1_n2
+                - self._value(slice_index_x, lower_index_y, slice_index_z)
+                - self._value(slice_index_x, lower_index_y + 1, slice_index_z) * (x1_n2 - 1.)) / (x1_n + x1_n2)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -1720,7 +2297,7 @@ cdef class _ArrayDerivative3D:
 
         """
 
-        return self._f[slice_index_x, lower_index_y + 1, slice_index_z] - self._f[slice_index_x, lower_index_y, slice_index_z]
+        return self._value(slice_index_x, lower_index_y + 1, slice_index_z) - self._value(slice_index_x, lower_index_y, slice_index_z)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -1742,9 +2319,9 @@ cdef class _ArrayDerivative3D:
 
         x1_n = (self._z[lower_index_z + 1] - self._z[lower_index_z]) / (self._z[lower_index_z + 2] - self._z[lower_index_z + 1])
         x1_n2 = x1_n * x1_n
-        return (self._f[slice_index_x, slice_index_y, lower_index_z + 2] * x1_n2
-                - self._f[slice_index_x, slice_index_y, lower_index_z]
-                - self._f[slice_index_x, slice_index_y, lower_index_z + 1] * (x1_n2 - 1.)) / (x1_n + x1_n2)
+        return (self._value(slice_index_x, slice_index_y, lower_index_z + 2) * x1_n2
+                - self._value(slice_index_x, slice_index_y, lower_index_z)
+                - self._value(slice_index_x, slice_index_y, lower_index_z + 1) * (x1_n2 - 1.)) / (x1_n + x1_n2)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -1760,7 +2337,7 @@ cdef class _ArrayDerivative3D:
 
         """
 
-        return self._f[slice_index_x, slice_index_y, lower_index_z + 1] - self._f[slice_index_x, slice_index_y, lower_index_z]
+        return self._value(slice_index_x, slice_index_y, lower_index_z + 1) - self._value(slice_index_x, slice_index_y, lower_index_z)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -1779,10 +2356,10 @@ cdef class _ArrayDerivative3D:
         For unit square normalisation, dx0 = 1 and dy0 = 1, the denominator simplifies.
         """
 
-        return self._f[lower_index_x + 1, lower_index_y + 1, slice_index_z] \
-               - self._f[lower_index_x, lower_index_y + 1, slice_index_z] \
-               - self._f[lower_index_x + 1, lower_index_y, slice_index_z] \
-               + self._f[lower_index_x, lower_index_y, slice_index_z]
+        return self._value(lower_index_x + 1, lower_index_y + 1, slice_index_z) \
+               - self._value(lower_index_x, lower_index_y + 1, slice_index_z) \
+               - self._value(lower_index_x + 1, lower_index_y, slice_index_z) \
+               + self._value(lower_index_x, lower_index_y, slice_index_z)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -1806,10 +2383,10 @@ cdef class _ArrayDerivative3D:
         cdef double dy
 
         dy = (self._y[lower_index_y + 1] - self._y[lower_index_y]) / (self._y[lower_index_y + 2] - self._y[lower_index_y + 1])
-        return (self._f[lower_index_x + 1, lower_index_y + 2, slice_index_z]
-                - self._f[lower_index_x, lower_index_y + 2, slice_index_z]
-                - self._f[lower_index_x + 1, lower_index_y, slice_index_z]
-                + self._f[lower_index_x, lower_index_y, slice_index_z]) / (1. + dy)
+        return (self._value(lower_index_x + 1, lower_index_y + 2, slice_index_z)
+                - self._value(lower_index_x, lower_index_y + 2, slice_index_z)
+                - self._value(lower_index_x + 1, lower_index_y, slice_index_z)
+                + self._value(lower_index_x, lower_index_y, slice_index_z)) / (1. + dy)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -1833,10 +2410,10 @@ cdef class _ArrayDerivative3D:
         cdef double dx
 
         dx = (self._x[lower_index_x + 1] - self._x[lower_index_x]) / (self._x[lower_index_x + 2] - self._x[lower_index_x + 1])
-        return (self._f[lower_index_x + 2, lower_index_y + 1, slice_index_z]
-                - self._f[lower_index_x, lower_index_y + 1, slice_index_z]
-                - self._f[lower_index_x + 2, lower_index_y, slice_index_z]
-                + self._f[lower_index_x, lower_index_y, slice_index_z]) / (1. + dx)
+        return (self._value(lower_index_x + 2, lower_index_y + 1, slice_index_z)
+                - self._value(lower_index_x, lower_index_y + 1, slice_index_z)
+                - self._value(lower_index_x + 2, lower_index_y, slice_index_z)
+                + self._value(lower_index_x, lower_index_y, slice_index_z)) / (1. + dx)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -1860,10 +2437,10 @@ cdef class _ArrayDerivative3D:
 
         dx = (self._x[lower_index_x + 1] - self._x[lower_index_x]) / (self._x[lower_index_x + 2] - self._x[lower_index_x + 1])
         dy = (self._y[lower_index_y + 1] - self._y[lower_index_y]) / (self._y[lower_index_y + 2] - self._y[lower_index_y + 1])
-        return (self._f[lower_index_x + 2, lower_index_y + 2, slice_index_z]
-                - self._f[lower_index_x, lower_index_y + 2, slice_index_z]
-                - self._f[lower_index_x + 2, lower_index_y, slice_index_z]
-                + self._f[lower_index_x, lower_index_y, slice_index_z]) / (1. + dx + dy + dx * dy)
+        return (self._value(lower_index_x + 2, lower_index_y + 2, slice_index_z)
+                - self._value(lower_index_x, lower_index_y + 2, slice_index_z)
+                - self._value(lower_index_x + 2, lower_index_y, slice_index_z)
+                + self._value(lower_index_x, lower_index_y, slice_index_z)) / (1. + dx + dy + dx * dy)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -1882,10 +2459,10 @@ cdef class _ArrayDerivative3D:
         For unit square normalisation, dx0 = 1 and dz0 = 1, the denominator simplifies.
         """
 
-        return self._f[lower_index_x + 1, slice_index_y, lower_index_z + 1] \
-               - self._f[lower_index_x, slice_index_y, lower_index_z + 1] \
-               - self._f[lower_index_x + 1, slice_index_y, lower_index_z] \
-               + self._f[lower_index_x, slice_index_y, lower_index_z]
+        return self._value(lower_index_x + 1, slice_index_y, lower_index_z + 1) \
+               - self._value(lower_index_x, slice_index_y, lower_index_z + 1) \
+               - self._value(lower_index_x + 1, slice_index_y, lower_index_z) \
+               + self._value(lower_index_x, slice_index_y, lower_index_z)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -1908,10 +2485,10 @@ cdef class _ArrayDerivative3D:
         cdef double dz
 
         dz = (self._z[lower_index_z + 1] - self._z[lower_index_z]) / (self._z[lower_index_z + 2] - self._z[lower_index_z + 1])
-        return (self._f[lower_index_x + 1, slice_index_y, lower_index_z + 2]
-                - self._f[lower_index_x, slice_index_y, lower_index_z + 2]
-                - self._f[lower_index_x + 1, slice_index_y, lower_index_z]
-                + self._f[lower_index_x, slice_index_y, lower_index_z]) / (1. + dz)
+        return (self._value(lower_index_x + 1, slice_index_y, lower_index_z + 2)
+                - self._value(lower_index_x, slice_index_y, lower_index_z + 2)
+                - self._value(lower_index_x + 1, slice_index_y, lower_index_z)
+                + self._value(lower_index_x, slice_index_y, lower_index_z)) / (1. + dz)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -1935,10 +2512,10 @@ cdef class _ArrayDerivative3D:
         cdef double dx
 
         dx = (self._x[lower_index_x + 1] - self._x[lower_index_x]) / (self._x[lower_index_x + 2] - self._x[lower_index_x + 1])
-        return (self._f[lower_index_x + 2, slice_index_y, lower_index_z + 1]
-                - self._f[lower_index_x, slice_index_y, lower_index_z + 1]
-                - self._f[lower_index_x + 2, slice_index_y, lower_index_z]
-                + self._f[lower_index_x, slice_index_y, lower_index_z]) / (1. + dx)
+        return (self._value(lower_index_x + 2, slice_index_y, lower_index_z + 1)
+                - self._value(lower_index_x, slice_index_y, lower_index_z + 1)
+                - self._value(lower_index_x + 2, slice_index_y, lower_index_z)
+                + self._value(lower_index_x, slice_index_y, lower_index_z)) / (1. + dx)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -1962,10 +2539,10 @@ cdef class _ArrayDerivative3D:
 
         dx = (self._x[lower_index_x + 1] - self._x[lower_index_x]) / (self._x[lower_index_x + 2] - self._x[lower_index_x + 1])
         dz = (self._z[lower_index_z + 1] - self._z[lower_index_z]) / (self._z[lower_index_z + 2] - self._z[lower_index_z + 1])
-        return (self._f[lower_index_x + 2, slice_index_y, lower_index_z + 2]
-                - self._f[lower_index_x, slice_index_y, lower_index_z + 2]
-                - self._f[lower_index_x + 2, slice_index_y, lower_index_z]
-                + self._f[lower_index_x, slice_index_y, lower_index_z]) / (1. + dx + dz + dx * dz)
+        return (self._value(lower_index_x + 2, slice_index_y, lower_index_z + 2)
+                - self._value(lower_index_x, slice_index_y, lower_index_z + 2)
+                - self._value(lower_index_x + 2, slice_index_y, lower_index_z)
+                + self._value(lower_index_x, slice_index_y, lower_index_z)) / (1. + dx + dz + dx * dz)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -1984,10 +2561,10 @@ cdef class _ArrayDerivative3D:
         For unit square normalisation, dy0 = 1 and dz0 = 1, the denominator simplifies.
         """
 
-        return self._f[slice_index_x, lower_index_y + 1, lower_index_z + 1] \
-               - self._f[slice_index_x, lower_index_y, lower_index_z + 1] \
-               - self._f[slice_index_x, lower_index_y + 1, lower_index_z] \
-               + self._f[slice_index_x, lower_index_y, lower_index_z]
+        return self._value(slice_index_x, lower_index_y + 1, lower_index_z + 1) \
+               - self._value(slice_index_x, lower_index_y, lower_index_z + 1) \
+               - self._value(slice_index_x, lower_index_y + 1, lower_index_z) \
+               + self._value(slice_index_x, lower_index_y, lower_index_z)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -2011,10 +2588,10 @@ cdef class _ArrayDerivative3D:
         cdef double dz
 
         dz = (self._z[lower_index_z + 1] - self._z[lower_index_z]) / (self._z[lower_index_z + 2] - self._z[lower_index_z + 1])
-        return (self._f[slice_index_x, lower_index_y + 1, lower_index_z + 2]
-                - self._f[slice_index_x, lower_index_y, lower_index_z + 2]
-                - self._f[slice_index_x, lower_index_y + 1, lower_index_z]
-                + self._f[slice_index_x, lower_index_y, lower_index_z]) / (1. + dz)
+        return (self._value(slice_index_x, lower_index_y + 1, lower_index_z + 2)
+                - self._value(slice_index_x, lower_index_y, lower_index_z + 2)
+                - self._value(slice_index_x, lower_index_y + 1, lower_index_z)
+                + self._value(slice_index_x, lower_index_y, lower_index_z)) / (1. + dz)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -2038,10 +2615,10 @@ cdef class _ArrayDerivative3D:
         cdef double dy
 
         dy = (self._y[lower_index_y + 1] - self._y[lower_index_y]) / (self._y[lower_index_y + 2] - self._y[lower_index_y + 1])
-        return (self._f[slice_index_x, lower_index_y + 2, lower_index_z + 1]
-                - self._f[slice_index_x, lower_index_y, lower_index_z + 1]
-                - self._f[slice_index_x, lower_index_y + 2, lower_index_z]
-                + self._f[slice_index_x, lower_index_y, lower_index_z]) / (1. + dy)
+        return (self._value(slice_index_x, lower_index_y + 2, lower_index_z + 1)
+                - self._value(slice_index_x, lower_index_y, lower_index_z + 1)
+                - self._value(slice_index_x, lower_index_y + 2, lower_index_z)
+                + self._value(slice_index_x, lower_index_y, lower_index_z)) / (1. + dy)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -2064,10 +2641,10 @@ cdef class _ArrayDerivative3D:
 
         dy = (self._y[lower_index_y + 1] - self._y[lower_index_y]) / (self._y[lower_index_y + 2] - self._y[lower_index_y + 1])
         dz = (self._z[lower_index_z + 1] - self._z[lower_index_z]) / (self._z[lower_index_z + 2] - self._z[lower_index_z + 1])
-        return (self._f[slice_index_x, lower_index_y + 2, lower_index_z + 2]
-                - self._f[slice_index_x, lower_index_y, lower_index_z + 2]
-                - self._f[slice_index_x, lower_index_y + 2, lower_index_z]
-                + self._f[slice_index_x, lower_index_y, lower_index_z]) / (1. + dy + dz + dy * dz)
+        return (self._value(slice_index_x, lower_index_y + 2, lower_index_z + 2)
+                - self._value(slice_index_x, lower_index_y, lower_index_z + 2)
+                - self._value(slice_index_x, lower_index_y + 2, lower_index_z)
+                + self._value(slice_index_x, lower_index_y, lower_index_z)) / (1. + dy + dz + dy * dz)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -2093,14 +2670,14 @@ cdef class _ArrayDerivative3D:
         dx1 = (self._x[lower_index_x + 1] - self._x[lower_index_x]) / (self._x[lower_index_x + 2] - self._x[lower_index_x + 1])
         dy1 = (self._y[lower_index_y + 1] - self._y[lower_index_y]) / (self._y[lower_index_y + 2] - self._y[lower_index_y + 1])
         dz1 = (self._z[lower_index_z + 1] - self._z[lower_index_z]) / (self._z[lower_index_z + 2] - self._z[lower_index_z + 1])
-        return (self._f[lower_index_x + 2, lower_index_y + 2, lower_index_z + 2]
-                - self._f[lower_index_x, lower_index_y + 2, lower_index_z + 2]
-                - self._f[lower_index_x + 2, lower_index_y, lower_index_z + 2]
-                + self._f[lower_index_x, lower_index_y, lower_index_z + 2]
-                - self._f[lower_index_x + 2, lower_index_y + 2, lower_index_z]
-                + self._f[lower_index_x, lower_index_y + 2, lower_index_z]
-                + self._f[lower_index_x + 2, lower_index_y, lower_index_z]
-                - self._f[lower_index_x, lower_index_y, lower_index_z]) / (1. + dx1 + dy1 + dz1 + dx1 * dy1 + dx1 * dz1 + dy1 * dz1 + dx1 * dy1 * dz1)
+        return (self._value(lower_index_x + 2, lower_index_y + 2, lower_index_z + 2)
+                - self._value(lower_index_x, lower_index_y + 2, lower_index_z + 2)
+                - self._value(lower_index_x + 2, lower_index_y, lower_index_z + 2)
+                + self._value(lower_index_x, lower_index_y, lower_index_z + 2)
+                - self._value(lower_index_x + 2, lower_index_y + 2, lower_index_z)
+                + self._value(lower_index_x, lower_index_y + 2, lower_index_z)
+                + self._value(lower_index_x + 2, lower_index_y, lower_index_z)
+                - self._value(lower_index_x, lower_index_y, lower_index_z)) / (1. + dx1 + dy1 + dz1 + dx1 * dy1 + dx1 * dz1 + dy1 * dz1 + dx1 * dy1 * dz1)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -2127,14 +2704,14 @@ cdef class _ArrayDerivative3D:
 
         dy1 = (self._y[lower_index_y + 1] - self._y[lower_index_y]) / (self._y[lower_index_y + 2] - self._y[lower_index_y + 1])
         dz1 = (self._z[lower_index_z + 1] - self._z[lower_index_z]) / (self._z[lower_index_z + 2] - self._z[lower_index_z + 1])
-        return (self._f[lower_index_x + 1, lower_index_y + 2, lower_index_z + 2]
-                - self._f[lower_index_x, lower_index_y + 2, lower_index_z + 2]
-                - self._f[lower_index_x + 1, lower_index_y, lower_index_z + 2]
-                + self._f[lower_index_x, lower_index_y, lower_index_z + 2]
-                - self._f[lower_index_x + 1, lower_index_y + 2, lower_index_z]
-                + self._f[lower_index_x, lower_index_y + 2, lower_index_z]
-                + self._f[lower_index_x + 1, lower_index_y, lower_index_z]
-                - self._f[lower_index_x, lower_index_y, lower_index_z]) / (1. + dy1 + dz1 + dy1 * dz1)
+        return (self._value(lower_index_x + 1, lower_index_y + 2, lower_index_z + 2)
+                - self._value(lower_index_x, lower_index_y + 2, lower_index_z + 2)
+                - self._value(lower_index_x + 1, lower_index_y, lower_index_z + 2)
+                + self._value(lower_index_x, lower_index_y, lower_index_z + 2)
+                - self._value(lower_index_x + 1, lower_index_y + 2, lower_index_z)
+                + self._value(lower_index_x, lower_index_y + 2, lower_index_z)
+                + self._value(lower_index_x + 1, lower_index_y, lower_index_z)
+                - self._value(lower_index_x, lower_index_y, lower_index_z)) / (1. + dy1 + dz1 + dy1 * dz1)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -2161,14 +2738,14 @@ cdef class _ArrayDerivative3D:
 
         dx1 = (self._x[lower_index_x + 1] - self._x[lower_index_x]) / (self._x[lower_index_x + 2] - self._x[lower_index_x + 1])
         dz1 = (self._z[lower_index_z + 1] - self._z[lower_index_z]) / (self._z[lower_index_z + 2] - self._z[lower_index_z + 1])
-        return (self._f[lower_index_x + 2, lower_index_y + 1, lower_index_z + 2]
-                - self._f[lower_index_x, lower_index_y + 1, lower_index_z + 2]
-                - self._f[lower_index_x + 2, lower_index_y, lower_index_z + 2]
-                + self._f[lower_index_x, lower_index_y, lower_index_z + 2]
-                - self._f[lower_index_x + 2, lower_index_y + 1, lower_index_z]
-                + self._f[lower_index_x, lower_index_y + 1, lower_index_z]
-                + self._f[lower_index_x + 2, lower_index_y, lower_index_z]
-                - self._f[lower_index_x, lower_index_y, lower_index_z]) / (1. + dx1 + dz1 + dx1 * dz1)
+        return (self._value(lower_index_x + 2, lower_index_y + 1, lower_index_z + 2)
+                - self._value(lower_index_x, lower_index_y + 1, lower_index_z + 2)
+                - self._value(lower_index_x + 2, lower_index_y, lower_index_z + 2)
+                + self._value(lower_index_x, lower_index_y, lower_index_z + 2)
+                - self._value(lower_index_x + 2, lower_index_y + 1, lower_index_z)
+                + self._value(lower_index_x, lower_index_y + 1, lower_index_z)
+                + self._value(lower_index_x + 2, lower_index_y, lower_index_z)
+                - self._value(lower_index_x, lower_index_y, lower_index_z)) / (1. + dx1 + dz1 + dx1 * dz1)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -2195,14 +2772,14 @@ cdef class _ArrayDerivative3D:
 
         dx1 = (self._x[lower_index_x + 1] - self._x[lower_index_x]) / (self._x[lower_index_x + 2] - self._x[lower_index_x + 1])
         dy1 = (self._y[lower_index_y + 1] - self._y[lower_index_y]) / (self._y[lower_index_y + 2] - self._y[lower_index_y + 1])
-        return (self._f[lower_index_x + 2, lower_index_y + 2, lower_index_z + 1]
-                - self._f[lower_index_x, lower_index_y + 2, lower_index_z + 1]
-                - self._f[lower_index_x + 2, lower_index_y, lower_index_z + 1]
-                + self._f[lower_index_x, lower_index_y, lower_index_z + 1]
-                - self._f[lower_index_x + 2, lower_index_y + 2, lower_index_z]
-                + self._f[lower_index_x, lower_index_y + 2, lower_index_z]
-                + self._f[lower_index_x + 2, lower_index_y, lower_index_z]
-                - self._f[lower_index_x, lower_index_y, lower_index_z]) / (1. + dx1 + dy1 + dx1 * dy1)
+        return (self._value(lower_index_x + 2, lower_index_y + 2, lower_index_z + 1)
+                - self._value(lower_index_x, lower_index_y + 2, lower_index_z + 1)
+                - self._value(lower_index_x + 2, lower_index_y, lower_index_z + 1)
+                + self._value(lower_index_x, lower_index_y, lower_index_z + 1)
+                - self._value(lower_index_x + 2, lower_index_y + 2, lower_index_z)
+                + self._value(lower_index_x, lower_index_y + 2, lower_index_z)
+                + self._value(lower_index_x + 2, lower_index_y, lower_index_z)
+                - self._value(lower_index_x, lower_index_y, lower_index_z)) / (1. + dx1 + dy1 + dx1 * dy1)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -2228,14 +2805,14 @@ cdef class _ArrayDerivative3D:
         cdef double dz1
 
         dz1 = (self._z[lower_index_z + 1] - self._z[lower_index_z]) / (self._z[lower_index_z + 2] - self._z[lower_index_z + 1])
-        return (self._f[lower_index_x + 1, lower_index_y + 1, lower_index_z + 2]
-                - self._f[lower_index_x, lower_index_y + 1, lower_index_z + 2]
-                - self._f[lower_index_x + 1, lower_index_y, lower_index_z + 2]
-                + self._f[lower_index_x, lower_index_y, lower_index_z + 2]
-                - self._f[lower_index_x + 1, lower_index_y + 1, lower_index_z]
-                + self._f[lower_index_x, lower_index_y + 1, lower_index_z]
-                + self._f[lower_index_x + 1, lower_index_y, lower_index_z]
-                - self._f[lower_index_x, lower_index_y, lower_index_z]) / (1. + dz1)
+        return (self._value(lower_index_x + 1, lower_index_y + 1, lower_index_z + 2)
+                - self._value(lower_index_x, lower_index_y + 1, lower_index_z + 2)
+                - self._value(lower_index_x + 1, lower_index_y, lower_index_z + 2)
+                + self._value(lower_index_x, lower_index_y, lower_index_z + 2)
+                - self._value(lower_index_x + 1, lower_index_y + 1, lower_index_z)
+                + self._value(lower_index_x, lower_index_y + 1, lower_index_z)
+                + self._value(lower_index_x + 1, lower_index_y, lower_index_z)
+                - self._value(lower_index_x, lower_index_y, lower_index_z)) / (1. + dz1)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -2261,14 +2838,14 @@ cdef class _ArrayDerivative3D:
         cdef double dy1
 
         dy1 = (self._y[lower_index_y + 1] - self._y[lower_index_y]) / (self._y[lower_index_y + 2] - self._y[lower_index_y + 1])
-        return (self._f[lower_index_x + 1, lower_index_y + 2, lower_index_z + 1]
-                - self._f[lower_index_x, lower_index_y + 2, lower_index_z + 1]
-                - self._f[lower_index_x + 1, lower_index_y, lower_index_z + 1]
-                + self._f[lower_index_x, lower_index_y, lower_index_z + 1]
-                - self._f[lower_index_x + 1, lower_index_y + 2, lower_index_z]
-                + self._f[lower_index_x, lower_index_y + 2, lower_index_z]
-                + self._f[lower_index_x + 1, lower_index_y, lower_index_z]
-                - self._f[lower_index_x, lower_index_y, lower_index_z]) / (1. + dy1)
+        return (self._value(lower_index_x + 1, lower_index_y + 2, lower_index_z + 1)
+                - self._value(lower_index_x, lower_index_y + 2, lower_index_z + 1)
+                - self._value(lower_index_x + 1, lower_index_y, lower_index_z + 1)
+                + self._value(lower_index_x, lower_index_y, lower_index_z + 1)
+                - self._value(lower_index_x + 1, lower_index_y + 2, lower_index_z)
+                + self._value(lower_index_x, lower_index_y + 2, lower_index_z)
+                + self._value(lower_index_x + 1, lower_index_y, lower_index_z)
+                - self._value(lower_index_x, lower_index_y, lower_index_z)) / (1. + dy1)
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -2294,14 +2871,14 @@ cdef class _ArrayDerivative3D:
         cdef double dx1
 
         dx1 = (self._x[lower_index_x + 1] - self._x[lower_index_x]) / (self._x[lower_index_x + 2] - self._x[lower_index_x + 1])
-        return (self._f[lower_index_x + 2, lower_index_y + 1, lower_index_z + 1]
-                - self._f[lower_index_x, lower_index_y + 1, lower_index_z + 1]
-                - self._f[lower_index_x + 2, lower_index_y, lower_index_z + 1]
-                + self._f[lower_index_x, lower_index_y, lower_index_z + 1]
-                - self._f[lower_index_x + 2, lower_index_y + 1, lower_index_z]
-                + self._f[lower_index_x, lower_index_y + 1, lower_index_z]
-                + self._f[lower_index_x + 2, lower_index_y, lower_index_z]
-                - self._f[lower_index_x, lower_index_y, lower_index_z]) / (1. + dx1)
+        return (self._value(lower_index_x + 2, lower_index_y + 1, lower_index_z + 1)
+                - self._value(lower_index_x, lower_index_y + 1, lower_index_z + 1)
+                - self._value(lower_index_x + 2, lower_index_y, lower_index_z + 1)
+                + self._value(lower_index_x, lower_index_y, lower_index_z + 1)
+                - self._value(lower_index_x + 2, lower_index_y + 1, lower_index_z)
+                + self._value(lower_index_x, lower_index_y + 1, lower_index_z)
+                + self._value(lower_index_x + 2, lower_index_y, lower_index_z)
+                - self._value(lower_index_x, lower_index_y, lower_index_z)) / (1. + dx1)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -2322,15 +2899,27 @@ cdef class _ArrayDerivative3D:
         For unit square normalisation, dy0 = 1, dz0 = 1 and dx0 = 1, the denominator simplifies.
         """
 
-        return self._f[lower_index_x + 1, lower_index_y + 1, lower_index_z + 1] \
-               - self._f[lower_index_x, lower_index_y + 1, lower_index_z + 1] \
-               - self._f[lower_index_x + 1, lower_index_y, lower_index_z + 1] \
-               + self._f[lower_index_x, lower_index_y, lower_index_z + 1] \
-               - self._f[lower_index_x + 1, lower_index_y + 1, lower_index_z] \
-               + self._f[lower_index_x, lower_index_y + 1, lower_index_z] \
-               + self._f[lower_index_x + 1, lower_index_y, lower_index_z] \
-               - self._f[lower_index_x, lower_index_y, lower_index_z]
+        return self._value(lower_index_x + 1, lower_index_y + 1, lower_index_z + 1) \
+               - self._value(lower_index_x, lower_index_y + 1, lower_index_z + 1) \
+               - self._value(lower_index_x + 1, lower_index_y, lower_index_z + 1) \
+               + self._value(lower_index_x, lower_index_y, lower_index_z + 1) \
+               - self._value(lower_index_x + 1, lower_index_y + 1, lower_index_z) \
+               + self._value(lower_index_x, lower_index_y + 1, lower_index_z) \
+               + self._value(lower_index_x + 1, lower_index_y, lower_index_z) \
+               - self._value(lower_index_x, lower_index_y, lower_index_z)
+
 
+id_to_cache = {
+    'lazy': CACHE_LAZY,
+    'lru': CACHE_LRU,
+    'eager': CACHE_EAGER,
+    'none': CACHE_NONE
+}
+
+id_to_storage = {
+    'float64': np.float64,
+    'float32': np.float32
+}
 
 id_to_interpolator = {
     _Interpolator3DLinear.ID: _Interpolator3DLinear,
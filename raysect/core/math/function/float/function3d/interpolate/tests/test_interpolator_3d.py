@@ -33,6 +33,7 @@ Unit tests for array interpolation (not mesh) from within Interpolate3DArray,
 including interaction with internal extrapolators.
 """
 import unittest
+import pickle
 import numpy as np
 from raysect.core.math.function.float.function3d.interpolate.interpolator3darray import Interpolator3DArray, \
     id_to_extrapolator, id_to_interpolator
@@ -841,3 +842,124 @@ class TestInterpolators3D(unittest.TestCase):
                                           f'{fx_str_short}, {fy_str_short}, {fz_str_short})'
 
                             self.initialise_tests_on_interpolators(x[i], y[j], z[k], f[i2], problem_str=problem_str)
+
+    def test_cubic_cache_types(self):
+        """
+        The cubic coefficient cache types must reproduce the results of the default lazy cache exactly.
+        """
+
+        x, y, z = np.meshgrid(self.x_uneven, self.y_uneven, self.z_uneven, indexing='ij')
+        f = np.sin(3 * x) * np.cos(2 * y) * np.exp(z) + x * y * z
+        reference = Interpolator3DArray(self.x_uneven, self.y_uneven, self.z_uneven, f, 'cubic', 'linear',
+                                        EXTRAPOLATION_RANGE, EXTRAPOLATION_RANGE, EXTRAPOLATION_RANGE)
+
+        # random samples inside the domain and in the extrapolation region, evaluated twice to exercise cache hits
+        rng = np.random.default_rng(7)
+        samples = rng.uniform(X_LOWER - 0.5 * EXTRAPOLATION_RANGE, X_UPPER + 0.5 * EXTRAPOLATION_RANGE, (500, 3))
+        samples = np.concatenate((samples, samples[rng.permutation(len(samples))]))
+        expected = [reference(*sample) for sample in samples]
+
+        for cache_type, cache_size in [('lazy', 65536), ('eager', 65536), ('none', 65536), ('lru', 1), ('lru', 10), ('lru', 65536)]:
+            interpolator = Interpolator3DArray(self.x_uneven, self.y_uneven, self.z_uneven, f, 'cubic', 'linear',
+                                               EXTRAPOLATION_RANGE, EXTRAPOLATION_RANGE, EXTRAPOLATION_RANGE,
+                                               cache_type=cache_type, cache_size=cache_size)
+            restored = pickle.loads(pickle.dumps(interpolator))
+            for interpolator in (interpolator, restored):
+                for sample, value in zip(samples, expected):
+                    self.assertEqual(interpolator(*sample), value, msg=f'Cache type {cache_type} ({cache_size}) differs at {sample}.')
+
+        # the cache type is ignored by the linear interpolator
+        Interpolator3DArray(self.x_uneven, self.y_uneven, self.z_uneven, f, 'linear', 'none', 0.0, 0.0, 0.0, cache_type='none')
+
+        with self.assertRaises(ValueError):
+            Interpolator3DArray(self.x_uneven, self.y_uneven, self.z_uneven, f, 'cubic', 'none', 0.0, 0.0, 0.0, cache_type='unknown')
+
+        with self.assertRaises(ValueError):
+            Interpolator3DArray(self.x_uneven, self.y_uneven, self.z_uneven, f, 'cubic', 'none', 0.0, 0.0, 0.0, cache_type='lru', cache_size=0)
+
+    def test_storage_types(self):
+        """
+        Single precision storage must match double precision storage of the rounded data, read only data must not be copied.
+        """
+
+        x, y, z = np.meshgrid(self.x_uneven, self.y_uneven, self.z_uneven, indexing='ij')
+        f = np.sin(3 * x) * np.cos(2 * y) * np.exp(z) + x * y * z
+        f_rounded = f.astype(np.float32).astype(np.float64)
+
+        rng = np.random.default_rng(7)
+        samples = rng.uniform(X_LOWER - 0.5 * EXTRAPOLATION_RANGE, X_UPPER + 0.5 * EXTRAPOLATION_RANGE, (500, 3))
+
+        for interpolation_type in ('linear', 'cubic'):
+            reference = Interpolator3DArray(self.x_uneven, self.y_uneven, self.z_uneven, f_rounded, interpolation_type, 'linear',
+                                            EXTRAPOLATION_RANGE, EXTRAPOLATION_RANGE, EXTRAPOLATION_RANGE)
+            interpolator = Interpolator3DArray(self.x_uneven, self.y_uneven, self.z_uneven, f, interpolation_type, 'linear',
+                                               EXTRAPOLATION_RANGE, EXTRAPOLATION_RANGE, EXTRAPOLATION_RANGE, storage_type='float32')
+            restored = pickle.loads(pickle.dumps(interpolator))
+            for interpolator in (interpolator, restored):
+                for sample in samples:
+                    self.assertEqual(interpolator(*sample), reference(*sample), msg=f'Storage type float32 ({interpolation_type}) differs at {sample}.')
+
+        # writeable data is copied, read only data of the storage type is used directly
+        for dtype, storage_type in ((np.float64, 'float64'), (np.float32, 'float32')):
+            data = f.astype(dtype)
+            interpolator_copy = Interpolator3DArray(self.x_uneven, self.y_uneven, self.z_uneven, data, 'linear', 'none',
+                                                    0.0, 0.0, 0.0, storage_type=storage_type)
+            view = data.view()
+            view.flags.writeable = False
+            interpolator_view = Interpolator3DArray(self.x_uneven, self.y_uneven, self.z_uneven, view, 'linear', 'none',
+                                                    0.0, 0.0, 0.0, storage_type=storage_type)
+            original = float(data[0, 0, 0])
+            data[0, 0, 0] += 1.0
+            point = (self.x_uneven[0], self.y_uneven[0], self.z_uneven[0])
+            self.assertEqual(interpolator_copy(*point), original)
+            self.assertEqual(interpolator_view(*point), float(data[0, 0, 0]))
+            self.assertTrue(data.flags.writeable)
+
+        with self.assertRaises(ValueError):
+            Interpolator3DArray(self.x_uneven, self.y_uneven, self.z_uneven, f, 'linear', 'none', 0.0, 0.0, 0.0, storage_type='float16')
+
+    def test_evaluate_gradient(self):
+        """
+        The gradient must match a finite difference of the interpolator and the value must match a plain evaluation.
+        """
+
+        x, y, z = np.meshgrid(self.x_uneven, self.y_uneven, self.z_uneven, indexing='ij')
+        f = np.sin(3 * x) * np.cos(2 * y) * np.cos(z) + x * y * z
+
+        # points inside every other cell (away from the knots) and in the extrapolation regions
+        def sample_points(knots):
+            return np.concatenate(([knots[0] - 0.3], (knots[:-1] + 0.37 * np.diff(knots))[::2], [knots[-1] + 0.3]))
+
+        xsamples, ysamples, zsamples = np.meshgrid(sample_points(self.x_uneven), sample_points(self.y_uneven),
+                                                   sample_points(self.z_uneven), indexing='ij')
+        xsamples = xsamples.ravel()
+        ysamples = ysamples.ravel()
+        zsamples = zsamples.ravel()
+        delta = 1e-6
+
+        for interpolation_type in ('linear', 'cubic'):
+            for extrapolation_type in ('nearest', 'linear'):
+                interpolator = Interpolator3DArray(self.x_uneven, self.y_uneven, self.z_uneven, f, interpolation_type,
+                                                   extrapolation_type, EXTRAPOLATION_RANGE, EXTRAPOLATION_RANGE,
+                                                   EXTRAPOLATION_RANGE)
+                values, df_dx, df_dy, df_dz = interpolator.evaluate_gradient_array(xsamples, ysamples, zsamples)
+                for i, (px, py, pz) in enumerate(zip(xsamples, ysamples, zsamples)):
+                    msg = f'Gradient ({interpolation_type}, {extrapolation_type}) differs at ({px}, {py}, {pz}).'
+                    self.assertEqual(interpolator.evaluate_gradient(px, py, pz), (values[i], df_dx[i], df_dy[i], df_dz[i]), msg=msg)
+                    self.assertEqual(values[i], interpolator(px, py, pz), msg=msg)
+                    fd_x = (interpolator(px + delta, py, pz) - interpolator(px - delta, py, pz)) / (2 * delta)
+                    fd_y = (interpolator(px, py + delta, pz) - interpolator(px, py - delta, pz)) / (2 * delta)
+                    fd_z = (interpolator(px, py, pz + delta) - interpolator(px, py, pz - delta)) / (2 * delta)
+                    self.assertAlmostEqual(df_dx[i], fd_x, places=5, msg=msg)
+                    self.assertAlmostEqual(df_dy[i], fd_y, places=5, msg=msg)
+                    self.assertAlmostEqual(df_dz[i], fd_z, places=5, msg=msg)
+
+        # coordinate arrays are broadcast
+        values, df_dx, df_dy, df_dz = interpolator.evaluate_gradient_array(xsamples[:5, np.newaxis], ysamples[np.newaxis, :4], 0.1)
+        for array in (values, df_dx, df_dy, df_dz):
+            self.assertEqual(array.shape, (5, 4))
+        self.assertEqual(values[2, 3], interpolator(xsamples[2], ysamples[3], 0.1))
+
+        interpolator = Interpolator3DArray(self.x_uneven, self.y_uneven, self.z_uneven, f, 'cubic', 'none', 0.0, 0.0, 0.0)
+        with self.assertRaises(ValueError):
+            interpolator.evaluate_gradient(self.x_uneven[0] - 0.1, 0.0, 0.0)
@@ -0,0 +1,133 @@
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Unit tests for the Interpolator3DMesh class.
+"""
+
+import unittest
+import pickle
+from itertools import permutations, product
+import numpy as np
+from raysect.core.math.function.float.function3d.interpolate.interpolator3dmesh import Interpolator3DMesh
+
+
+def unit_cube_mesh(n):
+    """
+    Splits the unit cube into n x n x n cells, each divided into six tetrahedra.
+    """
+
+    axis = np.linspace(0, 1, n + 1)
+    vertices = np.array(list(product(axis, axis, axis)))
+
+    def index(i, j, k):
+        return (i * (n + 1) + j) * (n + 1) + k
+
+    tetrahedra = []
+    for i, j, k in product(range(n), range(n), range(n)):
+        for order in permutations(range(3)):
+
+            # each tetrahedra follows a path along the cell edges from the lowest to the highest corner
+            corner = [i, j, k]
+            tetrahedron = [index(*corner)]
+            for axis_index in order:
+                corner[axis_index] += 1
+                tetrahedron.append(index(*corner))
+            tetrahedra.append(tetrahedron)
+
+    return vertices, np.array(tetrahedra)
+
+
+def linear(x, y, z):
+    return 1.0 + 2.0 * x - 3.0 * y + 0.5 * z
+
+
+class TestInterpolator3DMesh(unittest.TestCase):
+
+    def setUp(self):
+
+        self.vertices, self.tetrahedra = unit_cube_mesh(4)
+        self.data = linear(self.vertices[:, 0], self.vertices[:, 1], self.vertices[:, 2])
+        self.mesh = Interpolator3DMesh(self.vertices, self.data, self.tetrahedra, limit=False, default_value=-1.0)
+
+        rng = np.random.default_rng(3)
+        self.points = rng.uniform(0.001, 0.999, (200, 3))
+
+    def test_interpolation(self):
+
+        # data at the vertices is reproduced
+        for vertex, value in zip(self.vertices, self.data):
+            self.assertAlmostEqual(self.mesh(*vertex), value, delta=1e-12)
+
+        # linear data is interpolated exactly, the points are sorted so consecutive lookups reuse the previous tetrahedra
+        for point in self.points[np.argsort(self.points[:, 0])]:
+            self.assertAlmostEqual(self.mesh(*point), linear(*point), delta=1e-12)
+
+    def test_outside_mesh(self):
+
+        self.assertEqual(self.mesh(1.5, 0.5, 0.5), -1.0)
+
+        mesh = Interpolator3DMesh(self.vertices, self.data, self.tetrahedra)
+        with self.assertRaises(ValueError):
+            mesh(1.5, 0.5, 0.5)
+
+    def test_invalid_vertex_data(self):
+
+        with self.assertRaises(ValueError):
+            Interpolator3DMesh(self.vertices, self.data[:-1], self.tetrahedra)
+
+        with self.assertRaises(ValueError):
+            Interpolator3DMesh.instance(self.mesh, vertex_data=self.data[:-1])
+
+    def test_instance(self):
+
+        data = 2 * self.data
+        mesh = Interpolator3DMesh.instance(self.mesh, vertex_data=data, limit=True)
+
+        for point in self.points:
+            self.assertAlmostEqual(mesh(*point), 2 * linear(*point), delta=1e-12)
+
+        with self.assertRaises(ValueError):
+            mesh(1.5, 0.5, 0.5)
+
+        # settings that are not replaced are copied from the source instance
+        mesh = Interpolator3DMesh.instance(self.mesh)
+        self.assertEqual(mesh(1.5, 0.5, 0.5), -1.0)
+        self.assertEqual(mesh(*self.points[0]), self.mesh(*self.points[0]))
+
+    def test_pickle(self):
+
+        mesh = pickle.loads(pickle.dumps(self.mesh))
+        for point in self.points:
+            self.assertEqual(mesh(*point), self.mesh(*point))
+        self.assertEqual(mesh(1.5, 0.5, 0.5), -1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+from numpy import empty, linspace
+from .base cimport Function3D
+from .autowrap cimport autowrap_function3d, PythonFunction3D
+cimport cython
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef tuple sample3d(object function, double x_min, double x_max, int x_samples, double y_min, double y_max, int y_samples,
+                     double z_min, double z_max, int z_samples):
+    """
+    Samples Function3D over a regular grid.
+
+    :param function: the function to sample. a Function3D object, or a Python function
+    :param x_min: minimum value for x sample range
+    :param x_max: maximum value for x sample range
+    :param x_samples: number of samples between x_min and x_max, where endpoints are included
+    :param y_min: minimum value for y sample range
+    :param y_max: maximum value for y sample range
+    :param y_samples: number of samples between y_min and y_max, where endpoints are included
+    :param z_min: minimum value for z sample range
+    :param z_max: maximum value for z sample range
+    :param z_samples: number of samples between z_min and z_max, where endpoints are included
+    :return: a tuple of sampled x, y and z points and the function samples (x, y, z, f), f has shape
+      (x_samples, y_samples, z_samples)
+    """
+    cdef:
+        double[::1] x_v, y_v, z_v
+        double[:, :, ::1] f_v
+        int i, j, k
+        Function3D func
+
+    if x_min > x_max:
+        raise ValueError(f"x_min ({x_min}) argument cannot be greater than x_max ({x_max})")
+
+    if y_min > y_max:
+        raise ValueError(f"y_min ({y_min}) argument cannot be greater than y_max ({y_max})")
+
+    if z_min > z_max:
+        raise ValueError(f"z_min ({z_min}) argument cannot be greater than z_max ({z_max})")
+
+    if x_samples < 1:
+        raise ValueError("The argument x_samples must be >= 1")
+
+    if y_samples < 1:
+        raise ValueError("The argument y_samples must be >= 1")
+
+    if z_samples < 1:
+        raise ValueError("The argument z_samples must be >= 1")
+
+    # ensures that func is of type Function3D. I.e. if 'function' argument was Python function, it'll get autowrapped
+    # into Function3D object
+    func = autowrap_function3d(function)
+
+    x = linspace(x_min, x_max, x_samples)
+    y = linspace(y_min, y_max, y_samples)
+    z = linspace(z_min, z_max, z_samples)
+
+    # vectorised python functions are evaluated with a single call
+    if isinstance(func, PythonFunction3D) and (<PythonFunction3D> func).vectorised:
+        return x, y, z, func.evaluate_array(x[:, None, None], y[None, :, None], z[None, None, :])
+
+    f = empty((x_samples, y_samples, z_samples))
+
+    # use memory views
+    x_v = x
+    y_v = y
+    z_v = z
+    f_v = f
+
+    for i in range(x_samples):
+        for j in range(y_samples):
+            for k in range(z_samples):
+                f_v[i, j, k] = func.evaluate(x_v[i], y_v[j], z_v[k])
+
+    return x, y, z, f
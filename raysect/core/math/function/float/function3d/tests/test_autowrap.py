@@ -32,6 +32,7 @@ Unit tests for the autowrap_3d function
 """
 
 import unittest
+import numpy as np
 from raysect.core.math.function.float.function3d.autowrap import _autowrap_function3d, PythonFunction3D
 from raysect.core.math.function.float.function3d.constant import Constant3D
 
@@ -44,3 +45,20 @@ class TestAutowrap3D(unittest.TestCase):
     def test_python_function(self):
         function = _autowrap_function3d(lambda x, y, z: 10*x + 5*y + 2*z)
         self.assertIsInstance(function, PythonFunction3D, "Autowrapped function is not a PythonFunction3D.")
+
+    def test_vectorised_python_function(self):
+        calls = []
+
+        def vectorised(x, y, z):
+            calls.append((x, y, z))
+            return x * np.cos(y) + z
+
+        function = PythonFunction3D(vectorised, vectorised=True)
+        x = np.linspace(-2, 2, 11)[:, None, None]
+        y = np.linspace(0, 1, 5)[None, :, None]
+        z = np.linspace(3, 4, 2)[None, None, :]
+        f = function.evaluate_array(x, y, z)
+        self.assertEqual(f.shape, (11, 5, 2))
+        np.testing.assert_array_equal(f, x * np.cos(y) + z)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(function(0.5, 0.25, 1.0), 0.5 * np.cos(0.25) + 1.0)
@@ -33,6 +33,7 @@ Unit tests for the Function3D class.
 
 import math
 import unittest
+import numpy as np
 from raysect.core.math.function.float.function3d.autowrap import PythonFunction3D
 
 # TODO: expand tests to cover the cython interface
@@ -53,6 +54,20 @@ class TestFunction3D(unittest.TestCase):
                 for z in v:
                     self.assertEqual(self.f1(x, y, z), self.ref1(x, y, z), "Function3D call did not match reference function value.")
 
+    def test_evaluate_array(self):
+        v = [-1e10, -7, -0.001, 0.0, 0.00003, 10, 2.3e49]
+        r = 2 * self.f1 + 3
+        x = np.array(v).reshape(7, 1, 1)
+        y = np.array(v).reshape(1, 7, 1)
+        z = 5.0
+        f = r.evaluate_array(x, y, z)
+        self.assertEqual(f.shape, (7, 7, 1))
+        for i, xi in enumerate(v):
+            for j, yj in enumerate(v):
+                self.assertEqual(f[i, j, 0], r(xi, yj, z), "Function3D evaluate_array did not match the scalar evaluation.")
+        with self.assertRaises(ValueError):
+            r.evaluate_array([1, 2, 3], [1, 2], 0)
+
     def test_negate(self):
         v = [-1e10, -7, -0.001, 0.0, 0.00003, 10, 2.3e49]
         r = -self.f1
@@ -0,0 +1,138 @@
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Unit tests for the CompiledFunction3D class.
+"""
+
+import pickle
+import unittest
+from raysect.core.math.function.float.function3d import Arg3D, Constant3D, Blend3D, CompiledFunction3D
+from raysect.core.math.function.float.function3d.cmath import Exp3D, Sin3D, Cos3D, Tan3D, Asin3D, Acos3D, Atan3D, \
+    Atan4Q3D, Sqrt3D, Erf3D
+
+
+class TestCompiledFunction3D(unittest.TestCase):
+
+    def setUp(self):
+
+        self.x = Arg3D('x')
+        self.y = Arg3D('y')
+        self.z = Arg3D('z')
+        self.points = [(-2.5, 0.3, 1.0), (0.0, 0.0, 0.0), (0.7, -1.2, 3.3), (1.0, 2.0, -0.5), (4.2, 0.9, 0.1)]
+
+    def assert_compiled(self, function):
+        """Checks a compiled function returns the same values as the original function."""
+
+        compiled = CompiledFunction3D(function)
+        for x, y, z in self.points:
+            self.assertEqual(compiled(x, y, z), function(x, y, z), msg=f'Compiled function mismatch at ({x}, {y}, {z}).')
+
+    def test_arithmetic(self):
+
+        x, y, z = self.x, self.y, self.z
+        self.assert_compiled(x + y * z - 2)
+        self.assert_compiled(3 - x)
+        self.assert_compiled(-x / (y * y + 1))
+        self.assert_compiled(5 / (z * z + 1))
+        self.assert_compiled(x % 1.5 + 7 % (y * y + 1) + z % (x * x + 1))
+        self.assert_compiled(abs(x - y) ** 1.5 + 2 ** z + (x * x + 1) ** (y * 0.5))
+
+    def test_comparison(self):
+
+        x, y, z = self.x, self.y, self.z
+        self.assert_compiled((x == y) + (x != z) + (x < y) + (x > y) + (x <= 1.0) + (z >= 0.1))
+        self.assert_compiled((y == 0) + (y != 0) + (y < 0) + (y > 0) + (y <= 0) + (y >= 0))
+
+    def test_cmath(self):
+
+        x, y, z = self.x, self.y, self.z
+        self.assert_compiled(3 * Exp3D(-(x - 2) ** 2) + Sin3D(y) * Cos3D(z) + Tan3D(x * 0.1))
+        self.assert_compiled(Asin3D(Sin3D(x)) + Acos3D(Cos3D(y)) + Atan3D(z) + Atan4Q3D(x, y))
+        self.assert_compiled(Sqrt3D(x * x + y * y) + Erf3D(z))
+
+    def test_constant_folding(self):
+
+        x = self.x
+        self.assert_compiled(Constant3D(2) * 3 + Exp3D(Constant3D(1)) * x)
+        self.assert_compiled(Sqrt3D(Constant3D(4)) + Constant3D(1) / Constant3D(8))
+
+    def test_non_compilable_nodes(self):
+
+        x, y, z = self.x, self.y, self.z
+        python_function = lambda x, y, z: x * y - z
+        self.assert_compiled(2 * CompiledFunction3D(x + y) + python_function)
+        self.assert_compiled(Blend3D(x * 2, y + 1, z - 0.5) * 3)
+
+    def test_exceptions(self):
+
+        x, y = self.x, self.y
+
+        # errors in the original function must also be raised by the compiled function
+        cases = [
+            (x / y, ZeroDivisionError),
+            (1 / y, ZeroDivisionError),
+            (x % y, ZeroDivisionError),
+            (5 % y, ZeroDivisionError),
+            ((x - 1) ** 0.5, ValueError),
+            (y ** -1, ZeroDivisionError),
+            (Sqrt3D(x - 1), ValueError),
+            (Asin3D(x + 2), ValueError),
+            (Acos3D(x + 2), ValueError),
+            (Constant3D(1) / Constant3D(0), ZeroDivisionError),
+        ]
+
+        for function, exception in cases:
+            compiled = CompiledFunction3D(function)
+            with self.assertRaises(exception):
+                function(0, 0, 0)
+            with self.assertRaises(exception):
+                compiled(0, 0, 0)
+
+    def test_deep_expression(self):
+
+        # deeply nested right hand operands require an evaluation stack larger than the fixed size buffer
+        function = self.x
+        for i in range(100):
+            function = Constant3D(i) + (self.y * function)
+        self.assert_compiled(function)
+
+    def test_compile_method(self):
+
+        function = 3 * Exp3D(-(self.x - 2) ** 2)
+        compiled = function.compile()
+        self.assertIsInstance(compiled, CompiledFunction3D)
+        self.assertEqual(compiled(2, 0, 0), 3.0)
+
+    def test_pickle(self):
+
+        function = CompiledFunction3D(self.x * self.y + Sin3D(self.z))
+        restored = pickle.loads(pickle.dumps(function))
+        for x, y, z in self.points:
+            self.assertEqual(restored(x, y, z), function(x, y, z))
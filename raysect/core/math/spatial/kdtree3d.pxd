@@ -35,11 +35,12 @@ from raysect.core.math.point cimport Point3D
 from libc.stdint cimport int32_t
 
 # c-structure that represent a kd-tree node
+# (the field order avoids alignment padding, a node occupies 24 bytes on 64 bit platforms)
 cdef struct kdnode:
 
     int32_t type        # LEAF, X_AXIS, Y_AXIS, Z_AXIS
-    double split        # split position
     int32_t count       # upper index (BRANCH), item count (LEAF)
+    double split        # split position
     int32_t *items      # array of item ids
 
 
@@ -67,7 +68,9 @@ cdef class KDTree3DCore:
         int32_t _min_items
         double _hit_cost
         double _empty_bonus
+        double _build_cost
 
+    cdef object _rebuild(self, list items)
     cdef int32_t _build(self, list items, BoundingBox3D bounds, int32_t depth=*)
     cdef tuple _split(self, list items, BoundingBox3D bounds)
     cdef void _get_edges(self, list items, int32_t axis, int32_t *num_edges, edge **edges_ptr)
@@ -77,6 +80,11 @@ cdef class KDTree3DCore:
     cdef int32_t _new_leaf(self, list ids)
     cdef int32_t _new_branch(self, tuple split_solution, int32_t depth)
     cdef int32_t _new_node(self)
+    cdef object _trim_nodes(self)
+    cdef object _refit(self, list items)
+    cdef object _refit_item(self, int32_t id, Item3D item, list leaves)
+    cdef double _tree_cost(self)
+    cdef double _tree_cost_node(self, int32_t id, double *lower, double *upper)
     cpdef bint is_contained(self, Point3D point)
     cdef bint _is_contained(self, Point3D point)
     cdef bint _is_contained_node(self, int32_t id, Point3D point)
@@ -92,6 +100,7 @@ cdef class KDTree3DCore:
     cdef list _items_containing_node(self, int32_t id, Point3D point)
     cdef list _items_containing_branch(self, int32_t id, Point3D point)
     cdef list _items_containing_leaf(self, int32_t id, Point3D point)
+    cdef list _leaf_items(self, int32_t id)
     cdef void _reset(self)
     cdef double _read_double(self, object file)
     cdef int32_t _read_int32(self, object file)
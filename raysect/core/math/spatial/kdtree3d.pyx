@@ -125,9 +125,6 @@ cdef class KDTree3DCore:
     @cython.wraparound(False)
     def __init__(self, list items, int32_t max_depth=0, int32_t min_items=1, double hit_cost=20.0, double empty_bonus=0.2):
 
-        cdef:
-            Item3D item
-
         # sanity check
         if empty_bonus < 0.0 or empty_bonus > 1.0:
             raise ValueError("The empty_bonus cost modifier must lie in the range [0.0, 1.0].")
@@ -144,13 +141,7 @@ cdef class KDTree3DCore:
         if self._max_depth == 0:
             self._max_depth = <int32_t> ceil(8 + 1.3 * log(len(items)))
 
-        # calculate kd-tree bounds
-        self.bounds = BoundingBox3D()
-        for item in items:
-            self.bounds.union(item.box)
-
-        # start build
-        self._build(items, self.bounds)
+        self._rebuild(items)
 
     def __getstate__(self):
         state = io.BytesIO()
@@ -163,6 +154,30 @@ cdef class KDTree3DCore:
     def __reduce__(self):
         return self.__new__, (self.__class__, ), self.__getstate__()
 
+    cdef object _rebuild(self, list items):
+        """
+        Discards any existing tree and builds a new tree from the items.
+
+        :param items: A list of items.
+        """
+
+        cdef Item3D item
+
+        # free existing nodes
+        self._reset()
+
+        # calculate kd-tree bounds
+        self.bounds = BoundingBox3D()
+        for item in items:
+            self.bounds.union(item.box)
+
+        # start build
+        self._build(items, self.bounds)
+        self._trim_nodes()
+
+        # record the tree cost so degradation of the tree by refitting can be identified
+        self._build_cost = self._tree_cost()
+
     cdef int32_t _build(self, list items, BoundingBox3D bounds, int32_t depth=0):
         """
         Extends the kd-Tree by creating a new node.
@@ -485,6 +500,197 @@ cdef class KDTree3DCore:
         self._next_node += 1
         return id
 
+    cdef object _trim_nodes(self):
+        """
+        Releases the node memory allocated beyond the last node.
+
+        The node array grows by doubling during a build, up to half of the
+        allocation may be unused once the build is complete.
+        """
+
+        cdef kdnode *new_nodes = NULL
+
+        if self._next_node == 0 or self._next_node == self._allocated_nodes:
+            return
+
+        new_nodes = <kdnode *> PyMem_Realloc(self._nodes, sizeof(kdnode) * self._next_node)
+        if not new_nodes:
+            raise MemoryError()
+
+        self._nodes = new_nodes
+        self._allocated_nodes = self._next_node
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef object _refit(self, list items):
+        """
+        Redistributes updated items between the leaves of the existing tree.
+
+        The branch split planes are left unchanged, only the tree bounds and
+        the contents of the leaf nodes are recalculated. This is much faster
+        than a full rebuild and is intended for items whose extents have
+        changed by a modest amount (e.g. a deforming mesh). The item ids must
+        remain valid identifiers for the external objects.
+
+        As items move the split planes become less well placed, this may be
+        monitored by comparing _tree_cost() against the cost of the tree when
+        it was built (_build_cost).
+
+        :param items: A list of items.
+        """
+
+        cdef:
+            int32_t id, index, count
+            list leaves, ids
+            Item3D item
+
+        # recalculate kd-tree bounds
+        self.bounds = BoundingBox3D()
+        for item in items:
+            self.bounds.union(item.box)
+
+        # distribute the items between the existing leaves
+        leaves = [None] * self._next_node
+        for id in range(self._next_node):
+            if self._nodes[id].type == LEAF:
+                leaves[id] = []
+
+        for item in items:
+            self._refit_item(ROOT_NODE, item, leaves)
+
+        # replace the leaf contents
+        for id in range(self._next_node):
+
+            if self._nodes[id].type != LEAF:
+                continue
+
+            if self._nodes[id].count > 0:
+                PyMem_Free(self._nodes[id].items)
+                self._nodes[id].items = NULL
+
+            ids = leaves[id]
+            count = len(ids)
+            self._nodes[id].count = count
+            if count > 0:
+                self._nodes[id].items = <int32_t *> PyMem_Malloc(sizeof(int32_t) * count)
+                if not self._nodes[id].items:
+                    self._nodes[id].count = 0
+                    raise MemoryError()
+
+                for index in range(count):
+                    self._nodes[id].items[index] = ids[index]
+
+    cdef object _refit_item(self, int32_t id, Item3D item, list leaves):
+        """
+        Adds the item to the leaves of the sub-tree that overlap the item extent.
+
+        Items are assigned to the lower and upper nodes of each branch using
+        the same rules as the tree construction.
+
+        :param id: Index of node in node array.
+        :param item: The item to add.
+        :param leaves: A list of item id lists, indexed by leaf node id.
+        """
+
+        cdef:
+            int32_t axis
+            double split
+
+        # descend the tree, recursing into the lower node where the item straddles a split
+        while self._nodes[id].type != LEAF:
+
+            axis = self._nodes[id].type
+            split = self._nodes[id].split
+
+            if item.box.lower.get_index(axis) < split:
+                if item.box.upper.get_index(axis) > split:
+                    self._refit_item(id + 1, item, leaves)
+                    id = self._nodes[id].count
+                else:
+                    id = id + 1
+
+            elif item.box.upper.get_index(axis) > split:
+                id = self._nodes[id].count
+
+            else:
+                return
+
+        leaves[id].append(item.id)
+
+    @cython.cdivision(True)
+    cdef double _tree_cost(self):
+        """
+        Estimates the traversal cost of the tree with the surface area heuristic.
+
+        The cost is normalised by the surface area of the tree bounds, it is
+        the expected cost of tracing a ray that intersects the tree bounds.
+
+        :return: The estimated tree cost.
+        """
+
+        cdef:
+            double lower[3]
+            double upper[3]
+            double area
+            int32_t axis
+
+        if self._next_node == 0:
+            return 0.0
+
+        for axis in range(3):
+            lower[axis] = self.bounds.lower.get_index(axis)
+            upper[axis] = self.bounds.upper.get_index(axis)
+
+        area = self.bounds.surface_area()
+        if area == 0.0:
+            return 0.0
+
+        return self._tree_cost_node(ROOT_NODE, lower, upper) / area
+
+    cdef double _tree_cost_node(self, int32_t id, double *lower, double *upper):
+        """
+        Returns the area weighted cost of a node and its descendants.
+
+        :param id: Index of node in node array.
+        :param lower: The lower corner of the node bounds.
+        :param upper: The upper corner of the node bounds.
+        :return: The node cost multiplied by the node surface area.
+        """
+
+        cdef:
+            double dx, dy, dz, area, split, cost
+            double child_lower[3]
+            double child_upper[3]
+            int32_t axis
+
+        dx = upper[0] - lower[0]
+        dy = upper[1] - lower[1]
+        dz = upper[2] - lower[2]
+        area = 2 * (dx * dy + dx * dz + dy * dz)
+
+        if self._nodes[id].type == LEAF:
+            return area * self._nodes[id].count * self._hit_cost
+
+        # refitted trees may have split planes outside the node bounds
+        axis = self._nodes[id].type
+        split = min(max(self._nodes[id].split, lower[axis]), upper[axis])
+
+        # traversal cost
+        cost = area
+
+        # lower node
+        child_lower[0], child_lower[1], child_lower[2] = lower[0], lower[1], lower[2]
+        child_upper[0], child_upper[1], child_upper[2] = upper[0], upper[1], upper[2]
+        child_upper[axis] = split
+        cost += self._tree_cost_node(id + 1, child_lower, child_upper)
+
+        # upper node
+        child_upper[axis] = upper[axis]
+        child_lower[axis] = split
+        cost += self._tree_cost_node(self._nodes[id].count, child_lower, child_upper)
+
+        return cost
+
     cpdef bint is_contained(self, Point3D point):
         """
         Traverses the kd-Tree to identify if the point is contained by an any item.
@@ -836,6 +1042,26 @@ cdef class KDTree3DCore:
         self._allocated_nodes = 0
         self._next_node = 0
 
+    cdef list _leaf_items(self, int32_t id):
+        """
+        Returns the ids of the items held by a leaf node.
+
+        Derived classes that store the leaf contents in a different form must
+        override this method so the tree can be saved.
+
+        :param id: Index of node in node array.
+        :return: List of item ids.
+        """
+
+        cdef:
+            int32_t index
+            list items
+
+        items = []
+        for index in range(self._nodes[id].count):
+            items.append(self._nodes[id].items[index])
+        return items
+
     def __dealloc__(self):
         """
         Frees the memory allocated to store the kd-Tree.
@@ -897,8 +1123,8 @@ cdef class KDTree3DCore:
                 # leaf node
                 file.write(struct.pack("<i", self._nodes[id].type))
                 file.write(struct.pack("<i", self._nodes[id].count))
-                for item in range(self._nodes[id].count):
-                    file.write(struct.pack("<i", self._nodes[id].items[item]))
+                for item in self._leaf_items(id):
+                    file.write(struct.pack("<i", item))
 
             else:
 
@@ -979,6 +1205,8 @@ cdef class KDTree3DCore:
                 self._nodes[id].split = self._read_double(file)
                 self._nodes[id].count = self._read_int32(file)
 
+        self._build_cost = self._tree_cost()
+
         # if we opened a file, we should close it
         if close:
             file.close()
@@ -31,6 +31,7 @@
 
 from raysect.core.scenegraph._nodebase cimport _NodeBase
 from raysect.core.scenegraph.node cimport Node
+from raysect.core.scenegraph.assembly cimport Assembly
 from raysect.core.scenegraph.world cimport World
 from raysect.core.scenegraph.primitive cimport Primitive
 from raysect.core.scenegraph.observer cimport Observer
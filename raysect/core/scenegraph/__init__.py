@@ -1,4 +1,5 @@
 from .node import Node
+from .assembly import Assembly
 from .primitive import Primitive
 from .observer import Observer
 from .world import World
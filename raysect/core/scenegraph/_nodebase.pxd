@@ -43,5 +43,7 @@ cdef class _NodeBase:
     cdef bint _track_modifications
     cdef public dict meta
 
+    cdef bint _defer_update(self, _NodeBase node)
+
 
 
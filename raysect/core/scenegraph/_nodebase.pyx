@@ -110,6 +110,10 @@ cdef class _NodeBase:
 
         else:
 
+            # the root node may defer the update, e.g. during a batch update of the scene-graph
+            if (<_NodeBase> self._parent).root._defer_update(self):
+                return
+
             # is node connecting to a different scenegraph?
             if self.root is not self._parent.root:
 
@@ -171,6 +175,20 @@ cdef class _NodeBase:
 
         pass
 
+    cdef bint _defer_update(self, _NodeBase node):
+        """
+        When implemented by root nodes this method allows the root node to
+        postpone the update of a node in its scene-graph.
+
+        If the root node returns True, the node's update is skipped. The root
+        node is then responsible for calling the node's _update() method at a
+        later time.
+
+        Virtual method call.
+        """
+
+        return False
+
     def _modified(self):
         """
         This method is called when a scene-graph change occurs that modifies
@@ -0,0 +1,144 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+from raysect.core.math cimport AffineMatrix3D
+from raysect.core.scenegraph.primitive cimport Primitive
+
+
+cdef class Assembly(Node):
+    """
+    A scene-graph node that groups primitives into a rigid sub-assembly.
+
+    An Assembly behaves exactly like a Node. However, an acceleration structure
+    that is aware of assemblies, such as the AssemblyKDTree, builds and caches a
+    separate acceleration structure for the primitives below each assembly,
+    expressed in the assembly's co-ordinate space. Moving an assembly, by
+    changing its transform or parent, only requires the top-level acceleration
+    structure to be updated. Assemblies may be nested, each primitive belongs to
+    its nearest assembly.
+
+    Assemblies may be replicated with instance(). The primitives of the new
+    assembly are instances of the original primitives, and an assembly aware
+    acceleration structure shares the cached acceleration structure of the
+    original assembly with its instances.
+
+    Assemblies are ignored by acceleration structures that are not assembly
+    aware, such as the default KDTree.
+
+    :param Node parent: Assigns the Node's parent to the specified scene-graph object.
+    :param AffineMatrix3D transform: Sets the affine transform associated with the Node.
+    :param str name: A string defining the node name.
+
+    .. code-block:: pycon
+
+        >>> from raysect.core import World, Assembly, Point3D, translate
+        >>> from raysect.core.acceleration import AssemblyKDTree
+        >>> from raysect.primitive import Box
+        >>>
+        >>> world = World()
+        >>> world.accelerator = AssemblyKDTree()
+        >>>
+        >>> tile_row = Assembly(world)
+        >>> for i in range(100):
+        >>>     Box(Point3D(i, 0, 0), Point3D(i + 0.9, 1, 0.1), parent=tile_row)
+        >>>
+        >>> # the instance shares the acceleration structure of the original tile row
+        >>> second_row = tile_row.instance(world, translate(0, 2, 0))
+    """
+
+    def __init__(self, object parent=None, AffineMatrix3D transform=None, str name=None):
+
+        self.source = None
+        self._propagating = False
+        self._instanced = False
+        super().__init__(parent, transform, name)
+
+    def _update(self):
+
+        # identify the geometry changes caused by moving the assembly as a whole
+        self._propagating = True
+        try:
+            super()._update()
+        finally:
+            self._propagating = False
+
+    def instance(self, object parent=None, AffineMatrix3D transform=None, str name=None):
+        """
+        Returns a new assembly containing instances of this assembly's primitives.
+
+        The nodes below the assembly are replicated. Primitives are replicated
+        with their instance() method and retain their material. If the transform
+        or name are not specified, those of this assembly are used.
+
+        :param Node parent: The parent of the new assembly (default=None).
+        :param AffineMatrix3D transform: The transform of the new assembly (default=None).
+        :param str name: The name of the new assembly (default=None).
+        :return: A new Assembly.
+        :rtype: Assembly
+        """
+
+        cdef Assembly assembly
+
+        if transform is None:
+            transform = self._transform
+
+        if name is None:
+            name = self._name
+
+        assembly = Assembly(None, transform, name)
+        assembly.source = self.source if self.source is not None else self
+        assembly.source._instanced = True
+        self._replicate(self, assembly)
+        assembly.parent = parent
+        return assembly
+
+    def _replicate(self, Node source, Node target):
+        """
+        Replicates the children of the source node under the target node.
+        """
+
+        for child in source.children:
+
+            if isinstance(child, Primitive) and hasattr(child, "instance"):
+                node = child.instance(target, child.transform, child.material, child.name)
+
+            elif isinstance(child, Assembly):
+                node = child.instance(target)
+
+            elif type(child) is Node:
+                node = Node(target, child.transform, child.name)
+
+            else:
+                raise TypeError("The assembly contains a node of type {} that can not be instanced.".format(type(child).__name__))
+
+            # nested assemblies replicate their own children
+            if not isinstance(child, Assembly):
+                self._replicate(child, node)
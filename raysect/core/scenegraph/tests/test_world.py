@@ -26,3 +26,85 @@
 # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE. 
+
+import unittest
+from raysect.core.scenegraph.world import World
+from raysect.core.scenegraph.node import Node
+from raysect.core.math import Point3D, Vector3D, translate
+from raysect.core.ray import Ray
+from raysect.primitive import Sphere
+
+
+class TestWorld(unittest.TestCase):
+    """Tests the function of the scenegraph World class."""
+
+    def test_register_deregister(self):
+
+        world = World()
+        a = Sphere(1.0, world)
+        b = Sphere(1.0, world)
+        self.assertEqual(world.primitives, [a, b], "World should track both primitives in the order they were added.")
+
+        a.parent = None
+        self.assertEqual(world.primitives, [b], "Detached primitive should be deregistered.")
+
+        b.parent = None
+        self.assertEqual(world.primitives, [], "World primitive list should be empty.")
+
+    def test_batch_update(self):
+
+        world = World()
+        with world.batch_update():
+            node = Node(world)
+            spheres = [Sphere(0.5, node, transform=translate(i, 0, 0)) for i in range(10)]
+            node.transform = translate(0, 0, 5)
+
+            self.assertEqual(world.primitives, [], "Registration should be deferred inside a batch.")
+
+        self.assertEqual(world.primitives, spheres, "Primitives should be registered when the batch exits.")
+        for i, sphere in enumerate(spheres):
+            self.assertEqual(sphere.root, world, "Sphere root should be the world.")
+            self.assertAlmostEqual(sphere.to_root()[0, 3], i, delta=1e-14, msg="Root transform is incorrect.")
+            self.assertAlmostEqual(sphere.to_root()[2, 3], 5, delta=1e-14, msg="Root transform is incorrect.")
+
+        # the accelerator must include the batched primitives
+        intersection = world.hit(Ray(Point3D(3, 0, -10), Vector3D(0, 0, 1)))
+        self.assertIs(intersection.primitive, spheres[3], "Ray should hit the batched primitive.")
+        self.assertAlmostEqual(intersection.ray_distance, 14.5, delta=1e-9, msg="Hit distance is incorrect.")
+
+    def test_batch_update_nested(self):
+
+        world = World()
+        with world.batch_update():
+            a = Sphere(1.0, world)
+            with world.batch_update():
+                b = Sphere(1.0, world)
+            self.assertEqual(world.primitives, [], "Registration should be deferred until the outermost batch exits.")
+        self.assertEqual(world.primitives, [a, b], "Primitives should be registered when the batch exits.")
+
+    def test_batch_update_detach(self):
+
+        world = World()
+        a = Sphere(1.0, world)
+        with world.batch_update():
+            b = Sphere(1.0, world)
+            a.parent = None
+            b.parent = None
+            self.assertEqual(world.primitives, [], "Detached primitives should be deregistered immediately.")
+        self.assertEqual(world.primitives, [], "Detached primitives should not be registered by the batch.")
+        self.assertEqual(b.root, b, "Detached primitive should be its own root.")
+
+    def test_batch_update_move_between_worlds(self):
+
+        world = World()
+        other = World()
+        with world.batch_update():
+            a = Sphere(1.0, world)
+            a.parent = other
+            self.assertEqual(other.primitives, [a], "Other world is not batching and should register immediately.")
+        self.assertEqual(world.primitives, [], "Moved primitive should not be registered with the batching world.")
+        self.assertEqual(other.primitives, [a], "Moved primitive should remain registered with the other world.")
+
+
+if __name__ == "__main__":
+    unittest.main()
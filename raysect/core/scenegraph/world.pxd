@@ -40,12 +40,19 @@ cdef class World(_NodeBase):
 
     cdef:
         bint _rebuild_accelerator
+        bint _reset_accelerator
         Accelerator _accelerator
-        list _primitives
-        list _observers
+        dict _primitives
+        dict _observers
+        int _batch_depth
+        bint _flushing
+        dict _pending_updates
+        dict _pending_changes
 
     cpdef AffineMatrix3D to(self, _NodeBase node)
     cpdef Intersection hit(self, Ray ray)
     cpdef list contains(self, Point3D point)
     cpdef build_accelerator(self, bint force=*)
+    cdef bint _defer_update(self, _NodeBase node)
+    cdef object _flush_updates(self)
 
@@ -29,6 +29,7 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+from contextlib import contextmanager
 from raysect.core.scenegraph.signal import GEOMETRY
 
 from raysect.core.acceleration.kdtree cimport KDTree
@@ -45,6 +46,10 @@ cdef class World(_NodeBase):
     the ray-tracing calculations. The particular acceleration algorithm used is selectable. The default acceleration
     structure is a kd-tree.
 
+    Large scene-graph edits may be grouped with batch_update(). Inside the
+    context, transform recomputation, primitive/observer registration and
+    change notifications are postponed until the context exits.
+
     :param name: A string defining the node name.
     """
 
@@ -52,9 +57,15 @@ cdef class World(_NodeBase):
 
         super().__init__(name)
 
-        self._primitives = list()
-        self._observers = list()
+        # dicts are used as insertion ordered sets, giving O(1) (de)registration
+        self._primitives = dict()
+        self._observers = dict()
+        self._batch_depth = 0
+        self._flushing = False
+        self._pending_updates = dict()
+        self._pending_changes = dict()
         self._rebuild_accelerator = True
+        self._reset_accelerator = True
         self._accelerator = KDTree()
 
     @property
@@ -68,6 +79,7 @@ cdef class World(_NodeBase):
     def accelerator(self, Accelerator accelerator not None):
         self._accelerator = accelerator
         self._rebuild_accelerator = True
+        self._reset_accelerator = True
 
     @property
     def name(self):
@@ -89,7 +101,7 @@ cdef class World(_NodeBase):
 
         :rtype: list
         """
-        return self._primitives
+        return list(self._primitives)
 
     @property
     def observers(self):
@@ -98,7 +110,7 @@ cdef class World(_NodeBase):
 
         :rtype: list
         """
-        return self._observers
+        return list(self._observers)
 
     cpdef AffineMatrix3D to(self, _NodeBase node):
         """
@@ -174,6 +186,11 @@ cdef class World(_NodeBase):
         If the Acceleration object is already in a consistent state this method
         will do nothing unless the force keyword option is set to True.
 
+        Following a change to the scene-graph the Acceleration object is
+        updated, which allows accelerators that cache parts of their structure
+        (such as the AssemblyKDTree) to only rebuild the affected parts. A forced
+        rebuild discards any cached structures.
+
         The Acceleration object is used to accelerate hit() and contains()
         calculations, typically using a spatial sub-division method. If changes are
         made to the scene-graph structure, transforms or to a primitive's
@@ -189,9 +206,102 @@ cdef class World(_NodeBase):
         :param bool force: If set to True, forces rebuilding of acceleration structure.
         """
 
-        if self._rebuild_accelerator or force:
-            self._accelerator.build(self._primitives)
-            self._rebuild_accelerator = False
+        if self._reset_accelerator or force:
+            self._accelerator.build(list(self._primitives))
+        elif self._rebuild_accelerator:
+            self._accelerator.update(list(self._primitives))
+        self._rebuild_accelerator = False
+        self._reset_accelerator = False
+
+    @contextmanager
+    def batch_update(self):
+        """
+        Context manager that defers scene-graph updates until the context exits.
+
+        Attaching, moving or re-transforming many nodes one at a time causes the
+        world to recompute the root transforms of every affected sub-tree, to
+        (de)register each primitive and observer and to process a change
+        notification for every node. Inside a batch_update() context these
+        operations are recorded instead and are performed once, for the
+        top-most modified nodes only, when the context exits.
+
+        While the batch is open, the transforms of modified nodes (relative to
+        the world) and the world's primitive and observer lists are not updated.
+        Nodes detached from the scene-graph are still removed immediately.
+        Batches may be nested, the updates are applied when the outermost
+        context exits.
+
+        .. code-block:: pycon
+
+            >>> world = World()
+            >>> with world.batch_update():
+            ...     for i in range(10000):
+            ...         Sphere(0.1, parent=world, transform=translate(i, 0, 0))
+        """
+
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            try:
+                if self._batch_depth == 1:
+                    self._flush_updates()
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    changes = self._pending_changes
+                    self._pending_changes = dict()
+                    for change in changes:
+                        self._change(self, change)
+
+    cdef bint _defer_update(self, _NodeBase node):
+        """
+        Records the node update if a batch update is in progress.
+        """
+
+        if self._batch_depth == 0 or self._flushing:
+            return False
+
+        self._pending_updates[node] = None
+        return True
+
+    cdef object _flush_updates(self):
+        """
+        Applies the node updates recorded during a batch update.
+
+        Only the top-most pending nodes are updated, the update propagates to
+        their descendants. Nodes that were subsequently moved to a different
+        scene-graph are ignored, they were updated when they were moved.
+        """
+
+        cdef:
+            dict pending
+            _NodeBase node, ancestor
+            bint skip
+
+        pending = self._pending_updates
+        self._pending_updates = dict()
+
+        self._flushing = True
+        try:
+            for node in pending:
+
+                # skip the node if an ancestor is pending or it no longer belongs to this world
+                skip = False
+                ancestor = node
+                while ancestor._parent is not None:
+                    ancestor = ancestor._parent
+                    if ancestor in pending:
+                        skip = True
+                        break
+
+                if skip or ancestor is not self:
+                    continue
+
+                node._update()
+
+        finally:
+            self._flushing = False
 
     def _register(self, _NodeBase node):
         """
@@ -199,11 +309,11 @@ cdef class World(_NodeBase):
         """
 
         if isinstance(node, Primitive):
-            self._primitives.append(node)
+            self._primitives[node] = None
             self._rebuild_accelerator = True
 
         if isinstance(node, Observer):
-            self._observers.append(node)
+            self._observers[node] = None
 
     def _deregister(self, _NodeBase node):
         """
@@ -211,11 +321,11 @@ cdef class World(_NodeBase):
         """
 
         if isinstance(node, Primitive):
-            self._primitives.remove(node)
+            del self._primitives[node]
             self._rebuild_accelerator = True
 
         if isinstance(node, Observer):
-            self._observers.remove(node)
+            del self._observers[node]
 
     def _change(self, _NodeBase node, ChangeSignal change not None):
         """
@@ -232,8 +342,20 @@ cdef class World(_NodeBase):
         GEOMETRY signal is received, the world will be instructed to rebuild
         it's spatial acceleration structures on the next call to any method
         that interacts with the scene-graph geometry.
+
+        The accelerator is notified of each GEOMETRY change as it occurs, so
+        accelerators that cache parts of their structure can identify the
+        affected nodes. During a batch update the signals are collected and
+        each distinct signal is processed once when the batch completes.
         """
 
+        if change is GEOMETRY and node is not self:
+            self._accelerator.notify(node)
+
+        if self._batch_depth > 0:
+            self._pending_changes[change] = None
+            return
+
         if change is GEOMETRY:
             self._rebuild_accelerator = True
 
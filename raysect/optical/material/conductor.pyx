@@ -71,6 +71,10 @@ cdef class Conductor(Material):
         self.index = index
         self.extinction = extinction
 
+    cpdef object precache(self, list slices):
+        self.index.precache(slices)
+        self.extinction.precache(slices)
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
@@ -199,6 +203,10 @@ cdef class RoughConductor(ContinuousBSDF):
             raise ValueError("Surface roughness must lie in the range (0, 1].")
         self._roughness = value
 
+    cpdef object precache(self, list slices):
+        self.index.precache(slices)
+        self.extinction.precache(slices)
+
     @cython.cdivision(True)
     cpdef double pdf(self, Vector3D s_incoming, Vector3D s_outgoing, bint back_face):
 
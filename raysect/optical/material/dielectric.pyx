@@ -149,6 +149,11 @@ cdef class Dielectric(Material):
 
         self.importance = 1.0
 
+    cpdef object precache(self, list slices):
+        self.index.precache(slices)
+        self.external_index.precache(slices)
+        self.transmission.precache(slices)
+
     @cython.cdivision(True)
     cpdef Spectrum evaluate_surface(self, World world, Ray ray, Primitive primitive, Point3D hit_point,
                                     bint exiting, Point3D inside_point, Point3D outside_point,
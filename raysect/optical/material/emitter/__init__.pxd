@@ -33,4 +33,6 @@ from raysect.optical.material.emitter.homogeneous cimport HomogeneousVolumeEmitt
 from raysect.optical.material.emitter.inhomogeneous cimport InhomogeneousVolumeEmitter, VolumeIntegrator, NumericalIntegrator
 from raysect.optical.material.emitter.checkerboard cimport Checkerboard
 from raysect.optical.material.emitter.anisotropic cimport AnisotropicSurfaceEmitter
+from raysect.optical.material.emitter.voxel cimport VoxelVolumeEmitter
+from raysect.optical.material.emitter.tetramesh cimport TetraMeshVolumeEmitter
 
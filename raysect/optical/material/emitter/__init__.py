@@ -33,3 +33,5 @@ from .homogeneous import HomogeneousVolumeEmitter
 from .inhomogeneous import InhomogeneousVolumeEmitter, VolumeIntegrator, NumericalIntegrator
 from .checkerboard import Checkerboard
 from .anisotropic import AnisotropicSurfaceEmitter
+from .voxel import VoxelVolumeEmitter
+from .tetramesh import TetraMeshVolumeEmitter
@@ -90,6 +90,10 @@ cdef class Checkerboard(NullVolume):
         self._width = v
         self._rwidth = 1.0 / v
 
+    cpdef object precache(self, list slices):
+        self.emission_spectrum1.precache(slices)
+        self.emission_spectrum2.precache(slices)
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
@@ -0,0 +1,227 @@
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+import unittest
+import numpy as np
+from itertools import permutations
+from raysect.core import Point3D, Vector3D
+from raysect.primitive import Box
+from raysect.optical import World, Ray, InterpolatedSF
+from raysect.optical.material import TetraMeshVolumeEmitter, VoxelVolumeEmitter
+
+
+LOWER = Point3D(-1, -0.5, 0)
+UPPER = Point3D(1, 1.5, 0.5)
+
+
+def tetrahedralise(shape, removed=None):
+    """
+    Splits a regular grid spanning LOWER to UPPER into a conforming tetrahedral mesh.
+
+    Each cell is divided into six tetrahedra (Freudenthal decomposition). Returns
+    the vertices, tetrahedra and the grid cell index of each tetrahedra. Cells
+    listed in removed are omitted from the mesh.
+    """
+
+    nx, ny, nz = shape
+    x = np.linspace(LOWER.x, UPPER.x, nx + 1)
+    y = np.linspace(LOWER.y, UPPER.y, ny + 1)
+    z = np.linspace(LOWER.z, UPPER.z, nz + 1)
+    vertices = np.array(np.meshgrid(x, y, z, indexing='ij')).reshape(3, -1).T
+
+    def vertex(i, j, k):
+        return (i * (ny + 1) + j) * (nz + 1) + k
+
+    removed = removed or []
+    tetrahedra = []
+    cells = []
+    for i in range(nx):
+        for j in range(ny):
+            for k in range(nz):
+                if (i, j, k) in removed:
+                    continue
+                for order in permutations(range(3)):
+                    corner = [i, j, k]
+                    tetrahedra_vertices = [vertex(*corner)]
+                    for axis in order:
+                        corner[axis] += 1
+                        tetrahedra_vertices.append(vertex(*corner))
+                    tetrahedra.append(tetrahedra_vertices)
+                    cells.append((i, j, k))
+
+    return vertices, np.array(tetrahedra), np.array(cells)
+
+
+class TestTetraMeshVolumeEmitter(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(11)
+
+    def trace(self, material, origin, direction, bins=1):
+
+        world = World()
+        Box(LOWER, UPPER, parent=world, material=material)
+        ray = Ray(origin, direction.normalise(), min_wavelength=400, max_wavelength=700, bins=bins)
+        return ray.trace(world).samples
+
+    def compare(self, tetra_material, voxel_material, bins=1):
+        """Traces rays in random directions through both materials and checks the results agree."""
+
+        for _ in range(20):
+            origin = Point3D(*self.rng.uniform(-3, 3, 3))
+            target = Point3D(*self.rng.uniform((LOWER.x, LOWER.y, LOWER.z), (UPPER.x, UPPER.y, UPPER.z)))
+            direction = origin.vector_to(target)
+            expected = self.trace(voxel_material, origin, direction, bins)
+            samples = self.trace(tetra_material, origin, direction, bins)
+            for index in range(bins):
+                self.assertAlmostEqual(samples[index], expected[index], delta=1e-9 * max(1.0, abs(expected[index])))
+
+    def test_adjacency(self):
+
+        vertices, tetrahedra, cells = tetrahedralise((3, 2, 2))
+        material = TetraMeshVolumeEmitter(vertices, tetrahedra, np.ones(len(tetrahedra)))
+        adjacency = material.adjacency
+
+        # each boundary square of the grid is split into two triangles
+        boundary_squares = 2 * (3 * 2 + 3 * 2 + 2 * 2)
+        self.assertEqual((adjacency == -1).sum(), 2 * boundary_squares)
+
+        # adjacency is symmetric
+        for tetrahedra_id, neighbours in enumerate(adjacency):
+            for neighbour in neighbours:
+                if neighbour >= 0:
+                    self.assertIn(tetrahedra_id, adjacency[neighbour])
+
+    def test_emission(self):
+
+        shape = (4, 3, 2)
+        emission = self.rng.uniform(0, 1, shape)
+        vertices, tetrahedra, cells = tetrahedralise(shape)
+        tetra_emission = emission[cells[:, 0], cells[:, 1], cells[:, 2]]
+
+        self.compare(TetraMeshVolumeEmitter(vertices, tetrahedra, tetra_emission),
+                     VoxelVolumeEmitter(LOWER, UPPER, emission))
+
+    def test_absorption(self):
+
+        shape = (3, 4, 2)
+        emission = self.rng.uniform(0, 1, shape)
+        absorption = self.rng.uniform(0, 3, shape)
+        vertices, tetrahedra, cells = tetrahedralise(shape)
+        tetra_emission = emission[cells[:, 0], cells[:, 1], cells[:, 2]]
+        tetra_absorption = absorption[cells[:, 0], cells[:, 1], cells[:, 2]]
+
+        self.compare(TetraMeshVolumeEmitter(vertices, tetrahedra, tetra_emission, absorption=tetra_absorption),
+                     VoxelVolumeEmitter(LOWER, UPPER, emission, absorption=absorption))
+
+        # wavelength dependent absorption
+        absorption_spectrum = InterpolatedSF([400, 700], [0.5, 2.0])
+        self.compare(TetraMeshVolumeEmitter(vertices, tetrahedra, tetra_emission, absorption=tetra_absorption, absorption_spectrum=absorption_spectrum),
+                     VoxelVolumeEmitter(LOWER, UPPER, emission, absorption=absorption, absorption_spectrum=absorption_spectrum),
+                     bins=3)
+
+    def test_non_convex(self):
+
+        # remove cells to create holes the rays must cross
+        shape = (4, 4, 2)
+        removed = [(1, 1, 0), (1, 1, 1), (2, 2, 0), (2, 1, 1)]
+        emission = self.rng.uniform(0, 1, shape)
+        absorption = self.rng.uniform(0, 3, shape)
+        for cell in removed:
+            emission[cell] = 0
+            absorption[cell] = 0
+
+        vertices, tetrahedra, cells = tetrahedralise(shape, removed)
+        tetra_emission = emission[cells[:, 0], cells[:, 1], cells[:, 2]]
+        tetra_absorption = absorption[cells[:, 0], cells[:, 1], cells[:, 2]]
+
+        self.compare(TetraMeshVolumeEmitter(vertices, tetrahedra, tetra_emission, absorption=tetra_absorption),
+                     VoxelVolumeEmitter(LOWER, UPPER, emission, absorption=absorption))
+
+        # ray through a hole along the x axis
+        material = TetraMeshVolumeEmitter(vertices, tetrahedra, tetra_emission)
+        samples = self.trace(material, Point3D(-2, 0.75, 0.1), Vector3D(1, 0, 0))
+        self.assertAlmostEqual(samples[0], emission[:, 2, 0].sum() * 0.5, delta=1e-8)
+
+    def test_linear(self):
+
+        # linear interpolation reproduces a linear function exactly
+        vertices, tetrahedra, cells = tetrahedralise((3, 3, 2))
+        gradient = np.array([0.3, -0.2, 0.7])
+        emission = vertices @ gradient + 2.0
+        material = TetraMeshVolumeEmitter(vertices, tetrahedra, emission, interpolation='linear')
+
+        origin = Point3D(-2, -1, -0.5)
+        direction = origin.vector_to(Point3D(0.2, 0.3, 0.25)).normalise()
+
+        # ray enters through the base of the box and leaves through a side
+        start = origin + direction * (-origin.z / direction.z)
+        distances = [(UPPER.x - start.x) / direction.x, (UPPER.y - start.y) / direction.y, (UPPER.z - start.z) / direction.z]
+        length = min(distances)
+        mid = start + direction * (0.5 * length)
+        expected = length * (np.dot(gradient, [mid.x, mid.y, mid.z]) + 2.0)
+
+        samples = self.trace(material, origin, direction)
+        self.assertAlmostEqual(samples[0], expected, delta=1e-8 * expected)
+
+    def test_invalid_arguments(self):
+
+        vertices, tetrahedra, cells = tetrahedralise((1, 1, 1))
+        count = len(tetrahedra)
+
+        with self.assertRaises(ValueError):
+            TetraMeshVolumeEmitter(vertices[:, :2], tetrahedra, np.ones(count))
+
+        with self.assertRaises(ValueError):
+            TetraMeshVolumeEmitter(vertices, tetrahedra[:, :3], np.ones(count))
+
+        with self.assertRaises(ValueError):
+            TetraMeshVolumeEmitter(vertices, tetrahedra + len(vertices), np.ones(count))
+
+        with self.assertRaises(ValueError):
+            TetraMeshVolumeEmitter(vertices, tetrahedra, np.ones(count + 1))
+
+        with self.assertRaises(ValueError):
+            TetraMeshVolumeEmitter(vertices, tetrahedra, np.ones(count), absorption=-np.ones(count))
+
+        with self.assertRaises(ValueError):
+            TetraMeshVolumeEmitter(vertices, tetrahedra, np.ones(len(vertices)), absorption=np.ones(count), interpolation='linear')
+
+        with self.assertRaises(ValueError):
+            TetraMeshVolumeEmitter(vertices, tetrahedra, np.ones(count), interpolation='cubic')
+
+        # degenerate tetrahedra
+        flat = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0]])
+        with self.assertRaises(ValueError):
+            TetraMeshVolumeEmitter(flat, [[0, 1, 2, 3]], [1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,240 @@
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+import numpy as np
+from raysect.core import Point3D, Vector3D
+from raysect.primitive import Box
+from raysect.optical import World, Ray, InterpolatedSF
+from raysect.optical.material import VoxelVolumeEmitter
+
+
+LOWER = Point3D(-1, -0.5, 0)
+UPPER = Point3D(1, 1.5, 0.5)
+
+
+def nearest(values, point):
+    """Look up the cell value containing the point."""
+
+    shape = np.array(values.shape)
+    lower = np.array([LOWER.x, LOWER.y, LOWER.z])
+    upper = np.array([UPPER.x, UPPER.y, UPPER.z])
+    index = np.floor((point - lower) / (upper - lower) * shape).astype(int)
+    index = np.clip(index, 0, shape - 1)
+    return values[index[..., 0], index[..., 1], index[..., 2]]
+
+
+def trilinear(values, point):
+    """Trilinearly interpolate vertex values at the point."""
+
+    cells = np.array(values.shape) - 1
+    lower = np.array([LOWER.x, LOWER.y, LOWER.z])
+    upper = np.array([UPPER.x, UPPER.y, UPPER.z])
+    position = (point - lower) / (upper - lower) * cells
+    index = np.clip(np.floor(position).astype(int), 0, cells - 1)
+    f = position - index
+    i, j, k = index[..., 0], index[..., 1], index[..., 2]
+    u, v, w = f[..., 0], f[..., 1], f[..., 2]
+    result = 0
+    for di in (0, 1):
+        for dj in (0, 1):
+            for dk in (0, 1):
+                weight = (u if di else 1 - u) * (v if dj else 1 - v) * (w if dk else 1 - w)
+                result = result + weight * values[i + di, j + dj, k + dk]
+    return result
+
+
+def transfer(origin, direction, length, emission, absorption=None, samples=200000):
+    """Numerically integrate the radiative transfer along a path starting at the observer."""
+
+    origin = np.array(origin)
+    direction = np.array(direction) / np.linalg.norm(direction)
+    step = length / samples
+    t = (np.arange(samples) + 0.5) * step
+    points = origin + t[:, None] * direction
+    e = emission(points)
+    if absorption is None:
+        return np.sum(e) * step
+    a = absorption(points)
+    optical_depth = np.cumsum(a * step) - 0.5 * a * step
+    return np.sum(e * np.exp(-optical_depth)) * step
+
+
+class TestVoxelVolumeEmitter(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(7)
+
+    def trace(self, material, origin, direction, bins=1):
+
+        world = World()
+        Box(LOWER, UPPER, parent=world, material=material)
+        ray = Ray(origin, direction.normalise(), min_wavelength=400, max_wavelength=700, bins=bins)
+        return ray.trace(world).samples
+
+    def test_axis_aligned(self):
+
+        emission = self.rng.uniform(0, 1, (4, 5, 2))
+        material = VoxelVolumeEmitter(LOWER, UPPER, emission)
+
+        # ray along x through cell (:, 2, 1), cells are 0.5 m wide in x
+        samples = self.trace(material, Point3D(-2, 0.5, 0.3), Vector3D(1, 0, 0))
+        self.assertAlmostEqual(samples[0], emission[:, 2, 1].sum() * 0.5, delta=1e-8)
+
+        # reversed direction
+        samples = self.trace(material, Point3D(2, 0.5, 0.3), Vector3D(-1, 0, 0))
+        self.assertAlmostEqual(samples[0], emission[:, 2, 1].sum() * 0.5, delta=1e-8)
+
+    def test_oblique(self):
+
+        emission = self.rng.uniform(0, 1, (7, 6, 5))
+        material = VoxelVolumeEmitter(LOWER, UPPER, emission)
+
+        origin = Point3D(-1.5, -1, -0.25)
+        direction = origin.vector_to(Point3D(1.2, 1.4, 0.45))
+        samples = self.trace(material, origin, direction)
+
+        # the ray enters the grid through the base of the box
+        start = origin + direction.normalise() * (-origin.z / direction.normalise().z)
+        length = self._exit_distance(start, direction.normalise())
+        expected = transfer([start.x, start.y, start.z], [direction.x, direction.y, direction.z], length,
+                            lambda p: nearest(emission, p))
+        self.assertAlmostEqual(samples[0], expected, delta=1e-4 * expected)
+
+    def test_empty_cells(self):
+
+        emission = np.zeros((4, 4, 4))
+        emission[0, 0, 0] = 1.0
+        material = VoxelVolumeEmitter(LOWER, UPPER, emission)
+
+        samples = self.trace(material, Point3D(0.5, 0.5, -1), Vector3D(0, 0, 1))
+        self.assertEqual(samples[0], 0.0)
+
+    def test_absorption(self):
+
+        # homogeneous slab, analytic solution
+        material = VoxelVolumeEmitter(LOWER, UPPER, np.full((3, 3, 3), 2.0), absorption=np.full((3, 3, 3), 4.0))
+        samples = self.trace(material, Point3D(0, 0, -1), Vector3D(0, 0, 1))
+        self.assertAlmostEqual(samples[0], 2.0 / 4.0 * (1 - np.exp(-4.0 * 0.5)), delta=1e-8)
+
+        # inhomogeneous volume, numerical solution
+        emission = self.rng.uniform(0, 1, (5, 4, 6))
+        absorption = self.rng.uniform(0, 3, (5, 4, 6))
+        material = VoxelVolumeEmitter(LOWER, UPPER, emission, absorption=absorption)
+
+        origin = Point3D(1.5, 1.7, 0.4)
+        direction = Vector3D(-1, -0.8, -0.1).normalise()
+        samples = self.trace(material, origin, direction)
+
+        start = origin + direction * ((UPPER.x - origin.x) / direction.x)
+        length = self._exit_distance(start, direction)
+        expected = transfer([start.x, start.y, start.z], [direction.x, direction.y, direction.z], length,
+                            lambda p: nearest(emission, p), lambda p: nearest(absorption, p))
+        self.assertAlmostEqual(samples[0], expected, delta=1e-4 * expected)
+
+    def test_spectral_absorption(self):
+
+        emission = self.rng.uniform(0, 1, (4, 4, 4))
+        absorption = self.rng.uniform(0, 2, (4, 4, 4))
+        emission_spectrum = InterpolatedSF([400, 700], [1.0, 2.0])
+        absorption_spectrum = InterpolatedSF([400, 700], [0.0, 3.0])
+
+        material = VoxelVolumeEmitter(LOWER, UPPER, emission, emission_spectrum=emission_spectrum,
+                                      absorption=absorption, absorption_spectrum=absorption_spectrum)
+        samples = self.trace(material, Point3D(0.1, 0.3, -1), Vector3D(0, 0, 1), bins=3)
+
+        # each bin is equivalent to a grey absorber with a scaled absorption coefficient
+        wavelengths = np.array([450, 550, 650])
+        for index, wavelength in enumerate(wavelengths):
+            grey = VoxelVolumeEmitter(LOWER, UPPER, emission * emission_spectrum(wavelength),
+                                      absorption=absorption * absorption_spectrum(wavelength))
+            expected = self.trace(grey, Point3D(0.1, 0.3, -1), Vector3D(0, 0, 1))[0]
+            self.assertAlmostEqual(samples[index], expected, delta=1e-12)
+
+    def test_linear(self):
+
+        emission = self.rng.uniform(0, 1, (5, 4, 3))
+        material = VoxelVolumeEmitter(LOWER, UPPER, emission, interpolation='linear')
+
+        origin = Point3D(-1.5, -1, -0.25)
+        direction = origin.vector_to(Point3D(1.2, 1.4, 0.45))
+        samples = self.trace(material, origin, direction)
+
+        start = origin + direction.normalise() * (-origin.z / direction.normalise().z)
+        length = self._exit_distance(start, direction.normalise())
+        expected = transfer([start.x, start.y, start.z], [direction.x, direction.y, direction.z], length,
+                            lambda p: trilinear(emission, p))
+        self.assertAlmostEqual(samples[0], expected, delta=1e-6 * expected)
+
+    def test_grid_smaller_than_primitive(self):
+
+        # the grid only covers the upper half of the box in z
+        emission = np.ones((2, 2, 2))
+        material = VoxelVolumeEmitter(Point3D(LOWER.x, LOWER.y, 0.25), UPPER, emission)
+        samples = self.trace(material, Point3D(0, 0, -1), Vector3D(0, 0, 1))
+        self.assertAlmostEqual(samples[0], 0.25, delta=1e-8)
+
+    def test_invalid_arguments(self):
+
+        with self.assertRaises(ValueError):
+            VoxelVolumeEmitter(UPPER, LOWER, np.ones((2, 2, 2)))
+
+        with self.assertRaises(ValueError):
+            VoxelVolumeEmitter(LOWER, UPPER, np.ones((2, 2)))
+
+        with self.assertRaises(ValueError):
+            VoxelVolumeEmitter(LOWER, UPPER, np.ones((2, 2, 2)), absorption=np.ones((2, 2, 3)))
+
+        with self.assertRaises(ValueError):
+            VoxelVolumeEmitter(LOWER, UPPER, np.ones((2, 2, 2)), absorption=-np.ones((2, 2, 2)))
+
+        with self.assertRaises(ValueError):
+            VoxelVolumeEmitter(LOWER, UPPER, np.ones((2, 2, 2)), absorption=np.ones((2, 2, 2)), interpolation='linear')
+
+        with self.assertRaises(ValueError):
+            VoxelVolumeEmitter(LOWER, UPPER, np.ones((1, 2, 2)), interpolation='linear')
+
+        with self.assertRaises(ValueError):
+            VoxelVolumeEmitter(LOWER, UPPER, np.ones((2, 2, 2)), interpolation='cubic')
+
+    def _exit_distance(self, start, direction):
+        """Distance from a point inside the grid to the grid boundary along the direction."""
+
+        distances = []
+        for p, d, lower, upper in zip((start.x, start.y, start.z), (direction.x, direction.y, direction.z),
+                                      (LOWER.x, LOWER.y, LOWER.z), (UPPER.x, UPPER.y, UPPER.z)):
+            if d > 0:
+                distances.append((upper - p) / d)
+            elif d < 0:
+                distances.append((lower - p) / d)
+        return min(distances)
+
+
+if __name__ == "__main__":
+    unittest.main()
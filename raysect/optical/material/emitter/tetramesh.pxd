@@ -0,0 +1,69 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+from numpy cimport ndarray
+from libc.stdint cimport int32_t
+from raysect.core.math.function.float.function3d.interpolate.common cimport MeshKDTree3D
+from raysect.optical cimport World, Primitive, Ray, Spectrum, SpectralFunction, Point3D, AffineMatrix3D
+from raysect.optical.material.material cimport NullSurface
+
+
+cdef class _TetrahedraKDTree(MeshKDTree3D):
+
+    cdef:
+        double[:, :, ::1] _planes_mv
+        int32_t hit_tetrahedra
+        double hit_distance
+
+
+cdef class TetraMeshVolumeEmitter(NullSurface):
+
+    cdef:
+        ndarray _vertices, _tetrahedra
+        ndarray _planes, _adjacency, _linear_coefficients
+        ndarray _emission, _absorption
+        double[:, :, ::1] _planes_mv
+        int32_t[:, ::1] _adjacency_mv
+        double[:, ::1] _linear_coefficients_mv
+        double[::1] _emission_mv
+        double[::1] _absorption_mv
+        bint _linear, _absorbing
+        _TetrahedraKDTree _kdtree
+        SpectralFunction _emission_spectrum
+        SpectralFunction _absorption_spectrum
+
+    cdef int32_t _locate(self, double[3] origin, double[3] direction, double t, double t_end, double *t_entry)
+
+    cdef int32_t _exit_face(self, int32_t tetrahedra, double[3] origin, double[3] direction, double *t_exit) nogil
+
+    cdef double _sample_linear(self, int32_t tetrahedra, double[3] origin, double[3] direction, double t) nogil
+
+    cdef Spectrum _integrate(self, Spectrum spectrum, Ray ray, double[3] origin, double[3] direction, double length)
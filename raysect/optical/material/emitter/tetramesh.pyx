@@ -0,0 +1,608 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import numpy as np
+from raysect.core.ray cimport Ray as CoreRay, new_ray
+from raysect.optical cimport ConstantSF, new_point3d, new_vector3d
+from libc.math cimport exp, expm1, INFINITY
+cimport cython
+
+# a ray must penetrate a tetrahedra by more than this distance to enter it
+cdef const double EPSILON = 1e-9
+
+# the face opposite each tetrahedra vertex
+FACES = np.array([[1, 2, 3], [0, 2, 3], [0, 1, 3], [0, 1, 2]], dtype=np.int32)
+
+
+cdef class _TetrahedraKDTree(MeshKDTree3D):
+    """
+    Tetrahedral mesh kd-tree that identifies the first tetrahedra entered by a ray.
+    """
+
+    def __init__(self, object vertices not None, object tetrahedra not None, double[:, :, ::1] planes not None):
+
+        super().__init__(vertices, tetrahedra)
+        self._planes_mv = planes
+        self.hit_tetrahedra = -1
+        self.hit_distance = INFINITY
+
+    cpdef bint trace(self, CoreRay ray):
+
+        self.hit_tetrahedra = -1
+        self.hit_distance = INFINITY
+        return self._trace(ray)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    @cython.initializedcheck(False)
+    cdef bint _trace_leaf(self, int32_t id, CoreRay ray, double max_range):
+
+        cdef:
+            int32_t index, tetrahedra, face
+            double origin[3]
+            double direction[3]
+            double t_near, t_far, denominator, numerator, t
+
+        origin[0] = ray.origin.x
+        origin[1] = ray.origin.y
+        origin[2] = ray.origin.z
+
+        direction[0] = ray.direction.x
+        direction[1] = ray.direction.y
+        direction[2] = ray.direction.z
+
+        for index in range(self._nodes[id].count):
+
+            tetrahedra = self._nodes[id].items[index]
+
+            # clip the ray against the four (outward facing) face planes
+            t_near = -INFINITY
+            t_far = INFINITY
+            for face in range(4):
+
+                denominator = (self._planes_mv[tetrahedra, face, 0] * direction[0] +
+                               self._planes_mv[tetrahedra, face, 1] * direction[1] +
+                               self._planes_mv[tetrahedra, face, 2] * direction[2])
+
+                numerator = self._planes_mv[tetrahedra, face, 3] - (self._planes_mv[tetrahedra, face, 0] * origin[0] +
+                                                                     self._planes_mv[tetrahedra, face, 1] * origin[1] +
+                                                                     self._planes_mv[tetrahedra, face, 2] * origin[2])
+
+                if denominator > 0:
+                    t_far = min(t_far, numerator / denominator)
+                elif denominator < 0:
+                    t_near = max(t_near, numerator / denominator)
+                elif numerator < 0:
+                    # parallel to and outside the face
+                    t_far = -INFINITY
+
+            if t_near > t_far or t_far <= EPSILON:
+                continue
+
+            # the ray may start inside the tetrahedra
+            t = max(0.0, t_near)
+            if t <= max_range and t < self.hit_distance:
+                self.hit_tetrahedra = tetrahedra
+                self.hit_distance = t
+
+        return self.hit_tetrahedra >= 0
+
+
+cdef class TetraMeshVolumeEmitter(NullSurface):
+    """
+    An emitting and absorbing volume defined on an unstructured tetrahedral mesh.
+
+    The mesh is specified in the local co-ordinate space of the primitive as a
+    set of vertices, supplied as an Nx3 array, and a Mx4 array of vertex
+    indices defining the tetrahedra. The tetrahedra must not overlap. The
+    material should be attached to a primitive that encloses the mesh, the
+    volume of the primitive outside the mesh does not contribute.
+
+    Rays are not sampled at fixed steps. The first tetrahedra entered by a ray
+    is found with a kd-tree, thereafter the ray walks from tetrahedra to
+    tetrahedra across shared faces using a precomputed adjacency table. The
+    kd-tree is only consulted again if the ray leaves the mesh through a
+    boundary face, for example when crossing a hole in a non-convex mesh. The
+    cost of integration is therefore proportional to the number of tetrahedra
+    crossed. The radiative transfer through each tetrahedra is integrated
+    exactly.
+
+    Two interpolation modes are available:
+
+    * 'nearest': the emission and absorption arrays hold a value per
+      tetrahedra, of length M. The values are constant across each tetrahedra.
+    * 'linear': the emission array holds a value per vertex, of length N. The
+      emission is interpolated linearly inside each tetrahedra. Absorption is
+      not supported in this mode.
+
+    The emission spectrum of each tetrahedra is the emission value multiplied
+    by the emission spectrum. Likewise, the absorption coefficient is the
+    absorption value multiplied by the absorption spectrum. If no absorption
+    spectrum is supplied, the absorption is independent of wavelength.
+
+    :param ndarray vertices: An array of vertex coordinates (x, y, z) with shape Nx3.
+    :param ndarray tetrahedra: An array of vertex indices defining the mesh tetrahedra, with shape Mx4.
+    :param ndarray emission: An array of emission values, per tetrahedra or per vertex.
+    :param SpectralFunction emission_spectrum: The emission spectrum scaling the
+      emission values (default = ConstantSF(1.0), i.e. emission values are in W/m^3/str/nm).
+    :param ndarray absorption: An array of absorption coefficients in 1/m, one per
+      tetrahedra (default = None, no absorption).
+    :param SpectralFunction absorption_spectrum: The spectral dependence of the
+      absorption coefficient (default = None, wavelength independent).
+    :param str interpolation: The interpolation mode, 'nearest' or 'linear'
+      (default = 'nearest').
+
+    .. code-block:: pycon
+
+        >>> from raysect.primitive import Box
+        >>> from raysect.optical import World
+        >>> from raysect.optical.material import TetraMeshVolumeEmitter
+        >>>
+        >>> world = World()
+        >>> material = TetraMeshVolumeEmitter(vertices, tetrahedra, emission)
+        >>> box = Box(lower, upper, parent=world, material=material)
+    """
+
+    def __init__(self, object vertices not None, object tetrahedra not None, object emission not None,
+                 SpectralFunction emission_spectrum=None, object absorption=None,
+                 SpectralFunction absorption_spectrum=None, str interpolation='nearest'):
+
+        super().__init__()
+
+        if interpolation == 'nearest':
+            self._linear = False
+        elif interpolation == 'linear':
+            self._linear = True
+        else:
+            raise ValueError("The interpolation mode must be either 'nearest' or 'linear'.")
+
+        vertices = np.array(vertices, dtype=np.float64, order='c')
+        tetrahedra = np.array(tetrahedra, dtype=np.int32, order='c')
+
+        if vertices.ndim != 2 or vertices.shape[1] != 3:
+            raise ValueError("The vertex array must have dimensions Nx3.")
+
+        if tetrahedra.ndim != 2 or tetrahedra.shape[1] != 4:
+            raise ValueError("The tetrahedra array must have dimensions Mx4.")
+
+        if ((tetrahedra < 0) | (tetrahedra >= vertices.shape[0])).any():
+            raise ValueError("The tetrahedra array references non-existent vertices.")
+
+        emission = np.array(emission, dtype=np.float64, order='c')
+        if self._linear:
+            if emission.ndim != 1 or emission.shape[0] != vertices.shape[0]:
+                raise ValueError("With linear interpolation the emission array must contain a value per vertex.")
+        else:
+            if emission.ndim != 1 or emission.shape[0] != tetrahedra.shape[0]:
+                raise ValueError("The emission array must contain a value per tetrahedra.")
+
+        self._absorbing = absorption is not None
+        if self._absorbing:
+
+            if self._linear:
+                raise ValueError("Absorption is only supported with the 'nearest' interpolation mode.")
+
+            absorption = np.array(absorption, dtype=np.float64, order='c')
+            if absorption.shape != emission.shape:
+                raise ValueError("The absorption array must have the same shape as the emission array.")
+
+            if (absorption < 0).any():
+                raise ValueError("The absorption coefficients can not be negative.")
+
+            self._absorption = absorption
+            self._absorption_mv = absorption
+
+        elif absorption_spectrum is not None:
+            raise ValueError("An absorption spectrum can only be supplied with an absorption array.")
+
+        self._vertices = vertices
+        self._tetrahedra = tetrahedra
+        self._emission = emission
+        self._emission_mv = emission
+
+        self._planes = self._generate_planes(vertices, tetrahedra)
+        self._planes_mv = self._planes
+
+        self._adjacency = self._generate_adjacency(tetrahedra)
+        self._adjacency_mv = self._adjacency
+
+        if self._linear:
+            self._linear_coefficients = self._generate_linear_coefficients(vertices, tetrahedra, emission)
+            self._linear_coefficients_mv = self._linear_coefficients
+
+        self._kdtree = _TetrahedraKDTree(vertices, tetrahedra, self._planes)
+
+        if emission_spectrum is None:
+            emission_spectrum = ConstantSF(1.0)
+
+        self._emission_spectrum = emission_spectrum
+        self._absorption_spectrum = absorption_spectrum
+
+        self.importance = 1.0
+
+    @staticmethod
+    def _generate_planes(vertices, tetrahedra):
+        """
+        Calculates the outward facing face planes of each tetrahedra.
+
+        The face opposite each vertex is described by a unit normal n and an
+        offset d, points inside the tetrahedra satisfy n.x <= d.
+        """
+
+        corners = vertices[tetrahedra]
+        faces = corners[:, FACES]
+
+        normals = np.cross(faces[:, :, 1] - faces[:, :, 0], faces[:, :, 2] - faces[:, :, 0])
+        lengths = np.linalg.norm(normals, axis=2)
+
+        # degenerate tetrahedra have zero area faces or zero volume
+        volume = np.abs(np.einsum('ij,ij->i', normals[:, 0], corners[:, 0] - faces[:, 0, 0]))
+        if (lengths == 0).any() or (volume == 0).any():
+            raise ValueError("The mesh contains degenerate tetrahedra.")
+
+        normals /= lengths[:, :, None]
+        offsets = np.einsum('ijk,ijk->ij', normals, faces[:, :, 0])
+
+        # orient the normals away from the opposite vertex
+        inward = np.einsum('ijk,ijk->ij', normals, corners) > offsets
+        normals[inward] *= -1
+        offsets[inward] *= -1
+
+        return np.ascontiguousarray(np.concatenate((normals, offsets[:, :, None]), axis=2))
+
+    @staticmethod
+    def _generate_adjacency(tetrahedra):
+        """
+        Identifies the tetrahedra sharing each face, -1 marks a boundary face.
+        """
+
+        faces = np.sort(tetrahedra[:, FACES], axis=2).reshape(-1, 3)
+        order = np.lexsort((faces[:, 2], faces[:, 1], faces[:, 0]))
+        ordered = faces[order]
+
+        shared = (ordered[1:] == ordered[:-1]).all(axis=1)
+        first = order[:-1][shared]
+        second = order[1:][shared]
+
+        adjacency = np.full(faces.shape[0], -1, dtype=np.int32)
+        adjacency[first] = second // 4
+        adjacency[second] = first // 4
+        return adjacency.reshape(-1, 4)
+
+    @staticmethod
+    def _generate_linear_coefficients(vertices, tetrahedra, values):
+        """
+        Calculates the gradient g and offset c of the linear interpolant v = g.x + c in each tetrahedra.
+        """
+
+        corners = vertices[tetrahedra]
+        corner_values = values[tetrahedra]
+
+        edges = corners[:, 1:] - corners[:, 0:1]
+        differences = corner_values[:, 1:] - corner_values[:, 0:1]
+        gradients = np.linalg.solve(edges, differences[:, :, None])[:, :, 0]
+        offsets = corner_values[:, 0] - np.einsum('ij,ij->i', gradients, corners[:, 0])
+
+        return np.ascontiguousarray(np.concatenate((gradients, offsets[:, None]), axis=1))
+
+    @property
+    def vertices(self):
+        """
+        A copy of the mesh vertex array.
+
+        :rtype: ndarray
+        """
+        return self._vertices.copy()
+
+    @property
+    def tetrahedra(self):
+        """
+        A copy of the mesh tetrahedra array.
+
+        :rtype: ndarray
+        """
+        return self._tetrahedra.copy()
+
+    @property
+    def adjacency(self):
+        """
+        A copy of the Mx4 face adjacency array.
+
+        Element [i, j] holds the index of the tetrahedra sharing the face of
+        tetrahedra i opposite its vertex j, or -1 for a boundary face.
+
+        :rtype: ndarray
+        """
+        return self._adjacency.copy()
+
+    @property
+    def interpolation(self):
+        """
+        The interpolation mode, 'nearest' or 'linear'.
+
+        :rtype: str
+        """
+        return 'linear' if self._linear else 'nearest'
+
+    @property
+    def emission(self):
+        """
+        A copy of the emission array.
+
+        :rtype: ndarray
+        """
+        return self._emission.copy()
+
+    @property
+    def absorption(self):
+        """
+        A copy of the absorption array or None if the volume does not absorb.
+
+        :rtype: ndarray
+        """
+        if self._absorbing:
+            return self._absorption.copy()
+        return None
+
+    @property
+    def emission_spectrum(self):
+        """
+        The emission spectrum scaling the emission values.
+
+        :rtype: SpectralFunction
+        """
+        return self._emission_spectrum
+
+    @property
+    def absorption_spectrum(self):
+        """
+        The spectral dependence of the absorption coefficient or None if wavelength independent.
+
+        :rtype: SpectralFunction
+        """
+        return self._absorption_spectrum
+
+    cpdef object precache(self, list slices):
+        self._emission_spectrum.precache(slices)
+        if self._absorption_spectrum is not None:
+            self._absorption_spectrum.precache(slices)
+
+    cpdef Spectrum evaluate_volume(self, Spectrum spectrum, World world,
+                                   Ray ray, Primitive primitive,
+                                   Point3D start_point, Point3D end_point,
+                                   AffineMatrix3D world_to_primitive, AffineMatrix3D primitive_to_world):
+
+        cdef:
+            Point3D start, end
+            double[3] origin, direction
+            double length
+
+        # convert start and end points to local space
+        start = start_point.transform(world_to_primitive)
+        end = end_point.transform(world_to_primitive)
+
+        # light propagates from the start point to the end point, the mesh is traversed
+        # from the end point (nearest the observer) so the accumulated attenuation applies
+        # to the emission from each subsequent tetrahedron
+        origin[0] = end.x
+        origin[1] = end.y
+        origin[2] = end.z
+
+        direction[0] = start.x - end.x
+        direction[1] = start.y - end.y
+        direction[2] = start.z - end.z
+
+        length = start.distance_to(end)
+
+        # nothing to contribute?
+        if length == 0:
+            return spectrum
+
+        direction[0] /= length
+        direction[1] /= length
+        direction[2] /= length
+
+        return self._integrate(spectrum, ray, origin, direction, length)
+
+    cdef int32_t _locate(self, double[3] origin, double[3] direction, double t, double t_end, double *t_entry):
+        """
+        Finds the first tetrahedra entered by the path after distance t.
+
+        Returns the tetrahedra index and sets t_entry to the entry distance, or
+        returns -1 if the path does not enter the mesh before t_end.
+        """
+
+        cdef CoreRay ray
+
+        ray = new_ray(
+            new_point3d(origin[0] + t * direction[0], origin[1] + t * direction[1], origin[2] + t * direction[2]),
+            new_vector3d(direction[0], direction[1], direction[2]),
+            t_end - t
+        )
+
+        if not self._kdtree.trace(ray) or self._kdtree.hit_distance >= t_end - t:
+            return -1
+
+        t_entry[0] = t + self._kdtree.hit_distance
+        return self._kdtree.hit_tetrahedra
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    @cython.initializedcheck(False)
+    cdef int32_t _exit_face(self, int32_t tetrahedra, double[3] origin, double[3] direction, double *t_exit) nogil:
+        """
+        Identifies the face through which the path leaves the tetrahedra and the exit distance.
+        """
+
+        cdef:
+            int32_t face, exit_face
+            double denominator, t
+
+        exit_face = -1
+        t_exit[0] = INFINITY
+        for face in range(4):
+
+            denominator = (self._planes_mv[tetrahedra, face, 0] * direction[0] +
+                           self._planes_mv[tetrahedra, face, 1] * direction[1] +
+                           self._planes_mv[tetrahedra, face, 2] * direction[2])
+
+            if denominator > 0:
+
+                t = (self._planes_mv[tetrahedra, face, 3] - (self._planes_mv[tetrahedra, face, 0] * origin[0] +
+                                                             self._planes_mv[tetrahedra, face, 1] * origin[1] +
+                                                             self._planes_mv[tetrahedra, face, 2] * origin[2])) / denominator
+
+                if t < t_exit[0]:
+                    t_exit[0] = t
+                    exit_face = face
+
+        return exit_face
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double _sample_linear(self, int32_t tetrahedra, double[3] origin, double[3] direction, double t) nogil:
+        """
+        Evaluates the linear emission interpolant of the tetrahedra at distance t along the path.
+        """
+
+        return (self._linear_coefficients_mv[tetrahedra, 0] * (origin[0] + t * direction[0]) +
+                self._linear_coefficients_mv[tetrahedra, 1] * (origin[1] + t * direction[1]) +
+                self._linear_coefficients_mv[tetrahedra, 2] * (origin[2] + t * direction[2]) +
+                self._linear_coefficients_mv[tetrahedra, 3])
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    @cython.initializedcheck(False)
+    cdef Spectrum _integrate(self, Spectrum spectrum, Ray ray, double[3] origin, double[3] direction, double length):
+        """
+        Walks the path through the mesh, integrating the emission and absorption of each tetrahedra.
+        """
+
+        cdef:
+            int32_t tetrahedra, face, steps, max_steps
+            int index
+            double t, t_exit, segment
+            double emission, absorption, optical_depth, coefficient
+            double integral, transmission
+            bint spectral_absorption
+            double[::1] emission_spectrum, absorption_spectrum
+            double[::1] integral_bins, transmission_bins
+
+        tetrahedra = self._locate(origin, direction, 0.0, length, &t)
+        if tetrahedra < 0:
+            return spectrum
+
+        spectral_absorption = self._absorbing and self._absorption_spectrum is not None
+        if spectral_absorption:
+            absorption_spectrum = self._absorption_spectrum.sample_mv(spectrum.min_wavelength, spectrum.max_wavelength, spectrum.bins)
+            emission_spectrum = self._emission_spectrum.sample_mv(spectrum.min_wavelength, spectrum.max_wavelength, spectrum.bins)
+            integral_bins = np.zeros(spectrum.bins, dtype=np.float64)
+            transmission_bins = np.ones(spectrum.bins, dtype=np.float64)
+
+        integral = 0
+        transmission = 1
+
+        # guards against cycling between tetrahedra in degenerate configurations
+        steps = 0
+        max_steps = 2 * self._tetrahedra.shape[0] + 8
+
+        while steps < max_steps:
+
+            steps += 1
+
+            face = self._exit_face(tetrahedra, origin, direction, &t_exit)
+            t_exit = min(t_exit, length)
+            segment = max(0.0, t_exit - t)
+
+            if self._linear:
+
+                # the interpolant is linear along the path, the trapezium rule is exact
+                if segment > 0:
+                    integral += 0.5 * segment * (self._sample_linear(tetrahedra, origin, direction, t) +
+                                                 self._sample_linear(tetrahedra, origin, direction, t_exit))
+
+            elif segment > 0:
+
+                emission = self._emission_mv[tetrahedra]
+                absorption = self._absorption_mv[tetrahedra] if self._absorbing else 0
+
+                # empty tetrahedra make no contribution
+                if emission != 0 or absorption != 0:
+
+                    if spectral_absorption:
+
+                        for index in range(spectrum.bins):
+                            coefficient = absorption * absorption_spectrum[index]
+                            if coefficient > 0:
+                                optical_depth = coefficient * segment
+                                integral_bins[index] -= transmission_bins[index] * emission * emission_spectrum[index] * expm1(-optical_depth) / coefficient
+                                transmission_bins[index] *= exp(-optical_depth)
+                            else:
+                                integral_bins[index] += transmission_bins[index] * emission * emission_spectrum[index] * segment
+
+                    elif absorption > 0:
+
+                        # exact solution of the transfer equation through a homogeneous cell
+                        optical_depth = absorption * segment
+                        integral -= transmission * emission * expm1(-optical_depth) / absorption
+                        transmission *= exp(-optical_depth)
+
+                    else:
+                        integral += transmission * emission * segment
+
+            if t_exit >= length or face < 0:
+                break
+
+            t = max(t, t_exit)
+
+            # walk to the neighbouring tetrahedra, if the path leaves the mesh search for a re-entry point
+            if self._adjacency_mv[tetrahedra, face] >= 0:
+                tetrahedra = self._adjacency_mv[tetrahedra, face]
+            else:
+                tetrahedra = self._locate(origin, direction, t, length, &t)
+                if tetrahedra < 0:
+                    break
+
+        # attenuate the incoming radiance and add the emission of the volume
+        if spectral_absorption:
+            for index in range(spectrum.bins):
+                spectrum.samples_mv[index] = spectrum.samples_mv[index] * transmission_bins[index] + integral_bins[index]
+
+        else:
+            emission_spectrum = self._emission_spectrum.sample_mv(spectrum.min_wavelength, spectrum.max_wavelength, spectrum.bins)
+            for index in range(spectrum.bins):
+                spectrum.samples_mv[index] = spectrum.samples_mv[index] * transmission + integral * emission_spectrum[index]
+
+        return spectrum
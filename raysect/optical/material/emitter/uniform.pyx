@@ -61,6 +61,9 @@ cdef class UniformSurfaceEmitter(NullVolume):
         self.scale = scale
         self.importance = 1.0
 
+    cpdef object precache(self, list slices):
+        self.emission_spectrum.precache(slices)
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
@@ -115,6 +118,9 @@ cdef class UniformVolumeEmitter(HomogeneousVolumeEmitter):
         self.emission_spectrum = emission_spectrum
         self.scale = scale
 
+    cpdef object precache(self, list slices):
+        self.emission_spectrum.precache(slices)
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
@@ -0,0 +1,54 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+from numpy cimport ndarray
+from raysect.optical cimport World, Primitive, Ray, Spectrum, SpectralFunction, Point3D, AffineMatrix3D
+from raysect.optical.material.material cimport NullSurface
+
+
+cdef class VoxelVolumeEmitter(NullSurface):
+
+    cdef:
+        Point3D _lower, _upper
+        int _nx, _ny, _nz
+        double _dx, _dy, _dz
+        bint _linear, _absorbing
+        ndarray _emission, _absorption
+        double[:, :, ::1] _emission_mv
+        double[:, :, ::1] _absorption_mv
+        SpectralFunction _emission_spectrum
+        SpectralFunction _absorption_spectrum
+
+    cdef bint _clip(self, double[3] origin, double[3] direction, double *t_enter, double *t_exit)
+
+    cdef double _sample_linear(self, int ix, int iy, int iz, double x, double y, double z) nogil
+
+    cdef Spectrum _integrate(self, Spectrum spectrum, Ray ray, double[3] origin, double[3] direction, double t_enter, double t_exit)
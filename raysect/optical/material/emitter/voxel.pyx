@@ -0,0 +1,507 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import numpy as np
+from raysect.optical cimport ConstantSF
+from libc.math cimport exp, expm1, floor, INFINITY
+cimport cython
+
+
+cdef class VoxelVolumeEmitter(NullSurface):
+    """
+    An emitting and absorbing volume defined on a regular voxel grid.
+
+    The voxel grid is an axis aligned box in the local co-ordinate space of the
+    primitive, spanning lower to upper, divided into equally sized cells. The
+    material is typically attached to a Box primitive with the same lower and
+    upper corners. Where the primitive extends beyond the grid, the volume
+    outside the grid does not contribute.
+
+    Rays are marched through the grid cell by cell using a 3D digital
+    differential analyser (3D-DDA), and the radiative transfer through each
+    cell is integrated exactly. Cells with no emission and no absorption are
+    skipped without any spectral calculation. This is both faster and more
+    accurate than fixed step sampling with an InhomogeneousVolumeEmitter.
+
+    Two interpolation modes are available:
+
+    * 'nearest': the emission and absorption arrays hold the values of each
+      cell, of shape (nx, ny, nz). The values are constant across each cell.
+    * 'linear': the emission array holds the values at the cell vertices, of
+      shape (nx + 1, ny + 1, nz + 1). The emission is trilinearly interpolated
+      inside each cell. Absorption is not supported in this mode.
+
+    The emission spectrum of each voxel is the voxel emission value multiplied
+    by the emission spectrum. Likewise, the absorption coefficient of each voxel
+    is the voxel absorption value multiplied by the absorption spectrum. If no
+    absorption spectrum is supplied, the absorption is independent of
+    wavelength. Wavelength independent absorption is considerably cheaper to
+    integrate.
+
+    :param Point3D lower: The lower corner of the voxel grid in local space.
+    :param Point3D upper: The upper corner of the voxel grid in local space.
+    :param emission: A 3D array of voxel emission values.
+    :param SpectralFunction emission_spectrum: The emission spectrum scaling the
+      voxel values (default = ConstantSF(1.0), i.e. emission values are in W/m^3/str/nm).
+    :param absorption: A 3D array of voxel absorption coefficients in 1/m, the same
+      shape as the emission array (default = None, no absorption).
+    :param SpectralFunction absorption_spectrum: The spectral dependence of the
+      absorption coefficient (default = None, wavelength independent).
+    :param str interpolation: The interpolation mode, 'nearest' or 'linear'
+      (default = 'nearest').
+
+    .. code-block:: pycon
+
+        >>> import numpy as np
+        >>> from raysect.core import Point3D
+        >>> from raysect.primitive import Box
+        >>> from raysect.optical import World
+        >>> from raysect.optical.material import VoxelVolumeEmitter
+        >>>
+        >>> world = World()
+        >>> lower = Point3D(-1, -1, -1)
+        >>> upper = Point3D(1, 1, 1)
+        >>> emission = np.random.uniform(0, 1, (100, 100, 100))
+        >>> box = Box(lower, upper, parent=world, material=VoxelVolumeEmitter(lower, upper, emission))
+    """
+
+    def __init__(self, Point3D lower not None, Point3D upper not None, object emission not None,
+                 SpectralFunction emission_spectrum=None, object absorption=None,
+                 SpectralFunction absorption_spectrum=None, str interpolation='nearest'):
+
+        super().__init__()
+
+        if lower.x >= upper.x or lower.y >= upper.y or lower.z >= upper.z:
+            raise ValueError("The lower corner of the voxel grid must be less than the upper corner on all axes.")
+
+        if interpolation == 'nearest':
+            self._linear = False
+        elif interpolation == 'linear':
+            self._linear = True
+        else:
+            raise ValueError("The interpolation mode must be either 'nearest' or 'linear'.")
+
+        emission = np.array(emission, dtype=np.float64)
+        if emission.ndim != 3:
+            raise ValueError("The emission array must be 3 dimensional.")
+
+        if self._linear:
+            if emission.shape[0] < 2 or emission.shape[1] < 2 or emission.shape[2] < 2:
+                raise ValueError("With linear interpolation the emission array must have at least 2 vertices along each axis.")
+            self._nx = emission.shape[0] - 1
+            self._ny = emission.shape[1] - 1
+            self._nz = emission.shape[2] - 1
+        else:
+            if emission.shape[0] < 1 or emission.shape[1] < 1 or emission.shape[2] < 1:
+                raise ValueError("The emission array must have at least 1 cell along each axis.")
+            self._nx = emission.shape[0]
+            self._ny = emission.shape[1]
+            self._nz = emission.shape[2]
+
+        self._absorbing = absorption is not None
+        if self._absorbing:
+
+            if self._linear:
+                raise ValueError("Absorption is only supported with the 'nearest' interpolation mode.")
+
+            absorption = np.array(absorption, dtype=np.float64)
+            if absorption.shape != emission.shape:
+                raise ValueError("The absorption array must have the same shape as the emission array.")
+
+            if (absorption < 0).any():
+                raise ValueError("The absorption coefficients can not be negative.")
+
+            self._absorption = absorption
+            self._absorption_mv = absorption
+
+        elif absorption_spectrum is not None:
+            raise ValueError("An absorption spectrum can only be supplied with an absorption array.")
+
+        self._emission = emission
+        self._emission_mv = emission
+
+        self._lower = lower
+        self._upper = upper
+        self._dx = (upper.x - lower.x) / self._nx
+        self._dy = (upper.y - lower.y) / self._ny
+        self._dz = (upper.z - lower.z) / self._nz
+
+        if emission_spectrum is None:
+            emission_spectrum = ConstantSF(1.0)
+
+        self._emission_spectrum = emission_spectrum
+        self._absorption_spectrum = absorption_spectrum
+
+        self.importance = 1.0
+
+    @property
+    def lower(self):
+        """
+        The lower corner of the voxel grid in local space.
+
+        :rtype: Point3D
+        """
+        return self._lower
+
+    @property
+    def upper(self):
+        """
+        The upper corner of the voxel grid in local space.
+
+        :rtype: Point3D
+        """
+        return self._upper
+
+    @property
+    def shape(self):
+        """
+        The number of cells along each axis of the voxel grid.
+
+        :rtype: tuple
+        """
+        return self._nx, self._ny, self._nz
+
+    @property
+    def interpolation(self):
+        """
+        The interpolation mode, 'nearest' or 'linear'.
+
+        :rtype: str
+        """
+        return 'linear' if self._linear else 'nearest'
+
+    @property
+    def emission(self):
+        """
+        A copy of the voxel emission array.
+
+        :rtype: ndarray
+        """
+        return self._emission.copy()
+
+    @property
+    def absorption(self):
+        """
+        A copy of the voxel absorption array or None if the volume does not absorb.
+
+        :rtype: ndarray
+        """
+        if self._absorbing:
+            return self._absorption.copy()
+        return None
+
+    @property
+    def emission_spectrum(self):
+        """
+        The emission spectrum scaling the voxel emission values.
+
+        :rtype: SpectralFunction
+        """
+        return self._emission_spectrum
+
+    @property
+    def absorption_spectrum(self):
+        """
+        The spectral dependence of the absorption coefficient or None if wavelength independent.
+
+        :rtype: SpectralFunction
+        """
+        return self._absorption_spectrum
+
+    cpdef object precache(self, list slices):
+        self._emission_spectrum.precache(slices)
+        if self._absorption_spectrum is not None:
+            self._absorption_spectrum.precache(slices)
+
+    cpdef Spectrum evaluate_volume(self, Spectrum spectrum, World world,
+                                   Ray ray, Primitive primitive,
+                                   Point3D start_point, Point3D end_point,
+                                   AffineMatrix3D world_to_primitive, AffineMatrix3D primitive_to_world):
+
+        cdef:
+            Point3D start, end
+            double[3] origin, direction
+            double length, t_enter, t_exit
+
+        # convert start and end points to local space
+        start = start_point.transform(world_to_primitive)
+        end = end_point.transform(world_to_primitive)
+
+        # light propagates from the start point to the end point, the grid is traversed
+        # from the end point (nearest the observer) so the accumulated attenuation applies
+        # to the emission from each subsequent cell
+        origin[0] = end.x
+        origin[1] = end.y
+        origin[2] = end.z
+
+        direction[0] = start.x - end.x
+        direction[1] = start.y - end.y
+        direction[2] = start.z - end.z
+
+        length = start.distance_to(end)
+
+        # nothing to contribute?
+        if length == 0:
+            return spectrum
+
+        direction[0] /= length
+        direction[1] /= length
+        direction[2] /= length
+
+        # restrict the integration to the part of the path inside the grid
+        t_enter = 0
+        t_exit = length
+        if not self._clip(origin, direction, &t_enter, &t_exit):
+            return spectrum
+
+        return self._integrate(spectrum, ray, origin, direction, t_enter, t_exit)
+
+    @cython.cdivision(True)
+    cdef bint _clip(self, double[3] origin, double[3] direction, double *t_enter, double *t_exit):
+        """
+        Clips the path interval [t_enter, t_exit] to the voxel grid bounds.
+
+        Returns False if the clipped interval is empty.
+        """
+
+        cdef:
+            int axis
+            double lower[3]
+            double upper[3]
+            double t0, t1, temp
+
+        lower[0] = self._lower.x
+        lower[1] = self._lower.y
+        lower[2] = self._lower.z
+
+        upper[0] = self._upper.x
+        upper[1] = self._upper.y
+        upper[2] = self._upper.z
+
+        for axis in range(3):
+
+            if direction[axis] == 0:
+                if origin[axis] < lower[axis] or origin[axis] > upper[axis]:
+                    return False
+                continue
+
+            t0 = (lower[axis] - origin[axis]) / direction[axis]
+            t1 = (upper[axis] - origin[axis]) / direction[axis]
+            if t0 > t1:
+                temp = t0
+                t0 = t1
+                t1 = temp
+
+            if t0 > t_enter[0]:
+                t_enter[0] = t0
+
+            if t1 < t_exit[0]:
+                t_exit[0] = t1
+
+        return t_enter[0] < t_exit[0]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    @cython.initializedcheck(False)
+    cdef double _sample_linear(self, int ix, int iy, int iz, double x, double y, double z) nogil:
+        """
+        Trilinearly interpolates the vertex emission values of cell (ix, iy, iz) at local point (x, y, z).
+        """
+
+        cdef double u, v, w, c00, c01, c10, c11
+
+        u = min(1.0, max(0.0, (x - self._lower.x) / self._dx - ix))
+        v = min(1.0, max(0.0, (y - self._lower.y) / self._dy - iy))
+        w = min(1.0, max(0.0, (z - self._lower.z) / self._dz - iz))
+
+        c00 = (1 - u) * self._emission_mv[ix, iy, iz] + u * self._emission_mv[ix + 1, iy, iz]
+        c01 = (1 - u) * self._emission_mv[ix, iy, iz + 1] + u * self._emission_mv[ix + 1, iy, iz + 1]
+        c10 = (1 - u) * self._emission_mv[ix, iy + 1, iz] + u * self._emission_mv[ix + 1, iy + 1, iz]
+        c11 = (1 - u) * self._emission_mv[ix, iy + 1, iz + 1] + u * self._emission_mv[ix + 1, iy + 1, iz + 1]
+
+        return (1 - w) * ((1 - v) * c00 + v * c10) + w * ((1 - v) * c01 + v * c11)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    @cython.initializedcheck(False)
+    cdef Spectrum _integrate(self, Spectrum spectrum, Ray ray, double[3] origin, double[3] direction, double t_enter, double t_exit):
+        """
+        Marches the ray through the voxel grid with a 3D-DDA, integrating the emission and absorption of each cell.
+        """
+
+        cdef:
+            int axis, index
+            int cell[3]
+            int step[3]
+            int cells[3]
+            double width[3]
+            double lower[3]
+            double t_max[3]
+            double t_delta[3]
+            double t, t_next, length, position, mid
+            double emission, absorption, optical_depth, coefficient
+            double integral, transmission, value_start, value_mid, value_end
+            bint spectral_absorption
+            double[::1] emission_spectrum, absorption_spectrum
+            double[::1] integral_bins, transmission_bins
+
+        cells[0] = self._nx
+        cells[1] = self._ny
+        cells[2] = self._nz
+
+        width[0] = self._dx
+        width[1] = self._dy
+        width[2] = self._dz
+
+        lower[0] = self._lower.x
+        lower[1] = self._lower.y
+        lower[2] = self._lower.z
+
+        # initialise the DDA, the starting cell is clamped to the grid to handle rounding at the boundary
+        for axis in range(3):
+
+            position = origin[axis] + t_enter * direction[axis]
+            cell[axis] = <int> floor((position - lower[axis]) / width[axis])
+            cell[axis] = min(cells[axis] - 1, max(0, cell[axis]))
+
+            if direction[axis] > 0:
+                step[axis] = 1
+                t_max[axis] = (lower[axis] + (cell[axis] + 1) * width[axis] - origin[axis]) / direction[axis]
+                t_delta[axis] = width[axis] / direction[axis]
+
+            elif direction[axis] < 0:
+                step[axis] = -1
+                t_max[axis] = (lower[axis] + cell[axis] * width[axis] - origin[axis]) / direction[axis]
+                t_delta[axis] = -width[axis] / direction[axis]
+
+            else:
+                step[axis] = 0
+                t_max[axis] = INFINITY
+                t_delta[axis] = INFINITY
+
+        spectral_absorption = self._absorbing and self._absorption_spectrum is not None
+        if spectral_absorption:
+            absorption_spectrum = self._absorption_spectrum.sample_mv(spectrum.min_wavelength, spectrum.max_wavelength, spectrum.bins)
+            emission_spectrum = self._emission_spectrum.sample_mv(spectrum.min_wavelength, spectrum.max_wavelength, spectrum.bins)
+            integral_bins = np.zeros(spectrum.bins, dtype=np.float64)
+            transmission_bins = np.ones(spectrum.bins, dtype=np.float64)
+
+        integral = 0
+        transmission = 1
+        t = t_enter
+
+        if self._linear:
+            value_start = self._sample_linear(
+                cell[0], cell[1], cell[2],
+                origin[0] + t * direction[0], origin[1] + t * direction[1], origin[2] + t * direction[2]
+            )
+
+        while True:
+
+            # find the distance to the next cell boundary
+            axis = 0
+            if t_max[1] < t_max[axis]:
+                axis = 1
+            if t_max[2] < t_max[axis]:
+                axis = 2
+
+            t_next = min(t_max[axis], t_exit)
+            length = t_next - t
+
+            if self._linear:
+
+                # Simpson's rule is exact for the cubic emission profile of a trilinear cell
+                mid = 0.5 * (t + t_next)
+                value_mid = self._sample_linear(
+                    cell[0], cell[1], cell[2],
+                    origin[0] + mid * direction[0], origin[1] + mid * direction[1], origin[2] + mid * direction[2]
+                )
+                value_end = self._sample_linear(
+                    cell[0], cell[1], cell[2],
+                    origin[0] + t_next * direction[0], origin[1] + t_next * direction[1], origin[2] + t_next * direction[2]
+                )
+                if length > 0:
+                    integral += length / 6.0 * (value_start + 4.0 * value_mid + value_end)
+                value_start = value_end
+
+            elif length > 0:
+
+                emission = self._emission_mv[cell[0], cell[1], cell[2]]
+                absorption = self._absorption_mv[cell[0], cell[1], cell[2]] if self._absorbing else 0
+
+                # empty cells make no contribution
+                if emission != 0 or absorption != 0:
+
+                    if spectral_absorption:
+
+                        for index in range(spectrum.bins):
+                            coefficient = absorption * absorption_spectrum[index]
+                            if coefficient > 0:
+                                optical_depth = coefficient * length
+                                integral_bins[index] -= transmission_bins[index] * emission * emission_spectrum[index] * expm1(-optical_depth) / coefficient
+                                transmission_bins[index] *= exp(-optical_depth)
+                            else:
+                                integral_bins[index] += transmission_bins[index] * emission * emission_spectrum[index] * length
+
+                    elif absorption > 0:
+
+                        # exact solution of the transfer equation through a homogeneous cell
+                        optical_depth = absorption * length
+                        integral -= transmission * emission * expm1(-optical_depth) / absorption
+                        transmission *= exp(-optical_depth)
+
+                    else:
+                        integral += transmission * emission * length
+
+            if t_next >= t_exit:
+                break
+
+            # step to the next cell
+            cell[axis] += step[axis]
+            if cell[axis] < 0 or cell[axis] >= cells[axis]:
+                break
+
+            t = t_next
+            t_max[axis] += t_delta[axis]
+
+        # attenuate the incoming radiance and add the emission of the volume
+        if spectral_absorption:
+            for index in range(spectrum.bins):
+                spectrum.samples_mv[index] = spectrum.samples_mv[index] * transmission_bins[index] + integral_bins[index]
+
+        else:
+            emission_spectrum = self._emission_spectrum.sample_mv(spectrum.min_wavelength, spectrum.max_wavelength, spectrum.bins)
+            for index in range(spectrum.bins):
+                spectrum.samples_mv[index] = spectrum.samples_mv[index] * transmission + integral * emission_spectrum[index]
+
+        return spectrum
@@ -68,6 +68,9 @@ cdef class Lambert(ContinuousBSDF):
             reflectivity = ConstantSF(0.5)
         self.reflectivity = reflectivity
 
+    cpdef object precache(self, list slices):
+        self.reflectivity.precache(slices)
+
     cpdef double pdf(self, Vector3D s_incoming, Vector3D s_outgoing, bint back_face):
         return hemisphere_sampler.pdf(s_outgoing)
 
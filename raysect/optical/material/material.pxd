@@ -46,6 +46,8 @@ cdef class Material(CoreMaterial):
                                    Point3D start_point, Point3D end_point,
                                    AffineMatrix3D world_to_primitive, AffineMatrix3D primitive_to_world)
 
+    cpdef object precache(self, list slices)
+
 
 cdef class NullSurface(Material):
     pass
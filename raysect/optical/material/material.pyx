@@ -114,6 +114,20 @@ cdef class Material(CoreMaterial):
         """
         raise NotImplementedError("Material virtual method evaluate_volume() has not been implemented.")
 
+    cpdef object precache(self, list slices):
+        """
+        Prepares the material's spectral data for rendering the supplied spectral slices.
+
+        Called by observers before rendering. Materials holding spectral
+        functions should override this method and pass the slices to the
+        precache() method of each spectral function, so the functions are not
+        resampled as the rays move between slices. The default implementation
+        does nothing.
+
+        :param list slices: A list of SpectralSlice objects.
+        """
+        pass
+
 
 cdef class NullSurface(Material):
     """
@@ -85,6 +85,10 @@ cdef class Blend(Material):
         self.surface_only = surface_only
         self.volume_only = volume_only
 
+    cpdef object precache(self, list slices):
+        self.m1.precache(slices)
+        self.m2.precache(slices)
+
     cpdef Spectrum evaluate_surface(self, World world, Ray ray, Primitive primitive, Point3D hit_point,
                                     bint exiting, Point3D inside_point, Point3D outside_point,
                                     Normal3D normal, AffineMatrix3D world_to_primitive, AffineMatrix3D primitive_to_world,
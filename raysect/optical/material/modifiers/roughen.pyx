@@ -79,6 +79,9 @@ cdef class Roughen(Material):
         self.roughness = roughness
         self.material = material
 
+    cpdef object precache(self, list slices):
+        self.material.precache(slices)
+
     cpdef Spectrum evaluate_surface(self, World world, Ray ray, Primitive primitive, Point3D hit_point,
                                     bint exiting, Point3D inside_point, Point3D outside_point,
                                     Normal3D normal, AffineMatrix3D world_to_primitive, AffineMatrix3D primitive_to_world,
@@ -77,6 +77,9 @@ cdef class VolumeTransform(Material):
         self._transform = m
         self._transform_inv = m.inverse()
 
+    cpdef object precache(self, list slices):
+        self._material.precache(slices)
+
     cpdef Spectrum evaluate_surface(self, World world, Ray ray, Primitive primitive, Point3D hit_point,
                                     bint exiting, Point3D inside_point, Point3D outside_point,
                                     Normal3D normal, AffineMatrix3D world_to_primitive, AffineMatrix3D primitive_to_world,
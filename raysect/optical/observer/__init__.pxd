@@ -33,3 +33,4 @@ from raysect.optical.observer.base cimport *
 from raysect.optical.observer.pipeline cimport *
 from raysect.optical.observer.imaging cimport *
 from raysect.optical.observer.nonimaging cimport *
+from raysect.optical.observer.hitmap cimport HitMap2D
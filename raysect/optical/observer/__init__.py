@@ -32,4 +32,5 @@ from .pipeline import *
 from .imaging import *
 from .nonimaging import *
 from .sampler1d import *
-from .sampler2d import *
\ No newline at end of file
+from .sampler2d import *
+from .hitmap import HitMap2D
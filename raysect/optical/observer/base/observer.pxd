@@ -56,6 +56,7 @@ cdef class _ObserverBase(Observer):
 
     cpdef list _slice_spectrum(self)
     cpdef list _generate_templates(self, list slices)
+    cpdef object _precache(self, list slices)
     cpdef object _render_pixel(self, tuple task, int slice_id, Ray template)
     cpdef object _update_state(self, tuple packed_result, int slice_id)
     cpdef list _generate_tasks(self)
@@ -34,6 +34,7 @@ from raysect.core.workflow import RenderEngine, MulticoreEngine
 
 cimport cython
 from raysect.optical cimport World, Spectrum
+from raysect.optical.material.material cimport Material
 from raysect.optical.observer.base.sampler cimport FrameSampler1D, FrameSampler2D
 from raysect.optical.observer.base.pipeline cimport Pipeline0D, Pipeline1D, Pipeline2D
 from raysect.optical.observer.base.processor cimport PixelProcessor
@@ -280,6 +281,9 @@ cdef class _ObserverBase(Observer):
         slices = self._slice_spectrum()
         templates = self._generate_templates(slices)
 
+        # sample the materials' spectral functions for every slice before the render workers are launched
+        self._precache(slices)
+
         # initialise pipelines for rendering
         self._initialise_pipelines(self._min_wavelength, self._max_wavelength, self._spectral_bins, slices, self.quiet)
 
@@ -354,6 +358,26 @@ cdef class _ObserverBase(Observer):
             ) for slice in slices
         ]
 
+    cpdef object _precache(self, list slices):
+        """
+        Populates the spectral function caches of the world's materials.
+
+        Each material receives the complete list of spectral slices, so the
+        workers inherit spectral functions that are already sampled for every
+        slice rather than resampling as the render moves between slices.
+        """
+
+        cdef:
+            set visited
+            object material
+
+        visited = set()
+        for primitive in self.root.primitives:
+            material = primitive.material
+            if isinstance(material, Material) and id(material) not in visited:
+                visited.add(id(material))
+                (<Material> material).precache(slices)
+
     #################
     # WORKER THREAD #
     #################
@@ -0,0 +1,253 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+from time import time
+from raysect.core.workflow import MulticoreEngine
+import numpy as np
+
+cimport cython
+cimport numpy as np
+from libc.math cimport acos, fabs, INFINITY, NAN
+from numpy cimport int32_t, float64_t
+from raysect.core cimport Intersection
+from raysect.optical cimport World, Ray, Point3D, Vector3D, Normal3D, AffineMatrix3D
+from raysect.optical.observer.base.observer cimport Observer2D
+from raysect.primitive.mesh.mesh cimport MeshIntersection
+
+
+cdef class HitMap2D:
+    """
+    Maps the pixels of a 2D observer onto the scene geometry.
+
+    The rays of the observer are traced with World.hit() only. No materials are
+    evaluated, no daughter rays are spawned and no spectra are accumulated, so
+    a hit map of a large camera costs little more than one intersection test
+    per sample.
+
+    Rays are generated by the observer's own ray generation method, the hit
+    map therefore follows the observer's geometry (field of view, pixel
+    layout, pixel sampling) exactly. For each pixel and sample the following
+    is recorded in a packed numpy array:
+
+    * primitive_id: index of the primitive that was hit in the primitives
+      attribute, -1 if the ray escaped the scene.
+    * triangle: index of the mesh triangle that was hit if the primitive is
+      a Mesh, -1 otherwise.
+    * hit_point: the intersection point (world space).
+    * normal: the unit surface normal at the intersection point (world space).
+    * distance: the distance from the ray origin to the intersection point.
+    * incidence_angle: the angle between the ray and the surface normal in
+      radians, in the range [0, pi/2].
+
+    Missed samples hold NaN in the floating point arrays and -1 in the
+    integer arrays. The arrays have the shape (nx, ny, samples), with a
+    trailing dimension of 3 for the hit_point and normal arrays.
+
+    :param Observer2D observer: The observer to map, must be attached to a World.
+    :param int pixel_samples: The number of rays launched per pixel (default=1).
+    :param object render_engine: The render engine used to distribute the work (default=MulticoreEngine()).
+    :param bool quiet: When True, suppresses the printing of progress statistics (default=False).
+
+    .. code-block:: pycon
+
+        >>> from raysect.optical.observer import PinholeCamera, HitMap2D
+        >>>
+        >>> camera = PinholeCamera((1024, 1024), parent=world)
+        >>> hitmap = HitMap2D(camera)
+        >>> hitmap.observe()
+        >>> wall = hitmap.primitive_id == hitmap.primitives.index(wall_mesh)
+        >>> triangles = hitmap.triangle[wall]
+    """
+
+    def __init__(self, Observer2D observer not None, pixel_samples=None, render_engine=None, quiet=False):
+
+        self.observer = observer
+        self.pixel_samples = pixel_samples or 1
+        self.render_engine = render_engine or MulticoreEngine()
+        self.quiet = quiet
+        self.primitives = ()
+
+    @property
+    def pixel_samples(self):
+        """
+        The number of rays launched per pixel.
+
+        :rtype: int
+        """
+        return self._pixel_samples
+
+    @pixel_samples.setter
+    def pixel_samples(self, value):
+        if value <= 0:
+            raise ValueError("The number of pixel samples must be greater than 0.")
+        self._pixel_samples = value
+
+    cpdef object observe(self):
+        """
+        Traces the observer's rays through the scene and populates the hit map arrays.
+        """
+
+        cdef:
+            int nx, ny
+            list tasks
+            Ray template
+
+        if not isinstance(self.observer.root, World):
+            raise TypeError("Observer is not connected to a scene graph containing a World object.")
+        self._world = self.observer.root
+
+        # build the acceleration structure before any worker processes are spawned
+        self._world.build_accelerator()
+
+        self.primitives = tuple(self._world.primitives)
+        self._primitive_index = {primitive: index for index, primitive in enumerate(self.primitives)}
+
+        nx, ny = self.observer.pixels
+        self.primitive_id = np.full((nx, ny, self._pixel_samples), -1, dtype=np.int32)
+        self.triangle = np.full((nx, ny, self._pixel_samples), -1, dtype=np.int32)
+        self.hit_point = np.full((nx, ny, self._pixel_samples, 3), NAN, dtype=np.float64)
+        self.normal = np.full((nx, ny, self._pixel_samples, 3), NAN, dtype=np.float64)
+        self.distance = np.full((nx, ny, self._pixel_samples), NAN, dtype=np.float64)
+        self.incidence_angle = np.full((nx, ny, self._pixel_samples), NAN, dtype=np.float64)
+
+        # the observers require an optical ray template, a single spectral bin is sufficient
+        template = Ray(
+            min_wavelength=self.observer.min_wavelength,
+            max_wavelength=self.observer.max_wavelength,
+            bins=1
+        )
+
+        # a task is a column of pixels, amortising the inter-process communication costs
+        tasks = [(x, ) for x in range(nx)]
+
+        self._completed_tasks = 0
+        self._start_time = time()
+        self._progress_timer = self._start_time
+
+        self.render_engine.run(tasks, self._trace_column, self._update_state, render_args=(template, ))
+
+        if not self.quiet:
+            print("Hit map complete - time elapsed {:0.3f}s".format(time() - self._start_time))
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef object _trace_column(self, tuple task, Ray template):
+
+        cdef:
+            int x, y, ny, sample, samples
+            AffineMatrix3D to_world, primitive_to_world
+            list rays
+            Ray ray
+            Intersection intersection
+            Point3D point
+            Normal3D normal
+            Vector3D direction
+            np.ndarray primitive_id, triangle, hit_point, normals, distance, incidence_angle
+            int32_t[:, ::1] primitive_id_mv, triangle_mv
+            float64_t[:, :, ::1] hit_point_mv, normal_mv
+            float64_t[:, ::1] distance_mv, incidence_angle_mv
+
+        x, = task
+        ny = self.observer.pixels[1]
+        samples = self._pixel_samples
+        to_world = self.observer.to_root()
+
+        primitive_id = np.full((ny, samples), -1, dtype=np.int32)
+        triangle = np.full((ny, samples), -1, dtype=np.int32)
+        hit_point = np.full((ny, samples, 3), NAN, dtype=np.float64)
+        normals = np.full((ny, samples, 3), NAN, dtype=np.float64)
+        distance = np.full((ny, samples), NAN, dtype=np.float64)
+        incidence_angle = np.full((ny, samples), NAN, dtype=np.float64)
+
+        primitive_id_mv = primitive_id
+        triangle_mv = triangle
+        hit_point_mv = hit_point
+        normal_mv = normals
+        distance_mv = distance
+        incidence_angle_mv = incidence_angle
+
+        for y in range(ny):
+
+            rays = self.observer._generate_rays(x, y, template, samples)
+            for sample in range(samples):
+
+                ray = rays[sample][0]
+
+                # convert ray from local space to world space, a unit direction gives metric distances
+                ray.origin = ray.origin.transform(to_world)
+                ray.direction = ray.direction.transform(to_world).normalise()
+
+                intersection = self._world.hit(ray)
+                if intersection is None:
+                    continue
+
+                primitive_to_world = intersection.primitive_to_world
+                point = intersection.hit_point.transform(primitive_to_world)
+                normal = intersection.normal.transform(primitive_to_world).normalise()
+                direction = ray.direction
+
+                primitive_id_mv[y, sample] = self._primitive_index.get(intersection.primitive, -1)
+                if isinstance(intersection, MeshIntersection):
+                    triangle_mv[y, sample] = (<MeshIntersection> intersection).triangle
+
+                hit_point_mv[y, sample, 0] = point.x
+                hit_point_mv[y, sample, 1] = point.y
+                hit_point_mv[y, sample, 2] = point.z
+
+                normal_mv[y, sample, 0] = normal.x
+                normal_mv[y, sample, 1] = normal.y
+                normal_mv[y, sample, 2] = normal.z
+
+                distance_mv[y, sample] = intersection.ray_distance
+                incidence_angle_mv[y, sample] = acos(min(1.0, fabs(normal.dot(direction))))
+
+        return x, primitive_id, triangle, hit_point, normals, distance, incidence_angle
+
+    cpdef object _update_state(self, tuple packed_result):
+
+        cdef int x
+
+        x = packed_result[0]
+        self.primitive_id[x] = packed_result[1]
+        self.triangle[x] = packed_result[2]
+        self.hit_point[x] = packed_result[3]
+        self.normal[x] = packed_result[4]
+        self.distance[x] = packed_result[5]
+        self.incidence_angle[x] = packed_result[6]
+
+        if self.quiet:
+            return
+
+        self._completed_tasks += 1
+        if (time() - self._progress_timer) > 1.0:
+            print("Hit map time: {:0.3f}s ({:0.2f}% complete)".format(
+                time() - self._start_time, 100 * self._completed_tasks / self.primitive_id.shape[0]))
+            self._progress_timer = time()
@@ -112,6 +112,10 @@ cdef class MeshCamera(Observer1D):
                  ray_extinction_prob=None, ray_extinction_min_depth=None, ray_max_depth=None,
                  ray_importance_sampling=None, ray_important_path_weight=None, quiet=False):
 
+        # the observer samples the full size vertex and triangle arrays
+        if mesh.data.quantised:
+            raise ValueError("Quantised meshes are not supported, the mesh vertices must be stored at full precision.")
+
         pipelines = pipelines or [PowerPipeline1D()]
         frame_sampler = frame_sampler or FullFrameSampler1D()
 
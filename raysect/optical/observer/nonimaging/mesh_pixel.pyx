@@ -102,6 +102,10 @@ cdef class MeshPixel(Observer0D):
                  min_wavelength=None, max_wavelength=None, ray_extinction_prob=None, ray_extinction_min_depth=None,
                  ray_max_depth=None, ray_importance_sampling=None, ray_important_path_weight=None, quiet=False):
 
+        # the observer samples the full size vertex and triangle arrays
+        if mesh.data.quantised:
+            raise ValueError("Quantised meshes are not supported, the mesh vertices must be stored at full precision.")
+
         pipelines = pipelines or [SpectralPowerPipeline0D()]
 
         super().__init__(pipelines, parent=parent, transform=transform, name=name, render_engine=render_engine,
@@ -0,0 +1,121 @@
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+import numpy as np
+from raysect.core import Point3D, SerialEngine, translate, rotate_x
+from raysect.primitive import Box, Mesh
+from raysect.optical import World
+from raysect.optical.observer import OrthographicCamera, PinholeCamera, HitMap2D
+
+
+class TestHitMap2D(unittest.TestCase):
+
+    def setUp(self):
+
+        self.world = World()
+
+        # a square mesh at z = 2 in front of a large box with a face at z = 3
+        vertices = [[-1, -1, 0], [1, -1, 0], [1, 1, 0], [-1, 1, 0]]
+        triangles = [[0, 1, 2], [0, 2, 3]]
+        self.mesh = Mesh(vertices, triangles, parent=self.world, transform=translate(0, 0, 2))
+        self.box = Box(Point3D(-3, -3, 3), Point3D(3, 3, 4), parent=self.world)
+
+    def test_orthographic(self):
+
+        camera = OrthographicCamera((8, 8), 4, parent=self.world)
+        hitmap = HitMap2D(camera, pixel_samples=3, render_engine=SerialEngine(), quiet=True)
+        hitmap.observe()
+
+        self.assertEqual(hitmap.primitive_id.shape, (8, 8, 3))
+        self.assertEqual(hitmap.hit_point.shape, (8, 8, 3, 3))
+        self.assertEqual(set(hitmap.primitives), {self.mesh, self.box})
+
+        mesh_id = hitmap.primitives.index(self.mesh)
+        box_id = hitmap.primitives.index(self.box)
+
+        # pixel edges coincide with the mesh edges, so pixels are either fully on or off the mesh
+        on_mesh = (np.abs(hitmap.hit_point[..., 0]) < 1) & (np.abs(hitmap.hit_point[..., 1]) < 1)
+        self.assertEqual(on_mesh.sum(), 4 * 4 * 3)
+
+        self.assertTrue((hitmap.primitive_id[on_mesh] == mesh_id).all())
+        self.assertTrue((hitmap.primitive_id[~on_mesh] == box_id).all())
+
+        self.assertTrue(np.isin(hitmap.triangle[on_mesh], [0, 1]).all())
+        self.assertTrue((hitmap.triangle[~on_mesh] == -1).all())
+
+        np.testing.assert_allclose(hitmap.hit_point[on_mesh][:, 2], 2, atol=1e-6)
+        np.testing.assert_allclose(hitmap.hit_point[~on_mesh][:, 2], 3, atol=1e-6)
+        np.testing.assert_allclose(hitmap.distance[on_mesh], 2, atol=1e-6)
+        np.testing.assert_allclose(hitmap.distance[~on_mesh], 3, atol=1e-6)
+        np.testing.assert_allclose(np.abs(hitmap.normal[..., 2]), 1, atol=1e-6)
+        np.testing.assert_allclose(hitmap.incidence_angle, 0, atol=1e-3)
+
+    def test_pinhole(self):
+
+        camera = PinholeCamera((10, 6), fov=60, parent=self.world, transform=translate(0.2, -0.1, 0))
+        hitmap = HitMap2D(camera, render_engine=SerialEngine(), quiet=True)
+        hitmap.observe()
+
+        # every sample hits the scene, the recorded geometry must be self-consistent
+        self.assertTrue((hitmap.primitive_id >= 0).all())
+
+        origin = np.array([0.2, -0.1, 0])
+        offset = hitmap.hit_point - origin
+        np.testing.assert_allclose(np.linalg.norm(offset, axis=-1), hitmap.distance, rtol=1e-6)
+
+        cos_angle = np.abs(np.sum(offset * hitmap.normal, axis=-1)) / hitmap.distance
+        np.testing.assert_allclose(np.cos(hitmap.incidence_angle), cos_angle, atol=1e-6)
+
+        self.assertTrue((hitmap.incidence_angle > 0).any())
+
+    def test_miss(self):
+
+        camera = OrthographicCamera((4, 4), 1, parent=self.world, transform=rotate_x(180))
+        hitmap = HitMap2D(camera, render_engine=SerialEngine(), quiet=True)
+        hitmap.observe()
+
+        self.assertTrue((hitmap.primitive_id == -1).all())
+        self.assertTrue((hitmap.triangle == -1).all())
+        self.assertTrue(np.isnan(hitmap.hit_point).all())
+        self.assertTrue(np.isnan(hitmap.distance).all())
+
+    def test_unattached_observer(self):
+
+        camera = OrthographicCamera((4, 4), 1)
+        hitmap = HitMap2D(camera, render_engine=SerialEngine(), quiet=True)
+        with self.assertRaises(TypeError):
+            hitmap.observe()
+
+        with self.assertRaises(ValueError):
+            HitMap2D(camera, pixel_samples=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -31,34 +31,48 @@
 
 from numpy cimport ndarray
 
+cdef class _AverageCacheEntry:
+
+    cdef:
+        double min_wavelength
+        double max_wavelength
+        double average
+
+
+cdef class _SampleCacheEntry:
+
+    cdef:
+        double min_wavelength
+        double max_wavelength
+        int bins
+        ndarray samples
+        double[::1] samples_mv
+
+
 cdef class SpectralFunction:
 
     cdef:
-        double _average_cache
-        double _average_cache_min_wvl
-        double _average_cache_max_wvl
+        int _cache_size
+
+        list _average_cache
+        int _average_cache_next
 
-        ndarray _sample_cache
-        double[::1] _sample_cache_mv
-        double _sample_cache_min_wvl
-        double _sample_cache_max_wvl
-        int _sample_cache_num_samp
+        list _sample_cache
+        int _sample_cache_next
 
     cpdef double evaluate(self, double wavelength)
     cpdef double integrate(self, double min_wavelength, double max_wavelength)
     cpdef double average(self, double min_wavelength, double max_wavelength)
     cpdef ndarray sample(self, double min_wavelength, double max_wavelength, int bins)
     cdef double[::1] sample_mv(self, double min_wavelength, double max_wavelength, int bins)
+    cpdef object precache(self, list slices)
 
     cdef void _average_cache_init(self)
-    cdef bint _average_cache_valid(self, double min_wavelength, double max_wavelength)
-    cdef double _average_cache_get(self)
+    cdef _AverageCacheEntry _average_cache_find(self, double min_wavelength, double max_wavelength)
     cdef void _average_cache_set(self, double min_wavelength, double max_wavelength, double average)
 
     cdef void _sample_cache_init(self)
-    cdef bint _sample_cache_valid(self, double min_wavelength, double max_wavelength, int bins)
-    cdef ndarray _sample_cache_get_array(self)
-    cdef double[::1] _sample_cache_get_mv(self)
+    cdef _SampleCacheEntry _sample_cache_find(self, double min_wavelength, double max_wavelength, int bins)
     cdef void _sample_cache_set(self, double min_wavelength, double max_wavelength, int bins, ndarray samples, double[::1] samples_mv)
 
 
@@ -77,6 +91,7 @@ cdef class InterpolatedSF(SpectralFunction):
         ndarray samples
         double[::1] wavelengths_mv
         double[::1] samples_mv
+        int _hint
 
 
 cdef class ConstantSF(SpectralFunction):
@@ -30,7 +30,7 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 cimport cython
-from raysect.core.math.cython cimport interpolate, integrate
+from raysect.core.math.cython cimport interpolate_hunt, integrate
 from numpy import array, float64, argsort
 from numpy cimport PyArray_SimpleNew, PyArray_FILLWBYTE, NPY_FLOAT64, npy_intp, import_array
 from libc.math cimport ceil
@@ -39,6 +39,26 @@ from libc.math cimport ceil
 import_array()
 
 
+# number of wavelength ranges cached by default
+cdef const int DEFAULT_CACHE_SIZE = 4
+
+
+@cython.final
+cdef class _AverageCacheEntry:
+    """
+    A cached SpectralFunction average.
+    """
+    pass
+
+
+@cython.final
+cdef class _SampleCacheEntry:
+    """
+    A cached SpectralFunction sample array.
+    """
+    pass
+
+
 # TODO: add a note about how the caching works, particularly that users must cache clear if function parameters change
 @cython.freelist(512)
 cdef class SpectralFunction:
@@ -65,40 +85,70 @@ cdef class SpectralFunction:
     """
 
     def __init__(self):
+        self._cache_size = DEFAULT_CACHE_SIZE
         self._average_cache_init()
         self._sample_cache_init()
 
     def __getstate__(self):
 
-        return (
-            self._average_cache,
-            self._average_cache_min_wvl,
-            self._average_cache_max_wvl,
-            self._sample_cache,
-            self._sample_cache_min_wvl,
-            self._sample_cache_max_wvl,
-            self._sample_cache_num_samp
-        )
+        cdef:
+            _AverageCacheEntry average_entry
+            _SampleCacheEntry sample_entry
+            list average_cache = [], sample_cache = []
+
+        for average_entry in self._average_cache or []:
+            average_cache.append((average_entry.min_wavelength, average_entry.max_wavelength, average_entry.average))
+
+        for sample_entry in self._sample_cache or []:
+            sample_cache.append((sample_entry.min_wavelength, sample_entry.max_wavelength, sample_entry.bins, sample_entry.samples))
+
+        return self._cache_size, average_cache, sample_cache
 
     def __setstate__(self, state):
 
-        (
-            self._average_cache,
-            self._average_cache_min_wvl,
-            self._average_cache_max_wvl,
-            self._sample_cache,
-            self._sample_cache_min_wvl,
-            self._sample_cache_max_wvl,
-            self._sample_cache_num_samp
-        ) = state
+        cdef:
+            double min_wavelength, max_wavelength, average
+            int bins
+            ndarray samples
 
-        # rebuild memory views
-        self._sample_cache_mv = self._sample_cache
+        self._cache_size, average_cache, sample_cache = state
+        self._average_cache_init()
+        self._sample_cache_init()
+
+        # rebuild cache entries
+        for min_wavelength, max_wavelength, average in average_cache:
+            self._average_cache_set(min_wavelength, max_wavelength, average)
+
+        for min_wavelength, max_wavelength, bins, samples in sample_cache:
+            self._sample_cache_set(min_wavelength, max_wavelength, bins, samples, samples)
 
     # must override automatic __reduce__ method generated by cython for the base class
     def __reduce__(self):
         return self.__new__, (self.__class__, ), self.__getstate__()
 
+    @property
+    def cache_size(self):
+        """
+        The number of wavelength ranges for which samples and averages are cached.
+
+        Rays with different wavelength ranges, for example the spectral slices
+        of an observer with spectral_rays > 1, each use a cache entry. Setting
+        the cache size clears the caches.
+
+        :rtype: int
+        """
+        return self._cache_size
+
+    @cache_size.setter
+    def cache_size(self, int value):
+
+        if value < 1:
+            raise ValueError("The cache size must be greater than zero.")
+
+        self._cache_size = value
+        self._average_cache_init()
+        self._sample_cache_init()
+
     cpdef double evaluate(self, double wavelength):
         """
         Evaluate the spectral function f(wavelength)
@@ -154,9 +204,12 @@ cdef class SpectralFunction:
             1.095030870970234
         """
 
+        cdef _AverageCacheEntry entry
+
         # is a cached average already available?
-        if self._average_cache_valid(min_wavelength, max_wavelength):
-            return self._average_cache_get()
+        entry = self._average_cache_find(min_wavelength, max_wavelength)
+        if entry is not None:
+            return entry.average
 
         average = self.integrate(min_wavelength, max_wavelength) / (max_wavelength - min_wavelength)
 
@@ -187,14 +240,16 @@ cdef class SpectralFunction:
         """
 
         cdef:
+            _SampleCacheEntry entry
             ndarray samples
             double[::1] samples_mv
             npy_intp size, index
             double lower, upper, delta, reciprocal
 
         # are cached samples already available?
-        if self._sample_cache_valid(min_wavelength, max_wavelength, bins):
-            return self._sample_cache_get_array()
+        entry = self._sample_cache_find(min_wavelength, max_wavelength, bins)
+        if entry is not None:
+            return entry.samples
 
         # create new sample ndarray and obtain a memoryview for fast access
         size = bins
@@ -229,102 +284,135 @@ cdef class SpectralFunction:
         :rtype: Memoryview.
         """
 
-        if self._sample_cache_valid(min_wavelength, max_wavelength, bins):
-            return self._sample_cache_get_mv()
+        cdef _SampleCacheEntry entry
+
+        entry = self._sample_cache_find(min_wavelength, max_wavelength, bins)
+        if entry is not None:
+            return entry.samples_mv
 
         # populate cache
-        self.sample(min_wavelength, max_wavelength, bins)
-        return self._sample_cache_get_mv()
+        return self.sample(min_wavelength, max_wavelength, bins)
 
-    cdef void _average_cache_init(self):
+    cpdef object precache(self, list slices):
         """
-        Initialises the average cache.
+        Populates the sample and average caches for a list of spectral slices.
+
+        The cache size is increased to the number of slices if it is too small
+        to hold an entry for every slice. Observers call this (via the
+        materials) before rendering, so the spectral function is not resampled
+        when the rays move between slices.
+
+        :param list slices: A list of SpectralSlice objects.
         """
 
-        # initialise cache with invalid values
-        self._average_cache = 0
-        self._average_cache_min_wvl = -1
-        self._average_cache_max_wvl = -1
+        if len(slices) > self._cache_size:
+            self.cache_size = len(slices)
 
-    cdef bint _average_cache_valid(self, double min_wavelength, double max_wavelength):
+        for spectral_slice in slices:
+            self.sample_mv(spectral_slice.min_wavelength, spectral_slice.max_wavelength, spectral_slice.bins)
+            self.average(spectral_slice.min_wavelength, spectral_slice.max_wavelength)
+
+    cdef void _average_cache_init(self):
         """
-        Returns true if a suitable cached average is available.
+        Initialises the average cache.
         """
 
-        return (
-            self._average_cache_min_wvl == min_wavelength and
-            self._average_cache_max_wvl == max_wavelength
-        )
+        self._average_cache = None
+        self._average_cache_next = 0
 
-    cdef double _average_cache_get(self):
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef _AverageCacheEntry _average_cache_find(self, double min_wavelength, double max_wavelength):
         """
-        Returns the cached value.
-        
-        The value is undefined if called when _average_cache_valid() is False.
+        Returns the cached average entry for the wavelength range or None if not cached.
         """
 
-        return self._average_cache
+        cdef:
+            _AverageCacheEntry entry
+            Py_ssize_t index
+
+        if self._average_cache is None:
+            return None
+
+        for index in range(len(self._average_cache)):
+            entry = <_AverageCacheEntry> self._average_cache[index]
+            if entry.min_wavelength == min_wavelength and entry.max_wavelength == max_wavelength:
+                return entry
+        return None
 
     cdef void _average_cache_set(self, double min_wavelength, double max_wavelength, double average):
         """
-        Updates the cached average.
+        Adds an average to the cache, replacing the oldest entry if the cache is full.
         """
 
-        self._average_cache = average
-        self._average_cache_min_wvl = min_wavelength
-        self._average_cache_max_wvl = max_wavelength
+        cdef _AverageCacheEntry entry
+
+        if self._average_cache is None:
+            self._average_cache = []
+
+        if not self._average_cache or len(self._average_cache) < self._cache_size:
+            entry = _AverageCacheEntry.__new__(_AverageCacheEntry)
+            self._average_cache.append(entry)
+        else:
+            self._average_cache_next %= len(self._average_cache)
+            entry = <_AverageCacheEntry> self._average_cache[self._average_cache_next]
+            self._average_cache_next += 1
+
+        entry.min_wavelength = min_wavelength
+        entry.max_wavelength = max_wavelength
+        entry.average = average
 
     cdef void _sample_cache_init(self):
         """
         Initialises the sample cache.
         """
 
-        # initialise cache with invalid values
         self._sample_cache = None
-        self._sample_cache_mv = None
-        self._sample_cache_min_wvl = -1
-        self._sample_cache_max_wvl = -1
-        self._sample_cache_num_samp = -1
+        self._sample_cache_next = 0
 
-    cdef bint _sample_cache_valid(self, double min_wavelength, double max_wavelength, int bins):
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef _SampleCacheEntry _sample_cache_find(self, double min_wavelength, double max_wavelength, int bins):
         """
-        Returns true if a suitable cached samples are available.
+        Returns the cached sample entry for the wavelength range and bins or None if not cached.
         """
 
-        return (
-            self._sample_cache_min_wvl == min_wavelength and
-            self._sample_cache_max_wvl == max_wavelength and
-            self._sample_cache_num_samp == bins
-        )
+        cdef:
+            _SampleCacheEntry entry
+            Py_ssize_t index
 
-    cdef ndarray _sample_cache_get_array(self):
-        """
-        Returns the cached sample array.
-        
-        The value is undefined if called when _average_cache_valid() is False.
-        """
+        if self._sample_cache is None:
+            return None
 
-        return self._sample_cache
+        for index in range(len(self._sample_cache)):
+            entry = <_SampleCacheEntry> self._sample_cache[index]
+            if entry.min_wavelength == min_wavelength and entry.max_wavelength == max_wavelength and entry.bins == bins:
+                return entry
+        return None
 
-    cdef double[::1] _sample_cache_get_mv(self):
+    cdef void _sample_cache_set(self, double min_wavelength, double max_wavelength, int bins, ndarray samples, double[::1] samples_mv):
         """
-        Returns the cached sample array memoryview.
-        
-        The value is undefined if called when _average_cache_valid() is False.
+        Adds a sample array and memoryview to the cache, replacing the oldest entry if the cache is full.
         """
 
-        return self._sample_cache_mv
+        cdef _SampleCacheEntry entry
 
-    cdef void _sample_cache_set(self, double min_wavelength, double max_wavelength, int bins, ndarray samples, double[::1] samples_mv):
-        """
-        Updates the cached sample array and memoryview.
-        """
+        if self._sample_cache is None:
+            self._sample_cache = []
+
+        if not self._sample_cache or len(self._sample_cache) < self._cache_size:
+            entry = _SampleCacheEntry.__new__(_SampleCacheEntry)
+            self._sample_cache.append(entry)
+        else:
+            self._sample_cache_next %= len(self._sample_cache)
+            entry = <_SampleCacheEntry> self._sample_cache[self._sample_cache_next]
+            self._sample_cache_next += 1
 
-        self._sample_cache = samples
-        self._sample_cache_mv = samples_mv
-        self._sample_cache_min_wvl = min_wavelength
-        self._sample_cache_max_wvl = max_wavelength
-        self._sample_cache_num_samp = bins
+        entry.min_wavelength = min_wavelength
+        entry.max_wavelength = max_wavelength
+        entry.bins = bins
+        entry.samples = samples
+        entry.samples_mv = samples_mv
 
 
 cdef class NumericallyIntegratedSF(SpectralFunction):
@@ -491,7 +579,7 @@ cdef class InterpolatedSF(SpectralFunction):
         :rtype: float
         """
 
-        return interpolate(self.wavelengths_mv, self.samples_mv, wavelength)
+        return interpolate_hunt(self.wavelengths_mv, self.samples_mv, wavelength, &self._hint)
 
     @cython.initializedcheck(False)
     cpdef double integrate(self, double min_wavelength, double max_wavelength):
@@ -575,13 +663,15 @@ cdef class ConstantSF(SpectralFunction):
         """
 
         cdef:
+            _SampleCacheEntry entry
             ndarray samples
             npy_intp size
             double[::1] samples_mv
 
         # are cached samples already available?
-        if self._sample_cache_valid(min_wavelength, max_wavelength, bins):
-            return self._sample_cache_get_array()
+        entry = self._sample_cache_find(min_wavelength, max_wavelength, bins)
+        if entry is not None:
+            return entry.samples
 
         # create new sample ndarray and obtain a memoryview for fast access
         size = bins
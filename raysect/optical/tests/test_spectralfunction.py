@@ -0,0 +1,159 @@
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+import pickle
+from raysect.optical import ConstantSF, InterpolatedSF, NumericallyIntegratedSF
+from raysect.optical.observer.base.slice import SpectralSlice
+
+
+class CountingSF(NumericallyIntegratedSF):
+    """
+    A linear spectral function that counts the number of function evaluations.
+    """
+
+    def __init__(self):
+        super().__init__(sample_resolution=10)
+        self.calls = 0
+
+    def function(self, wavelength):
+        self.calls += 1
+        return wavelength
+
+
+class TestSpectralFunctionCache(unittest.TestCase):
+
+    def test_alternating_ranges(self):
+
+        function = CountingSF()
+
+        samples1 = function.sample(400, 500, 10)
+        samples2 = function.sample(500, 600, 10)
+        average1 = function.average(400, 500)
+        average2 = function.average(500, 600)
+        calls = function.calls
+
+        # alternating between wavelength ranges must not resample the function
+        for _ in range(3):
+            self.assertIs(function.sample(400, 500, 10), samples1)
+            self.assertIs(function.sample(500, 600, 10), samples2)
+            self.assertEqual(function.average(400, 500), average1)
+            self.assertEqual(function.average(500, 600), average2)
+        self.assertEqual(function.calls, calls)
+
+        # a different number of bins is a different cache entry
+        self.assertIsNot(function.sample(400, 500, 20), samples1)
+        self.assertEqual(len(function.sample(400, 500, 20)), 20)
+
+    def test_cache_replacement(self):
+
+        function = CountingSF()
+        function.cache_size = 2
+
+        samples1 = function.sample(400, 500, 10)
+        samples2 = function.sample(500, 600, 10)
+        function.sample(600, 700, 10)
+
+        # the oldest entry is replaced when the cache is full
+        self.assertIs(function.sample(500, 600, 10), samples2)
+        self.assertIsNot(function.sample(400, 500, 10), samples1)
+        self.assertEqual(list(function.sample(400, 500, 10)), list(samples1))
+
+    def test_cache_size(self):
+
+        function = CountingSF()
+        samples = function.sample(400, 500, 10)
+
+        # changing the cache size clears the cache
+        function.cache_size = 8
+        self.assertEqual(function.cache_size, 8)
+        self.assertIsNot(function.sample(400, 500, 10), samples)
+
+        with self.assertRaises(ValueError, msg="A cache size of zero did not raise a ValueError."):
+            function.cache_size = 0
+
+        with self.assertRaises(ValueError, msg="A negative cache size did not raise a ValueError."):
+            function.cache_size = -1
+
+    def test_precache(self):
+
+        function = CountingSF()
+        slices = [SpectralSlice(375, 740, 60, 10, offset) for offset in range(0, 60, 10)]
+
+        function.precache(slices)
+        self.assertEqual(function.cache_size, len(slices))
+
+        # every slice must now be served from the cache
+        calls = function.calls
+        for spectral_slice in slices:
+            function.sample(spectral_slice.min_wavelength, spectral_slice.max_wavelength, spectral_slice.bins)
+            function.average(spectral_slice.min_wavelength, spectral_slice.max_wavelength)
+        self.assertEqual(function.calls, calls)
+
+        # a larger cache is not reduced
+        function.cache_size = 10
+        function.precache(slices)
+        self.assertEqual(function.cache_size, 10)
+
+    def test_constant(self):
+
+        function = ConstantSF(2.0)
+        samples1 = function.sample(400, 500, 10)
+        samples2 = function.sample(500, 600, 10)
+        self.assertIs(function.sample(400, 500, 10), samples1)
+        self.assertIs(function.sample(500, 600, 10), samples2)
+        self.assertEqual(list(samples1), [2.0] * 10)
+
+    def test_pickle(self):
+
+        function = InterpolatedSF([400, 500, 600], [1, 2, 3])
+        function.cache_size = 6
+        samples1 = function.sample(400, 500, 10)
+        samples2 = function.sample(500, 600, 5)
+        average = function.average(400, 600)
+
+        restored = pickle.loads(pickle.dumps(function))
+        self.assertEqual(restored.cache_size, 6)
+        self.assertEqual(list(restored.sample(400, 500, 10)), list(samples1))
+        self.assertEqual(list(restored.sample(500, 600, 5)), list(samples2))
+        self.assertEqual(restored.average(400, 600), average)
+
+    def test_pickle_restores_cache(self):
+
+        function = CountingSF()
+        samples = function.sample(400, 500, 10)
+
+        restored = pickle.loads(pickle.dumps(function))
+        restored.calls = 0
+        self.assertEqual(list(restored.sample(400, 500, 10)), list(samples))
+        self.assertEqual(restored.calls, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
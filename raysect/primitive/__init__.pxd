@@ -31,8 +31,10 @@ from raysect.primitive.box cimport Box
 from raysect.primitive.sphere cimport Sphere
 from raysect.primitive.torus cimport Torus
 from raysect.primitive.cylinder cimport Cylinder
-from raysect.primitive.csg cimport Union, Intersect, Subtract
-from raysect.primitive.mesh cimport Mesh
+from raysect.primitive.csg cimport Union, Intersect, Subtract, MultiUnion, MultiIntersect, MultiSubtract
+from raysect.primitive.particles cimport ParticleArray, SphereArray, CylinderArray
+from raysect.primitive.heightfield cimport HeightField
+from raysect.primitive.mesh cimport Mesh, LODMesh
 from raysect.primitive.cone cimport Cone
 from raysect.primitive.parabola cimport Parabola
 from raysect.primitive.utility cimport EncapsulatedPrimitive
\ No newline at end of file
@@ -31,8 +31,10 @@ from .box import Box
 from .torus import Torus
 from .sphere import Sphere
 from .cylinder import Cylinder
-from .csg import Union, Intersect, Subtract
-from .mesh import Mesh, import_obj, export_obj, import_stl, export_stl, import_ply, export_ply, import_vtk, export_vtk
+from .csg import Union, Intersect, Subtract, MultiUnion, MultiIntersect, MultiSubtract
+from .particles import ParticleArray, SphereArray, CylinderArray
+from .heightfield import HeightField
+from .mesh import Mesh, LODMesh, simplify_mesh, import_obj, export_obj, import_stl, export_stl, import_ply, export_ply, import_vtk, export_vtk
 from .cone import Cone
 from .parabola import Parabola
 from .utility import EncapsulatedPrimitive
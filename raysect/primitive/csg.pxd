@@ -29,8 +29,10 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
-from raysect.core cimport Ray, Intersection, Node, Primitive
+from raysect.core cimport Ray, Intersection, Node, Primitive, Point3D, BoundingBox3D
 from raysect.core.acceleration cimport BoundPrimitive
+from raysect.core.math.spatial cimport KDTree3DCore
+from numpy cimport int32_t
 
 
 cdef class CSGPrimitive(Primitive):
@@ -77,4 +79,69 @@ cdef class Subtract(CSGPrimitive):
     pass
 
 
+cdef class _OperandKDTree(KDTree3DCore):
 
+    cdef MultiCSGPrimitive csg_primitive
+    cdef bint discover_only
+
+
+cdef class MultiCSGPrimitive(Primitive):
+
+    cdef MultiCSGRoot _csgroot
+    cdef list _operands
+    cdef _OperandKDTree _tree
+    cdef int32_t[::1] _discovered
+    cdef int32_t _stamp
+    cdef int32_t _count
+    cdef list _events
+    cdef Ray _cache_ray
+    cdef Ray _local_ray
+    cdef Intersection _result
+    cdef bint _terminated
+    cdef bint _cache_invalid
+    cdef bint _fully_discovered
+
+    cdef bint _start(self)
+
+    cdef bint _discover(self, int32_t index)
+
+    cdef bint _process_leaf(self, int32_t *items, int32_t count, double max_range)
+
+    cdef Intersection _advance(self, double max_range)
+
+    cdef BoundPrimitive _operand(self, int32_t index)
+
+    cdef void _update_inside(self, int32_t index, bint before, bint after)
+
+    cdef bint _inside(self)
+
+    cdef Intersection _modify_intersection(self, Intersection intersection, int32_t index)
+
+    cdef Intersection _finalise(self, Intersection intersection, int32_t index)
+
+    cdef list _operands_containing(self, Point3D p)
+
+    cdef BoundingBox3D _world_box(self, BoundingBox3D box)
+
+    cdef void rebuild(self)
+
+
+cdef class MultiCSGRoot(Node):
+
+    cdef MultiCSGPrimitive csg_primitive
+
+
+cdef class MultiUnion(MultiCSGPrimitive):
+
+    pass
+
+
+cdef class MultiIntersect(MultiCSGPrimitive):
+
+    pass
+
+
+cdef class MultiSubtract(MultiCSGPrimitive):
+
+    cdef BoundPrimitive _base
+    cdef bint _base_inside
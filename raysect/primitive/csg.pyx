@@ -31,13 +31,21 @@
 
 # TODO: add more advanced material handling
 
+from heapq import heappush, heappop
+
 from libc.math cimport INFINITY
+from libc.stdint cimport INT32_MAX
+from numpy import zeros, int32
 
 from raysect.core cimport _NodeBase, ChangeSignal, Material, new_ray, new_intersection, Point3D, AffineMatrix3D, BoundingBox3D
+from raysect.core.math.spatial cimport Item3D
 
 # bounding box is padded by a small amount to avoid numerical accuracy issues
 cdef const double BOX_PADDING = 1e-9
 
+# operand index of the base primitive of an n-ary subtraction
+cdef const int32_t BASE_OPERAND = -1
+
 
 cdef class CSGPrimitive(Primitive):
     """
@@ -597,3 +605,577 @@ cdef class Subtract(CSGPrimitive):
         primitive_a = self._primitive_a.primitive.instance()
         primitive_b = self._primitive_b.primitive.instance()
         return Subtract(primitive_a, primitive_b, parent, transform, material, name)
+
+
+cdef class _OperandKDTree(KDTree3DCore):
+    """
+    A kd-tree over the operand bounding boxes of an n-ary CSG primitive.
+
+    Leaves are visited in order along the ray and handed to the CSG primitive,
+    which evaluates the boolean operation incrementally.
+    """
+
+    def __init__(self, MultiCSGPrimitive csg_primitive, list items):
+
+        super().__init__(items, max_depth=0, min_items=1, hit_cost=80.0, empty_bonus=0.2)
+        self.csg_primitive = csg_primitive
+        self.discover_only = False
+
+    cdef bint _trace_leaf(self, int32_t id, Ray ray, double max_range):
+
+        cdef int32_t item
+
+        if self._nodes[id].count == 0:
+            return False
+
+        if self.discover_only:
+            for item in range(self._nodes[id].count):
+                self.csg_primitive._discover(self._nodes[id].items[item])
+            return False
+
+        return self.csg_primitive._process_leaf(self._nodes[id].items, self._nodes[id].count, max_range)
+
+    cdef list _items_containing_leaf(self, int32_t id, Point3D point):
+
+        cdef:
+            int32_t item, index
+            list operands, containing
+
+        operands = self.csg_primitive._operands
+        containing = []
+        for item in range(self._nodes[id].count):
+            index = self._nodes[id].items[item]
+            if (<BoundPrimitive> operands[index]).contains(point):
+                containing.append(index)
+        return containing
+
+
+cdef class MultiCSGPrimitive(Primitive):
+    """
+    N-ary Constructive Solid Geometry (CSG) Primitive base class.
+
+    This is an abstract base class and can not be used directly.
+
+    The n-ary CSG primitives combine any number of operand primitives with a
+    single boolean operation. The operand bounding boxes are held in a
+    kd-tree. Operands are only tested for intersection when the ray reaches
+    their bounding box, and the operand intersections are merged in a single
+    pass along the ray. Combining many operands is therefore much faster than
+    a deep chain of binary CSG primitives.
+
+    :param list primitives: A list of operand primitives.
+    :param Node parent: Scene-graph parent node or None (default = None).
+    :param AffineMatrix3D transform: An AffineMatrix3D defining the local co-ordinate
+      system relative to the scene-graph parent (default = identity matrix).
+    :param Material material: A Material object defining the CSG primitive's
+      material (default = None).
+    """
+
+    def __init__(self, list primitives=None, object parent=None, AffineMatrix3D transform=None,
+                 Material material=None, str name=None):
+
+        super().__init__(parent, transform, material, name)
+
+        primitives = primitives or []
+        for primitive in primitives:
+            if not isinstance(primitive, Primitive):
+                raise TypeError("The CSG operands must be primitives.")
+
+        # build CSG scene graph, the acceleration structures are built once all operands are attached
+        self._operands = None
+        self._csgroot = MultiCSGRoot(self)
+        for primitive in primitives:
+            (<Primitive> primitive).parent = self._csgroot
+
+        self._operands = [BoundPrimitive(primitive) for primitive in primitives]
+        self.rebuild()
+
+        # initialise next_intersection cache
+        self._stamp = 0
+        self._events = []
+        self._cache_ray = None
+        self._local_ray = None
+        self._result = None
+        self._terminated = False
+        self._cache_invalid = True
+        self._fully_discovered = False
+
+    @property
+    def primitives(self):
+        """
+        The operand primitives of the compound CSG primitive.
+
+        :rtype: tuple
+        """
+        return tuple((<BoundPrimitive> operand).primitive for operand in self._operands)
+
+    cpdef Intersection hit(self, Ray ray):
+
+        # invalidate next_intersection cache
+        self._cache_invalid = True
+
+        # convert ray to local space
+        self._cache_ray = ray
+        self._local_ray = new_ray(ray.origin.transform(self.to_local()),
+                                  ray.direction.transform(self.to_local()),
+                                  INFINITY)
+
+        # reset the ray state, operands are marked as discovered with a per-ray stamp to avoid clearing the array
+        if self._stamp == INT32_MAX:
+            self._discovered[:] = 0
+            self._stamp = 0
+        self._stamp += 1
+        self._events = []
+        self._count = 0
+        self._result = None
+        self._terminated = False
+        self._fully_discovered = False
+
+        if not self._start():
+            return None
+
+        # the kd-tree traversal stops at the first leaf that yields a valid intersection
+        if self._tree is not None and self._tree._trace(self._local_ray):
+            return self._result
+
+        # all operands along the ray have been discovered, process the remaining intersections
+        self._fully_discovered = True
+        self._result = self._advance(INFINITY)
+        return self._result
+
+    cpdef Intersection next_intersection(self):
+
+        cdef Intersection intersection
+
+        if self._cache_invalid or self._terminated:
+            return None
+
+        # discover any operands beyond the kd-tree leaf that yielded the last intersection
+        if not self._fully_discovered:
+            if self._tree is not None:
+                self._tree.discover_only = True
+                self._tree._trace(self._local_ray)
+                self._tree.discover_only = False
+            self._fully_discovered = True
+
+        intersection = self._advance(INFINITY)
+        if intersection is None:
+            self._cache_invalid = True
+        return intersection
+
+    cdef bint _start(self):
+        """
+        Performs any operation specific setup at the start of a hit() call.
+
+        :return: False if the ray cannot intersect the CSG primitive.
+        """
+        return True
+
+    cdef bint _discover(self, int32_t index):
+        """
+        Obtains the first intersection of a newly reached operand.
+
+        :param index: The operand index.
+        :return: True if the operand had not previously been discovered.
+        """
+
+        cdef Intersection intersection
+
+        if self._discovered[index] == self._stamp:
+            return False
+        self._discovered[index] = self._stamp
+
+        intersection = self._operand(index).hit(self._local_ray)
+        if intersection is not None:
+            heappush(self._events, (intersection.ray_distance, index, intersection))
+
+            # an exiting first intersection means the ray starts inside the operand
+            if intersection.exiting:
+                self._update_inside(index, False, True)
+
+        return True
+
+    cdef bint _process_leaf(self, int32_t *items, int32_t count, double max_range):
+        """
+        Discovers the operands in a kd-tree leaf and processes intersections up to the leaf exit.
+
+        All operands overlapping the ray up to the leaf exit distance have been
+        discovered once the leaf has been processed, so the intersections in
+        this range can be classified.
+
+        :return: True if the search along the ray is complete.
+        """
+
+        cdef int32_t item
+
+        for item in range(count):
+            self._discover(items[item])
+
+        self._result = self._advance(max_range)
+        return self._result is not None or self._terminated
+
+    cdef Intersection _advance(self, double max_range):
+        """
+        Processes operand intersections in order until one changes the CSG enclosure state.
+
+        :param max_range: Intersections beyond this distance are left queued.
+        :return: The valid intersection or None.
+        """
+
+        cdef:
+            double distance
+            int32_t index
+            bint inside
+            Intersection intersection, next_intersection
+
+        while self._events and (<tuple> self._events[0])[0] <= max_range:
+
+            distance, index, intersection = heappop(self._events)
+            inside = self._inside()
+
+            # queue the operand's next intersection
+            next_intersection = self._operand(index).next_intersection()
+            if next_intersection is not None:
+                heappush(self._events, (next_intersection.ray_distance, index, next_intersection))
+
+            # the state of an operand prior to an intersection is given by the intersection's exiting flag
+            self._update_inside(index, intersection.exiting, next_intersection is not None and next_intersection.exiting)
+
+            # an intersection is valid if it changes the CSG enclosure state
+            if self._inside() != inside:
+
+                if distance > self._cache_ray.max_distance:
+                    self._terminated = True
+                    return None
+
+                return self._finalise(intersection, index)
+
+        return None
+
+    cdef BoundPrimitive _operand(self, int32_t index):
+        return <BoundPrimitive> self._operands[index]
+
+    cdef void _update_inside(self, int32_t index, bint before, bint after):
+        self._count += <int32_t> after - <int32_t> before
+
+    cdef bint _inside(self):
+        raise NotImplementedError("Warning: CSG operator not implemented")
+
+    cdef Intersection _modify_intersection(self, Intersection intersection, int32_t index):
+        # by default, do nothing
+        return intersection
+
+    cdef Intersection _finalise(self, Intersection intersection, int32_t index):
+
+        self._cache_invalid = False
+
+        # allow derived classes to modify intersection if required
+        intersection = self._modify_intersection(intersection, index)
+
+        # convert local intersection attributes to csg primitive coordinate space
+        intersection.ray = self._cache_ray
+        intersection.hit_point = intersection.hit_point.transform(intersection.primitive_to_world)
+        intersection.inside_point = intersection.inside_point.transform(intersection.primitive_to_world)
+        intersection.outside_point = intersection.outside_point.transform(intersection.primitive_to_world)
+        intersection.normal = intersection.normal.transform(intersection.primitive_to_world)
+        intersection.world_to_primitive = self.to_local()
+        intersection.primitive_to_world = self.to_root()
+        intersection.primitive = self
+
+        return intersection
+
+    cdef list _operands_containing(self, Point3D p):
+
+        if self._tree is None:
+            return []
+        return self._tree._items_containing(p)
+
+    cdef void rebuild(self):
+        """
+        Triggers a rebuild of the CSG primitive's acceleration structures.
+        """
+
+        cdef int32_t index
+
+        # operands are still being attached to the CSG scene graph
+        if self._operands is None:
+            return
+
+        self._operands = [BoundPrimitive((<BoundPrimitive> operand).primitive) for operand in self._operands]
+        self._discovered = zeros(len(self._operands), dtype=int32)
+        self._stamp = 0
+        self._cache_invalid = True
+
+        if self._operands:
+            items = [Item3D(index, (<BoundPrimitive> self._operands[index]).box) for index in range(len(self._operands))]
+            self._tree = _OperandKDTree(self, items)
+        else:
+            self._tree = None
+
+    cdef BoundingBox3D _world_box(self, BoundingBox3D box):
+
+        cdef:
+            Point3D point
+            BoundingBox3D world_box
+
+        # convert points to world space and build an enclosing world space bounding box
+        # a small degree of padding is added to avoid potential numerical accuracy issues
+        world_box = BoundingBox3D()
+        for point in box.vertices():
+            world_box.extend(point.transform(self.to_root()), BOX_PADDING)
+
+        return world_box
+
+
+cdef class MultiCSGRoot(Node):
+    """
+    Specialised scenegraph root node for n-ary CSG primitives.
+
+    The root node responds to geometry change notifications and propagates them
+    to the CSG primitive and its enclosing scenegraph.
+    """
+
+    def __init__(self, MultiCSGPrimitive csg_primitive):
+
+        super().__init__()
+        self.csg_primitive = csg_primitive
+
+    def _change(self, _NodeBase node, ChangeSignal change not None):
+        """
+        Handles a scenegraph node change handler.
+
+        Propagates geometry change notifications to the enclosing CSG primitive and its
+        scenegraph.
+        """
+
+        # the CSG primitive acceleration structures must be rebuilt
+        self.csg_primitive.rebuild()
+
+        # propagate change notifications from csg scenegraph to enclosing scenegraph
+        self.csg_primitive.root._change(node, change)
+
+
+cdef class MultiUnion(MultiCSGPrimitive):
+    """
+    N-ary CSGPrimitive that is the volumetric union of a list of primitives.
+
+    All of the volume of each primitive will be in the new primitive.
+
+    :param list primitives: The primitives to unite.
+    :param Node parent: Scene-graph parent node or None (default = None).
+    :param AffineMatrix3D transform: An AffineMatrix3D defining the local co-ordinate
+      system relative to the scene-graph parent (default = identity matrix).
+    :param Material material: A Material object defining the new CSG primitive's
+      material (default = None).
+
+    .. code-block:: python
+
+        from raysect.core import translate
+        from raysect.primitive import Sphere, MultiUnion
+        from raysect.optical import World
+        from raysect.optical.material import AbsorbingSurface
+
+        world = World()
+
+        spheres = [Sphere(0.6, transform=translate(i, 0, 0)) for i in range(100)]
+        chain = MultiUnion(spheres, world, material=AbsorbingSurface())
+    """
+
+    cdef bint _inside(self):
+        return self._count > 0
+
+    cpdef bint contains(self, Point3D p) except -1:
+
+        p = p.transform(self.to_local())
+        return len(self._operands_containing(p)) > 0
+
+    cpdef BoundingBox3D bounding_box(self):
+
+        cdef:
+            BoundPrimitive operand
+            BoundingBox3D box
+
+        # union local space bounding boxes
+        box = BoundingBox3D()
+        for operand in self._operands:
+            box.union(operand.box)
+
+        return self._world_box(box)
+
+    cpdef object instance(self, object parent=None, AffineMatrix3D transform=None, Material material=None, str name=None):
+        return MultiUnion([primitive.instance() for primitive in self.primitives], parent, transform, material, name)
+
+
+cdef class MultiIntersect(MultiCSGPrimitive):
+    """
+    N-ary CSGPrimitive that is the volumetric intersection of a list of primitives.
+
+    Only volumes that are present in all the primitives will be present in the
+    new CSG primitive.
+
+    :param list primitives: The primitives to intersect.
+    :param Node parent: Scene-graph parent node or None (default = None).
+    :param AffineMatrix3D transform: An AffineMatrix3D defining the local co-ordinate
+      system relative to the scene-graph parent (default = identity matrix).
+    :param Material material: A Material object defining the new CSG primitive's
+      material (default = None).
+    """
+
+    cdef bint _inside(self):
+        return self._count > 0 and self._count == len(self._operands)
+
+    cpdef bint contains(self, Point3D p) except -1:
+
+        cdef BoundPrimitive operand
+
+        if not self._operands:
+            return False
+
+        p = p.transform(self.to_local())
+        for operand in self._operands:
+            if not operand.contains(p):
+                return False
+        return True
+
+    cpdef BoundingBox3D bounding_box(self):
+
+        cdef:
+            BoundPrimitive operand
+            BoundingBox3D box
+
+        if not self._operands:
+            return BoundingBox3D()
+
+        # find the intersection of the bounding boxes (this will always surround the intersected primitives)
+        box = (<BoundPrimitive> self._operands[0]).box.copy()
+        for operand in self._operands[1:]:
+            box.lower.x = max(box.lower.x, operand.box.lower.x)
+            box.lower.y = max(box.lower.y, operand.box.lower.y)
+            box.lower.z = max(box.lower.z, operand.box.lower.z)
+            box.upper.x = min(box.upper.x, operand.box.upper.x)
+            box.upper.y = min(box.upper.y, operand.box.upper.y)
+            box.upper.z = min(box.upper.z, operand.box.upper.z)
+
+        return self._world_box(box)
+
+    cpdef object instance(self, object parent=None, AffineMatrix3D transform=None, Material material=None, str name=None):
+        return MultiIntersect([primitive.instance() for primitive in self.primitives], parent, transform, material, name)
+
+
+cdef class MultiSubtract(MultiCSGPrimitive):
+    """
+    N-ary CSGPrimitive that is the volume of a primitive minus the volumes of a list of primitives.
+
+    This is the efficient equivalent of subtracting each primitive in turn,
+    for example when drilling many holes into a component.
+
+    :param Primitive primitive: The primitive to subtract from.
+    :param list primitives: The primitives to subtract.
+    :param Node parent: Scene-graph parent node or None (default = None).
+    :param AffineMatrix3D transform: An AffineMatrix3D defining the local co-ordinate
+      system relative to the scene-graph parent (default = identity matrix).
+    :param Material material: A Material object defining the new CSG primitive's
+      material (default = None).
+
+    .. code-block:: python
+
+        from raysect.core import translate, Point3D
+        from raysect.primitive import Box, Cylinder, MultiSubtract
+        from raysect.optical import World
+        from raysect.optical.material import AbsorbingSurface
+
+        world = World()
+
+        tile = Box(Point3D(0, 0, 0), Point3D(1, 1, 0.1))
+        holes = [Cylinder(0.01, 0.2, transform=translate(0.05 * i + 0.025, 0.05 * j + 0.025, -0.05))
+                 for i in range(20) for j in range(20)]
+
+        drilled_tile = MultiSubtract(tile, holes, world, material=AbsorbingSurface())
+    """
+
+    def __init__(self, Primitive primitive not None, list primitives=None, object parent=None,
+                 AffineMatrix3D transform=None, Material material=None, str name=None):
+
+        # the base primitive must be attached to the CSG scene graph before the operands trigger a rebuild
+        self._base = None
+        super().__init__(primitives, parent, transform, material, name)
+        primitive.parent = self._csgroot
+        self._base = BoundPrimitive(primitive)
+
+    @property
+    def primitive(self):
+        """
+        The primitive the operands are subtracted from.
+
+        :rtype: Primitive
+        """
+        return self._base.primitive
+
+    cdef bint _start(self):
+
+        cdef Intersection intersection
+
+        # no intersection with the base primitive, the ray can not intersect the CSG primitive
+        intersection = self._base.hit(self._local_ray)
+        if intersection is None:
+            return False
+
+        heappush(self._events, (intersection.ray_distance, BASE_OPERAND, intersection))
+        self._base_inside = intersection.exiting
+        return True
+
+    cdef BoundPrimitive _operand(self, int32_t index):
+
+        if index == BASE_OPERAND:
+            return self._base
+        return <BoundPrimitive> self._operands[index]
+
+    cdef void _update_inside(self, int32_t index, bint before, bint after):
+
+        if index == BASE_OPERAND:
+            self._base_inside = after
+        else:
+            self._count += <int32_t> after - <int32_t> before
+
+    cdef bint _inside(self):
+        return self._base_inside and self._count == 0
+
+    cdef Intersection _modify_intersection(self, Intersection intersection, int32_t index):
+
+        if index != BASE_OPERAND:
+
+            # invert exiting/entering state, normal and swap inside and outside points
+            return new_intersection(
+                ray=intersection.ray,
+                ray_distance=intersection.ray_distance,
+                primitive=intersection.primitive,
+                hit_point=intersection.hit_point,
+                inside_point=intersection.outside_point,
+                outside_point=intersection.inside_point,
+                normal=intersection.normal.neg(),
+                exiting=not intersection.exiting,
+                world_to_primitive=intersection.world_to_primitive,
+                primitive_to_world=intersection.primitive_to_world
+            )
+
+        return intersection
+
+    cpdef bint contains(self, Point3D p) except -1:
+
+        p = p.transform(self.to_local())
+        return self._base.contains(p) and len(self._operands_containing(p)) == 0
+
+    cpdef BoundingBox3D bounding_box(self):
+
+        # the subtracted object will only ever occupy the same or less space than the base primitive
+        return self._world_box(self._base.box)
+
+    cdef void rebuild(self):
+
+        MultiCSGPrimitive.rebuild(self)
+        if self._base is not None:
+            self._base = BoundPrimitive(self._base.primitive)
+
+    cpdef object instance(self, object parent=None, AffineMatrix3D transform=None, Material material=None, str name=None):
+        return MultiSubtract(self._base.primitive.instance(), [primitive.instance() for primitive in self.primitives],
+                             parent, transform, material, name)
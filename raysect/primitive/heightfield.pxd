@@ -0,0 +1,93 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+from raysect.core cimport Primitive, Ray, Intersection
+from libc.stdint cimport int32_t
+
+
+cdef class HeightField(Primitive):
+
+    cdef:
+        object _heights
+        const float[:, ::1] _heights_mv
+        int32_t _nx, _ny
+        double _width, _length, _base, _maximum
+        double _dx, _dy
+        bint _smoothing
+
+        # min/max mipmap over blocks of cells
+        float[:, ::1] _mipmap_mv
+        int32_t _levels
+        int32_t[::1] _level_offset
+        int32_t[::1] _level_nx
+        int32_t[::1] _level_ny
+
+        # ray state
+        Ray _cached_ray
+        double _origin[3]
+        double _direction[3]
+        int32_t _ix, _iy, _iz
+        double _sx, _sy, _sz
+        double _min_distance
+        double _max_distance
+        bint _seek_next_intersection
+
+        # closest intersection found by the traversal
+        int32_t _closest_surface
+        int32_t _closest_i, _closest_j, _closest_triangle
+        double _closest_distance
+        double _closest_u, _closest_v
+
+    cdef object _build_mipmap(self)
+
+    cdef void _calc_rayspace_transform(self)
+
+    cdef Intersection _trace(self)
+
+    cdef void _trace_surface(self)
+
+    cdef bint _node_range(self, int32_t level, int32_t ix, int32_t iy, double *t0, double *t1)
+
+    cdef void _trace_block(self, int32_t bx, int32_t by)
+
+    cdef void _trace_cell(self, int32_t i, int32_t j)
+
+    cdef void _trace_sides(self)
+
+    cdef void _trace_wall(self, int32_t axis, double position, int32_t surface)
+
+    cdef double _edge_height(self, int32_t axis, int32_t index, double position)
+
+    cdef void _vertex(self, int32_t i, int32_t j, double v[3])
+
+    cdef void _vertex_normal(self, int32_t i, int32_t j, double n[3])
+
+    cdef Intersection _generate_intersection(self)
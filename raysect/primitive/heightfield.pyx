@@ -0,0 +1,840 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import numpy as np
+cimport cython
+
+from raysect.core cimport Material, Point3D, Vector3D, Normal3D, AffineMatrix3D, BoundingBox3D, new_point3d, new_normal3d, new_intersection
+from libc.math cimport floor, fabs, sqrt, INFINITY
+
+# bounding box is padded by a small amount to avoid numerical accuracy issues
+cdef const double BOX_PADDING = 1e-9
+
+# additional ray distance to avoid re-hitting the same surface point
+cdef const double EPSILON = 1e-9
+
+# cells and mipmap nodes are padded by this fraction of the cell size, so a surface intersection close to
+# a cell edge can not be culled by both neighbouring cells due to rounding
+cdef const double CELL_PADDING = 1e-6
+
+# the number of height values read into memory at a time when building the mipmap
+cdef const int32_t REDUCE_CHUNK = 1 << 22
+
+# the lowest mipmap level holds the height range of blocks of BLOCK_SIZE x BLOCK_SIZE cells
+cdef const int32_t BLOCK_SIZE = 4
+
+cdef enum:
+
+    # surface enumeration
+    NO_SURFACE = -1
+    TOP_SURFACE = 0
+    BASE_SURFACE = 1
+    LOWER_X_SURFACE = 2
+    UPPER_X_SURFACE = 3
+    LOWER_Y_SURFACE = 4
+    UPPER_Y_SURFACE = 5
+
+    # axis enumeration
+    X_AXIS = 0
+    Y_AXIS = 1
+
+    # maximum mipmap traversal stack size (4 entries per level)
+    MAX_STACK = 128
+
+
+@cython.cdivision(True)
+cdef inline bint _slab(double origin, double direction, double lower, double upper, double *t0, double *t1) nogil:
+    """
+    Clips the ray interval [t0, t1] to the slab lower <= x <= upper.
+    """
+
+    cdef double a, b
+
+    if direction == 0:
+        return lower <= origin <= upper
+
+    a = (lower - origin) / direction
+    b = (upper - origin) / direction
+    if a > b:
+        a, b = b, a
+
+    if a > t0[0]:
+        t0[0] = a
+    if b < t1[0]:
+        t1[0] = b
+    return t0[0] <= t1[0]
+
+
+@cython.cdivision(True)
+cdef inline bint _hit_triangle(HeightField field, double p1[3], double p2[3], double p3[3], double *t, double *u, double *v) nogil:
+    """
+    Watertight ray-triangle intersection.
+
+    Returns the hit distance and the barycentric coordinates of p2 (u) and p3 (v).
+
+    The edge tests of neighbouring triangles are evaluated from identical
+    vertex coordinates, so a ray can not pass between triangles sharing an
+    edge. This is the algorithm used by the Mesh primitive, evaluated in
+    double precision.
+    """
+
+    # This code is a port of the code listed in appendix A of
+    #  "Watertight Ray/Triangle Intersection", S.Woop, C.Benthin, I.Wald,
+    #  Journal of Computer Graphics Techniques (2013), Vol.2, No. 1
+
+    cdef:
+        int32_t ix = field._ix, iy = field._iy, iz = field._iz
+        double x1, x2, x3
+        double y1, y2, y3
+        double z1, z2, z3
+        double a, b, c, det
+
+    # transform vertices by shearing and scaling space so the ray points along the +ve z axis
+    z1 = p1[iz] - field._origin[iz]
+    z2 = p2[iz] - field._origin[iz]
+    z3 = p3[iz] - field._origin[iz]
+
+    x1 = (p1[ix] - field._origin[ix]) - field._sx * z1
+    x2 = (p2[ix] - field._origin[ix]) - field._sx * z2
+    x3 = (p3[ix] - field._origin[ix]) - field._sx * z3
+
+    y1 = (p1[iy] - field._origin[iy]) - field._sy * z1
+    y2 = (p2[iy] - field._origin[iy]) - field._sy * z2
+    y3 = (p3[iy] - field._origin[iy]) - field._sy * z3
+
+    # calculate scaled barycentric coordinates
+    a = x3 * y2 - y3 * x2
+    b = x1 * y3 - y1 * x3
+    c = x2 * y1 - y2 * x1
+
+    # perform edge tests
+    if (a < 0.0 or b < 0.0 or c < 0.0) and (a > 0.0 or b > 0.0 or c > 0.0):
+        return False
+
+    # if determinant is zero the ray is parallel to the face
+    det = a + b + c
+    if det == 0.0:
+        return False
+
+    t[0] = field._sz * (a * z1 + b * z2 + c * z3) / det
+    u[0] = b / det
+    v[0] = c / det
+    return True
+
+
+def _block_range(object lower, object upper, int32_t size, int32_t nx, int32_t ny, bint shared):
+    """
+    Returns the minimum of the lower values and the maximum of the upper values over blocks of size x size values.
+
+    Blocks are extended by one value if they share edges with their
+    neighbours. The values are processed in chunks of rows, so only a few
+    rows of blocks are read into memory at a time.
+    """
+
+    cdef int32_t span, rows, start, stop
+
+    span = size + 1 if shared else size
+    rows = max(1, REDUCE_CHUNK // (size * lower.shape[1]))
+
+    block_lower = np.empty((nx, ny), dtype=np.float32)
+    block_upper = np.empty((nx, ny), dtype=np.float32)
+    for start in range(0, nx, rows):
+        stop = min(start + rows, nx)
+
+        # the rows covered by this chunk of blocks, including the shared edge row
+        chunk = slice(start * size, min(stop * size + 1, lower.shape[0]))
+        row_lower = _reduce_axis(np.asarray(lower[chunk]), np.minimum, 0, size, span, stop - start)
+        row_upper = _reduce_axis(np.asarray(upper[chunk]), np.maximum, 0, size, span, stop - start)
+        block_lower[start:stop] = _reduce_axis(row_lower, np.minimum, 1, size, span, ny)
+        block_upper[start:stop] = _reduce_axis(row_upper, np.maximum, 1, size, span, ny)
+
+    return block_lower, block_upper
+
+
+def _reduce_axis(object values, object function, int32_t axis, int32_t size, int32_t span, int32_t count):
+    """
+    Reduces spans of values along an axis, a span starts every size values.
+
+    Spans extending beyond the end of the axis are clamped to the last value.
+    """
+
+    reduced = None
+    for k in range(span):
+        selected = np.take(values, np.minimum(np.arange(count) * size + k, values.shape[axis] - 1), axis=axis)
+        if reduced is None:
+            reduced = selected
+        else:
+            function(reduced, selected, out=reduced)
+
+    return reduced
+
+
+cdef class HeightField(Primitive):
+    """
+    A solid bounded above by a regularly sampled height field.
+
+    The height field surface is defined by a 2D array of heights sampled on a
+    regular grid spanning 0 <= x <= width and 0 <= y <= length. Each grid cell
+    is split into two triangles. The solid extends down from the surface to a
+    flat base, closed by vertical side walls around the grid perimeter.
+
+    Rays are intersected with the surface using a min/max mipmap traversal
+    of the height samples, no triangle mesh or kd-tree is generated. The
+    height array is held as 32 bit floats. A C-contiguous float32 array,
+    such as a numpy memmap, is used directly without copying. This allows
+    very large measured surfaces to be traced without loading them into
+    memory.
+
+    :param object heights: A 2D array of surface heights with shape (nx, ny), nx and ny must be at least 2.
+    :param double width: The extent of the surface along the x-axis.
+    :param double length: The extent of the surface along the y-axis.
+    :param object base: The z coordinate of the base of the solid, this must not be greater
+      than the minimum height (default=minimum height less 1% of the larger lateral extent).
+    :param bint smoothing: True to interpolate the surface normals across the triangles
+      for a smooth appearance, False to use the triangle face normals (default=True).
+    :param Node parent: Scene graph parent node (default=None).
+    :param AffineMatrix3D transform: An AffineMatrix3D defining the local coordinate system relative to the scene graph parent (default=identity matrix).
+    :param Material material: A Material object defining the height field material (default=None).
+    :param str name: A string specifying a user-friendly name for the height field (default="").
+
+    .. code-block:: pycon
+
+        >>> import numpy as np
+        >>> from raysect.optical import World
+        >>> from raysect.optical.material import Lambert
+        >>> from raysect.primitive import HeightField
+        >>>
+        >>> world = World()
+        >>>
+        >>> # a memory-mapped 8k x 8k measured surface profile
+        >>> heights = np.load("profile.npy", mmap_mode="r")
+        >>> surface = HeightField(heights, 0.1, 0.1, parent=world, material=Lambert())
+    """
+
+    def __init__(self, object heights not None, double width, double length, object base=None, bint smoothing=True,
+                 object parent=None, AffineMatrix3D transform=None, Material material=None, str name=None):
+
+        super().__init__(parent, transform, material, name)
+
+        heights = np.ascontiguousarray(heights, dtype=np.float32)
+        if heights.ndim != 2 or heights.shape[0] < 2 or heights.shape[1] < 2:
+            raise ValueError("The heights must be a 2D array with at least 2 samples along each axis.")
+
+        if width <= 0 or length <= 0:
+            raise ValueError("The height field width and length must be greater than zero.")
+
+        minimum = float(heights.min())
+        if base is None:
+            base = minimum - 0.01 * max(width, length)
+        elif base > minimum:
+            raise ValueError("The base of the height field cannot lie above the minimum height.")
+
+        self._heights = heights
+        self._heights_mv = heights
+        self._nx = heights.shape[0]
+        self._ny = heights.shape[1]
+        self._width = width
+        self._length = length
+        self._base = base
+        self._maximum = float(heights.max())
+        self._dx = width / (self._nx - 1)
+        self._dy = length / (self._ny - 1)
+        self._smoothing = smoothing
+
+        self._build_mipmap()
+        self._seek_next_intersection = False
+
+    @property
+    def heights(self):
+        """
+        A read-only view of the height array.
+
+        :rtype: ndarray
+        """
+        heights = self._heights.view()
+        heights.flags.writeable = False
+        return heights
+
+    @property
+    def width(self):
+        """
+        The extent of the surface along the x-axis.
+
+        :rtype: float
+        """
+        return self._width
+
+    @property
+    def length(self):
+        """
+        The extent of the surface along the y-axis.
+
+        :rtype: float
+        """
+        return self._length
+
+    @property
+    def base(self):
+        """
+        The z coordinate of the base of the solid.
+
+        :rtype: float
+        """
+        return self._base
+
+    @property
+    def smoothing(self):
+        """
+        True if the surface normals are interpolated.
+
+        :rtype: bool
+        """
+        return self._smoothing
+
+    cdef object _build_mipmap(self):
+        """
+        Builds the min/max height pyramid.
+
+        Level 0 holds the height range of blocks of cells, each subsequent
+        level halves the resolution until a single node covers the grid.
+        """
+
+        cdef:
+            int32_t nx, ny
+            list levels
+
+        nx = (self._nx - 2) // BLOCK_SIZE + 1
+        ny = (self._ny - 2) // BLOCK_SIZE + 1
+        lower, upper = _block_range(self._heights, self._heights, BLOCK_SIZE, nx, ny, True)
+        levels = [np.stack((lower, upper), axis=-1).reshape(-1, 2)]
+        shapes = [(nx, ny)]
+
+        while nx > 1 or ny > 1:
+            nx = (nx + 1) // 2
+            ny = (ny + 1) // 2
+            lower, upper = _block_range(lower, upper, 2, nx, ny, False)
+            levels.append(np.stack((lower, upper), axis=-1).reshape(-1, 2))
+            shapes.append((nx, ny))
+
+        self._levels = len(levels)
+        self._mipmap_mv = np.ascontiguousarray(np.concatenate(levels), dtype=np.float32)
+        self._level_offset = np.cumsum([0] + [len(level) for level in levels[:-1]]).astype(np.int32)
+        self._level_nx = np.array([shape[0] for shape in shapes], dtype=np.int32)
+        self._level_ny = np.array([shape[1] for shape in shapes], dtype=np.int32)
+
+        if 4 * self._levels > MAX_STACK:
+            raise ValueError("The height field is too large.")
+
+    cpdef Intersection hit(self, Ray ray):
+
+        cdef:
+            Point3D origin
+            Vector3D direction
+
+        self._cached_ray = ray
+
+        # convert ray to local space
+        origin = ray.origin.transform(self.to_local())
+        direction = ray.direction.transform(self.to_local())
+
+        self._origin[0] = origin.x
+        self._origin[1] = origin.y
+        self._origin[2] = origin.z
+
+        self._direction[0] = direction.x
+        self._direction[1] = direction.y
+        self._direction[2] = direction.z
+        self._calc_rayspace_transform()
+
+        self._min_distance = 0.0
+        self._max_distance = ray.max_distance
+
+        return self._trace()
+
+    cpdef Intersection next_intersection(self):
+
+        if not self._seek_next_intersection:
+            return None
+
+        return self._trace()
+
+    @cython.cdivision(True)
+    cdef void _calc_rayspace_transform(self):
+        """
+        Calculates the ray space transform used by the watertight triangle intersection.
+        """
+
+        cdef int32_t ix, iy, iz
+
+        # cycle the direction components so the largest becomes the z-component
+        if fabs(self._direction[0]) > fabs(self._direction[1]) and fabs(self._direction[0]) > fabs(self._direction[2]):
+            ix, iy, iz = 1, 2, 0
+        elif fabs(self._direction[1]) > fabs(self._direction[0]) and fabs(self._direction[1]) > fabs(self._direction[2]):
+            ix, iy, iz = 2, 0, 1
+        else:
+            ix, iy, iz = 0, 1, 2
+
+        # if the z component is negative, swap x and y to restore the handedness of the space
+        if self._direction[iz] < 0.0:
+            ix, iy = iy, ix
+
+        self._ix = ix
+        self._iy = iy
+        self._iz = iz
+        self._sz = 1.0 / self._direction[iz]
+        self._sx = self._direction[ix] * self._sz
+        self._sy = self._direction[iy] * self._sz
+
+    cdef Intersection _trace(self):
+        """
+        Finds the closest intersection beyond the last intersection.
+        """
+
+        self._closest_surface = NO_SURFACE
+        self._closest_distance = self._max_distance
+
+        self._trace_sides()
+        self._trace_surface()
+
+        if self._closest_surface == NO_SURFACE:
+            self._seek_next_intersection = False
+            return None
+
+        # subsequent searches start after this intersection
+        self._min_distance = self._closest_distance
+        self._seek_next_intersection = True
+        return self._generate_intersection()
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _trace_surface(self):
+        """
+        Traverses the min/max mipmap front to back to find the closest surface intersection.
+        """
+
+        cdef:
+            int32_t stack_level[MAX_STACK]
+            int32_t stack_x[MAX_STACK]
+            int32_t stack_y[MAX_STACK]
+            double stack_t[MAX_STACK]
+            int32_t child_x[4]
+            int32_t child_y[4]
+            double child_t[4]
+            int32_t size, level, ix, iy, count, i, j, k
+            double t0, t1
+
+        if not self._node_range(self._levels - 1, 0, 0, &t0, &t1):
+            return
+
+        size = 1
+        stack_level[0] = self._levels - 1
+        stack_x[0] = 0
+        stack_y[0] = 0
+        stack_t[0] = t0
+
+        while size > 0:
+
+            size -= 1
+            level = stack_level[size]
+            ix = stack_x[size]
+            iy = stack_y[size]
+
+            # a closer intersection has been found since the node was queued
+            if stack_t[size] > self._closest_distance:
+                continue
+
+            if level == 0:
+                self._trace_block(ix, iy)
+                continue
+
+            # identify the children intersected by the ray
+            count = 0
+            for i in range(2 * ix, min(2 * ix + 2, self._level_nx[level - 1])):
+                for j in range(2 * iy, min(2 * iy + 2, self._level_ny[level - 1])):
+                    if self._node_range(level - 1, i, j, &t0, &t1):
+
+                        # insertion sort, furthest child first
+                        k = count
+                        while k > 0 and child_t[k - 1] < t0:
+                            child_x[k] = child_x[k - 1]
+                            child_y[k] = child_y[k - 1]
+                            child_t[k] = child_t[k - 1]
+                            k -= 1
+                        child_x[k] = i
+                        child_y[k] = j
+                        child_t[k] = t0
+                        count += 1
+
+            # push the children so the nearest child is processed first
+            for k in range(count):
+                stack_level[size] = level - 1
+                stack_x[size] = child_x[k]
+                stack_y[size] = child_y[k]
+                stack_t[size] = child_t[k]
+                size += 1
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef bint _node_range(self, int32_t level, int32_t ix, int32_t iy, double *t0, double *t1):
+        """
+        Calculates the ray interval inside the bounding box of a mipmap node.
+        """
+
+        cdef:
+            int32_t cells, node
+            double padding
+
+        cells = BLOCK_SIZE << level
+        node = self._level_offset[level] + ix * self._level_ny[level] + iy
+        padding = CELL_PADDING * (self._dx + self._dy)
+
+        t0[0] = self._min_distance
+        t1[0] = self._closest_distance
+        return (
+            _slab(self._origin[0], self._direction[0], ix * cells * self._dx - padding, min((ix + 1) * cells, self._nx - 1) * self._dx + padding, t0, t1)
+            and _slab(self._origin[1], self._direction[1], iy * cells * self._dy - padding, min((iy + 1) * cells, self._ny - 1) * self._dy + padding, t0, t1)
+            and _slab(self._origin[2], self._direction[2], self._mipmap_mv[node, 0] - padding, self._mipmap_mv[node, 1] + padding, t0, t1)
+        )
+
+    cdef void _trace_block(self, int32_t bx, int32_t by):
+
+        cdef int32_t i, j
+
+        for i in range(bx * BLOCK_SIZE, min((bx + 1) * BLOCK_SIZE, self._nx - 1)):
+            for j in range(by * BLOCK_SIZE, min((by + 1) * BLOCK_SIZE, self._ny - 1)):
+                self._trace_cell(i, j)
+
+    cdef void _trace_cell(self, int32_t i, int32_t j):
+
+        cdef:
+            double t0, t1, t, u, v, padding
+            double p00[3]
+            double p10[3]
+            double p01[3]
+            double p11[3]
+
+        # skip cells that are not crossed by the ray
+        t0 = self._min_distance
+        t1 = self._closest_distance
+        padding = CELL_PADDING * (self._dx + self._dy)
+        if not (_slab(self._origin[0], self._direction[0], i * self._dx - padding, (i + 1) * self._dx + padding, &t0, &t1)
+                and _slab(self._origin[1], self._direction[1], j * self._dy - padding, (j + 1) * self._dy + padding, &t0, &t1)):
+            return
+
+        self._vertex(i, j, p00)
+        self._vertex(i + 1, j, p10)
+        self._vertex(i, j + 1, p01)
+        self._vertex(i + 1, j + 1, p11)
+
+        # the cell is split into two triangles along the (i, j) - (i + 1, j + 1) diagonal
+        if _hit_triangle(self, p00, p10, p11, &t, &u, &v):
+            if self._min_distance < t <= self._closest_distance:
+                self._closest_surface = TOP_SURFACE
+                self._closest_distance = t
+                self._closest_i = i
+                self._closest_j = j
+                self._closest_triangle = 0
+                self._closest_u = u
+                self._closest_v = v
+
+        if _hit_triangle(self, p00, p11, p01, &t, &u, &v):
+            if self._min_distance < t <= self._closest_distance:
+                self._closest_surface = TOP_SURFACE
+                self._closest_distance = t
+                self._closest_i = i
+                self._closest_j = j
+                self._closest_triangle = 1
+                self._closest_u = u
+                self._closest_v = v
+
+    @cython.cdivision(True)
+    cdef void _trace_sides(self):
+
+        cdef double t, x, y, padding
+
+        # the sides are padded so they overlap at the rim and the top surface, leaving no cracks for rays to leak through
+        padding = CELL_PADDING * (self._dx + self._dy)
+
+        # base
+        if self._direction[2] != 0:
+            t = (self._base - self._origin[2]) / self._direction[2]
+            if self._min_distance < t <= self._closest_distance:
+                x = self._origin[0] + t * self._direction[0]
+                y = self._origin[1] + t * self._direction[1]
+                if -padding <= x <= self._width + padding and -padding <= y <= self._length + padding:
+                    self._closest_surface = BASE_SURFACE
+                    self._closest_distance = t
+
+        # side walls
+        self._trace_wall(X_AXIS, 0, LOWER_X_SURFACE)
+        self._trace_wall(X_AXIS, self._width, UPPER_X_SURFACE)
+        self._trace_wall(Y_AXIS, 0, LOWER_Y_SURFACE)
+        self._trace_wall(Y_AXIS, self._length, UPPER_Y_SURFACE)
+
+    @cython.cdivision(True)
+    cdef void _trace_wall(self, int32_t axis, double position, int32_t surface):
+
+        cdef:
+            int32_t other, index
+            double t, s, z, extent, padding
+
+        other = 1 - axis
+        if self._direction[axis] == 0:
+            return
+
+        t = (position - self._origin[axis]) / self._direction[axis]
+        if not (self._min_distance < t <= self._closest_distance):
+            return
+
+        # the wall spans the grid edge, from the base up to the surface
+        padding = CELL_PADDING * (self._dx + self._dy)
+        s = self._origin[other] + t * self._direction[other]
+        extent = self._length if axis == X_AXIS else self._width
+        if not (-padding <= s <= extent + padding):
+            return
+
+        if axis == X_AXIS:
+            index = 0 if surface == LOWER_X_SURFACE else self._nx - 1
+        else:
+            index = 0 if surface == LOWER_Y_SURFACE else self._ny - 1
+
+        z = self._origin[2] + t * self._direction[2]
+        if self._base - padding <= z <= self._edge_height(axis, index, s) + padding:
+            self._closest_surface = surface
+            self._closest_distance = t
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef double _edge_height(self, int32_t axis, int32_t index, double position):
+        """
+        Returns the surface height along a grid edge.
+
+        :param axis: The axis normal to the edge.
+        :param index: The grid index of the edge along the axis.
+        :param position: The position along the edge.
+        """
+
+        cdef:
+            int32_t j, n
+            double f
+
+        if axis == X_AXIS:
+            n = self._ny
+            f = position / self._dy
+        else:
+            n = self._nx
+            f = position / self._dx
+
+        j = <int32_t> floor(f)
+        j = min(max(j, 0), n - 2)
+        f -= j
+
+        if axis == X_AXIS:
+            return (1 - f) * self._heights_mv[index, j] + f * self._heights_mv[index, j + 1]
+        return (1 - f) * self._heights_mv[j, index] + f * self._heights_mv[j + 1, index]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _vertex(self, int32_t i, int32_t j, double v[3]):
+        v[0] = i * self._dx
+        v[1] = j * self._dy
+        v[2] = self._heights_mv[i, j]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef void _vertex_normal(self, int32_t i, int32_t j, double n[3]):
+        """
+        Calculates the vertex normal from the height gradient (central differences).
+        """
+
+        cdef int32_t i0, i1, j0, j1
+
+        i0 = max(i - 1, 0)
+        i1 = min(i + 1, self._nx - 1)
+        j0 = max(j - 1, 0)
+        j1 = min(j + 1, self._ny - 1)
+
+        n[0] = -(self._heights_mv[i1, j] - self._heights_mv[i0, j]) / ((i1 - i0) * self._dx)
+        n[1] = -(self._heights_mv[i, j1] - self._heights_mv[i, j0]) / ((j1 - j0) * self._dy)
+        n[2] = 1.0
+
+    cdef Intersection _generate_intersection(self):
+
+        cdef:
+            double t, w
+            double p0[3]
+            double p1[3]
+            double p2[3]
+            double n0[3]
+            double n1[3]
+            double n2[3]
+            int32_t i0, j0, i1, j1, i2, j2
+            Point3D hit_point, inside_point, outside_point
+            Normal3D face_normal, normal
+
+        t = self._closest_distance
+        hit_point = new_point3d(
+            self._origin[0] + t * self._direction[0],
+            self._origin[1] + t * self._direction[1],
+            self._origin[2] + t * self._direction[2]
+        )
+
+        if self._closest_surface == TOP_SURFACE:
+
+            # triangle vertex indices
+            i0 = self._closest_i
+            j0 = self._closest_j
+            if self._closest_triangle == 0:
+                i1, j1 = i0 + 1, j0
+                i2, j2 = i0 + 1, j0 + 1
+            else:
+                i1, j1 = i0 + 1, j0 + 1
+                i2, j2 = i0, j0 + 1
+
+            self._vertex(i0, j0, p0)
+            self._vertex(i1, j1, p1)
+            self._vertex(i2, j2, p2)
+
+            face_normal = new_normal3d(
+                (p1[1] - p0[1]) * (p2[2] - p0[2]) - (p1[2] - p0[2]) * (p2[1] - p0[1]),
+                (p1[2] - p0[2]) * (p2[0] - p0[0]) - (p1[0] - p0[0]) * (p2[2] - p0[2]),
+                (p1[0] - p0[0]) * (p2[1] - p0[1]) - (p1[1] - p0[1]) * (p2[0] - p0[0])
+            ).normalise()
+
+            if self._smoothing:
+
+                self._vertex_normal(i0, j0, n0)
+                self._vertex_normal(i1, j1, n1)
+                self._vertex_normal(i2, j2, n2)
+
+                w = 1.0 - self._closest_u - self._closest_v
+                normal = new_normal3d(
+                    w * n0[0] + self._closest_u * n1[0] + self._closest_v * n2[0],
+                    w * n0[1] + self._closest_u * n1[1] + self._closest_v * n2[1],
+                    w * n0[2] + self._closest_u * n1[2] + self._closest_v * n2[2]
+                ).normalise()
+
+            else:
+                normal = face_normal
+
+        else:
+
+            if self._closest_surface == BASE_SURFACE:
+                face_normal = new_normal3d(0, 0, -1)
+            elif self._closest_surface == LOWER_X_SURFACE:
+                face_normal = new_normal3d(-1, 0, 0)
+            elif self._closest_surface == UPPER_X_SURFACE:
+                face_normal = new_normal3d(1, 0, 0)
+            elif self._closest_surface == LOWER_Y_SURFACE:
+                face_normal = new_normal3d(0, -1, 0)
+            else:
+                face_normal = new_normal3d(0, 1, 0)
+            normal = face_normal
+
+        # displace hit_point away from surface to generate inner and outer points
+        inside_point = new_point3d(
+            hit_point.x - face_normal.x * EPSILON,
+            hit_point.y - face_normal.y * EPSILON,
+            hit_point.z - face_normal.z * EPSILON
+        )
+
+        outside_point = new_point3d(
+            hit_point.x + face_normal.x * EPSILON,
+            hit_point.y + face_normal.y * EPSILON,
+            hit_point.z + face_normal.z * EPSILON
+        )
+
+        return new_intersection(
+            self._cached_ray, t, self, hit_point, inside_point, outside_point, normal,
+            self._direction[0] * face_normal.x + self._direction[1] * face_normal.y + self._direction[2] * face_normal.z > 0.0,
+            self.to_local(), self.to_root()
+        )
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cpdef bint contains(self, Point3D p) except -1:
+
+        cdef:
+            int32_t i, j
+            double fx, fy, h00, h10, h01, h11, height
+
+        # convert point to local object space
+        p = p.transform(self.to_local())
+
+        if not (0 <= p.x <= self._width and 0 <= p.y <= self._length and self._base <= p.z <= self._maximum):
+            return False
+
+        # locate cell
+        fx = p.x / self._dx
+        fy = p.y / self._dy
+        i = min(<int32_t> fx, self._nx - 2)
+        j = min(<int32_t> fy, self._ny - 2)
+        fx -= i
+        fy -= j
+
+        h00 = self._heights_mv[i, j]
+        h10 = self._heights_mv[i + 1, j]
+        h01 = self._heights_mv[i, j + 1]
+        h11 = self._heights_mv[i + 1, j + 1]
+
+        # interpolate the surface height on the cell triangle containing the point
+        if fx >= fy:
+            height = h00 + fx * (h10 - h00) + fy * (h11 - h10)
+        else:
+            height = h00 + fy * (h01 - h00) + fx * (h11 - h01)
+
+        return p.z <= height
+
+    cpdef BoundingBox3D bounding_box(self):
+
+        cdef:
+            list points
+            Point3D point
+            BoundingBox3D box
+
+        box = BoundingBox3D(new_point3d(0, 0, self._base), new_point3d(self._width, self._length, self._maximum))
+
+        # obtain local space vertices
+        points = box.vertices()
+
+        # convert points to world space and build an enclosing world space bounding box
+        # a small degree of padding is added to avoid potential numerical accuracy issues
+        box = BoundingBox3D()
+        for point in points:
+            box.extend(point.transform(self.to_root()), BOX_PADDING)
+
+        return box
+
+    cpdef object instance(self, object parent=None, AffineMatrix3D transform=None, Material material=None, str name=None):
+        return HeightField(self._heights, self._width, self._length, self._base, self._smoothing, parent, transform, material, name)
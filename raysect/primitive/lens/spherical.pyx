@@ -29,21 +29,338 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
-from raysect.primitive import Intersect, Subtract, Union, Sphere, Cylinder
-
-from raysect.core cimport Primitive
-from raysect.core cimport AffineMatrix3D, translate, Material
-from raysect.primitive.utility cimport EncapsulatedPrimitive
+from raysect.core cimport Primitive, Ray, Intersection, Point3D, Vector3D, Normal3D, BoundingBox3D
+from raysect.core cimport AffineMatrix3D, Material, new_point3d, new_normal3d, new_intersection
+from raysect.core.math.cython cimport solve_quadratic
 from libc.math cimport sqrt
+cimport cython
 
 """
 Basic spherical lens primitives.
 """
 
-cdef const double PADDING = 0.000001
+# bounding box is padded by a small amount to avoid numerical accuracy issues
+cdef const double BOX_PADDING = 1e-9
+
+# additional ray distance to avoid re-hitting the same surface point
+cdef const double EPSILON = 1e-9
+
+cdef enum:
+
+    # lens surface enumeration
+    FRONT_SURFACE = 0
+    BACK_SURFACE = 1
+    BARREL_SURFACE = 2
+
+    # surface shape enumeration
+    PLANE = 0
+    CONVEX = 1
+    CONCAVE = 2
+
+    # a ray can cross each spherical surface and the barrel at most twice
+    MAX_HITS = 6
 
 
-cdef class BiConvex(EncapsulatedPrimitive):
+cdef class _SphericalLens(Primitive):
+    """
+    Base class for the spherical lens primitives.
+
+    The lens is a solid of revolution about the z-axis, bounded by a
+    cylindrical barrel, a spherical front surface and a spherical or plane
+    back surface. The intersections with each surface are calculated
+    analytically and merged, so a lens is traced in a single hit() call.
+
+    Each spherical surface is described by the centre of curvature on the
+    z-axis, the radius of curvature and the hemisphere of the sphere
+    that forms the lens surface. The surface height at radius r is given by
+    z = centre + hemisphere * sqrt(curvature^2 - r^2).
+    """
+
+    cdef:
+        double _radius
+        int _front_shape, _back_shape
+        double _front_centre, _back_centre
+        double _front_radius, _back_radius
+        double _front_hemisphere, _back_hemisphere
+        double _front_edge, _back_edge
+        double _lower, _upper
+        double _hit_distance[MAX_HITS]
+        int _hit_surface[MAX_HITS]
+        int _hit_count
+        int _next_hit
+        Ray _cached_ray
+        Point3D _cached_origin
+        Vector3D _cached_direction
+
+    cdef void _configure(self, double diameter, double center_thickness, int front_shape, double front_curvature, int back_shape, double back_curvature):
+        """
+        Configures the lens surfaces.
+
+        The front surface is always spherical, its vertex lies on the z-axis
+        at z=center_thickness. The vertex of the back surface lies at z=0.
+        """
+
+        self._radius = 0.5 * diameter
+        self._front_shape = front_shape
+        self._back_shape = back_shape
+        self._front_radius = front_curvature
+        self._back_radius = back_curvature
+
+        if front_shape == CONVEX:
+            self._front_centre = center_thickness - front_curvature
+            self._front_hemisphere = 1.0
+        else:
+            self._front_centre = center_thickness + front_curvature
+            self._front_hemisphere = -1.0
+        self._front_edge = self._surface_height(self._front_centre, front_curvature, self._front_hemisphere, self._radius * self._radius)
+
+        if back_shape == PLANE:
+            self._back_centre = 0.0
+            self._back_hemisphere = 0.0
+            self._back_edge = 0.0
+        else:
+            if back_shape == CONVEX:
+                self._back_centre = back_curvature
+                self._back_hemisphere = -1.0
+            else:
+                self._back_centre = -back_curvature
+                self._back_hemisphere = 1.0
+            self._back_edge = self._surface_height(self._back_centre, back_curvature, self._back_hemisphere, self._radius * self._radius)
+
+        self._lower = min(0.0, self._back_edge)
+        self._upper = max(center_thickness, self._front_edge)
+
+        self._hit_count = 0
+        self._next_hit = 0
+
+    cdef double _surface_height(self, double centre, double curvature, double hemisphere, double radius_sqr):
+        return centre + hemisphere * sqrt(curvature * curvature - radius_sqr)
+
+    @cython.cdivision(True)
+    cpdef Intersection hit(self, Ray ray):
+
+        cdef:
+            Point3D origin
+            Vector3D direction
+            double a, b, c, t0, t1
+
+        # reset the next intersection cache
+        self._hit_count = 0
+        self._next_hit = 0
+
+        # convert ray origin and direction to local space
+        origin = ray.origin.transform(self.to_local())
+        direction = ray.direction.transform(self.to_local())
+
+        # barrel intersections, the barrel contributes no intersections if the ray is parallel to the lens axis
+        a = direction.x * direction.x + direction.y * direction.y
+        if a > 0:
+            b = 2.0 * (direction.x * origin.x + direction.y * origin.y)
+            c = origin.x * origin.x + origin.y * origin.y - self._radius * self._radius
+            if solve_quadratic(a, b, c, &t0, &t1):
+                self._add_barrel_hit(origin, direction, t0, ray.max_distance)
+                self._add_barrel_hit(origin, direction, t1, ray.max_distance)
+
+        # surface intersections
+        self._trace_sphere(origin, direction, ray.max_distance, FRONT_SURFACE, self._front_centre, self._front_radius, self._front_hemisphere)
+        if self._back_shape == PLANE:
+            if direction.z != 0:
+                self._add_cap_hit(origin, direction, -origin.z / direction.z, ray.max_distance, BACK_SURFACE)
+        else:
+            self._trace_sphere(origin, direction, ray.max_distance, BACK_SURFACE, self._back_centre, self._back_radius, self._back_hemisphere)
+
+        if self._hit_count == 0:
+            return None
+
+        self._cached_ray = ray
+        self._cached_origin = origin
+        self._cached_direction = direction
+
+        self._next_hit = 1
+        return self._generate_intersection(ray, origin, direction, self._hit_distance[0], self._hit_surface[0])
+
+    cpdef Intersection next_intersection(self):
+
+        cdef int index
+
+        if self._next_hit >= self._hit_count:
+            return None
+
+        index = self._next_hit
+        self._next_hit += 1
+        return self._generate_intersection(self._cached_ray, self._cached_origin, self._cached_direction,
+                                           self._hit_distance[index], self._hit_surface[index])
+
+    cdef void _trace_sphere(self, Point3D origin, Vector3D direction, double max_distance, int surface, double centre, double curvature, double hemisphere):
+
+        cdef double a, b, c, z, t0, t1
+
+        z = origin.z - centre
+        a = direction.x * direction.x + direction.y * direction.y + direction.z * direction.z
+        b = 2.0 * (direction.x * origin.x + direction.y * origin.y + direction.z * z)
+        c = origin.x * origin.x + origin.y * origin.y + z * z - curvature * curvature
+        if not solve_quadratic(a, b, c, &t0, &t1):
+            return
+
+        # only the lens hemisphere of the sphere forms part of the lens surface
+        if hemisphere * (origin.z + t0 * direction.z - centre) >= 0:
+            self._add_cap_hit(origin, direction, t0, max_distance, surface)
+
+        if hemisphere * (origin.z + t1 * direction.z - centre) >= 0:
+            self._add_cap_hit(origin, direction, t1, max_distance, surface)
+
+    cdef void _add_cap_hit(self, Point3D origin, Vector3D direction, double t, double max_distance, int surface):
+
+        cdef double x, y
+
+        # the lens surfaces are bounded by the barrel
+        x = origin.x + t * direction.x
+        y = origin.y + t * direction.y
+        if x * x + y * y <= self._radius * self._radius:
+            self._add_hit(t, surface, max_distance)
+
+    cdef void _add_barrel_hit(self, Point3D origin, Vector3D direction, double t, double max_distance):
+
+        cdef double z
+
+        # the barrel spans the region between the edges of the lens surfaces
+        z = origin.z + t * direction.z
+        if self._back_edge <= z <= self._front_edge:
+            self._add_hit(t, BARREL_SURFACE, max_distance)
+
+    cdef void _add_hit(self, double t, int surface, double max_distance):
+
+        cdef int i
+
+        if t < 0.0 or t > max_distance or self._hit_count == MAX_HITS:
+            return
+
+        # insertion sort, the hit list is very short
+        i = self._hit_count
+        while i > 0 and self._hit_distance[i - 1] > t:
+            self._hit_distance[i] = self._hit_distance[i - 1]
+            self._hit_surface[i] = self._hit_surface[i - 1]
+            i -= 1
+
+        self._hit_distance[i] = t
+        self._hit_surface[i] = surface
+        self._hit_count += 1
+
+    @cython.cdivision(True)
+    cdef Intersection _generate_intersection(self, Ray ray, Point3D origin, Vector3D direction, double ray_distance, int surface):
+
+        cdef:
+            Point3D hit_point, inside_point, outside_point
+            Normal3D normal
+            double x, y, z, r
+            bint exiting
+
+        # point of surface intersection in local space
+        hit_point = new_point3d(origin.x + ray_distance * direction.x,
+                                origin.y + ray_distance * direction.y,
+                                origin.z + ray_distance * direction.z)
+
+        # calculate surface normal in local space
+        if surface == BARREL_SURFACE:
+            normal = new_normal3d(hit_point.x, hit_point.y, 0).normalise()
+
+        elif surface == FRONT_SURFACE:
+            normal = self._sphere_normal(hit_point, self._front_shape, self._front_centre, self._front_radius)
+
+        elif self._back_shape == PLANE:
+            normal = new_normal3d(0, 0, -1)
+
+        else:
+            normal = self._sphere_normal(hit_point, self._back_shape, self._back_centre, self._back_radius)
+
+        # displace hit_point away from surface to generate inner and outer points
+        x = hit_point.x - EPSILON * normal.x
+        y = hit_point.y - EPSILON * normal.y
+        z = hit_point.z - EPSILON * normal.z
+
+        # keep the inside point within the lens at the edges of the surfaces
+        if surface == BARREL_SURFACE:
+            if hit_point.z > self._front_edge - EPSILON:
+                z -= EPSILON
+            if hit_point.z < self._back_edge + EPSILON:
+                z += EPSILON
+        else:
+            r = sqrt(hit_point.x * hit_point.x + hit_point.y * hit_point.y)
+            if r > self._radius - EPSILON:
+                x -= EPSILON * hit_point.x / r
+                y -= EPSILON * hit_point.y / r
+
+        inside_point = new_point3d(x, y, z)
+
+        outside_point = new_point3d(hit_point.x + EPSILON * normal.x,
+                                    hit_point.y + EPSILON * normal.y,
+                                    hit_point.z + EPSILON * normal.z)
+
+        # is ray exiting surface
+        exiting = direction.dot(normal) >= 0.0
+
+        return new_intersection(ray, ray_distance, self, hit_point, inside_point, outside_point,
+                                normal, exiting, self.to_local(), self.to_root())
+
+    @cython.cdivision(True)
+    cdef Normal3D _sphere_normal(self, Point3D point, int shape, double centre, double curvature):
+
+        cdef double scale
+
+        # the outward normal of a concave surface points towards the centre of curvature
+        scale = 1.0 / curvature
+        if shape == CONCAVE:
+            scale = -scale
+
+        return new_normal3d(scale * point.x, scale * point.y, scale * (point.z - centre))
+
+    cpdef bint contains(self, Point3D point) except -1:
+
+        cdef double radius_sqr
+
+        # convert point to local object space
+        point = point.transform(self.to_local())
+
+        # is the point inside the barrel
+        radius_sqr = point.x * point.x + point.y * point.y
+        if radius_sqr > self._radius * self._radius:
+            return False
+
+        # is the point below the front surface
+        if point.z > self._surface_height(self._front_centre, self._front_radius, self._front_hemisphere, radius_sqr):
+            return False
+
+        # is the point above the back surface
+        if self._back_shape == PLANE:
+            return point.z >= 0.0
+        return point.z >= self._surface_height(self._back_centre, self._back_radius, self._back_hemisphere, radius_sqr)
+
+    cpdef BoundingBox3D bounding_box(self):
+
+        cdef:
+            list points
+            Point3D point
+            BoundingBox3D box
+
+        box = BoundingBox3D()
+
+        # calculate local bounds
+        box.lower = new_point3d(-self._radius, -self._radius, self._lower)
+        box.upper = new_point3d(self._radius, self._radius, self._upper)
+
+        # obtain local space vertices
+        points = box.vertices()
+
+        # convert points to world space and build an enclosing world space bounding box
+        # a small degree of padding is added to avoid potential numerical accuracy issues
+        box = BoundingBox3D()
+        for point in points:
+            box.extend(point.transform(self.to_root()), BOX_PADDING)
+
+        return box
+
+
+cdef class BiConvex(_SphericalLens):
     """
     A bi-convex spherical lens primitive.
 
@@ -102,14 +419,10 @@ cdef class BiConvex(EncapsulatedPrimitive):
         if self.edge_thickness < 0:
             raise ValueError("The curvatures and/or thickness are too small to produce a lens of the specified diameter.")
 
-        # construct lens
-        if self._is_short():
-            lens = self._build_short_lens()
-        else:
-            lens = self._build_long_lens()
+        # configure lens surfaces
+        self._configure(diameter, center_thickness, CONVEX, front_curvature, CONVEX, back_curvature)
 
-        # attach to local root (performed in EncapsulatedPrimitive init)
-        super().__init__(lens, parent, transform, material, name)
+        super().__init__(parent, transform, material, name)
 
     cdef void _calc_geometry(self):
 
@@ -126,61 +439,11 @@ cdef class BiConvex(EncapsulatedPrimitive):
         # edge thickness is the length of the barrel without the curved surfaces
         self.edge_thickness = self.center_thickness - (self.front_thickness + self.back_thickness)
 
-    cdef bint _is_short(self):
-        """
-        Do the facing spheres overlap sufficiently to build a lens using just their intersection?
-        """
-
-        cdef double available_thickness = min(
-            2 * (self.front_curvature - self.front_thickness),
-            2 * (self.back_curvature - self.back_thickness)
-        )
-        return self.edge_thickness <= available_thickness
-
-    cdef Primitive _build_short_lens(self):
-        """
-        Short lens requires 3 primitives.
-        """
-
-        # padding to add to the barrel cylinder to avoid potential numerical accuracy issues
-        padding = self.center_thickness * PADDING
-
-        # construct lens using CSG
-        front = Sphere(self.front_curvature, transform=translate(0, 0, self.center_thickness - self.front_curvature))
-        back = Sphere(self.back_curvature, transform=translate(0, 0, self.back_curvature))
-        barrel = Cylinder(0.5 * self.diameter, self.center_thickness + 2 * padding, transform=translate(0, 0, -padding))
-        return Intersect(barrel, Intersect(front, back))
-
-    cdef Primitive _build_long_lens(self):
-        """
-        Long lens requires 5 primitives.
-        """
-
-        # padding to avoid potential numerical accuracy issues
-        padding = self.center_thickness * PADDING
-        radius = 0.5 * self.diameter
-
-        # front face
-        front_sphere = Sphere(self.front_curvature, transform=translate(0, 0, self.center_thickness - self.front_curvature))
-        front_barrel = Cylinder(radius, self.front_thickness + 2 * padding, transform=translate(0, 0, self.back_thickness + self.edge_thickness - padding))
-        front_element = Intersect(front_sphere, front_barrel)
-
-        # back face
-        back_sphere = Sphere(self.back_curvature, transform=translate(0, 0, self.back_curvature))
-        back_barrel = Cylinder(radius, self.back_thickness + 2 * padding, transform=translate(0, 0, -padding))
-        back_element = Intersect(back_sphere, back_barrel)
-
-        # bridging barrel
-        barrel = Cylinder(radius, self.edge_thickness, transform=translate(0, 0, self.back_thickness))
-
-        # construct lens
-        return Union(barrel, Union(front_element, back_element))
-
     cpdef object instance(self, object parent=None, AffineMatrix3D transform=None, Material material=None, str name=None):
         return BiConvex(self.diameter, self.center_thickness, self.front_curvature, self.back_curvature, parent, transform, material, name)
 
 
-cdef class BiConcave(EncapsulatedPrimitive):
+cdef class BiConcave(_SphericalLens):
     """
     A bi-concave spherical lens primitive.
 
@@ -236,14 +499,10 @@ cdef class BiConcave(EncapsulatedPrimitive):
 
         self._calc_geometry()
 
-        # construct lens using CSG
-        front = Sphere(front_curvature, transform=translate(0, 0, center_thickness + front_curvature))
-        back = Sphere(back_curvature, transform=translate(0, 0, -back_curvature))
-        barrel = Cylinder(radius, self.edge_thickness, transform=translate(0, 0, -self.back_thickness))
-        lens = Subtract(Subtract(barrel, front), back)
+        # configure lens surfaces
+        self._configure(diameter, center_thickness, CONCAVE, front_curvature, CONCAVE, back_curvature)
 
-        # attach to local root (performed in EncapsulatedPrimitive init)
-        super().__init__(lens, parent, transform, material, name)
+        super().__init__(parent, transform, material, name)
 
     cdef void _calc_geometry(self):
 
@@ -264,7 +523,7 @@ cdef class BiConcave(EncapsulatedPrimitive):
         return BiConcave(self.diameter, self.center_thickness, self.front_curvature, self.back_curvature, parent, transform, material, name)
 
 
-cdef class PlanoConvex(EncapsulatedPrimitive):
+cdef class PlanoConvex(_SphericalLens):
     """
     A plano-convex spherical lens primitive.
 
@@ -318,14 +577,10 @@ cdef class PlanoConvex(EncapsulatedPrimitive):
         if self.edge_thickness < 0:
             raise ValueError("The curvature and/or thickness is too small to produce a lens of the specified diameter.")
 
-        # construct lens
-        if self._is_short():
-            lens = self._build_short_lens()
-        else:
-            lens = self._build_long_lens()
+        # configure lens surfaces
+        self._configure(diameter, center_thickness, CONVEX, curvature, PLANE, 0)
 
-        # attach to local root (performed in EncapsulatedPrimitive init)
-        super().__init__(lens, parent, transform, material, name)
+        super().__init__(parent, transform, material, name)
 
     cdef void _calc_geometry(self):
 
@@ -341,52 +596,11 @@ cdef class PlanoConvex(EncapsulatedPrimitive):
         # edge thickness is the length of the barrel without the curved surfaces
         self.edge_thickness = self.center_thickness - self.curve_thickness
 
-    cdef bint _is_short(self):
-        """
-        Does the front sphere have sufficient radius to build the lens with just an intersection?
-        """
-
-        cdef double available_thickness = 2 * (self.curvature - self.curve_thickness)
-        return self.edge_thickness <= available_thickness
-
-    cdef Primitive _build_short_lens(self):
-        """
-        Short lens requires 2 primitives.
-        """
-
-        # padding to add to the barrel cylinder to avoid potential numerical accuracy issues
-        padding = self.center_thickness * PADDING
-
-        # construct lens using CSG
-        front = Sphere(self.curvature, transform=translate(0, 0, self.center_thickness - self.curvature))
-        barrel = Cylinder(0.5 * self.diameter, self.center_thickness + padding)
-        return Intersect(barrel, front)
-
-    cdef Primitive _build_long_lens(self):
-        """
-        Long lens requires 3 primitives.
-        """
-
-        # padding to avoid potential numerical accuracy issues
-        padding = self.center_thickness * PADDING
-        radius = 0.5 * self.diameter
-
-        # curved face
-        curved_sphere = Sphere(self.curvature, transform=translate(0, 0, self.center_thickness - self.curvature))
-        curved_barrel = Cylinder(radius, self.curve_thickness + 2 * padding, transform=translate(0, 0, self.edge_thickness - padding))
-        curved_element = Intersect(curved_sphere, curved_barrel)
-
-        # barrel
-        barrel = Cylinder(radius, self.edge_thickness)
-
-        # construct lens
-        return Union(barrel, curved_element)
-
     cpdef object instance(self, object parent=None, AffineMatrix3D transform=None, Material material=None, str name=None):
         return PlanoConvex(self.diameter, self.center_thickness, self.curvature, parent, transform, material, name)
 
 
-cdef class PlanoConcave(EncapsulatedPrimitive):
+cdef class PlanoConcave(_SphericalLens):
     """
     A plano-concave spherical lens primitive.
 
@@ -437,13 +651,10 @@ cdef class PlanoConcave(EncapsulatedPrimitive):
 
         self._calc_geometry()
 
-        # construct lens using CSG
-        curve = Sphere(curvature, transform=translate(0, 0, center_thickness + curvature))
-        barrel = Cylinder(radius, self.edge_thickness)
-        lens = Subtract(barrel, curve)
+        # configure lens surfaces
+        self._configure(diameter, center_thickness, CONCAVE, curvature, PLANE, 0)
 
-        # attach to local root (performed in EncapsulatedPrimitive init)
-        super().__init__(lens, parent, transform, material, name)
+        super().__init__(parent, transform, material, name)
 
     cdef void _calc_geometry(self):
 
@@ -463,7 +674,7 @@ cdef class PlanoConcave(EncapsulatedPrimitive):
         return PlanoConcave(self.diameter, self.center_thickness, self.curvature, parent, transform, material, name)
 
 
-cdef class Meniscus(EncapsulatedPrimitive):
+cdef class Meniscus(_SphericalLens):
     """
     A meniscus spherical lens primitive.
 
@@ -522,14 +733,10 @@ cdef class Meniscus(EncapsulatedPrimitive):
         if self.edge_thickness < 0:
             raise ValueError("The curvatures and/or thickness are not compatible with the specified diameter.")
 
-        # construct lens
-        if self._is_short():
-            lens = self._build_short_lens()
-        else:
-            lens = self._build_long_lens()
+        # configure lens surfaces
+        self._configure(diameter, center_thickness, CONVEX, front_curvature, CONCAVE, back_curvature)
 
-        # attach to local root (performed in EncapsulatedPrimitive init)
-        super().__init__(lens, parent, transform, material, name)
+        super().__init__(parent, transform, material, name)
 
     cdef void _calc_geometry(self):
 
@@ -546,81 +753,5 @@ cdef class Meniscus(EncapsulatedPrimitive):
         # edge thickness is the length of the barrel without the front surface
         self.edge_thickness = self.center_thickness - self.front_thickness + self.back_thickness
 
-    cdef bint _is_short(self):
-        """
-        Does the front sphere have sufficient radius to build the lens with just an intersection?
-        """
-
-        cdef double available_thickness = 2 * self.front_curvature - self.front_thickness
-        return (self.center_thickness + self.back_thickness) <= available_thickness
-
-    cdef Primitive _build_short_lens(self):
-        """
-        Short lens requires 3 primitives.
-        """
-
-        # padding to add to the barrel cylinder to avoid potential numerical accuracy issues
-        padding = (self.back_thickness + self.center_thickness) * PADDING
-
-        # construct lens using CSG
-        front = Sphere(self.front_curvature, transform=translate(0, 0, self.center_thickness - self.front_curvature))
-        back = Sphere(self.back_curvature, transform=translate(0, 0, -self.back_curvature))
-        barrel = Cylinder(0.5 * self.diameter, self.back_thickness + self.center_thickness + padding, transform=translate(0, 0, -self.back_thickness))
-        return Subtract(Intersect(barrel, front), back)
-
-    cdef Primitive _build_long_lens(self):
-        """
-        Long lens requires 4 primitives.
-        """
-
-        # padding to avoid potential numerical accuracy issues
-        padding = (self.back_thickness + self.center_thickness) * PADDING
-        radius = 0.5 * self.diameter
-
-        # front face
-        front_sphere = Sphere(self.front_curvature, transform=translate(0, 0, self.center_thickness - self.front_curvature))
-        front_barrel = Cylinder(radius, self.front_thickness + 2 * padding, transform=translate(0, 0, self.center_thickness - self.front_thickness - padding))
-        front_element = Intersect(front_sphere, front_barrel)
-
-        # back face
-        back_element = Sphere(self.back_curvature, transform=translate(0, 0, -self.back_curvature))
-
-        # barrel
-        barrel = Cylinder(radius, self.edge_thickness, transform=translate(0, 0, -self.back_thickness))
-
-        # construct lens
-        return Subtract(Union(barrel, front_element), back_element)
-
     cpdef object instance(self, object parent=None, AffineMatrix3D transform=None, Material material=None, str name=None):
         return Meniscus(self.diameter, self.center_thickness, self.front_curvature, self.back_curvature, parent, transform, material, name)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
@@ -29,7 +29,8 @@
 
 import unittest
 
-from raysect.core import Point3D, Vector3D
+from raysect.core import Point3D, Vector3D, translate
+from raysect.primitive import Sphere, Cylinder, Union, Intersect, Subtract
 from raysect.primitive.lens.spherical import BiConvex, BiConcave, PlanoConvex, PlanoConcave, Meniscus
 from raysect.core.ray import Ray as CoreRay
 
@@ -441,3 +442,105 @@ class TestSphericalLens(unittest.TestCase):
                 cos_angle_incidence = intersection.normal.dot(intersection.ray.direction.normalise())
                 self.assertAlmostEqual(fabs(cos_angle_incidence), 1, self.tolerance_angle,
                                        msg="Angle of incidence differs from perpendicular.")
+
+
+def _csg_lens(lens):
+    """
+    Builds the CSG equivalent of a spherical lens.
+    """
+
+    radius = 0.5 * lens.diameter
+    ct = lens.center_thickness
+
+    # overlap the CSG elements to avoid internal surfaces
+    padding = 1e-6 * ct
+
+    if isinstance(lens, BiConvex):
+        front = Intersect(Sphere(lens.front_curvature, transform=translate(0, 0, ct - lens.front_curvature)),
+                          Cylinder(radius, lens.front_thickness + 2 * padding, transform=translate(0, 0, ct - lens.front_thickness - padding)))
+        back = Intersect(Sphere(lens.back_curvature, transform=translate(0, 0, lens.back_curvature)),
+                         Cylinder(radius, lens.back_thickness + 2 * padding, transform=translate(0, 0, -padding)))
+        barrel = Cylinder(radius, lens.edge_thickness, transform=translate(0, 0, lens.back_thickness))
+        return Union(barrel, Union(front, back))
+
+    if isinstance(lens, BiConcave):
+        front = Sphere(lens.front_curvature, transform=translate(0, 0, ct + lens.front_curvature))
+        back = Sphere(lens.back_curvature, transform=translate(0, 0, -lens.back_curvature))
+        barrel = Cylinder(radius, lens.edge_thickness, transform=translate(0, 0, -lens.back_thickness))
+        return Subtract(Subtract(barrel, front), back)
+
+    if isinstance(lens, PlanoConvex):
+        curve = Intersect(Sphere(lens.curvature, transform=translate(0, 0, ct - lens.curvature)),
+                          Cylinder(radius, lens.curve_thickness + 2 * padding, transform=translate(0, 0, lens.edge_thickness - padding)))
+        return Union(Cylinder(radius, lens.edge_thickness), curve)
+
+    if isinstance(lens, PlanoConcave):
+        curve = Sphere(lens.curvature, transform=translate(0, 0, ct + lens.curvature))
+        return Subtract(Cylinder(radius, lens.edge_thickness), curve)
+
+    front = Intersect(Sphere(lens.front_curvature, transform=translate(0, 0, ct - lens.front_curvature)),
+                      Cylinder(radius, lens.front_thickness + 2 * padding, transform=translate(0, 0, ct - lens.front_thickness - padding)))
+    back = Sphere(lens.back_curvature, transform=translate(0, 0, -lens.back_curvature))
+    barrel = Cylinder(radius, lens.edge_thickness, transform=translate(0, 0, -lens.back_thickness))
+    return Subtract(Union(barrel, front), back)
+
+
+class TestSphericalLensGeometry(unittest.TestCase):
+    """
+    Compares the analytic lens primitives against equivalent CSG constructions.
+    """
+
+    lenses = [
+        BiConvex(25, 8, 30, 50),
+        BiConvex(25, 16, 12.5, 40),
+        BiConcave(25, 2, 30, 60),
+        PlanoConvex(25, 6, 20),
+        PlanoConvex(25, 14, 12.5),
+        PlanoConcave(25, 3, 25),
+        Meniscus(25, 5, 30, 60),
+        Meniscus(25, 10, 15, 20)
+    ]
+
+    def test_intersections(self):
+
+        rng = np.random.default_rng(1)
+        for lens in self.lenses:
+            reference = _csg_lens(lens)
+            for _ in range(500):
+                origin = Point3D(*rng.uniform(-30, 30, 3))
+                target = Point3D(*rng.uniform((-12.5, -12.5, -5), (12.5, 12.5, 15)))
+                ray = CoreRay(origin, origin.vector_to(target).normalise())
+
+                expected = []
+                intersection = reference.hit(ray)
+                while intersection is not None:
+                    expected.append(intersection)
+                    intersection = reference.next_intersection()
+
+                intersection = lens.hit(ray)
+                for reference_intersection in expected:
+                    self.assertIsNotNone(intersection)
+                    self.assertAlmostEqual(intersection.ray_distance, reference_intersection.ray_distance, places=8)
+                    self.assertEqual(intersection.exiting, reference_intersection.exiting)
+                    self.assertAlmostEqual(intersection.normal.dot(reference_intersection.normal), 1.0, places=8)
+                    intersection = lens.next_intersection()
+                self.assertIsNone(intersection)
+
+    def test_contains(self):
+
+        rng = np.random.default_rng(2)
+        for lens in self.lenses:
+            reference = _csg_lens(lens)
+            for point in rng.uniform((-15, -15, -8), (15, 15, 18), (2000, 3)):
+                point = Point3D(*point)
+                self.assertEqual(lens.contains(point), reference.contains(point))
+
+    def test_bounding_box(self):
+
+        for lens in self.lenses:
+            box = lens.bounding_box()
+            reference = _csg_lens(lens).bounding_box()
+            for a, b in ((box.lower, reference.lower), (box.upper, reference.upper)):
+                self.assertAlmostEqual(a.x, b.x, places=6)
+                self.assertAlmostEqual(a.y, b.y, places=6)
+                self.assertAlmostEqual(a.z, b.z, places=6)
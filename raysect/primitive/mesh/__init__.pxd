@@ -30,3 +30,4 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 from raysect.primitive.mesh.mesh cimport Mesh, MeshIntersection
+from raysect.primitive.mesh.lod cimport LODMesh
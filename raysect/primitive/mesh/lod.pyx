@@ -0,0 +1,1130 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+from numpy import array, arange, argsort, bincount, concatenate, cumsum, empty, float64, full, int32, int64, sort, uint8, unique, zeros
+from raysect.core cimport AffineMatrix3D, Material, Ray, new_ray, Intersection, BoundingBox3D
+from raysect.primitive.mesh.mesh cimport Mesh, MeshData
+from libc.math cimport fabs, sqrt, INFINITY
+from numpy cimport ndarray, int32_t, uint8_t
+cimport cython
+
+# constants
+cdef enum:
+
+    # vertex index
+    V1 = 0
+    V2 = 1
+    V3 = 2
+
+    # quadric coefficient index
+    QXX = 0
+    QXY = 1
+    QXZ = 2
+    QXW = 3
+    QYY = 4
+    QYZ = 5
+    QYW = 6
+    QZZ = 7
+    QZW = 8
+    QWW = 9
+
+    # the smallest number of triangles a simplified mesh may contain (a tetrahedron)
+    MIN_TRIANGLES = 4
+
+cdef class _QuadricSimplifier:
+    """
+    Simplifies a triangle mesh by iterative edge collapse.
+
+    Each vertex accumulates a quadric holding the planes of the original
+    triangles it represents. The cost of collapsing an edge is the sum of the
+    squared distances of the merged vertex to these planes. Open mesh
+    boundaries are preserved with additional planes perpendicular to the
+    boundary edges.
+
+    The collapses are performed in passes. Each pass collapses edges in order of
+    increasing cost, skipping edges whose neighbourhood has already been
+    modified in the pass. Collapses that would make the mesh non-manifold or flip
+    a triangle are rejected.
+
+    :param object vertices: An N x 3 array of vertices.
+    :param object triangles: An M x 3 array of vertex indices, additional
+      columns (e.g. normal indices) are ignored.
+    """
+
+    cdef:
+        ndarray _vertices
+        ndarray _triangles
+        ndarray _quadrics
+        ndarray _parents
+        ndarray _original_vertices
+        ndarray _original_triangles
+
+    def __init__(self, object vertices, object triangles):
+
+        vertices = array(vertices, dtype=float64)
+        triangles = array(triangles, dtype=int32)
+
+        if vertices.ndim != 2 or vertices.shape[1] != 3:
+            raise ValueError("The vertex array must have dimensions Nx3.")
+
+        if triangles.ndim != 2 or (triangles.shape[1] != 3 and triangles.shape[1] != 6):
+            raise ValueError("The triangle array must have dimensions Mx3 or Mx6.")
+
+        if triangles.size > 0 and (triangles[:, :3].min() < 0 or triangles[:, :3].max() >= vertices.shape[0]):
+            raise ValueError("The triangle array references non-existent vertices.")
+
+        self._vertices = vertices
+        self._triangles = array(triangles[:, :3], dtype=int32)
+        self._quadrics = zeros((vertices.shape[0], 10), dtype=float64)
+        self._parents = arange(vertices.shape[0], dtype=int32)
+        self._original_vertices = vertices.copy()
+        self._original_triangles = self._triangles.copy()
+
+        self._initialise_quadrics()
+
+    @property
+    def triangle_count(self):
+        return self._triangles.shape[0]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef object _initialise_quadrics(self):
+
+        cdef:
+            int32_t i, f, a, b
+            double[:, ::1] vertices_mv = self._vertices
+            double[:, ::1] quadrics_mv = self._quadrics
+            int32_t[:, ::1] triangles_mv = self._triangles
+            int32_t[::1] edge_a_mv, edge_b_mv, edge_face_mv
+            double normal[3]
+            double edge[3]
+            double plane[3]
+
+        # triangle planes
+        for f in range(triangles_mv.shape[0]):
+            if _triangle_normal(vertices_mv, triangles_mv, f, normal):
+                for i in range(3):
+                    _add_plane(quadrics_mv, triangles_mv[f, i], normal, &vertices_mv[triangles_mv[f, i], 0])
+
+        # boundary edges are referenced by a single triangle
+        keys, first, counts = unique(self._edge_keys(), return_index=True, return_counts=True)
+        boundary = counts == 1
+        n = vertices_mv.shape[0]
+        edge_a_mv = (keys[boundary] // n).astype(int32)
+        edge_b_mv = (keys[boundary] % n).astype(int32)
+        edge_face_mv = (first[boundary] % triangles_mv.shape[0]).astype(int32)
+
+        # constrain boundary vertices to planes perpendicular to the boundary
+        for i in range(edge_a_mv.shape[0]):
+            a = edge_a_mv[i]
+            b = edge_b_mv[i]
+            f = edge_face_mv[i]
+
+            if not _triangle_normal(vertices_mv, triangles_mv, f, normal):
+                continue
+
+            edge[0] = vertices_mv[b, 0] - vertices_mv[a, 0]
+            edge[1] = vertices_mv[b, 1] - vertices_mv[a, 1]
+            edge[2] = vertices_mv[b, 2] - vertices_mv[a, 2]
+
+            plane[0] = edge[1] * normal[2] - edge[2] * normal[1]
+            plane[1] = edge[2] * normal[0] - edge[0] * normal[2]
+            plane[2] = edge[0] * normal[1] - edge[1] * normal[0]
+            if not _normalise(plane):
+                continue
+
+            _add_plane(quadrics_mv, a, plane, &vertices_mv[a, 0])
+            _add_plane(quadrics_mv, b, plane, &vertices_mv[a, 0])
+
+    cdef ndarray _edge_keys(self):
+        """
+        Returns a unique integer key for each triangle edge, ordered edge by edge.
+
+        The key for the edge between vertices a < b is a * N + b, where N is the
+        number of vertices. Key k belongs to triangle k % M, where M is the number
+        of triangles.
+        """
+
+        triangles = self._triangles
+        edges = sort(concatenate((triangles[:, [V1, V2]], triangles[:, [V2, V3]], triangles[:, [V3, V1]])), axis=1).astype(int64)
+        return edges[:, 0] * self._vertices.shape[0] + edges[:, 1]
+
+    def simplify(self, int target):
+        """
+        Collapses edges until the mesh has no more than the target number of triangles.
+
+        Simplification stops early if no further edges can be collapsed without
+        exceeding the error limit.
+
+        :param int target: The target number of triangles.
+        """
+
+        target = max(target, MIN_TRIANGLES)
+        while self._triangles.shape[0] > target:
+            if not self._collapse_pass(target):
+                break
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef bint _collapse_pass(self, int32_t target):
+
+        cdef:
+            int32_t n, remaining, collapsed, stamp
+            int32_t i, j, k, a, b, f, v, shared, common
+            bint valid
+            double[:, ::1] vertices_mv = self._vertices
+            double[:, ::1] quadrics_mv = self._quadrics
+            int32_t[:, ::1] triangles_mv = self._triangles
+            int32_t[::1] edge_a_mv, edge_b_mv, order_mv, offsets_mv, faces_mv, marks_a_mv, marks_b_mv
+            double[::1] costs_mv
+            double[:, ::1] positions_mv
+            uint8_t[::1] locked_mv, dead_mv
+            int32_t[::1] parents_mv = self._parents
+
+        n = vertices_mv.shape[0]
+        remaining = triangles_mv.shape[0]
+
+        # rank unique edges by collapse cost
+        keys = unique(self._edge_keys())
+        edge_a_mv = (keys // n).astype(int32)
+        edge_b_mv = (keys % n).astype(int32)
+
+        costs = zeros(keys.shape[0], dtype=float64)
+        positions = zeros((keys.shape[0], 3), dtype=float64)
+        costs_mv = costs
+        positions_mv = positions
+        for i in range(edge_a_mv.shape[0]):
+            costs_mv[i] = _collapse_cost(vertices_mv, quadrics_mv, edge_a_mv[i], edge_b_mv[i], &positions_mv[i, 0])
+        order_mv = argsort(costs, kind="stable").astype(int32)
+
+        # triangles referencing each vertex
+        vertex_ids = self._triangles.ravel()
+        offsets = zeros(n + 1, dtype=int32)
+        offsets[1:] = cumsum(bincount(vertex_ids, minlength=n))
+        offsets_mv = offsets
+        faces_mv = (argsort(vertex_ids, kind="stable") // 3).astype(int32)
+
+        dead = zeros(remaining, dtype=uint8)
+        dead_mv = dead
+        locked_mv = zeros(n, dtype=uint8)
+        marks_a_mv = full(n, -1, dtype=int32)
+        marks_b_mv = full(n, -1, dtype=int32)
+
+        collapsed = 0
+        for stamp in range(order_mv.shape[0]):
+
+            if remaining <= target:
+                break
+
+            k = order_mv[stamp]
+            a = edge_a_mv[k]
+            b = edge_b_mv[k]
+            if locked_mv[a] or locked_mv[b]:
+                continue
+
+            # mark the neighbours of vertex a
+            for i in range(offsets_mv[a], offsets_mv[a + 1]):
+                f = faces_mv[i]
+                for j in range(3):
+                    marks_a_mv[triangles_mv[f, j]] = stamp
+
+            # count the triangles sharing the edge and the neighbours common to both vertices
+            shared = 0
+            common = 0
+            for i in range(offsets_mv[b], offsets_mv[b + 1]):
+                f = faces_mv[i]
+                if triangles_mv[f, V1] == a or triangles_mv[f, V2] == a or triangles_mv[f, V3] == a:
+                    shared += 1
+                for j in range(3):
+                    v = triangles_mv[f, j]
+                    if v != a and v != b and marks_a_mv[v] == stamp and marks_b_mv[v] != stamp:
+                        marks_b_mv[v] = stamp
+                        common += 1
+
+            # the link condition, each triangle on the edge must contribute the only common neighbours
+            if shared == 0 or shared > 2 or common != shared:
+                continue
+
+            # reject collapses that flip or degenerate the surrounding triangles
+            valid = True
+            for i in range(offsets_mv[a], offsets_mv[a + 1]):
+                if not _moved_triangle_valid(vertices_mv, triangles_mv, faces_mv[i], a, b, &positions_mv[k, 0]):
+                    valid = False
+                    break
+
+            if valid:
+                for i in range(offsets_mv[b], offsets_mv[b + 1]):
+                    if not _moved_triangle_valid(vertices_mv, triangles_mv, faces_mv[i], b, a, &positions_mv[k, 0]):
+                        valid = False
+                        break
+
+            if not valid:
+                continue
+
+            # lock the neighbourhood, the vertex to triangle map is not updated during a pass
+            for i in range(offsets_mv[a], offsets_mv[a + 1]):
+                f = faces_mv[i]
+                for j in range(3):
+                    locked_mv[triangles_mv[f, j]] = True
+
+            for i in range(offsets_mv[b], offsets_mv[b + 1]):
+                f = faces_mv[i]
+                for j in range(3):
+                    locked_mv[triangles_mv[f, j]] = True
+
+            # collapse vertex b into vertex a
+            for j in range(3):
+                vertices_mv[a, j] = positions_mv[k, j]
+
+            for j in range(10):
+                quadrics_mv[a, j] += quadrics_mv[b, j]
+
+            for i in range(offsets_mv[b], offsets_mv[b + 1]):
+                f = faces_mv[i]
+                if triangles_mv[f, V1] == a or triangles_mv[f, V2] == a or triangles_mv[f, V3] == a:
+                    dead_mv[f] = True
+                else:
+                    for j in range(3):
+                        if triangles_mv[f, j] == b:
+                            triangles_mv[f, j] = a
+
+            parents_mv[b] = a
+            remaining -= shared
+            collapsed += 1
+
+        if collapsed > 0:
+            self._triangles = self._triangles[dead == 0]
+
+        return collapsed > 0
+
+    def result(self):
+        """
+        Returns the simplified mesh.
+
+        :return: A tuple of the vertex array, the triangle array and the geometric error.
+        """
+
+        used = unique(self._triangles)
+        remap = full(self._vertices.shape[0], -1, dtype=int32)
+        remap[used] = arange(used.shape[0], dtype=int32)
+        return self._vertices[used], remap[self._triangles], self._measure_error()
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double _measure_error(self):
+        """
+        Estimates the distance between the original and simplified surfaces.
+
+        Each surface is sampled at its vertices, edge midpoints and triangle
+        centroids. Samples of the original surface are measured against the
+        simplified triangles surrounding the simplified vertices their triangle
+        was merged into, samples of the simplified surface are measured against
+        the original triangles merged into their triangle's vertices. The
+        largest distance is returned.
+
+        This is an estimate of the Hausdorff distance between the surfaces,
+        not a bound: the surfaces may deviate by more between the samples.
+        """
+
+        cdef:
+            int32_t i, j, k, f, n, root
+            double error
+            double[:, ::1] vertices_mv = self._vertices
+            double[:, ::1] original_vertices_mv = self._original_vertices
+            int32_t[:, ::1] triangles_mv = self._triangles
+            int32_t[:, ::1] original_triangles_mv = self._original_triangles
+            int32_t[::1] roots_mv, offsets_mv, faces_mv, original_offsets_mv, original_faces_mv
+            int32_t[3] candidates
+            double[:, ::1] samples_mv
+
+        n = vertices_mv.shape[0]
+
+        # resolve the simplified vertex each original vertex was merged into
+        roots = self._parents.copy()
+        roots_mv = roots
+        for i in range(n):
+            root = roots_mv[i]
+            while roots_mv[root] != root:
+                root = roots_mv[root]
+            roots_mv[i] = root
+
+        # simplified triangles referencing each simplified vertex
+        offsets, faces = _vertex_faces(self._triangles, n)
+        offsets_mv = offsets
+        faces_mv = faces
+
+        # original triangles merged into each simplified vertex
+        original_offsets, original_faces = _vertex_faces(roots[self._original_triangles], n)
+        original_offsets_mv = original_offsets
+        original_faces_mv = original_faces
+
+        # original surface to the simplified surface
+        error = 0.0
+        samples = empty((7, 3), dtype=float64)
+        samples_mv = samples
+        for f in range(original_triangles_mv.shape[0]):
+
+            for j in range(3):
+                candidates[j] = roots_mv[original_triangles_mv[f, j]]
+
+            _triangle_samples(original_vertices_mv, original_triangles_mv, f, samples_mv)
+            for k in range(7):
+                error = max(error, _nearest_neighbourhood(
+                    &samples_mv[k, 0], candidates, offsets_mv, faces_mv, vertices_mv, triangles_mv
+                ))
+
+        # simplified surface to the original surface
+        for f in range(triangles_mv.shape[0]):
+
+            for j in range(3):
+                candidates[j] = triangles_mv[f, j]
+
+            _triangle_samples(vertices_mv, triangles_mv, f, samples_mv)
+            for k in range(7):
+                error = max(error, _nearest_merged(
+                    &samples_mv[k, 0], candidates, original_offsets_mv, original_faces_mv, original_vertices_mv, original_triangles_mv
+                ))
+
+        return sqrt(error)
+
+
+cdef tuple _vertex_faces(ndarray triangles, int32_t n):
+    """
+    Returns the triangles referencing each vertex as an offset and face array.
+
+    The triangles referencing vertex i are faces[offsets[i]:offsets[i + 1]].
+    """
+
+    vertex_ids = triangles.ravel()
+    offsets = zeros(n + 1, dtype=int32)
+    offsets[1:] = cumsum(bincount(vertex_ids, minlength=n))
+    faces = (argsort(vertex_ids, kind="stable") // 3).astype(int32)
+    return offsets, faces
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+@cython.cdivision(True)
+cdef inline void _triangle_samples(double[:, ::1] vertices, int32_t[:, ::1] triangles, int32_t f, double[:, ::1] samples):
+    """
+    Populates samples with a triangle's vertices, edge midpoints and centroid.
+    """
+
+    cdef int32_t j, k
+
+    for j in range(3):
+        for k in range(3):
+            samples[k, j] = vertices[triangles[f, k], j]
+        samples[3, j] = 0.5 * (samples[0, j] + samples[1, j])
+        samples[4, j] = 0.5 * (samples[1, j] + samples[2, j])
+        samples[5, j] = 0.5 * (samples[2, j] + samples[0, j])
+        samples[6, j] = (samples[0, j] + samples[1, j] + samples[2, j]) / 3.0
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+cdef double _nearest_neighbourhood(const double *p, const int32_t *roots, int32_t[::1] offsets, int32_t[::1] faces,
+                                   double[:, ::1] vertices, int32_t[:, ::1] triangles):
+    """
+    Returns the squared distance from a point to the nearest simplified triangle around the specified vertices.
+
+    The triangles surrounding the vertices adjacent to each simplified vertex
+    are searched. Returns zero if none of the vertices are referenced by a
+    simplified triangle.
+    """
+
+    cdef:
+        int32_t i, j, k, l, f, v
+        double distance = INFINITY
+        bint found = False
+
+    for i in range(3):
+        for j in range(offsets[roots[i]], offsets[roots[i] + 1]):
+            for k in range(3):
+                v = triangles[faces[j], k]
+                for l in range(offsets[v], offsets[v + 1]):
+                    f = faces[l]
+                    found = True
+                    distance = min(distance, _point_triangle_distance(
+                        p,
+                        &vertices[triangles[f, V1], 0],
+                        &vertices[triangles[f, V2], 0],
+                        &vertices[triangles[f, V3], 0]
+                    ))
+
+    return distance if found else 0.0
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+cdef double _nearest_merged(const double *p, const int32_t *roots, int32_t[::1] offsets, int32_t[::1] faces,
+                            double[:, ::1] vertices, int32_t[:, ::1] triangles):
+    """
+    Returns the squared distance from a point to the nearest original triangle merged into the specified vertices.
+    """
+
+    cdef:
+        int32_t i, j, f
+        double distance = INFINITY
+
+    for i in range(3):
+        for j in range(offsets[roots[i]], offsets[roots[i] + 1]):
+            f = faces[j]
+            distance = min(distance, _point_triangle_distance(
+                p,
+                &vertices[triangles[f, V1], 0],
+                &vertices[triangles[f, V2], 0],
+                &vertices[triangles[f, V3], 0]
+            ))
+
+    return distance
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+cdef inline bint _normalise(double *v):
+
+    cdef double length = sqrt(v[0] * v[0] + v[1] * v[1] + v[2] * v[2])
+
+    if length == 0.0:
+        return False
+
+    v[0] /= length
+    v[1] /= length
+    v[2] /= length
+    return True
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+cdef inline void _cross(double[:, ::1] vertices, int32_t i1, const double *p2, const double *p3, double *normal):
+
+    cdef double e1[3]
+    cdef double e2[3]
+    cdef int32_t j
+
+    for j in range(3):
+        e1[j] = p2[j] - vertices[i1, j]
+        e2[j] = p3[j] - vertices[i1, j]
+
+    normal[0] = e1[1] * e2[2] - e1[2] * e2[1]
+    normal[1] = e1[2] * e2[0] - e1[0] * e2[2]
+    normal[2] = e1[0] * e2[1] - e1[1] * e2[0]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+cdef inline bint _triangle_normal(double[:, ::1] vertices, int32_t[:, ::1] triangles, int32_t f, double *normal):
+
+    _cross(vertices, triangles[f, V1], &vertices[triangles[f, V2], 0], &vertices[triangles[f, V3], 0], normal)
+    return _normalise(normal)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+cdef inline void _add_plane(double[:, ::1] quadrics, int32_t i, const double *normal, const double *point):
+
+    cdef double a = normal[0], b = normal[1], c = normal[2]
+    cdef double d = -(a * point[0] + b * point[1] + c * point[2])
+
+    quadrics[i, QXX] += a * a
+    quadrics[i, QXY] += a * b
+    quadrics[i, QXZ] += a * c
+    quadrics[i, QXW] += a * d
+    quadrics[i, QYY] += b * b
+    quadrics[i, QYZ] += b * c
+    quadrics[i, QYW] += b * d
+    quadrics[i, QZZ] += c * c
+    quadrics[i, QZW] += c * d
+    quadrics[i, QWW] += d * d
+
+
+cdef inline double _quadric_error(const double *q, const double *p):
+
+    cdef double x = p[0], y = p[1], z = p[2]
+
+    return (
+        q[QXX] * x * x + 2 * q[QXY] * x * y + 2 * q[QXZ] * x * z + 2 * q[QXW] * x
+        + q[QYY] * y * y + 2 * q[QYZ] * y * z + 2 * q[QYW] * y
+        + q[QZZ] * z * z + 2 * q[QZW] * z
+        + q[QWW]
+    )
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+cdef double _collapse_cost(double[:, ::1] vertices, double[:, ::1] quadrics, int32_t a, int32_t b, double *position):
+    """
+    Returns the cost of collapsing an edge and fills in the position of the merged vertex.
+
+    The position minimising the combined quadric is used if it is well defined
+    and lies near the edge, otherwise the best of the end points and mid-point.
+    """
+
+    cdef:
+        int32_t j
+        double q[10]
+        double candidate[3]
+        double best[3]
+        double det, cost, best_cost, length, offset
+        double c00, c01, c02, c11, c12, c22
+
+    for j in range(10):
+        q[j] = quadrics[a, j] + quadrics[b, j]
+
+    # end points and mid-point
+    for j in range(3):
+        best[j] = vertices[a, j]
+    best_cost = _quadric_error(q, best)
+
+    for j in range(3):
+        candidate[j] = vertices[b, j]
+    cost = _quadric_error(q, candidate)
+    if cost < best_cost:
+        best_cost = cost
+        for j in range(3):
+            best[j] = candidate[j]
+
+    for j in range(3):
+        candidate[j] = 0.5 * (vertices[a, j] + vertices[b, j])
+    cost = _quadric_error(q, candidate)
+    if cost < best_cost:
+        best_cost = cost
+        for j in range(3):
+            best[j] = candidate[j]
+
+    # optimal position, solve the 3x3 quadric system with Cramer's rule
+    c00 = q[QYY] * q[QZZ] - q[QYZ] * q[QYZ]
+    c01 = q[QXZ] * q[QYZ] - q[QXY] * q[QZZ]
+    c02 = q[QXY] * q[QYZ] - q[QXZ] * q[QYY]
+    det = q[QXX] * c00 + q[QXY] * c01 + q[QXZ] * c02
+
+    if fabs(det) > 1e-12 * (q[QXX] + q[QYY] + q[QZZ]) ** 3:
+
+        c11 = q[QXX] * q[QZZ] - q[QXZ] * q[QXZ]
+        c12 = q[QXY] * q[QXZ] - q[QXX] * q[QYZ]
+        c22 = q[QXX] * q[QYY] - q[QXY] * q[QXY]
+
+        candidate[0] = -(c00 * q[QXW] + c01 * q[QYW] + c02 * q[QZW]) / det
+        candidate[1] = -(c01 * q[QXW] + c11 * q[QYW] + c12 * q[QZW]) / det
+        candidate[2] = -(c02 * q[QXW] + c12 * q[QYW] + c22 * q[QZW]) / det
+
+        # ill-conditioned systems can place the vertex far from the edge
+        length = 0.0
+        offset = 0.0
+        for j in range(3):
+            length += (vertices[b, j] - vertices[a, j]) ** 2
+            offset += (candidate[j] - 0.5 * (vertices[a, j] + vertices[b, j])) ** 2
+
+        if offset <= length:
+            cost = _quadric_error(q, candidate)
+            if cost < best_cost:
+                best_cost = cost
+                for j in range(3):
+                    best[j] = candidate[j]
+
+    for j in range(3):
+        position[j] = best[j]
+
+    # rounding may produce a small negative cost
+    return max(best_cost, 0.0)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+cdef bint _moved_triangle_valid(double[:, ::1] vertices, int32_t[:, ::1] triangles, int32_t f, int32_t moved, int32_t other, const double *position):
+    """
+    Tests if a triangle remains valid after moving one of its vertices.
+
+    Triangles containing both edge vertices are removed by the collapse and are
+    always valid. A triangle is invalid if it degenerates or its normal flips.
+    """
+
+    cdef:
+        int32_t j, i1
+        double old_normal[3]
+        double new_normal[3]
+        double p[3][3]
+
+    if triangles[f, V1] == other or triangles[f, V2] == other or triangles[f, V3] == other:
+        return True
+
+    for j in range(3):
+        for i1 in range(3):
+            if triangles[f, j] == moved:
+                p[j][i1] = position[i1]
+            else:
+                p[j][i1] = vertices[triangles[f, j], i1]
+
+    _cross(vertices, triangles[f, V1], &vertices[triangles[f, V2], 0], &vertices[triangles[f, V3], 0], old_normal)
+
+    new_normal[0] = (p[1][1] - p[0][1]) * (p[2][2] - p[0][2]) - (p[1][2] - p[0][2]) * (p[2][1] - p[0][1])
+    new_normal[1] = (p[1][2] - p[0][2]) * (p[2][0] - p[0][0]) - (p[1][0] - p[0][0]) * (p[2][2] - p[0][2])
+    new_normal[2] = (p[1][0] - p[0][0]) * (p[2][1] - p[0][1]) - (p[1][1] - p[0][1]) * (p[2][0] - p[0][0])
+
+    if not _normalise(new_normal) or not _normalise(old_normal):
+        return False
+
+    return new_normal[0] * old_normal[0] + new_normal[1] * old_normal[1] + new_normal[2] * old_normal[2] > 0.0
+
+
+cdef inline double _dot(const double *a, const double *b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+cdef inline double _distance_squared(const double *a, const double *b):
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+
+
+cdef double _point_triangle_distance(const double *p, const double *a, const double *b, const double *c):
+    """
+    Returns the squared distance between a point and a triangle.
+
+    Implements the closest point search described in "Real-Time Collision
+    Detection", C. Ericson, Morgan Kaufmann (2005), section 5.1.5.
+    """
+
+    cdef:
+        int32_t j
+        double ab[3]
+        double ac[3]
+        double ap[3]
+        double bp[3]
+        double cp[3]
+        double closest[3]
+        double d1, d2, d3, d4, d5, d6, va, vb, vc, v, w, denom
+
+    for j in range(3):
+        ab[j] = b[j] - a[j]
+        ac[j] = c[j] - a[j]
+        ap[j] = p[j] - a[j]
+
+    d1 = _dot(ab, ap)
+    d2 = _dot(ac, ap)
+    if d1 <= 0.0 and d2 <= 0.0:
+        return _dot(ap, ap)
+
+    for j in range(3):
+        bp[j] = p[j] - b[j]
+
+    d3 = _dot(ab, bp)
+    d4 = _dot(ac, bp)
+    if d3 >= 0.0 and d4 <= d3:
+        return _dot(bp, bp)
+
+    vc = d1 * d4 - d3 * d2
+    if vc <= 0.0 and d1 >= 0.0 and d3 <= 0.0:
+        v = d1 / (d1 - d3)
+        for j in range(3):
+            closest[j] = a[j] + v * ab[j]
+        return _distance_squared(p, closest)
+
+    for j in range(3):
+        cp[j] = p[j] - c[j]
+
+    d5 = _dot(ab, cp)
+    d6 = _dot(ac, cp)
+    if d6 >= 0.0 and d5 <= d6:
+        return _dot(cp, cp)
+
+    vb = d5 * d2 - d1 * d6
+    if vb <= 0.0 and d2 >= 0.0 and d6 <= 0.0:
+        w = d2 / (d2 - d6)
+        for j in range(3):
+            closest[j] = a[j] + w * ac[j]
+        return _distance_squared(p, closest)
+
+    va = d3 * d6 - d5 * d4
+    if va <= 0.0 and (d4 - d3) >= 0.0 and (d5 - d6) >= 0.0:
+        w = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        for j in range(3):
+            closest[j] = b[j] + w * (c[j] - b[j])
+        return _distance_squared(p, closest)
+
+    # degenerate triangles have no interior
+    denom = va + vb + vc
+    if denom == 0.0:
+        return min(_dot(ap, ap), _dot(bp, bp), _dot(cp, cp))
+
+    v = vb / denom
+    w = vc / denom
+    for j in range(3):
+        closest[j] = a[j] + ab[j] * v + ac[j] * w
+    return _distance_squared(p, closest)
+
+
+def simplify_mesh(object vertices, object triangles, int target_triangles):
+    """
+    Simplifies a triangle mesh with quadric error metric edge collapses.
+
+    Edges are collapsed until the mesh has no more than the target number of
+    triangles, or until no further edge can be collapsed without making the
+    mesh non-manifold or flipping a triangle. Open mesh boundaries are
+    preserved.
+
+    The returned geometric error is an estimate of the Hausdorff distance
+    between the original and simplified surfaces. Both surfaces are sampled at
+    their vertices, edge midpoints and triangle centroids, and the largest
+    distance from a sample to the other surface is returned. The surfaces may
+    deviate by more between the samples, the error is not a bound.
+
+    Any vertex normal indices in the triangle array are discarded.
+
+    :param object vertices: An N x 3 array of vertices.
+    :param object triangles: An M x 3 or M x 6 array of triangles.
+    :param int target_triangles: The target number of triangles.
+    :return: A tuple containing the simplified vertex array, triangle array
+      and the geometric error of the simplified mesh.
+
+    .. code-block:: pycon
+
+        >>> vertices, triangles, error = simplify_mesh(mesh.data.vertices, mesh.data.triangles, 1000)
+        >>> coarse = Mesh(vertices, triangles, smoothing=False)
+    """
+
+    simplifier = _QuadricSimplifier(vertices, triangles)
+    simplifier.simplify(target_triangles)
+    return simplifier.result()
+
+
+cdef class LODMesh(Mesh):
+    """
+    A mesh primitive that traces simplified levels of detail for distant rays.
+
+    A sequence of simplified meshes (levels of detail) is generated from a full
+    resolution mesh with quadric error metric simplification. Each level
+    retains a fraction of the triangles of the previous level and records its
+    geometric error, see simplify_mesh().
+
+    Each ray is traced against the coarsest level of detail whose geometric
+    error does not exceed the error tolerated by the ray. The tolerated error
+    is the ray footprint angle multiplied by the distance from the ray origin to
+    the mesh bounding box, capped at max_error. The footprint angle is
+    typically set to the angular size of a camera pixel. Rays that start close
+    to the mesh, such as secondary rays leaving the mesh surface, therefore see
+    the full resolution mesh. Levels of detail whose estimated geometric error
+    exceeds max_error are not generated. As the error is estimated by sampling
+    the surfaces, a level of detail may deviate from the full resolution mesh
+    by somewhat more than its recorded error between the samples.
+
+    The full resolution mesh is always used for contains() and is the mesh
+    saved by save(). The simplified levels do not carry vertex normals and are
+    rendered without normal smoothing. The triangle indices of MeshIntersection
+    objects refer to the level of detail that was hit.
+
+    :param Mesh mesh: The full resolution mesh, its mesh data is shared.
+    :param double max_error: The largest geometric error any ray may be traced with.
+    :param double footprint: The angular footprint of a ray in radians (default=0.001).
+    :param int levels: The maximum number of simplified levels of detail (default=4).
+    :param double reduction: The fraction of triangles retained by each
+      successive level of detail (default=0.25).
+    :param Node parent: Attaches the mesh to the specified scene-graph node (default=None).
+    :param AffineMatrix3D transform: The co-ordinate transform between
+      the mesh and its parent (default=unity matrix).
+    :param Material material: The surface/volume material
+      (default=Material() instance).
+    :param str name: A human friendly name to identity the mesh in the
+      scene-graph (default="").
+
+    .. code-block:: pycon
+
+        >>> from raysect.primitive import Mesh, LODMesh
+        >>>
+        >>> mesh = Mesh.from_file("assembly.rsm")
+        >>> lod_mesh = LODMesh(mesh, max_error=0.001, footprint=camera_pixel_angle, parent=world)
+    """
+
+    def __init__(self, Mesh mesh not None, double max_error, double footprint=0.001, int levels=4,
+                 double reduction=0.25, object parent=None, AffineMatrix3D transform=None,
+                 Material material=None, str name=None):
+
+        super(Mesh, self).__init__(parent, transform, material, name)
+
+        if max_error < 0:
+            raise ValueError("The maximum error cannot be less than zero.")
+
+        if levels < 0:
+            raise ValueError("The number of levels cannot be less than zero.")
+
+        if reduction <= 0 or reduction >= 1:
+            raise ValueError("The reduction must lie in the range (0, 1).")
+
+        self.footprint = footprint
+        self._max_error = max_error
+        self._levels = levels
+        self._reduction = reduction
+        self.data = mesh.data
+        self._generate_lods()
+
+        # initialise next intersection search
+        self._seek_next_intersection = False
+        self._next_world_ray = None
+        self._next_local_ray = None
+        self._ray_distance = 0
+        self._active = self.data
+
+    cdef object _generate_lods(self):
+
+        cdef:
+            int32_t level, target, count
+            _QuadricSimplifier simplifier
+
+        lods = [self.data]
+        errors = [0.0]
+
+        if self._levels > 0 and self._max_error > 0:
+
+            # each level continues the simplification of the previous level, errors are measured from the original mesh
+            simplifier = _QuadricSimplifier(self.data.vertices, self.data.triangles)
+            target = simplifier.triangle_count
+            for level in range(self._levels):
+
+                target = <int32_t> (target * self._reduction)
+                if target < MIN_TRIANGLES:
+                    break
+
+                count = simplifier.triangle_count
+                simplifier.simplify(target)
+                if simplifier.triangle_count == count:
+                    break
+
+                vertices, triangles, error = simplifier.result()
+                if error > self._max_error:
+                    break
+
+                lods.append(MeshData(vertices, triangles, smoothing=False, closed=self.data.closed))
+                errors.append(error)
+
+        self._lods = tuple(lods)
+        self._errors = array(errors, dtype=float64)
+
+    @property
+    def footprint(self):
+        """
+        The angular footprint of a ray in radians.
+
+        :rtype: float
+        """
+        return self._footprint
+
+    @footprint.setter
+    def footprint(self, double value):
+        if value < 0:
+            raise ValueError("The footprint cannot be less than zero.")
+        self._footprint = value
+
+    @property
+    def max_error(self):
+        """
+        The largest geometric error any ray may be traced with.
+
+        :rtype: float
+        """
+        return self._max_error
+
+    @property
+    def lods(self):
+        """
+        The mesh data for each level of detail, ordered from the full resolution mesh to the coarsest level.
+
+        :rtype: tuple
+        """
+        return self._lods
+
+    @property
+    def lod_errors(self):
+        """
+        The estimated geometric error of each level of detail, see simplify_mesh().
+
+        :rtype: tuple
+        """
+        return tuple(self._errors)
+
+    cpdef object instance(self, object parent=None, AffineMatrix3D transform=None, Material material=None, str name=None):
+
+        cdef LODMesh mesh = LODMesh.__new__(LODMesh)
+        super(Mesh, mesh).__init__(parent, transform, material, name)
+
+        # share the levels of detail
+        mesh.data = self.data
+        mesh._lods = self._lods
+        mesh._errors = self._errors
+        mesh._max_error = self._max_error
+        mesh._levels = self._levels
+        mesh._reduction = self._reduction
+        mesh._footprint = self._footprint
+
+        # initialise next intersection search
+        mesh._seek_next_intersection = False
+        mesh._next_world_ray = None
+        mesh._next_local_ray = None
+        mesh._ray_distance = 0
+        mesh._active = mesh.data
+
+        return mesh
+
+    def update_vertices(self, object vertices, object normals=None, double rebuild_threshold=3.0):
+        """
+        Replaces the mesh vertices and regenerates the levels of detail.
+
+        The levels of detail are shared with any instances of this mesh made
+        with instance() prior to the update, these instances continue to use
+        the previous levels of detail. See Mesh.update_vertices() for details.
+
+        :param object vertices: An N x 3 list of vertices.
+        :param object normals: An K x 3 list of vertex normals or None to
+          retain the existing normals (default=None).
+        :param double rebuild_threshold: The factor by which the estimated
+          kd-tree traversal cost may grow before the kd-tree is rebuilt (default=3.0).
+        :return: True if the full resolution kd-tree was rebuilt, False if it was refitted.
+        """
+
+        rebuilt = super().update_vertices(vertices, normals, rebuild_threshold)
+        self._generate_lods()
+        self._active = self.data
+        return rebuilt
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef MeshData _select_lod(self, Ray local_ray):
+
+        cdef:
+            int32_t level
+            double dx, dy, dz, tolerance
+            BoundingBox3D bounds = self.data.bounds
+
+        # distance from the ray origin to the mesh bounds, zero inside the bounds
+        dx = max(bounds.lower.x - local_ray.origin.x, 0.0, local_ray.origin.x - bounds.upper.x)
+        dy = max(bounds.lower.y - local_ray.origin.y, 0.0, local_ray.origin.y - bounds.upper.y)
+        dz = max(bounds.lower.z - local_ray.origin.z, 0.0, local_ray.origin.z - bounds.upper.z)
+        tolerance = min(self._max_error, self._footprint * sqrt(dx * dx + dy * dy + dz * dz))
+
+        # levels are ordered by increasing error
+        for level in range(self._errors.shape[0] - 1, 0, -1):
+            if self._errors[level] <= tolerance:
+                return <MeshData> self._lods[level]
+
+        return self.data
+
+    cpdef Intersection hit(self, Ray ray):
+        """
+        Returns the first intersection with the mesh surface.
+
+        The level of detail is selected from the ray origin and is used for any
+        subsequent calls to next_intersection().
+
+        :param ray: A world-space ray.
+        :return: An Intersection or None.
+        """
+
+        cdef Ray local_ray
+
+        local_ray = new_ray(
+            ray.origin.transform(self.to_local()),
+            ray.direction.transform(self.to_local()),
+            ray.max_distance
+        )
+
+        # reset accumulated ray distance (used by next_intersection)
+        self._ray_distance = 0
+
+        # do we hit the selected level of detail?
+        self._active = self._select_lod(local_ray)
+        if self._active.trace(local_ray):
+            return self._process_intersection(self._active, ray, local_ray)
+
+        # there was no intersection so disable next intersection search
+        self._seek_next_intersection = False
+
+        return None
+
+    cpdef Intersection next_intersection(self):
+        """
+        Returns the next intersection of the ray with the mesh along the ray
+        path.
+
+        The level of detail selected by the preceding call to hit() is used.
+
+        :return: An Intersection or None.
+        """
+
+        if self._seek_next_intersection:
+
+            # do we hit the mesh again?
+            if self._active.trace(self._next_local_ray):
+                return self._process_intersection(self._active, self._next_world_ray, self._next_local_ray)
+
+            # there was no intersection so disable further searching
+            self._seek_next_intersection = False
+
+        return None
+
+    cpdef BoundingBox3D bounding_box(self):
+        """
+        Returns a world space bounding box that encloses all the levels of detail.
+
+        :return: A BoundingBox3D object.
+        """
+
+        cdef:
+            MeshData lod
+            BoundingBox3D box
+
+        box = self.data.bounding_box(self.to_root())
+        for lod in self._lods[1:]:
+            box.union(lod.bounding_box(self.to_root()))
+        return box
+
+    def load(self, object file):
+        """
+        Loads the full resolution mesh from a file object or filename.
+
+        The levels of detail are regenerated from the loaded mesh.
+
+        :param file: File object or string path.
+        """
+
+        super().load(file)
+        self._generate_lods()
+        self._active = self.data
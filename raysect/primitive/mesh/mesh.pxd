@@ -31,7 +31,15 @@
 
 from raysect.core cimport Primitive, Ray, Intersection, BoundingBox3D, AffineMatrix3D, Normal3D, Point3D
 from raysect.core.math.spatial cimport KDTree3DCore
-from numpy cimport float32_t, int32_t, uint8_t, ndarray
+from numpy cimport float32_t, int32_t, uint8_t, uint16_t, ndarray
+
+
+# c-structure holding a copy of a triangle's vertices for cache efficient intersection tests
+cdef struct packed_triangle:
+
+    float v1[3]
+    float v2[3]
+    float v3[3]
 
 
 cdef class MeshIntersection(Intersection):
@@ -49,9 +57,32 @@ cdef class MeshData(KDTree3DCore):
         ndarray _face_normals
         ndarray _triangles
         float32_t[:, ::1] vertices_mv
+        ndarray _quantised_vertices
+        uint16_t[:, ::1] quantised_vertices_mv
+        bint _quantised
+        ndarray _quantise_lower
+        ndarray _quantise_scale
+        float32_t[:, ::1] quantise_lower_mv
+        float32_t[:, ::1] quantise_scale_mv
         float32_t[:, ::1] vertex_normals_mv
         float32_t[:, ::1] face_normals_mv
         int32_t[:, ::1] triangles_mv
+        bint _compact
+        ndarray _triangle_base
+        ndarray _triangle_offsets
+        ndarray _triangle_overflow
+        int32_t[:, ::1] triangle_base_mv
+        uint16_t[:, ::1] triangle_offsets_mv
+        int32_t[:, ::1] triangle_overflow_mv
+        ndarray _leaf_stream
+        uint16_t[::1] leaf_stream_mv
+        packed_triangle *_packed
+        int32_t *_packed_offsets
+        ndarray _grid
+        uint8_t[:, :, ::1] grid_mv
+        int32_t _grid_resolution
+        double _grid_lower[3]
+        double _grid_cell_size[3]
         public bint smoothing
         public bint closed
         int32_t _ix, _iy, _iz
@@ -63,16 +94,33 @@ cdef class MeshData(KDTree3DCore):
     cpdef ndarray triangle(self, int index)
     cpdef Normal3D vertex_normal(self, int index)
     cpdef Normal3D face_normal(self, int index)
+    cdef int32_t _triangle_count(self)
+    cdef int32_t _vertex_count(self)
+    cdef void _read_vertex(self, int32_t index, float *vertex)
+    cdef object _quantise_vertices(self, ndarray vertices)
+    cdef object _compact_triangles(self)
+    cdef ndarray _decode_triangles(self)
+    cdef object _compact_leaves(self)
+    cdef list _leaf_items(self, int32_t id)
+    cdef list _degenerate_triangles(self, float32_t[:, ::1] vertices)
     cdef object _filter_triangles(self)
     cdef object _flip_normals(self)
     cdef object _generate_face_normals(self)
     cdef BoundingBox3D _generate_bounding_box(self, int32_t i)
+    cdef object _pack_triangles(self)
+    cdef void _free_packed_triangles(self)
+    cdef object _build_containment_grid(self, int32_t resolution)
+    cdef int32_t _grid_cell_index(self, int32_t axis, double value, int32_t count)
     cdef void _calc_rayspace_transform(self, Ray ray)
     cdef bint _hit_triangle(self, int32_t i, Ray ray, float[4] hit_data)
     cpdef Intersection calc_intersection(self, Ray ray)
     cdef Normal3D _intersection_normal(self)
     cpdef bint contains(self, Point3D p)
+    cdef bint _contains_exact(self, Point3D p)
     cpdef BoundingBox3D bounding_box(self, AffineMatrix3D to_world)
+    cdef object _write_data(self, object file)
+    cdef object _read_data(self, object file, int minor_version)
+    cdef ndarray _read_array(self, object file, str format, object dtype, tuple shape)
     cdef uint8_t _read_uint8(self, object file)
     cdef bint _read_bool(self, object file)
     cdef double _read_float(self, object file)
@@ -87,7 +135,7 @@ cdef class Mesh(Primitive):
         Ray _next_local_ray
         double _ray_distance
 
-    cdef Intersection _process_intersection(self, Ray world_ray, Ray local_ray)
+    cdef Intersection _process_intersection(self, MeshData data, Ray world_ray, Ray local_ray)
 
 
 cdef inline MeshIntersection new_mesh_intersection(
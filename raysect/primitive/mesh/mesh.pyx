@@ -31,13 +31,16 @@
 
 import io
 import struct
+import zlib
 
-from numpy import array, float32, int32, zeros
+from numpy import array, arange, repeat, float32, int32, uint8, uint16, zeros, frombuffer, dtype as np_dtype
 from raysect.core cimport Primitive, AffineMatrix3D, Normal3D, new_normal3d, Point3D, new_point3d, Vector3D, new_vector3d, Material, Ray, new_ray, Intersection, new_intersection, BoundingBox3D, new_boundingbox3d
 from raysect.core.math.spatial cimport KDTree3DCore, Item3D
-from libc.math cimport fabs, INFINITY
-from numpy cimport float32_t, int32_t, uint8_t
+from libc.math cimport fabs, sqrt, floor, INFINITY
+from numpy cimport float32_t, int32_t, uint8_t, uint16_t
 from cpython.bytes cimport PyBytes_AsString
+from cpython.mem cimport PyMem_Malloc, PyMem_Free
+from libc.stdlib cimport qsort
 cimport cython
 
 """
@@ -51,6 +54,18 @@ cdef const double BOX_PADDING = 1e-6
 # additional ray distance to avoid re-hitting the same surface point
 cdef const double EPSILON = 1e-6
 
+# largest quantised vertex coordinate value (16 bit)
+cdef const double QUANTISE_MAX = 65535
+
+# vertices are quantised in blocks of consecutive vertices, each relative to its own bounds
+# (the block size must equal 2^QUANTISE_BLOCK_SHIFT)
+cdef const int32_t QUANTISE_BLOCK_SHIFT = 7
+cdef const int32_t QUANTISE_BLOCK_SIZE = 128
+
+# the compact kd-Tree leaf contents are stored as 16 bit differences between triangle ids,
+# this word marks a triangle id stored in full in the following two words
+cdef const int32_t LEAF_ESCAPE = 65535
+
 # constants
 cdef enum:
 
@@ -77,9 +92,17 @@ cdef enum:
 
     NO_INTERSECTION = -1
 
+    # kd-tree leaf node type
+    LEAF = -1
+
+    # containment grid cell classification
+    CELL_OUTSIDE = 0
+    CELL_INSIDE = 1
+    CELL_BOUNDARY = 2
+
     # raysect mesh format constants
     RSM_VERSION_MAJOR = 1
-    RSM_VERSION_MINOR = 0
+    RSM_VERSION_MINOR = 1
 
 
 cdef class MeshIntersection(Intersection):
@@ -135,6 +158,161 @@ cdef class MeshIntersection(Intersection):
             self.triangle, self.u, self.v, self.w)
 
 
+@cython.cdivision(True)
+cdef inline bint _hit_vertices(MeshData mesh, const float *p1, const float *p2, const float *p3, Ray ray, float *hit_data):
+
+    # This code is a Python port of the code listed in appendix A of
+    #  "Watertight Ray/Triangle Intersection", S.Woop, C.Benthin, I.Wald,
+    #  Journal of Computer Graphics Techniques (2013), Vol.2, No. 1
+
+    cdef:
+        int32_t ix, iy, iz
+        float sx, sy, sz
+        float[3] v1, v2, v3
+        float x1, x2, x3
+        float y1, y2, y3
+        float z1, z2, z3
+        float t, u, v, w
+        float det, det_reciprocal
+
+    # center coordinate space on ray origin
+    v1[X] = p1[X] - ray.origin.x
+    v1[Y] = p1[Y] - ray.origin.y
+    v1[Z] = p1[Z] - ray.origin.z
+
+    v2[X] = p2[X] - ray.origin.x
+    v2[Y] = p2[Y] - ray.origin.y
+    v2[Z] = p2[Z] - ray.origin.z
+
+    v3[X] = p3[X] - ray.origin.x
+    v3[Y] = p3[Y] - ray.origin.y
+    v3[Z] = p3[Z] - ray.origin.z
+
+    # obtain ray transform
+    ix = mesh._ix
+    iy = mesh._iy
+    iz = mesh._iz
+
+    sx = mesh._sx
+    sy = mesh._sy
+    sz = mesh._sz
+
+    # transform vertices by shearing and scaling space so the ray points along the +ve z axis
+    # we can now discard the z-axis and work with the 2D projection of the triangle in x and y
+    x1 = v1[ix] - sx * v1[iz]
+    x2 = v2[ix] - sx * v2[iz]
+    x3 = v3[ix] - sx * v3[iz]
+
+    y1 = v1[iy] - sy * v1[iz]
+    y2 = v2[iy] - sy * v2[iz]
+    y3 = v3[iy] - sy * v3[iz]
+
+    # calculate scaled barycentric coordinates
+    u = x3 * y2 - y3 * x2
+    v = x1 * y3 - y1 * x3
+    w = x2 * y1 - y2 * x1
+
+    # catch cases where there is insufficient numerical accuracy to resolve the subsequent edge tests
+    if u == 0.0 or v == 0.0 or w == 0.0:
+        u = <float> (<double> x3 * <double> y2 - <double> y3 * <double> x2)
+        v = <float> (<double> x1 * <double> y3 - <double> y1 * <double> x3)
+        w = <float> (<double> x2 * <double> y1 - <double> y2 * <double> x1)
+
+    # perform edge tests
+    if (u < 0.0 or v < 0.0 or w < 0.0) and (u > 0.0 or v > 0.0 or w > 0.0):
+        return False
+
+    # calculate determinant
+    det = u + v + w
+
+    # if determinant is zero the ray is parallel to the face
+    if det == 0.0:
+        return False
+
+    # calculate z coordinates for the transform vertices, we need the z component to calculate the hit distance
+    z1 = sz * v1[iz]
+    z2 = sz * v2[iz]
+    z3 = sz * v3[iz]
+    t = u * z1 + v * z2 + w * z3
+
+    # is hit distance within ray limits
+    if det > 0.0:
+        if t < 0.0 or t > ray.max_distance * det:
+            return False
+    else:
+        if t > 0.0 or t < ray.max_distance * det:
+            return False
+
+    # normalise barycentric coordinates and hit distance
+    det_reciprocal = 1.0 / det
+    hit_data[U] = u * det_reciprocal
+    hit_data[V] = v * det_reciprocal
+    hit_data[W] = w * det_reciprocal
+    hit_data[T] = t * det_reciprocal
+
+    return True
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+cdef inline void _decode_vertex(MeshData mesh, int32_t index, float *vertex):
+
+    # decoding is performed in single precision so all code paths produce identical vertices
+    cdef int32_t axis, block = index >> QUANTISE_BLOCK_SHIFT
+
+    for axis in range(3):
+        vertex[axis] = mesh.quantise_lower_mv[block, axis] + <float> mesh.quantised_vertices_mv[index, axis] * mesh.quantise_scale_mv[block, axis]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+cdef inline int32_t _triangle_index(MeshData mesh, int32_t triangle, int32_t column):
+
+    # compact triangles hold 16 bit offsets from the base indices of their block, a negative
+    # base identifies a block whose indices are stored in full in the overflow array
+    cdef int32_t block, base
+
+    if not mesh._compact:
+        return mesh.triangles_mv[triangle, column]
+
+    block = triangle >> QUANTISE_BLOCK_SHIFT
+    base = mesh.triangle_base_mv[block, 0]
+    if base < 0:
+        return mesh.triangle_overflow_mv[((-1 - base) << QUANTISE_BLOCK_SHIFT) | (triangle & (QUANTISE_BLOCK_SIZE - 1)), column]
+
+    if column >= N1:
+        base = mesh.triangle_base_mv[block, 1]
+    return base + mesh.triangle_offsets_mv[triangle, column]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+cdef inline int32_t _decode_leaf_item(MeshData mesh, int32_t *offset, int32_t previous):
+
+    # reads the next triangle id of a compact leaf and advances the stream offset
+    cdef uint16_t word = mesh.leaf_stream_mv[offset[0]]
+
+    if word == LEAF_ESCAPE:
+        previous = mesh.leaf_stream_mv[offset[0] + 1] | (<int32_t> mesh.leaf_stream_mv[offset[0] + 2] << 16)
+        offset[0] += 3
+        return previous
+
+    offset[0] += 1
+    return previous + word
+
+
+cdef int _compare_ids(const void *p1, const void *p2) nogil:
+
+    cdef int32_t id1, id2
+
+    id1 = (<int32_t *> p1)[0]
+    id2 = (<int32_t *> p2)[0]
+    return (id1 > id2) - (id1 < id2)
+
+
 # TODO: fire exceptions if degenerate triangles are found and tolerant mode is not enabled (the face normal call will fail @ normalisation)
 # TODO: tidy up the internal storage of triangles - separate the triangle reference arrays for vertices, normals etc...
 # TODO: the following code really is a bit opaque, needs a general tidy up
@@ -169,11 +347,27 @@ cdef class MeshData(KDTree3DCore):
       vs kd-tree traversal (default=20.0).
     :param double empty_bonus: The bonus applied to node splits that generate empty
       kd-Tree leaves (default=0.2).
+    :param bool packed_triangles: Stores a copy of the triangle vertices in kd-Tree
+      leaf order to speed up intersection tests, at the cost of additional
+      memory (default=False).
+    :param int containment_grid: The number of cells along the longest axis of
+      a voxel grid used to accelerate contains() for closed meshes, disabled if
+      set to 0 (default=0).
+    :param bool quantise_vertices: Stores the vertices as 16 bit integers
+      relative to the bounds of each block of 128 vertices and stores the
+      triangle indices and kd-Tree leaf contents in a compact 16 bit form
+      (default=False). See MeshData.quantised.
     """
 
+    def __cinit__(self):
+
+        self._packed = NULL
+        self._packed_offsets = NULL
+
     def __init__(self, object vertices, object triangles, object normals=None, bint smoothing=True,
                  bint closed=True, bint tolerant=True, bint flip_normals=False,
-                 int max_depth=0, int min_items=1, double hit_cost=20.0, double empty_bonus=0.2):
+                 int max_depth=0, int min_items=1, double hit_cost=20.0, double empty_bonus=0.2,
+                 bint packed_triangles=False, int containment_grid=0, bint quantise_vertices=False):
 
         self.smoothing = smoothing
         self.closed = closed
@@ -214,15 +408,16 @@ cdef class MeshData(KDTree3DCore):
                 raise ValueError("The triangle array references non-existent normals.")
 
         # assign to internal attributes
-        self._vertices = vertices
         self._vertex_normals = vertex_normals
         self._triangles = triangles
 
         # assign to memory views
-        self.vertices_mv = vertices
         self.vertex_normals_mv = vertex_normals
         self.triangles_mv = triangles
 
+        self._vertices = vertices
+        self.vertices_mv = vertices
+
         # initial hit data
         self._u = -1.0
         self._v = -1.0
@@ -238,16 +433,34 @@ cdef class MeshData(KDTree3DCore):
         if flip_normals:
             self._flip_normals()
 
+        # all subsequent geometry calculations use the quantised vertices, if enabled
+        if quantise_vertices:
+            self._quantise_vertices(vertices)
+
         # generate face normals
         self._generate_face_normals()
 
         # kd-Tree init requires the triangle's id (it's index here) and bounding box
         items = []
-        for i in range(self.triangles_mv.shape[0]):
+        for i in range(self._triangle_count()):
             items.append(Item3D(i, self._generate_bounding_box(i)))
 
         super().__init__(items, max_depth, min_items, hit_cost, empty_bonus)
 
+        # quantised meshes also store the triangle indices and kd-Tree leaves in compact form
+        if quantise_vertices:
+            self._compact_triangles()
+            self._compact_leaves()
+
+        if packed_triangles:
+            self._pack_triangles()
+
+        self._build_containment_grid(containment_grid)
+
+    def __dealloc__(self):
+
+        self._free_packed_triangles()
+
     def __getstate__(self):
         state = io.BytesIO()
         self.save(state)
@@ -261,10 +474,24 @@ cdef class MeshData(KDTree3DCore):
 
     @property
     def vertices(self):
-        return self._vertices.copy()
+
+        cdef:
+            int32_t i
+            float32_t[:, ::1] vertices_mv
+
+        if not self._quantised:
+            return self._vertices.copy()
+
+        vertices = zeros((self._vertex_count(), 3), dtype=float32)
+        vertices_mv = vertices
+        for i in range(vertices_mv.shape[0]):
+            self._read_vertex(i, &vertices_mv[i, X])
+        return vertices
 
     @property
     def triangles(self):
+        if self._compact:
+            return self._decode_triangles()
         return self._triangles.copy()
 
     @property
@@ -277,6 +504,107 @@ cdef class MeshData(KDTree3DCore):
     def face_normals(self):
         return self._face_normals.copy()
 
+    @property
+    def packed_triangles(self):
+        """
+        True if packed triangle data is used to accelerate intersection tests.
+
+        The packed layout holds a copy of each triangle's vertices, stored
+        contiguously in the order the triangles are referenced by the kd-Tree
+        leaves. This avoids the indirect vertex look-ups otherwise required
+        for each ray-triangle test. Results are identical in either mode, the
+        packed layout trades memory for speed.
+
+        :rtype: bool
+        """
+        return self._packed != NULL
+
+    @packed_triangles.setter
+    def packed_triangles(self, bint value):
+        if value:
+            self._pack_triangles()
+        else:
+            self._free_packed_triangles()
+
+    @property
+    def containment_grid(self):
+        """
+        The resolution of the voxel grid used to accelerate contains().
+
+        The containment grid divides the mesh bounds into cells, with the
+        specified number of cells along the longest axis. Each cell is
+        classified once as inside, outside or on the boundary of the mesh.
+        A contains() query for a point in an inside or outside cell is
+        answered directly from the grid, only points in boundary cells require
+        a ray to be traced through the mesh. The grid is only meaningful for
+        closed meshes. A value of 0 disables the grid.
+
+        :rtype: int
+        """
+        return self._grid_resolution
+
+    @containment_grid.setter
+    def containment_grid(self, int value):
+        self._build_containment_grid(value)
+
+    @property
+    def quantised(self):
+        """
+        True if the mesh is stored in the compact, quantised 16 bit format.
+
+        The vertices are divided into blocks of 128 consecutive vertices and
+        each block is stored as 16 bit integers relative to the bounds of the
+        block's vertices. The quantisation error therefore depends on the
+        spatial extent of the blocks: meshes whose vertex order follows the
+        surface (as produced by most meshing tools) have small blocks and
+        accurate vertices, whereas a randomly ordered vertex array is
+        quantised over roughly the whole mesh bounds. The blocks partition the
+        vertices, each vertex decodes to a single position and the decoded
+        mesh is watertight.
+
+        The triangle indices and kd-Tree leaf contents are also compacted.
+        The vertex indices of each block of 128 consecutive triangles, and
+        their vertex normal indices if present, are stored as 16 bit offsets
+        from the smallest index in the block. Blocks whose indices span more
+        than 16 bits are stored at full size. The triangle ids held by each
+        kd-Tree leaf are sorted and stored as 16 bit differences between
+        consecutive ids. The face normals, vertex normals and kd-Tree nodes
+        are stored at full size.
+
+        The vertices, triangle indices and leaf contents are decoded during
+        each intersection test. Tracing a quantised mesh is up to roughly 10%
+        slower than tracing the original mesh. If the quantisation would
+        reduce any triangle to a line or a point, a ValueError listing the
+        affected triangles is raised rather than altering the mesh. The
+        MeshPixel and MeshCamera observers require a mesh that is not
+        quantised.
+
+        For example, for a 640k triangle sphere the memory used by the mesh
+        data is reduced from 73 MB to 61 MB. The remainder is dominated by the
+        kd-Tree nodes (39 MB), the node count may be reduced with the kd-Tree
+        min_items and max_depth settings at some cost in tracing speed. The
+        compact form is created once the kd-Tree is built, the peak memory
+        used while constructing the mesh is not reduced.
+
+        :rtype: bool
+        """
+        return self._quantised
+
+    @property
+    def quantisation_error(self):
+        """
+        The maximum vertex position error introduced by quantisation along any axis.
+
+        The error excludes the single precision rounding common to all mesh
+        vertices. Zero if the vertices are not quantised.
+
+        :rtype: float
+        """
+
+        if not self._quantised or self._quantise_scale.size == 0:
+            return 0.0
+        return 0.5 * float(self._quantise_scale.max())
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
@@ -288,14 +616,13 @@ cdef class MeshData(KDTree3DCore):
         :return: A Point3D object.
         """
 
-        if index < 0 or index >= self.vertices_mv.shape[0]:
-            raise ValueError('Vertex index is out of range: [0, {}].'.format(self.vertices_mv.shape[0]))
+        cdef float vertex[3]
 
-        return new_point3d(
-            self.vertices_mv[index, X],
-            self.vertices_mv[index, Y],
-            self.vertices_mv[index, Z]
-        )
+        if index < 0 or index >= self._vertex_count():
+            raise ValueError('Vertex index is out of range: [0, {}].'.format(self._vertex_count()))
+
+        self._read_vertex(index, vertex)
+        return new_point3d(vertex[X], vertex[Y], vertex[Z])
 
     cpdef ndarray triangle(self, int index):
         """
@@ -309,10 +636,20 @@ cdef class MeshData(KDTree3DCore):
         :return: A numpy array.
         """
 
-        if index < 0 or index >= self.vertices_mv.shape[0]:
-            raise ValueError('Triangle index is out of range: [0, {}].'.format(self.triangles_mv.shape[0]))
+        cdef:
+            int32_t column
+            ndarray triangle
+
+        if index < 0 or index >= self._triangle_count():
+            raise ValueError('Triangle index is out of range: [0, {}].'.format(self._triangle_count()))
+
+        if not self._compact:
+            return self._triangles[index, :].copy()
 
-        return self._triangles[index, :].copy()
+        triangle = zeros(self.triangle_offsets_mv.shape[1], dtype=int32)
+        for column in range(triangle.shape[0]):
+            triangle[column] = _triangle_index(self, index, column)
+        return triangle
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -357,6 +694,438 @@ cdef class MeshData(KDTree3DCore):
             self.face_normals_mv[index, Z]
         )
 
+    cdef int32_t _triangle_count(self):
+        """
+        Returns the number of triangles.
+        """
+
+        if self._compact:
+            return self.triangle_offsets_mv.shape[0]
+        return self.triangles_mv.shape[0]
+
+    cdef int32_t _vertex_count(self):
+        """
+        Returns the number of vertices.
+        """
+
+        if self._quantised:
+            return self.quantised_vertices_mv.shape[0]
+        return self.vertices_mv.shape[0]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef void _read_vertex(self, int32_t index, float *vertex):
+        """
+        Copies the specified vertex, decoding it if the vertices are quantised.
+
+        :param index: The vertex index.
+        :param vertex: A 3 element array to populate with the vertex coordinates.
+        """
+
+        cdef int32_t axis
+
+        if self._quantised:
+            _decode_vertex(self, index, vertex)
+        else:
+            for axis in range(3):
+                vertex[axis] = self.vertices_mv[index, axis]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    @cython.cdivision(True)
+    cdef object _quantise_vertices(self, ndarray vertices):
+        """
+        Replaces the vertex storage with 16 bit vertices quantised over the bounds of each vertex block.
+
+        The mesh is left unmodified if the quantisation would make any
+        triangle degenerate.
+
+        :param vertices: A float32 array of vertices with shape Nx3.
+        """
+
+        cdef:
+            int32_t i, i1, i2, i3, axis, block, blocks, first, last, count
+            double value
+            float32_t[:, ::1] vertices_mv, lower_mv, scale_mv
+            uint16_t[:, ::1] quantised_mv
+            ndarray quantised, lower, scale
+            float v1[3]
+            float v2[3]
+            float v3[3]
+            double nx, ny, nz
+            list degenerate
+
+        vertices_mv = vertices
+        blocks = (vertices_mv.shape[0] + QUANTISE_BLOCK_SIZE - 1) >> QUANTISE_BLOCK_SHIFT
+
+        # quantisation is relative to the bounds of each block of vertices
+        lower = zeros((blocks, 3), dtype=float32)
+        scale = zeros((blocks, 3), dtype=float32)
+        lower_mv = lower
+        scale_mv = scale
+        for block in range(blocks):
+            first = block << QUANTISE_BLOCK_SHIFT
+            last = min(first + QUANTISE_BLOCK_SIZE, vertices_mv.shape[0])
+            for axis in range(3):
+                lower_mv[block, axis] = vertices[first:last, axis].min()
+                scale_mv[block, axis] = <float> ((<double> vertices[first:last, axis].max() - lower_mv[block, axis]) / QUANTISE_MAX)
+
+        quantised = zeros((vertices_mv.shape[0], 3), dtype=uint16)
+        quantised_mv = quantised
+        for i in range(vertices_mv.shape[0]):
+            block = i >> QUANTISE_BLOCK_SHIFT
+            for axis in range(3):
+                if scale_mv[block, axis] > 0.0:
+                    value = floor((vertices_mv[i, axis] - lower_mv[block, axis]) / scale_mv[block, axis] + 0.5)
+                    quantised_mv[i, axis] = <uint16_t> min(max(value, 0.0), QUANTISE_MAX)
+
+        # quantised triangles must not collapse to a line or a point
+        degenerate = []
+        for i in range(self._triangle_count()):
+
+            i1 = _triangle_index(self, i, V1)
+            i2 = _triangle_index(self, i, V2)
+            i3 = _triangle_index(self, i, V3)
+
+            for axis in range(3):
+                block = i1 >> QUANTISE_BLOCK_SHIFT
+                v1[axis] = lower_mv[block, axis] + <float> quantised_mv[i1, axis] * scale_mv[block, axis]
+                block = i2 >> QUANTISE_BLOCK_SHIFT
+                v2[axis] = lower_mv[block, axis] + <float> quantised_mv[i2, axis] * scale_mv[block, axis]
+                block = i3 >> QUANTISE_BLOCK_SHIFT
+                v3[axis] = lower_mv[block, axis] + <float> quantised_mv[i3, axis] * scale_mv[block, axis]
+
+            nx = (<double> v2[Y] - v1[Y]) * (<double> v3[Z] - v1[Z]) - (<double> v3[Y] - v1[Y]) * (<double> v2[Z] - v1[Z])
+            ny = (<double> v2[Z] - v1[Z]) * (<double> v3[X] - v1[X]) - (<double> v3[Z] - v1[Z]) * (<double> v2[X] - v1[X])
+            nz = (<double> v2[X] - v1[X]) * (<double> v3[Y] - v1[Y]) - (<double> v3[X] - v1[X]) * (<double> v2[Y] - v1[Y])
+            if nx == 0.0 and ny == 0.0 and nz == 0.0:
+                degenerate.append(i)
+
+        if degenerate:
+            count = len(degenerate)
+            ids = ", ".join(str(i) for i in degenerate[:10]) + (", ..." if count > 10 else "")
+            raise ValueError(
+                "Quantising the vertices would make {} triangle(s) degenerate (triangle ids: {}), "
+                "the mesh can not be quantised.".format(count, ids)
+            )
+
+        self._quantised_vertices = quantised
+        self.quantised_vertices_mv = quantised_mv
+        self._quantise_lower = lower
+        self._quantise_scale = scale
+        self.quantise_lower_mv = lower_mv
+        self.quantise_scale_mv = scale_mv
+        self._quantised = True
+
+        # release the full precision vertices
+        self._vertices = None
+        self.vertices_mv = None
+
+    cdef object _compact_triangles(self):
+        """
+        Replaces the triangle array with 16 bit indices relative to the base indices of each triangle block.
+
+        The triangles are divided into blocks of 128 consecutive triangles.
+        The vertex indices of a block, and its vertex normal indices if
+        present, are stored as 16 bit offsets from the smallest index in the
+        block. Blocks whose indices span more than 16 bits are stored at full
+        size in an overflow array.
+        """
+
+        cdef int32_t count, width, blocks
+
+        count = self.triangles_mv.shape[0]
+        width = self.triangles_mv.shape[1]
+        blocks = (count + QUANTISE_BLOCK_SIZE - 1) >> QUANTISE_BLOCK_SHIFT
+
+        # pad the last block with copies of the final triangle so all blocks are complete
+        padded = zeros((blocks << QUANTISE_BLOCK_SHIFT, width), dtype=int32)
+        padded[:count] = self._triangles
+        if count > 0:
+            padded[count:] = self._triangles[count - 1]
+
+        # the vertex indices and normal indices of each block have separate base indices
+        grouped = padded.reshape(blocks, QUANTISE_BLOCK_SIZE, width // 3, 3)
+        base = grouped.min(axis=(1, 3))
+        wide = ((grouped.max(axis=(1, 3)) - base) > QUANTISE_MAX).any(axis=1)
+        wide_rows = repeat(wide, QUANTISE_BLOCK_SIZE)
+
+        offsets = (grouped - base[:, None, :, None]).reshape(-1, width)
+        offsets[wide_rows] = 0
+
+        # the base index of a wide block is replaced by the negated position of its rows in the overflow array
+        base[wide, 0] = -1 - arange(wide.sum(), dtype=int32)
+
+        self._triangle_base = base.astype(int32)
+        self._triangle_offsets = offsets[:count].astype(uint16)
+        self._triangle_overflow = padded[wide_rows]
+        self.triangle_base_mv = self._triangle_base
+        self.triangle_offsets_mv = self._triangle_offsets
+        self.triangle_overflow_mv = self._triangle_overflow
+        self._compact = True
+
+        # release the full size triangles
+        self._triangles = None
+        self.triangles_mv = None
+
+    cdef ndarray _decode_triangles(self):
+        """
+        Returns a full size copy of the compact triangle array.
+        """
+
+        rows = arange(self.triangle_offsets_mv.shape[0], dtype=int32)
+        base = self._triangle_base[rows >> QUANTISE_BLOCK_SHIFT]
+        triangles = self._triangle_offsets.astype(int32) + repeat(base, 3, axis=1)
+
+        wide = base[:, 0] < 0
+        triangles[wide] = self._triangle_overflow[((-1 - base[wide, 0]) << QUANTISE_BLOCK_SHIFT) | (rows[wide] & (QUANTISE_BLOCK_SIZE - 1))]
+        return triangles
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef object _compact_leaves(self):
+        """
+        Replaces the kd-Tree leaf item arrays with a single delta encoded 16 bit stream.
+
+        The triangle ids of each leaf are sorted and each id is stored as the
+        difference from the preceding id in the leaf (the first id follows an
+        implicit id of zero). Differences that do not fit in a 16 bit word are
+        stored as an escape word followed by the full id. The node item
+        arrays are released, the item counts are retained. The split position
+        is unused by leaf nodes, each leaf holds the stream offset of its
+        first word in its place.
+        """
+
+        cdef:
+            int32_t id, item, count, size, offset, previous, delta
+            int32_t *items
+            uint16_t[::1] stream
+
+        # sort the leaf contents and locate each leaf in the stream
+        size = 0
+        for id in range(self._next_node):
+
+            if self._nodes[id].type != LEAF or self._nodes[id].count == 0:
+                continue
+
+            self._nodes[id].split = size
+
+            items = self._nodes[id].items
+            count = self._nodes[id].count
+            qsort(<void *> items, count, sizeof(int32_t), _compare_ids)
+
+            previous = 0
+            for item in range(count):
+                size += 1 if items[item] - previous < LEAF_ESCAPE else 3
+                previous = items[item]
+
+        # encode the leaf contents
+        self._leaf_stream = zeros(size, dtype=uint16)
+        stream = self._leaf_stream
+        for id in range(self._next_node):
+
+            if self._nodes[id].type != LEAF or self._nodes[id].count == 0:
+                continue
+
+            items = self._nodes[id].items
+            count = self._nodes[id].count
+            offset = <int32_t> self._nodes[id].split
+
+            previous = 0
+            for item in range(count):
+
+                delta = items[item] - previous
+                if delta < LEAF_ESCAPE:
+                    stream[offset] = <uint16_t> delta
+                    offset += 1
+                else:
+                    stream[offset] = LEAF_ESCAPE
+                    stream[offset + 1] = <uint16_t> (items[item] & 0xFFFF)
+                    stream[offset + 2] = <uint16_t> (items[item] >> 16)
+                    offset += 3
+                previous = items[item]
+
+            PyMem_Free(items)
+            self._nodes[id].items = NULL
+
+        self.leaf_stream_mv = self._leaf_stream
+
+    cdef list _leaf_items(self, int32_t id):
+        """
+        Returns the ids of the triangles held by a leaf node.
+
+        :param id: Index of node in node array.
+        :return: List of triangle ids.
+        """
+
+        cdef:
+            int32_t item, offset, triangle
+            list items
+
+        if not self._compact:
+            return KDTree3DCore._leaf_items(self, id)
+
+        items = []
+        offset = <int32_t> self._nodes[id].split
+        triangle = 0
+        for item in range(self._nodes[id].count):
+            triangle = _decode_leaf_item(self, &offset, triangle)
+            items.append(triangle)
+        return items
+
+    def update_vertices(self, object vertices, object normals=None, double rebuild_threshold=3.0):
+        """
+        Replaces the mesh vertices while keeping the triangle connectivity.
+
+        This method is intended for meshes that deform over time, but whose
+        topology remains fixed. Rather than constructing a new mesh, the
+        vertices are replaced and the existing kd-Tree is refitted: the tree
+        bounds and leaf contents are recalculated while the split planes are
+        kept. As the mesh deforms the split planes become less optimal,
+        therefore the traversal cost of the refitted tree is estimated with
+        the surface area heuristic. If the cost exceeds the cost of the tree at
+        its last full build by more than the rebuild_threshold factor, the
+        kd-Tree is rebuilt from scratch. The kd-Tree split planes closely wrap
+        the original triangles, so even small deformations noticeably raise
+        the estimated cost; the default threshold allows for this.
+
+        The new vertex array must have the same dimensions as the existing
+        vertex array. If the mesh has vertex normals, updated normals may be
+        supplied, otherwise the existing vertex normals are retained.
+
+        A ValueError is raised, and the mesh is left unchanged, if the new
+        vertices would make any triangle degenerate. If the mesh vertices are
+        quantised, the new vertices are quantised relative to their own block
+        bounds and the check is applied to the quantised vertices.
+
+        Note, the mesh data is shared by all instances of a mesh.
+
+        :param object vertices: An array of vertices with shape Nx3, where N is
+          the number of vertices in the mesh.
+        :param object normals: Optional array of vertex normals with shape Kx3,
+          where K is the number of vertex normals in the mesh (default=None).
+        :param double rebuild_threshold: The factor by which the estimated
+          traversal cost may grow before the kd-Tree is rebuilt (default=3.0).
+        :return: True if the kd-Tree was rebuilt, False if it was refitted.
+        """
+
+        cdef:
+            int32_t i, count
+            list items, degenerate
+            bint rebuilt
+            str ids
+
+        vertices = array(vertices, dtype=float32)
+        if vertices.shape != (self._vertex_count(), 3):
+            raise ValueError("The vertex array must have dimensions {}x3.".format(self._vertex_count()))
+
+        if normals is not None:
+
+            if self._vertex_normals is None:
+                raise ValueError('Mesh does not contain vertex normals.')
+
+            normals = array(normals, dtype=float32)
+            if normals.shape != (self.vertex_normals_mv.shape[0], 3):
+                raise ValueError("The normal array must have dimensions {}x3.".format(self.vertex_normals_mv.shape[0]))
+
+        # quantise first, the mesh must be left unchanged if the vertices can not be quantised
+        if self._quantised:
+            self._quantise_vertices(vertices)
+        else:
+
+            # the face normals of degenerate triangles are undefined
+            degenerate = self._degenerate_triangles(vertices)
+            if degenerate:
+                count = len(degenerate)
+                ids = ", ".join(str(i) for i in degenerate[:10]) + (", ..." if count > 10 else "")
+                raise ValueError(
+                    "The new vertices would make {} triangle(s) degenerate (triangle ids: {}), "
+                    "the mesh is left unchanged.".format(count, ids)
+                )
+
+            self._vertices = vertices
+            self.vertices_mv = vertices
+
+        if normals is not None:
+            self._vertex_normals = normals
+            self.vertex_normals_mv = normals
+
+        self._generate_face_normals()
+
+        # refit the kd-Tree, rebuilding it if the tree quality has degraded too far
+        items = []
+        for i in range(self._triangle_count()):
+            items.append(Item3D(i, self._generate_bounding_box(i)))
+
+        self._refit(items)
+        rebuilt = self._tree_cost() > rebuild_threshold * self._build_cost
+        if rebuilt:
+            self._rebuild(items)
+
+        # refitting and rebuilding produce full size leaf item arrays
+        if self._compact:
+            self._compact_leaves()
+
+        # the packed triangles hold copies of the vertices
+        if self._packed != NULL:
+            self._pack_triangles()
+
+        self._build_containment_grid(self._grid_resolution)
+
+        # reset hit data
+        self._u = -1.0
+        self._v = -1.0
+        self._w = -1.0
+        self._t = INFINITY
+        self._i = NO_INTERSECTION
+
+        return rebuilt
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef list _degenerate_triangles(self, float32_t[:, ::1] vertices):
+        """
+        Returns the ids of the triangles that are degenerate with the supplied full precision vertices.
+
+        The test matches the face normal calculation, a triangle is degenerate
+        if the cross product of its edge vectors is zero.
+
+        :param vertices: A float32 memory view of the vertices with shape Nx3.
+        """
+
+        cdef:
+            int32_t i, i1, i2, i3
+            double[3] v1, v2
+            double nx, ny, nz
+            list degenerate
+
+        degenerate = []
+        for i in range(self._triangle_count()):
+
+            i1 = _triangle_index(self, i, V1)
+            i2 = _triangle_index(self, i, V2)
+            i3 = _triangle_index(self, i, V3)
+
+            v1[X] = <double> vertices[i2, X] - <double> vertices[i1, X]
+            v1[Y] = <double> vertices[i2, Y] - <double> vertices[i1, Y]
+            v1[Z] = <double> vertices[i2, Z] - <double> vertices[i1, Z]
+
+            v2[X] = <double> vertices[i3, X] - <double> vertices[i1, X]
+            v2[Y] = <double> vertices[i3, Y] - <double> vertices[i1, Y]
+            v2[Z] = <double> vertices[i3, Z] - <double> vertices[i1, Z]
+
+            nx = v1[Y] * v2[Z] - v2[Y] * v1[Z]
+            ny = v1[Z] * v2[X] - v2[Z] * v1[X]
+            nz = v1[X] * v2[Y] - v2[X] * v1[Y]
+            if nx * nx + ny * ny + nz * nz == 0.0:
+                degenerate.append(i)
+
+        return degenerate
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
@@ -364,21 +1133,23 @@ cdef class MeshData(KDTree3DCore):
 
         cdef:
             int32_t i, valid
-            int32_t i1, i2, i3
+            float vertex1[3]
+            float vertex2[3]
+            float vertex3[3]
             Point3D p1, p2, p3
             Vector3D v1, v2, v3
 
         # scan triangles and make valid triangles contiguous
         valid = 0
-        for i in range(self.triangles_mv.shape[0]):
+        for i in range(self._triangle_count()):
 
-            i1 = self.triangles_mv[i, V1]
-            i2 = self.triangles_mv[i, V2]
-            i3 = self.triangles_mv[i, V3]
+            self._read_vertex(self.triangles_mv[i, V1], vertex1)
+            self._read_vertex(self.triangles_mv[i, V2], vertex2)
+            self._read_vertex(self.triangles_mv[i, V3], vertex3)
 
-            p1 = new_point3d(self.vertices_mv[i1, X], self.vertices_mv[i1, Y], self.vertices_mv[i1, Z])
-            p2 = new_point3d(self.vertices_mv[i2, X], self.vertices_mv[i2, Y], self.vertices_mv[i2, Z])
-            p3 = new_point3d(self.vertices_mv[i3, X], self.vertices_mv[i3, Y], self.vertices_mv[i3, Z])
+            p1 = new_point3d(vertex1[X], vertex1[Y], vertex1[Z])
+            p2 = new_point3d(vertex2[X], vertex2[Y], vertex2[Z])
+            p3 = new_point3d(vertex3[X], vertex3[Y], vertex3[Z])
 
             # the cross product of two edge vectors of a degenerate triangle
             # (where 2 or more vertices are coincident or lie on the same line)
@@ -396,7 +1167,8 @@ cdef class MeshData(KDTree3DCore):
             valid += 1
 
         # reslice array to contain only valid triangles
-        self.triangles_mv = self.triangles_mv[:valid, :]
+        self._triangles = self._triangles[:valid, :]
+        self.triangles_mv = self._triangles
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -408,12 +1180,12 @@ cdef class MeshData(KDTree3DCore):
 
         if self._vertex_normals is None:
 
-            for i in range(self.triangles_mv.shape[0]):
+            for i in range(self._triangle_count()):
                 self.triangles_mv[i, 0], self.triangles_mv[i, 2] = self.triangles_mv[i, 2], self.triangles_mv[i, 0]
 
         else:
 
-            for i in range(self.triangles_mv.shape[0]):
+            for i in range(self._triangle_count()):
                 self.triangles_mv[i, 0], self.triangles_mv[i, 2] = self.triangles_mv[i, 2], self.triangles_mv[i, 0]
                 self.triangles_mv[i, 3], self.triangles_mv[i, 5] = self.triangles_mv[i, 5], self.triangles_mv[i, 3]
 
@@ -437,29 +1209,42 @@ cdef class MeshData(KDTree3DCore):
 
         cdef:
             int32_t i
-            int32_t i1, i2, i3
-            Point3D p1, p2, p3
-            Vector3D v1, v2, v3
+            float vertex1[3]
+            float vertex2[3]
+            float vertex3[3]
+            double[3] v1, v2
+            double nx, ny, nz, length
 
-        self._face_normals = zeros((self.triangles_mv.shape[0], 3), dtype=float32)
+        self._face_normals = zeros((self._triangle_count(), 3), dtype=float32)
         self.face_normals_mv = self._face_normals
         for i in range(self.face_normals_mv.shape[0]):
 
-            i1 = self.triangles_mv[i, V1]
-            i2 = self.triangles_mv[i, V2]
-            i3 = self.triangles_mv[i, V3]
+            self._read_vertex(_triangle_index(self, i, V1), vertex1)
+            self._read_vertex(_triangle_index(self, i, V2), vertex2)
+            self._read_vertex(_triangle_index(self, i, V3), vertex3)
 
-            p1 = new_point3d(self.vertices_mv[i1, X], self.vertices_mv[i1, Y], self.vertices_mv[i1, Z])
-            p2 = new_point3d(self.vertices_mv[i2, X], self.vertices_mv[i2, Y], self.vertices_mv[i2, Z])
-            p3 = new_point3d(self.vertices_mv[i3, X], self.vertices_mv[i3, Y], self.vertices_mv[i3, Z])
+            # triangle edge vectors
+            v1[X] = <double> vertex2[X] - <double> vertex1[X]
+            v1[Y] = <double> vertex2[Y] - <double> vertex1[Y]
+            v1[Z] = <double> vertex2[Z] - <double> vertex1[Z]
 
-            v1 = p1.vector_to(p2)
-            v2 = p1.vector_to(p3)
-            v3 = v1.cross(v2).normalise()
+            v2[X] = <double> vertex3[X] - <double> vertex1[X]
+            v2[Y] = <double> vertex3[Y] - <double> vertex1[Y]
+            v2[Z] = <double> vertex3[Z] - <double> vertex1[Z]
 
-            self.face_normals_mv[i, X] = v3.x
-            self.face_normals_mv[i, Y] = v3.y
-            self.face_normals_mv[i, Z] = v3.z
+            # normal is the normalised cross product of the edge vectors
+            nx = v1[Y] * v2[Z] - v2[Y] * v1[Z]
+            ny = v1[Z] * v2[X] - v2[Z] * v1[X]
+            nz = v1[X] * v2[Y] - v2[X] * v1[Y]
+
+            length = nx * nx + ny * ny + nz * nz
+            if length == 0.0:
+                raise ZeroDivisionError("A zero length vector can not be normalised as the direction of a zero length vector is undefined.")
+            length = 1.0 / sqrt(length)
+
+            self.face_normals_mv[i, X] = nx * length
+            self.face_normals_mv[i, Y] = ny * length
+            self.face_normals_mv[i, Z] = nz * length
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -476,23 +1261,25 @@ cdef class MeshData(KDTree3DCore):
         """
 
         cdef:
-            int32_t i1, i2, i3
+            float v1[3]
+            float v2[3]
+            float v3[3]
             BoundingBox3D bbox
 
-        i1 = self.triangles_mv[i, V1]
-        i2 = self.triangles_mv[i, V2]
-        i3 = self.triangles_mv[i, V3]
+        self._read_vertex(_triangle_index(self, i, V1), v1)
+        self._read_vertex(_triangle_index(self, i, V2), v2)
+        self._read_vertex(_triangle_index(self, i, V3), v3)
 
         bbox = new_boundingbox3d(
             new_point3d(
-                min(self.vertices_mv[i1, X], self.vertices_mv[i2, X], self.vertices_mv[i3, X]),
-                min(self.vertices_mv[i1, Y], self.vertices_mv[i2, Y], self.vertices_mv[i3, Y]),
-                min(self.vertices_mv[i1, Z], self.vertices_mv[i2, Z], self.vertices_mv[i3, Z]),
+                min(v1[X], v2[X], v3[X]),
+                min(v1[Y], v2[Y], v3[Y]),
+                min(v1[Z], v2[Z], v3[Z]),
             ),
             new_point3d(
-                max(self.vertices_mv[i1, X], self.vertices_mv[i2, X], self.vertices_mv[i3, X]),
-                max(self.vertices_mv[i1, Y], self.vertices_mv[i2, Y], self.vertices_mv[i3, Y]),
-                max(self.vertices_mv[i1, Z], self.vertices_mv[i2, Z], self.vertices_mv[i3, Z]),
+                max(v1[X], v2[X], v3[X]),
+                max(v1[Y], v2[Y], v3[Y]),
+                max(v1[Z], v2[Z], v3[Z]),
             ),
         )
 
@@ -503,6 +1290,177 @@ cdef class MeshData(KDTree3DCore):
 
         return bbox
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef object _pack_triangles(self):
+        """
+        Builds the packed triangle vertex array from the kd-Tree leaves.
+
+        Triangles are stored in the order they are referenced by the leaf
+        nodes, triangles shared between leaves are duplicated. The offset of
+        each node's first packed triangle is recorded in a per-node array.
+        """
+
+        cdef:
+            int32_t id, item, triangle, count, total, offset
+            packed_triangle *packed
+
+        self._free_packed_triangles()
+
+        # identify the location of each leaf's triangles in the packed array
+        self._packed_offsets = <int32_t *> PyMem_Malloc(sizeof(int32_t) * max(1, self._next_node))
+        if not self._packed_offsets:
+            raise MemoryError()
+
+        total = 0
+        for id in range(self._next_node):
+            self._packed_offsets[id] = total
+            if self._nodes[id].type == LEAF:
+                total += self._nodes[id].count
+
+        self._packed = <packed_triangle *> PyMem_Malloc(sizeof(packed_triangle) * max(1, total))
+        if not self._packed:
+            PyMem_Free(self._packed_offsets)
+            self._packed_offsets = NULL
+            raise MemoryError()
+
+        # copy the triangle vertices into the packed array
+        for id in range(self._next_node):
+
+            if self._nodes[id].type != LEAF:
+                continue
+
+            count = self._nodes[id].count
+            offset = <int32_t> self._nodes[id].split if self._compact else 0
+            triangle = 0
+            for item in range(count):
+
+                if self._compact:
+                    triangle = _decode_leaf_item(self, &offset, triangle)
+                else:
+                    triangle = self._nodes[id].items[item]
+                packed = &self._packed[self._packed_offsets[id] + item]
+
+                self._read_vertex(_triangle_index(self, triangle, V1), packed.v1)
+                self._read_vertex(_triangle_index(self, triangle, V2), packed.v2)
+                self._read_vertex(_triangle_index(self, triangle, V3), packed.v3)
+
+    cdef void _free_packed_triangles(self):
+        """
+        Frees the packed triangle data, if allocated.
+        """
+
+        PyMem_Free(self._packed)
+        PyMem_Free(self._packed_offsets)
+        self._packed = NULL
+        self._packed_offsets = NULL
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    @cython.cdivision(True)
+    cdef object _build_containment_grid(self, int32_t resolution):
+        """
+        Builds the voxel grid used to accelerate contains() queries.
+
+        Any cell overlapped by a triangle's bounding box is marked as a
+        boundary cell. As no triangle passes through the remaining cells, each
+        is entirely inside or outside the mesh. These cells are classified by
+        testing a point in the cell with the exact ray test. Neighbouring
+        cells in a column that are not separated by a boundary cell share the
+        same classification, so only the first cell of each run is tested.
+
+        :param resolution: Number of cells along the longest axis, 0 disables the grid.
+        """
+
+        cdef:
+            int32_t i, axis, ix, iy, iz
+            int32_t[3] shape, lower, upper
+            double extent, largest_extent
+            uint8_t state
+            bint classified
+            BoundingBox3D bbox
+            uint8_t[:, :, ::1] grid
+
+        if resolution < 0:
+            raise ValueError("The containment grid resolution cannot be less than zero.")
+
+        self._grid = None
+        self.grid_mv = None
+        self._grid_resolution = 0
+
+        if resolution == 0 or self._triangle_count() == 0:
+            return
+
+        # cells are cubic where possible, the longest axis has the requested number of cells
+        largest_extent = self.bounds.largest_extent()
+        for axis in range(3):
+            extent = self.bounds.upper.get_index(axis) - self.bounds.lower.get_index(axis)
+            shape[axis] = max(1, <int32_t> (resolution * extent / largest_extent + 0.5))
+            self._grid_lower[axis] = self.bounds.lower.get_index(axis)
+            self._grid_cell_size[axis] = extent / shape[axis]
+
+        self._grid = zeros((shape[X], shape[Y], shape[Z]), dtype=uint8)
+        grid = self._grid
+
+        # mark the cells overlapped by each triangle as boundary cells
+        for i in range(self._triangle_count()):
+
+            bbox = self._generate_bounding_box(i)
+            for axis in range(3):
+                lower[axis] = self._grid_cell_index(axis, bbox.lower.get_index(axis), shape[axis])
+                upper[axis] = self._grid_cell_index(axis, bbox.upper.get_index(axis), shape[axis])
+
+            for ix in range(lower[X], upper[X] + 1):
+                for iy in range(lower[Y], upper[Y] + 1):
+                    for iz in range(lower[Z], upper[Z] + 1):
+                        grid[ix, iy, iz] = CELL_BOUNDARY
+
+        # classify the remaining cells, a run of cells in a column that is not interrupted by a boundary cell
+        # lies entirely inside or outside the mesh
+        for ix in range(shape[X]):
+            for iy in range(shape[Y]):
+
+                classified = False
+                state = CELL_OUTSIDE
+                for iz in range(shape[Z]):
+
+                    if grid[ix, iy, iz] == CELL_BOUNDARY:
+                        classified = False
+                        continue
+
+                    if not classified:
+                        if self._contains_exact(new_point3d(
+                            self._grid_lower[X] + (ix + 0.5) * self._grid_cell_size[X],
+                            self._grid_lower[Y] + (iy + 0.5) * self._grid_cell_size[Y],
+                            self._grid_lower[Z] + (iz + 0.5) * self._grid_cell_size[Z]
+                        )):
+                            state = CELL_INSIDE
+                        else:
+                            state = CELL_OUTSIDE
+                        classified = True
+
+                    grid[ix, iy, iz] = state
+
+        self.grid_mv = grid
+        self._grid_resolution = resolution
+
+    @cython.cdivision(True)
+    cdef int32_t _grid_cell_index(self, int32_t axis, double value, int32_t count):
+        """
+        Returns the index of the containment grid cell enclosing the coordinate.
+
+        :param axis: The axis index.
+        :param value: The coordinate along the axis.
+        :param count: The number of grid cells along the axis.
+        :return: The cell index, clamped to the grid.
+        """
+
+        cdef int32_t index
+        index = <int32_t> floor((value - self._grid_lower[axis]) / self._grid_cell_size[axis])
+        return min(max(index, 0), count - 1)
+
     cpdef bint trace(self, Ray ray):
 
         # reset hit data
@@ -517,38 +1475,73 @@ cdef class MeshData(KDTree3DCore):
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
+    @cython.initializedcheck(False)
     cdef bint _trace_leaf(self, int32_t id, Ray ray, double max_range):
 
         cdef:
             float hit_data[4]
-            int32_t count, item, index
+            int32_t count, item, index, offset
             double distance
             double u, v, w, t
             int32_t triangle, closest_triangle
+            packed_triangle *packed
 
-        # unpack leaf data
+        # unpack leaf data, the ids of a compact leaf are decoded sequentially from the leaf stream
         count = self._nodes[id].count
+        offset = 0
+        triangle = 0
+        if self._compact:
+            offset = <int32_t> self._nodes[id].split
 
         # find the closest triangle-ray intersection with initial search distance limited by node and ray limits
         # closest_triangle is initialised with an illegal value so a non-intersection can be detected
         distance = min(ray.max_distance, max_range)
         closest_triangle = NO_INTERSECTION
-        for item in range(count):
 
-            # dereference the triangle
-            triangle = self._nodes[id].items[item]
+        if self._packed != NULL:
+
+            # the leaf's triangle vertices are stored contiguously in the packed array
+            packed = &self._packed[self._packed_offsets[id]]
+            for item in range(count):
+
+                if self._compact:
+                    triangle = _decode_leaf_item(self, &offset, triangle)
+                else:
+                    triangle = self._nodes[id].items[item]
 
-            # test for intersection
-            if self._hit_triangle(triangle, ray, hit_data):
+                # test for intersection
+                if _hit_vertices(self, packed[item].v1, packed[item].v2, packed[item].v3, ray, hit_data):
 
-                t = hit_data[T]
-                if t < distance:
+                    t = hit_data[T]
+                    if t < distance:
 
-                    distance = t
-                    closest_triangle = triangle
-                    u = hit_data[U]
-                    v = hit_data[V]
-                    w = hit_data[W]
+                        distance = t
+                        closest_triangle = triangle
+                        u = hit_data[U]
+                        v = hit_data[V]
+                        w = hit_data[W]
+
+        else:
+
+            for item in range(count):
+
+                # dereference the triangle
+                if self._compact:
+                    triangle = _decode_leaf_item(self, &offset, triangle)
+                else:
+                    triangle = self._nodes[id].items[item]
+
+                # test for intersection
+                if self._hit_triangle(triangle, ray, hit_data):
+
+                    t = hit_data[T]
+                    if t < distance:
+
+                        distance = t
+                        closest_triangle = triangle
+                        u = hit_data[U]
+                        v = hit_data[V]
+                        w = hit_data[W]
 
         if closest_triangle == NO_INTERSECTION:
             return False
@@ -609,108 +1602,29 @@ cdef class MeshData(KDTree3DCore):
         self._sy = sy
         self._sz = sz
 
-    @cython.cdivision(True)
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
     cdef bint _hit_triangle(self, int32_t i, Ray ray, float[4] hit_data):
 
-        # This code is a Python port of the code listed in appendix A of
-        #  "Watertight Ray/Triangle Intersection", S.Woop, C.Benthin, I.Wald,
-        #  Journal of Computer Graphics Techniques (2013), Vol.2, No. 1
-
         cdef:
             int32_t i1, i2, i3
-            int32_t ix, iy, iz
-            float sx, sy, sz
-            float[3] v1, v2, v3
-            float x1, x2, x3
-            float y1, y2, y3
-            float z1, z2, z3
-            float t, u, v, w
-            float det, det_reciprocal
+            float v1[3]
+            float v2[3]
+            float v3[3]
 
         # obtain vertex ids
-        i1 = self.triangles_mv[i, V1]
-        i2 = self.triangles_mv[i, V2]
-        i3 = self.triangles_mv[i, V3]
-
-        # center coordinate space on ray origin
-        v1[X] = self.vertices_mv[i1, X] - ray.origin.x
-        v1[Y] = self.vertices_mv[i1, Y] - ray.origin.y
-        v1[Z] = self.vertices_mv[i1, Z] - ray.origin.z
-
-        v2[X] = self.vertices_mv[i2, X] - ray.origin.x
-        v2[Y] = self.vertices_mv[i2, Y] - ray.origin.y
-        v2[Z] = self.vertices_mv[i2, Z] - ray.origin.z
-
-        v3[X] = self.vertices_mv[i3, X] - ray.origin.x
-        v3[Y] = self.vertices_mv[i3, Y] - ray.origin.y
-        v3[Z] = self.vertices_mv[i3, Z] - ray.origin.z
-
-        # obtain ray transform
-        ix = self._ix
-        iy = self._iy
-        iz = self._iz
-
-        sx = self._sx
-        sy = self._sy
-        sz = self._sz
-
-        # transform vertices by shearing and scaling space so the ray points along the +ve z axis
-        # we can now discard the z-axis and work with the 2D projection of the triangle in x and y
-        x1 = v1[ix] - sx * v1[iz]
-        x2 = v2[ix] - sx * v2[iz]
-        x3 = v3[ix] - sx * v3[iz]
-
-        y1 = v1[iy] - sy * v1[iz]
-        y2 = v2[iy] - sy * v2[iz]
-        y3 = v3[iy] - sy * v3[iz]
-
-        # calculate scaled barycentric coordinates
-        u = x3 * y2 - y3 * x2
-        v = x1 * y3 - y1 * x3
-        w = x2 * y1 - y2 * x1
-
-        # catch cases where there is insufficient numerical accuracy to resolve the subsequent edge tests
-        if u == 0.0 or v == 0.0 or w == 0.0:
-            u = <float> (<double> x3 * <double> y2 - <double> y3 * <double> x2)
-            v = <float> (<double> x1 * <double> y3 - <double> y1 * <double> x3)
-            w = <float> (<double> x2 * <double> y1 - <double> y2 * <double> x1)
-
-        # perform edge tests
-        if (u < 0.0 or v < 0.0 or w < 0.0) and (u > 0.0 or v > 0.0 or w > 0.0):
-            return False
-
-        # calculate determinant
-        det = u + v + w
-
-        # if determinant is zero the ray is parallel to the face
-        if det == 0.0:
-            return False
-
-        # calculate z coordinates for the transform vertices, we need the z component to calculate the hit distance
-        z1 = sz * v1[iz]
-        z2 = sz * v2[iz]
-        z3 = sz * v3[iz]
-        t = u * z1 + v * z2 + w * z3
-
-        # is hit distance within ray limits
-        if det > 0.0:
-            if t < 0.0 or t > ray.max_distance * det:
-                return False
-        else:
-            if t > 0.0 or t < ray.max_distance * det:
-                return False
+        i1 = _triangle_index(self, i, V1)
+        i2 = _triangle_index(self, i, V2)
+        i3 = _triangle_index(self, i, V3)
 
-        # normalise barycentric coordinates and hit distance
-        det_reciprocal = 1.0 / det
-        hit_data[U] = u * det_reciprocal
-        hit_data[V] = v * det_reciprocal
-        hit_data[W] = w * det_reciprocal
-        hit_data[T] = t * det_reciprocal
+        if self._quantised:
+            _decode_vertex(self, i1, v1)
+            _decode_vertex(self, i2, v2)
+            _decode_vertex(self, i3, v3)
+            return _hit_vertices(self, v1, v2, v3, ray, hit_data)
 
-        return True
+        return _hit_vertices(self, &self.vertices_mv[i1, X], &self.vertices_mv[i2, X], &self.vertices_mv[i3, X], ray, hit_data)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -781,9 +1695,9 @@ cdef class MeshData(KDTree3DCore):
 
         if self.smoothing and self.vertex_normals_mv is not None:
 
-            n1 = self.triangles_mv[self._i, N1]
-            n2 = self.triangles_mv[self._i, N2]
-            n3 = self.triangles_mv[self._i, N3]
+            n1 = _triangle_index(self, self._i, N1)
+            n2 = _triangle_index(self, self._i, N2)
+            n3 = _triangle_index(self, self._i, N3)
 
             return new_normal3d(
                 self._u * self.vertex_normals_mv[n1, X] + self._v * self.vertex_normals_mv[n2, X] + self._w * self.vertex_normals_mv[n3, X],
@@ -810,6 +1724,40 @@ cdef class MeshData(KDTree3DCore):
         must be performed externally (this is generally quicker as coordinate
         transforms etc... can be skipped if the mesh is open).
 
+        If the containment grid is enabled, points that do not lie in a
+        boundary cell of the grid are classified without tracing a ray.
+
+        :param p: Local space Point3D.
+        :return: True if mesh contains point, False otherwise.
+        """
+
+        cdef:
+            int32_t ix, iy, iz
+            uint8_t state
+
+        if self.grid_mv is not None:
+
+            # points outside the mesh bounds cannot be inside a closed mesh
+            if not self.bounds.contains(p):
+                return False
+
+            ix = self._grid_cell_index(X, p.x, self.grid_mv.shape[0])
+            iy = self._grid_cell_index(Y, p.y, self.grid_mv.shape[1])
+            iz = self._grid_cell_index(Z, p.z, self.grid_mv.shape[2])
+
+            state = self.grid_mv[ix, iy, iz]
+            if state != CELL_BOUNDARY:
+                return state == CELL_INSIDE
+
+        return self._contains_exact(p)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef bint _contains_exact(self, Point3D p):
+        """
+        Tests if a point is contained by the mesh by tracing a ray.
+
         :param p: Local space Point3D.
         :return: True if mesh contains point, False otherwise.
         """
@@ -847,33 +1795,31 @@ cdef class MeshData(KDTree3DCore):
         cdef:
             int32_t i
             BoundingBox3D bbox
+            float v[3]
             Point3D vertex
 
         # TODO: padding should really be a function of mesh extent
         # convert vertices to world space and grow a bounding box around them
         bbox = BoundingBox3D()
-        for i in range(self.vertices_mv.shape[0]):
-            vertex = new_point3d(self.vertices_mv[i, X], self.vertices_mv[i, Y], self.vertices_mv[i, Z])
+        for i in range(self._vertex_count()):
+            self._read_vertex(i, v)
+            vertex = new_point3d(v[X], v[Y], v[Z])
             bbox.extend(vertex.transform(to_world), BOX_PADDING)
 
         return bbox
 
-    # TODO: this code is forking horrible - need to split the triangle array into separate components (for a start!)
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
-    def save(self, object file):
+    def save(self, object file, bint compress=False):
         """
         Save the mesh's kd-Tree representation to a binary Raysect mesh file (.rsm).
 
+        If compress is True, the mesh data is zlib compressed. This reduces the
+        file size at the cost of slower saving and loading. Quantised vertices
+        are saved in their quantised form.
+
         :param object file: File stream or string file name to save state.
+        :param bool compress: Compress the mesh data (default=False).
         """
 
-        cdef:
-            int32_t i, j
-            float32_t[:, ::1] vertices
-            float32_t[:, ::1] vertex_normals
-            int32_t[:, ::1] triangles
-
         close = False
 
         # treat as a filename if a stream is not supplied
@@ -881,61 +1827,72 @@ cdef class MeshData(KDTree3DCore):
             file = open(file, mode="wb")
             close = True
 
-        # hold local references to avoid repeated memory view object checks
-        vertices = self.vertices_mv
-        vertex_normals = self.vertex_normals_mv
-        triangles = self.triangles_mv
-
         # write header
         file.write(b"RSM")
         file.write(struct.pack("<B", RSM_VERSION_MAJOR))
         file.write(struct.pack("<B", RSM_VERSION_MINOR))
+        file.write(struct.pack("<?", compress))
+
+        if compress:
+            stream = io.BytesIO()
+            self._write_data(stream)
+            data = zlib.compress(stream.getvalue())
+            file.write(struct.pack("<Q", len(data)))
+            file.write(data)
+        else:
+            self._write_data(file)
+
+        # if we opened a file, we should close it
+        if close:
+            file.close()
+
+    cdef object _write_data(self, object file):
+        """
+        Writes the mesh settings, geometry and kd-tree to a stream.
+        """
 
         # mesh setting flags
         file.write(struct.pack("<?", self.smoothing))
         file.write(struct.pack("<?", self.closed))
         file.write(struct.pack("<?", True))    # kdtree in file (hardcoded for now, will be an option)
+        file.write(struct.pack("<?", self._packed != NULL))
+        file.write(struct.pack("<i", self._grid_resolution))
+        file.write(struct.pack("<?", self._quantised))
 
         # item counts
-        file.write(struct.pack("<i", vertices.shape[0]))
+        file.write(struct.pack("<i", self._vertex_count()))
 
         if self.vertex_normals_mv is not None:
-            file.write(struct.pack("<i", vertex_normals.shape[0]))
+            file.write(struct.pack("<i", self.vertex_normals_mv.shape[0]))
         else:
             file.write(struct.pack("<i", 0))
 
-        file.write(struct.pack("<i", triangles.shape[0]))
+        file.write(struct.pack("<i", self._triangle_count()))
 
         # write vertices
-        for i in range(vertices.shape[0]):
-            for j in range(3):
-                file.write(struct.pack("<f", vertices[i, j]))
+        if self._quantised:
+            file.write(self._quantise_lower.astype("<f4").tobytes())
+            file.write(self._quantise_scale.astype("<f4").tobytes())
+            file.write(self._quantised_vertices.astype("<u2").tobytes())
+        else:
+            file.write(self._vertices.astype("<f4").tobytes())
 
         # write normals
-        if vertex_normals is not None:
-            for i in range(vertex_normals.shape[0]):
-                for j in range(3):
-                    file.write(struct.pack("<f", vertex_normals[i, j]))
-
-        # triangles
-        width = 3
-        if vertex_normals is not None:
-            # we have vertex normals for each triangle
-            width += 3
-
-        for i in range(triangles.shape[0]):
-            for j in range(width):
-                file.write(struct.pack("<i", triangles[i, j]))
-
-        # write kd-tree
-        super().save(file)
+        if self._vertex_normals is not None:
+            file.write(self._vertex_normals.astype("<f4").tobytes())
+
+        # write triangles, the triangle array holds the vertex normal ids if normals are present
+        if self._compact:
+            file.write(struct.pack("<i", self.triangle_overflow_mv.shape[0] >> QUANTISE_BLOCK_SHIFT))
+            file.write(self._triangle_base.astype("<i4").tobytes())
+            file.write(self._triangle_offsets.astype("<u2").tobytes())
+            file.write(self._triangle_overflow.astype("<i4").tobytes())
+        else:
+            file.write(self._triangles.astype("<i4").tobytes())
 
-        # if we opened a file, we should close it
-        if close:
-            file.close()
+        # write kd-tree, the leaves of a compact tree are written at full size
+        KDTree3DCore.save(self, file)
 
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
     def load(self, object file):
         """
         Load a mesh with its kd-Tree representation from Raysect mesh binary file (.rsm).
@@ -943,9 +1900,6 @@ cdef class MeshData(KDTree3DCore):
         :param object file: File stream or string file name to save state.
         """
 
-        cdef:
-            int32_t i, j
-
         close = False
 
         # treat as a filename if a stream is not supplied
@@ -962,33 +1916,76 @@ cdef class MeshData(KDTree3DCore):
         if identifier != b"RSM":
             raise ValueError("Specified file is not a Raysect mesh file.")
 
-        if major_version != RSM_VERSION_MAJOR or minor_version != RSM_VERSION_MINOR:
+        if major_version != RSM_VERSION_MAJOR or minor_version > RSM_VERSION_MINOR:
             raise ValueError("Unsupported Raysect mesh version.")
 
+        # compression added in version 1.1
+        compressed = False
+        if minor_version >= 1:
+            compressed = self._read_bool(file)
+
+        if compressed:
+            length = struct.unpack("<Q", file.read(8))[0]
+            self._read_data(io.BytesIO(zlib.decompress(file.read(length))), minor_version)
+        else:
+            self._read_data(file, minor_version)
+
+        # if we opened a file, we should close it
+        if close:
+            file.close()
+
+    cdef object _read_data(self, object file, int minor_version):
+        """
+        Reads the mesh settings, geometry and kd-tree from a stream.
+        """
+
         # mesh setting flags
         self.smoothing = self._read_bool(file)
         self.closed = self._read_bool(file)
         _ = self._read_bool(file)    # kdtree option, ignore for now (to be implemented)
 
+        # acceleration and storage options added in version 1.1
+        packed_triangles = False
+        containment_grid = 0
+        quantised = False
+        if minor_version >= 1:
+            packed_triangles = self._read_bool(file)
+            containment_grid = self._read_int32(file)
+            quantised = self._read_bool(file)
+
         # item counts
         num_vertices = self._read_int32(file)
         num_vertex_normals = self._read_int32(file)
         num_triangles = self._read_int32(file)
 
         # read vertices
-        self._vertices = zeros((num_vertices, 3), dtype=float32)
-        self.vertices_mv = self._vertices
-        for i in range(num_vertices):
-            for j in range(3):
-                self.vertices_mv[i, j] = self._read_float(file)
+        if quantised:
+            blocks = (num_vertices + QUANTISE_BLOCK_SIZE - 1) >> QUANTISE_BLOCK_SHIFT
+            self._quantise_lower = self._read_array(file, "<f4", float32, (blocks, 3))
+            self._quantise_scale = self._read_array(file, "<f4", float32, (blocks, 3))
+            self.quantise_lower_mv = self._quantise_lower
+            self.quantise_scale_mv = self._quantise_scale
+            self._quantised_vertices = self._read_array(file, "<u2", uint16, (num_vertices, 3))
+            self.quantised_vertices_mv = self._quantised_vertices
+            self._quantised = True
+            self._vertices = None
+            self.vertices_mv = None
+
+        else:
+            self._vertices = self._read_array(file, "<f4", float32, (num_vertices, 3))
+            self.vertices_mv = self._vertices
+            self._quantised_vertices = None
+            self.quantised_vertices_mv = None
+            self._quantise_lower = None
+            self._quantise_scale = None
+            self.quantise_lower_mv = None
+            self.quantise_scale_mv = None
+            self._quantised = False
 
         # read vertex normals
         if num_vertex_normals > 0:
-            self._vertex_normals = zeros((num_vertex_normals, 3), dtype=float32)
+            self._vertex_normals = self._read_array(file, "<f4", float32, (num_vertex_normals, 3))
             self.vertex_normals_mv = self._vertex_normals
-            for i in range(num_vertex_normals):
-                for j in range(3):
-                    self.vertex_normals_mv[i, j] = self._read_float(file)
 
         else:
             self._vertex_normals = None
@@ -1000,18 +1997,51 @@ cdef class MeshData(KDTree3DCore):
             # we have vertex normals for each triangle
             width += 3
 
-        self._triangles = zeros((num_triangles, width), dtype=int32)
-        self.triangles_mv = self._triangles
-        for i in range(num_triangles):
-            for j in range(width):
-                self.triangles_mv[i, j] = self._read_int32(file)
+        # quantised meshes store the triangles in compact form, see _compact_triangles()
+        if quantised:
+            blocks = (num_triangles + QUANTISE_BLOCK_SIZE - 1) >> QUANTISE_BLOCK_SHIFT
+            wide_blocks = self._read_int32(file)
+            self._triangle_base = self._read_array(file, "<i4", int32, (blocks, width // 3))
+            self._triangle_offsets = self._read_array(file, "<u2", uint16, (num_triangles, width))
+            self._triangle_overflow = self._read_array(file, "<i4", int32, (wide_blocks << QUANTISE_BLOCK_SHIFT, width))
+            self.triangle_base_mv = self._triangle_base
+            self.triangle_offsets_mv = self._triangle_offsets
+            self.triangle_overflow_mv = self._triangle_overflow
+            self._compact = True
+            self._triangles = None
+            self.triangles_mv = None
+
+        else:
+            self._triangles = self._read_array(file, "<i4", int32, (num_triangles, width))
+            self.triangles_mv = self._triangles
+            self._triangle_base = None
+            self._triangle_offsets = None
+            self._triangle_overflow = None
+            self.triangle_base_mv = None
+            self.triangle_offsets_mv = None
+            self.triangle_overflow_mv = None
+            self._compact = False
 
         # read kdtree
-        super().load(file)
+        KDTree3DCore.load(self, file)
+
+        if self._compact:
+            self._compact_leaves()
+        else:
+            self._leaf_stream = None
+            self.leaf_stream_mv = None
 
         # generate face normals
         self._generate_face_normals()
 
+        # rebuild packed triangles
+        if packed_triangles:
+            self._pack_triangles()
+        else:
+            self._free_packed_triangles()
+
+        self._build_containment_grid(containment_grid)
+
         # initial hit data
         self._u = -1.0
         self._v = -1.0
@@ -1019,9 +2049,17 @@ cdef class MeshData(KDTree3DCore):
         self._t = INFINITY
         self._i = NO_INTERSECTION
 
-        # if we opened a file, we should close it
-        if close:
-            file.close()
+    cdef ndarray _read_array(self, object file, str format, object dtype, tuple shape):
+        """
+        Reads a little-endian array from a stream into a new, writable native array.
+        """
+
+        dtype_in = np_dtype(format)
+        count = shape[0] * shape[1]
+        buffer = file.read(count * dtype_in.itemsize)
+        if len(buffer) != count * dtype_in.itemsize:
+            raise ValueError("Unexpected end of Raysect mesh file.")
+        return frombuffer(buffer, dtype=dtype_in).astype(dtype).reshape(shape)
 
     @classmethod
     def from_file(cls, file):
@@ -1132,6 +2170,17 @@ cdef class Mesh(Primitive):
       (default=Material() instance).
     :param str name: A human friendly name to identity the mesh in the
       scene-graph (default="").
+    :param bool packed_triangles: Stores a copy of the triangle vertices in
+      kd-tree leaf order, increasing the ray-triangle intersection speed at the
+      cost of additional memory (default=False).
+    :param int containment_grid: Resolution of a voxel grid used to accelerate
+      contains() for closed meshes, given as the number of cells along the
+      longest axis of the mesh. Disabled if set to 0 (default=0).
+    :param bool quantise_vertices: Stores the vertices as 16 bit integers
+      relative to the bounds of each block of 128 vertices and stores the
+      triangle indices and kd-tree leaf contents in a compact 16 bit form,
+      reducing the mesh memory at the cost of a small vertex position error and
+      a slightly slower intersection test (default=False). See MeshData.quantised.
 
     :ivar MeshData data: A class instance containing all the mesh data.
     """
@@ -1141,7 +2190,8 @@ cdef class Mesh(Primitive):
                  bint smoothing=True, bint closed=True, bint tolerant=True, bint flip_normals=False,
                  int kdtree_max_depth=-1, int kdtree_min_items=1, double kdtree_hit_cost=5.0,
                  double kdtree_empty_bonus=0.25, object parent=None,
-                 AffineMatrix3D transform=None, Material material=None, str name=None):
+                 AffineMatrix3D transform=None, Material material=None, str name=None,
+                 bint packed_triangles=False, int containment_grid=0, bint quantise_vertices=False):
 
         super().__init__(parent, transform, material, name)
 
@@ -1151,7 +2201,9 @@ cdef class Mesh(Primitive):
         # build the kd-Tree
         self.data = MeshData(vertices, triangles, normals=normals, smoothing=smoothing, closed=closed,
                              tolerant=tolerant, flip_normals=flip_normals, max_depth=kdtree_max_depth,
-                             min_items=kdtree_min_items, hit_cost=kdtree_hit_cost, empty_bonus=kdtree_empty_bonus)
+                             min_items=kdtree_min_items, hit_cost=kdtree_hit_cost, empty_bonus=kdtree_empty_bonus,
+                             packed_triangles=packed_triangles, containment_grid=containment_grid,
+                             quantise_vertices=quantise_vertices)
 
         # initialise next intersection search
         self._seek_next_intersection = False
@@ -1175,6 +2227,43 @@ cdef class Mesh(Primitive):
 
         return mesh
 
+    def update_vertices(self, object vertices, object normals=None, double rebuild_threshold=3.0):
+        """
+        Replaces the mesh vertices while keeping the triangle connectivity.
+
+        The mesh kd-tree is refitted to the new vertices and is only rebuilt if
+        the quality of the refitted tree degrades beyond the rebuild threshold.
+        This is much faster than creating a new mesh each time a deforming mesh
+        is updated. See MeshData.update_vertices() for details.
+
+        The mesh data is shared between a mesh and its instances, all instances
+        will therefore be updated.
+
+        :param object vertices: An N x 3 list of vertices.
+        :param object normals: An K x 3 list of vertex normals or None to
+          retain the existing normals (default=None).
+        :param double rebuild_threshold: The factor by which the estimated
+          kd-tree traversal cost may grow before the kd-tree is rebuilt (default=3.0).
+        :return: True if the kd-tree was rebuilt, False if it was refitted.
+
+        .. code-block:: pycon
+
+            >>> for frame in frames:
+            >>>     mesh.update_vertices(frame.vertices)
+            >>>     camera.observe()
+        """
+
+        rebuilt = self.data.update_vertices(vertices, normals, rebuild_threshold)
+
+        # cached next intersection search state refers to the old geometry
+        self._seek_next_intersection = False
+        self._next_world_ray = None
+        self._next_local_ray = None
+        self._ray_distance = 0
+
+        self.notify_geometry_change()
+        return rebuilt
+
     cpdef Intersection hit(self, Ray ray):
         """
         Returns the first intersection with the mesh surface.
@@ -1203,7 +2292,7 @@ cdef class Mesh(Primitive):
 
         # do we hit the mesh?
         if self.data.trace(local_ray):
-            return self._process_intersection(ray, local_ray)
+            return self._process_intersection(self.data, ray, local_ray)
 
         # there was no intersection so disable next intersection search
         self._seek_next_intersection = False
@@ -1230,20 +2319,20 @@ cdef class Mesh(Primitive):
 
             # do we hit the mesh again?
             if self.data.trace(self._next_local_ray):
-                return self._process_intersection(self._next_world_ray, self._next_local_ray)
+                return self._process_intersection(self.data, self._next_world_ray, self._next_local_ray)
 
             # there was no intersection so disable further searching
             self._seek_next_intersection = False
 
         return None
 
-    cdef Intersection _process_intersection(self, Ray world_ray, Ray local_ray):
+    cdef Intersection _process_intersection(self, MeshData data, Ray world_ray, Ray local_ray):
 
         cdef:
             Intersection intersection
 
         # obtain intersection details from the kd-tree
-        intersection = self.data.calc_intersection(local_ray)
+        intersection = data.calc_intersection(local_ray)
 
         # enable next intersection search and cache the local ray for the next intersection calculation
         # we must shift the new origin past the last intersection
@@ -1307,7 +2396,7 @@ cdef class Mesh(Primitive):
 
         return self.data.bounding_box(self.to_root())
 
-    def save(self, object file):
+    def save(self, object file, bint compress=False):
         """
         Saves the mesh to the specified file object or filename.
 
@@ -1315,6 +2404,7 @@ cdef class Mesh(Primitive):
         contains the mesh geometry and the mesh acceleration structures.
 
         :param file: File object or string path.
+        :param bool compress: Compress the mesh data with zlib (default=False).
 
         .. code-block:: pycon
 
@@ -1342,7 +2432,7 @@ cdef class Mesh(Primitive):
         # """
 
         # hand over to the mesh data object
-        self.data.save(file)
+        self.data.save(file, compress)
 
     def load(self, object file):
         """
@@ -0,0 +1,206 @@
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+import numpy as np
+
+from raysect.core import Point3D
+from raysect.core.ray import Ray as CoreRay
+from raysect.primitive.mesh import Mesh, LODMesh, simplify_mesh
+from raysect.primitive.mesh.tests.test_mesh import _sphere_mesh_arrays
+
+
+def _edge_counts(triangles):
+
+    edges = np.sort(np.concatenate((triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]])), axis=1)
+    return np.unique(edges, axis=0, return_counts=True)[1]
+
+
+class TestSimplifyMesh(unittest.TestCase):
+
+    def test_closed_mesh(self):
+
+        vertices, triangles = _sphere_mesh_arrays(rings=40, sectors=80)
+        simple_vertices, simple_triangles, error = simplify_mesh(vertices, triangles, 1000)
+
+        self.assertLessEqual(simple_triangles.shape[0], 1000)
+        self.assertGreater(simple_triangles.shape[0], 900)
+
+        # the simplified mesh remains closed and manifold
+        self.assertTrue(np.all(_edge_counts(simple_triangles) == 2))
+
+        # the error covers the deviation of the simplified vertices and triangle interiors from the sphere,
+        # the original mesh lies up to 1 - cos(pi / 80) inside the sphere
+        self.assertGreater(error, 0)
+        self.assertLess(error, 0.05)
+        self.assertLessEqual(np.abs(np.linalg.norm(simple_vertices, axis=1) - 1).max(), error)
+        centroids = simple_vertices[simple_triangles].mean(axis=1)
+        self.assertLessEqual((1 - np.linalg.norm(centroids, axis=1)).max() - (1 - np.cos(np.pi / 80)), error)
+
+    def test_open_mesh(self):
+
+        # a flat grid simplifies without error and keeps its boundary
+        x, y = np.meshgrid(np.linspace(0, 1, 11), np.linspace(0, 1, 11))
+        vertices = np.stack((x.ravel(), y.ravel(), np.zeros(x.size)), axis=1)
+        triangles = []
+        for i in range(10):
+            for j in range(10):
+                v = i * 11 + j
+                triangles.append([v, v + 1, v + 12])
+                triangles.append([v, v + 12, v + 11])
+        triangles = np.array(triangles)
+
+        simple_vertices, simple_triangles, error = simplify_mesh(vertices, triangles, 10)
+
+        self.assertLessEqual(simple_triangles.shape[0], 10)
+        self.assertAlmostEqual(error, 0, delta=1e-9)
+
+        # the corners are retained and the area is unchanged
+        for corner in ([0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0]):
+            self.assertTrue(np.any(np.all(np.isclose(simple_vertices, corner), axis=1)))
+
+        p1, p2, p3 = (simple_vertices[simple_triangles[:, i]] for i in range(3))
+        area = 0.5 * np.linalg.norm(np.cross(p2 - p1, p3 - p1), axis=1).sum()
+        self.assertAlmostEqual(area, 1.0, places=9)
+
+    def test_invalid_arguments(self):
+
+        vertices, triangles = _sphere_mesh_arrays(rings=4, sectors=8)
+
+        with self.assertRaises(ValueError):
+            simplify_mesh(vertices[:, :2], triangles, 10)
+
+        with self.assertRaises(ValueError):
+            simplify_mesh(vertices, triangles[:, :2], 10)
+
+        with self.assertRaises(ValueError):
+            simplify_mesh(vertices, triangles + vertices.shape[0], 10)
+
+
+class TestLODMesh(unittest.TestCase):
+
+    def setUp(self):
+
+        vertices, triangles = _sphere_mesh_arrays(rings=40, sectors=80)
+        self.mesh = Mesh(vertices, triangles)
+
+    def assert_same_hits(self, primitive, mesh_data, rays):
+
+        reference = Mesh(mesh_data.vertices, mesh_data.triangles, smoothing=False)
+        for ray in rays:
+            a = primitive.hit(ray)
+            b = reference.hit(ray)
+            self.assertEqual(a is None, b is None)
+            if a is not None:
+                self.assertEqual(a.triangle, b.triangle)
+                self.assertAlmostEqual(a.ray_distance, b.ray_distance, places=9)
+
+    def _rays(self, distance, count=200):
+
+        rng = np.random.default_rng(1)
+        rays = []
+        for _ in range(count):
+            origin = Point3D(0, 0, -distance)
+            target = Point3D(*rng.uniform(-0.9, 0.9, 2), 0)
+            rays.append(CoreRay(origin, origin.vector_to(target).normalise()))
+        return rays
+
+    def test_levels(self):
+
+        lod = LODMesh(self.mesh, max_error=0.05, levels=3, reduction=0.25)
+
+        self.assertIs(lod.data, self.mesh.data)
+        self.assertIs(lod.lods[0], self.mesh.data)
+        self.assertEqual(len(lod.lods), len(lod.lod_errors))
+        self.assertGreater(len(lod.lods), 1)
+
+        # levels are successively coarser with increasing error, all within the bound
+        errors = lod.lod_errors
+        self.assertEqual(errors[0], 0)
+        for i in range(1, len(lod.lods)):
+            self.assertLess(lod.lods[i].triangles.shape[0], lod.lods[i - 1].triangles.shape[0])
+            self.assertGreater(errors[i], errors[i - 1])
+            self.assertLessEqual(errors[i], 0.05)
+
+        # a zero error bound disables simplification
+        self.assertEqual(len(LODMesh(self.mesh, max_error=0).lods), 1)
+
+    def test_selection(self):
+
+        lod = LODMesh(self.mesh, max_error=0.05, footprint=0.01)
+        coarsest = lod.lods[-1]
+
+        # distant rays tolerate the largest error and trace the coarsest level
+        self.assertLessEqual(lod.lod_errors[-1], 0.01 * 10)
+        self.assert_same_hits(lod, coarsest, self._rays(11))
+
+        # rays starting within the mesh bounds always trace the full resolution mesh
+        self.assert_same_hits(lod, self.mesh.data, self._rays(0.5))
+
+        # a zero footprint always selects the full resolution mesh
+        lod.footprint = 0
+        self.assert_same_hits(lod, self.mesh.data, self._rays(11))
+
+        # the selected level is retained for subsequent intersections
+        lod.footprint = 0.01
+        ray = self._rays(11, count=1)[0]
+        self.assertEqual(lod.hit(ray).triangle, Mesh(coarsest.vertices, coarsest.triangles).hit(ray).triangle)
+        intersection = lod.next_intersection()
+        self.assertIsNotNone(intersection)
+        self.assertLess(intersection.triangle, coarsest.triangles.shape[0])
+
+    def test_instance(self):
+
+        lod = LODMesh(self.mesh, max_error=0.05, footprint=0.01)
+        instance = lod.instance()
+
+        self.assertIsInstance(instance, LODMesh)
+        self.assertEqual(instance.lods, lod.lods)
+        self.assertEqual(instance.footprint, lod.footprint)
+        self.assertEqual(instance.max_error, lod.max_error)
+        self.assert_same_hits(instance, lod.lods[-1], self._rays(11, count=20))
+
+    def test_invalid_arguments(self):
+
+        with self.assertRaises(ValueError):
+            LODMesh(self.mesh, max_error=-1)
+
+        with self.assertRaises(ValueError):
+            LODMesh(self.mesh, max_error=0.01, footprint=-1)
+
+        with self.assertRaises(ValueError):
+            LODMesh(self.mesh, max_error=0.01, levels=-1)
+
+        with self.assertRaises(ValueError):
+            LODMesh(self.mesh, max_error=0.01, reduction=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
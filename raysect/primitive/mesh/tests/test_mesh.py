@@ -0,0 +1,363 @@
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import io
+import pickle
+import unittest
+
+import numpy as np
+
+from raysect.core import Point3D
+from raysect.core.ray import Ray as CoreRay
+from raysect.primitive.mesh import Mesh
+
+
+def _sphere_mesh_arrays(radius=1.0, rings=16, sectors=32):
+    """
+    Generates the vertices and triangles of a closed, outward facing UV sphere.
+    """
+
+    vertices = [[0, 0, radius]]
+    for ring in range(1, rings):
+        theta = np.pi * ring / rings
+        for sector in range(sectors):
+            phi = 2 * np.pi * sector / sectors
+            vertices.append([radius * np.sin(theta) * np.cos(phi), radius * np.sin(theta) * np.sin(phi), radius * np.cos(theta)])
+    vertices.append([0, 0, -radius])
+
+    def index(ring, sector):
+        return 1 + (ring - 1) * sectors + sector % sectors
+
+    bottom = len(vertices) - 1
+    triangles = []
+    for sector in range(sectors):
+        triangles.append([0, index(1, sector), index(1, sector + 1)])
+        triangles.append([bottom, index(rings - 1, sector + 1), index(rings - 1, sector)])
+    for ring in range(1, rings - 1):
+        for sector in range(sectors):
+            triangles.append([index(ring, sector), index(ring + 1, sector), index(ring + 1, sector + 1)])
+            triangles.append([index(ring, sector), index(ring + 1, sector + 1), index(ring, sector + 1)])
+
+    return np.array(vertices), np.array(triangles)
+
+
+def _random_rays(count, seed=1):
+
+    rng = np.random.default_rng(seed)
+    rays = []
+    for _ in range(count):
+        origin = Point3D(*rng.uniform(-2, 2, 3))
+        target = Point3D(*rng.uniform(-0.8, 0.8, 3))
+        rays.append(CoreRay(origin, origin.vector_to(target).normalise()))
+    return rays
+
+
+class TestMesh(unittest.TestCase):
+
+    def assert_same_intersections(self, mesh_a, mesh_b, rays):
+
+        for ray in rays:
+            a = mesh_a.hit(ray)
+            b = mesh_b.hit(ray)
+            while a is not None or b is not None:
+                self.assertIsNotNone(a)
+                self.assertIsNotNone(b)
+                self.assertEqual(a.triangle, b.triangle)
+                self.assertEqual(a.ray_distance, b.ray_distance)
+                self.assertEqual((a.u, a.v, a.w), (b.u, b.v, b.w))
+                a = mesh_a.next_intersection()
+                b = mesh_b.next_intersection()
+
+    def test_packed_triangles(self):
+
+        vertices, triangles = _sphere_mesh_arrays()
+        mesh = Mesh(vertices, triangles)
+        packed = Mesh(vertices, triangles, packed_triangles=True)
+
+        self.assertFalse(mesh.data.packed_triangles)
+        self.assertTrue(packed.data.packed_triangles)
+        self.assert_same_intersections(mesh, packed, _random_rays(500))
+
+        # packing may be toggled after construction
+        mesh.data.packed_triangles = True
+        self.assertTrue(mesh.data.packed_triangles)
+        self.assert_same_intersections(mesh, packed, _random_rays(100, seed=2))
+        mesh.data.packed_triangles = False
+        self.assertFalse(mesh.data.packed_triangles)
+
+    def test_packed_triangles_persistence(self):
+
+        vertices, triangles = _sphere_mesh_arrays()
+        mesh = Mesh(vertices, triangles, packed_triangles=True)
+
+        stream = io.BytesIO()
+        mesh.save(stream)
+        stream.seek(0)
+        loaded = Mesh.from_file(stream)
+        self.assertTrue(loaded.data.packed_triangles)
+        self.assert_same_intersections(mesh, loaded, _random_rays(100))
+
+        unpickled = pickle.loads(pickle.dumps(mesh.data))
+        self.assertTrue(unpickled.packed_triangles)
+
+    def test_degenerate_triangle_persistence(self):
+
+        vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0], [2, 0, 0]])
+        triangles = np.array([[0, 1, 2], [0, 0, 1], [1, 3, 2], [0, 1, 4]])
+        mesh = Mesh(vertices, triangles)
+
+        # the degenerate triangles are removed by the tolerant mesh and must not be saved
+        self.assertTrue(np.array_equal(mesh.data.triangles, [[0, 1, 2], [1, 3, 2]]))
+
+        stream = io.BytesIO()
+        mesh.save(stream)
+        stream.seek(0)
+        loaded = Mesh.from_file(stream)
+        self.assertTrue(np.array_equal(loaded.data.triangles, mesh.data.triangles))
+        self.assert_same_intersections(mesh, loaded, _random_rays(100))
+
+        unpickled = pickle.loads(pickle.dumps(mesh.data))
+        self.assertTrue(np.array_equal(unpickled.triangles, mesh.data.triangles))
+
+    def test_update_vertices(self):
+
+        vertices, triangles = _sphere_mesh_arrays()
+        mesh = Mesh(vertices, triangles, packed_triangles=True)
+
+        # deform the sphere into an ellipsoid, refitting the existing kd-tree
+        deformed = vertices * [1.2, 0.9, 1.1] + [0.05, 0, -0.05]
+        rebuilt = mesh.update_vertices(deformed, rebuild_threshold=float('inf'))
+        self.assertFalse(rebuilt)
+        self.assertTrue(np.array_equal(mesh.data.vertices, deformed.astype(np.float32)))
+        self.assert_same_intersections(mesh, Mesh(deformed, triangles), _random_rays(500))
+
+        # a zero threshold always triggers a rebuild
+        rebuilt = mesh.update_vertices(vertices, rebuild_threshold=0)
+        self.assertTrue(rebuilt)
+        self.assert_same_intersections(mesh, Mesh(vertices, triangles), _random_rays(500))
+
+        # topology must not change
+        with self.assertRaises(ValueError):
+            mesh.update_vertices(vertices[:-1])
+
+        with self.assertRaises(ValueError):
+            mesh.update_vertices(vertices, normals=vertices)
+
+        # a deformation that collapses a triangle is rejected and leaves the mesh unchanged
+        collapsed = vertices.copy()
+        collapsed[triangles[5, 1]] = collapsed[triangles[5, 0]]
+        with self.assertRaisesRegex(ValueError, r"triangle ids: .*\b5\b"):
+            mesh.update_vertices(collapsed)
+        self.assertTrue(np.array_equal(mesh.data.vertices, vertices.astype(np.float32)))
+        self.assert_same_intersections(mesh, Mesh(vertices, triangles), _random_rays(100))
+
+    def test_containment_grid(self):
+
+        vertices, triangles = _sphere_mesh_arrays()
+        mesh = Mesh(vertices, triangles)
+        gridded = Mesh(vertices, triangles, containment_grid=16)
+        self.assertEqual(gridded.data.containment_grid, 16)
+
+        rng = np.random.default_rng(1)
+        points = [Point3D(*p) for p in rng.uniform(-1.2, 1.2, (2000, 3))]
+
+        # include points very close to the surface
+        for direction in rng.normal(size=(500, 3)):
+            direction /= np.linalg.norm(direction)
+            points.append(Point3D(*(direction * rng.uniform(0.98, 1.02))))
+
+        for point in points:
+            self.assertEqual(mesh.contains(point), gridded.contains(point))
+
+        # the grid survives serialisation and vertex updates
+        stream = io.BytesIO()
+        gridded.save(stream)
+        stream.seek(0)
+        loaded = Mesh.from_file(stream)
+        self.assertEqual(loaded.data.containment_grid, 16)
+
+        scaled = vertices * 0.5
+        mesh.update_vertices(scaled)
+        gridded.update_vertices(scaled)
+        for point in points:
+            self.assertEqual(mesh.contains(point), gridded.contains(point))
+
+        gridded.data.containment_grid = 0
+        self.assertEqual(gridded.data.containment_grid, 0)
+
+        with self.assertRaises(ValueError):
+            gridded.data.containment_grid = -1
+
+    def test_quantised_vertices(self):
+
+        vertices, triangles = _sphere_mesh_arrays()
+        mesh = Mesh(vertices, triangles, quantise_vertices=True)
+        self.assertTrue(mesh.data.quantised)
+
+        # decoded vertices lie within the quantisation error of the originals
+        error = mesh.data.quantisation_error
+        self.assertGreater(error, 0)
+        self.assertLess(error, 2.0 / 65535)
+        self.assertLessEqual(np.abs(mesh.data.vertices - vertices).max(), error + 1e-6)
+
+        # the quantised mesh traces exactly as a mesh built from the decoded vertices
+        decoded = Mesh(mesh.data.vertices, triangles)
+        self.assertFalse(decoded.data.quantised)
+        self.assertEqual(decoded.data.quantisation_error, 0)
+        self.assert_same_intersections(mesh, decoded, _random_rays(500))
+        self.assert_same_intersections(Mesh(vertices, triangles, quantise_vertices=True, packed_triangles=True), decoded, _random_rays(100))
+
+        # vertex updates are re-quantised
+        scaled = vertices * 0.5
+        mesh.update_vertices(scaled)
+        self.assertTrue(mesh.data.quantised)
+        self.assertLessEqual(np.abs(mesh.data.vertices - scaled).max(), mesh.data.quantisation_error + 1e-6)
+
+    def test_quantised_degenerate_triangles(self):
+
+        # a 1000 m square with a 1 mm triangle
+        large = [[0, 0, 0], [1000, 0, 0], [1000, 1000, 0], [0, 1000, 0]]
+        small = [[500, 500, 1], [500.001, 500, 1], [500, 500.001, 1]]
+
+        # the small triangle shares a vertex block with the large square and would collapse
+        vertices = np.array(large + small)
+        triangles = np.array([[0, 1, 2], [0, 2, 3], [4, 5, 6]])
+        with self.assertRaisesRegex(ValueError, r"triangle ids: 2\b"):
+            Mesh(vertices, triangles, quantise_vertices=True)
+
+        # in a block of its own the small triangle is quantised relative to its own bounds
+        padding = [[0, 0, 0]] * (128 - len(large))
+        vertices = np.array(large + padding + small)
+        triangles = np.array([[0, 1, 2], [0, 2, 3], [128, 129, 130]])
+        mesh = Mesh(vertices, triangles, quantise_vertices=True)
+        self.assertEqual(len(mesh.data.triangles), 3)
+        self.assertLess(np.abs(mesh.data.vertices[128:] - vertices[128:]).max(), 1e-4)
+        self.assertLessEqual(np.abs(mesh.data.vertices - vertices).max(), mesh.data.quantisation_error + 1e-4)
+
+        # an update that would collapse a triangle is rejected and leaves the mesh unchanged
+        vertices = np.vstack((vertices, [[500, 500, 2]]))
+        triangles = np.array([[0, 1, 2], [0, 2, 3], [128, 129, 130], [128, 129, 131]])
+        mesh = Mesh(vertices, triangles, quantise_vertices=True)
+        original = mesh.data.vertices
+
+        moved = vertices.copy()
+        moved[131] = [1000, 1000, 1000]
+        with self.assertRaisesRegex(ValueError, r"triangle ids: 2\b"):
+            mesh.update_vertices(moved)
+        self.assertTrue(np.array_equal(mesh.data.vertices, original))
+
+    def test_quantised_compact_storage(self):
+
+        # an inner sphere whose vertices lie beyond unused padding vertices, so blocks that mix
+        # its triangles with those of the outer sphere span more than 16 bits of vertex indices,
+        # with enough triangles that the kd-tree leaves hold ids beyond 16 bits
+        outer_vertices, outer_triangles = _sphere_mesh_arrays(1.0, 16, 32)
+        inner_vertices, inner_triangles = _sphere_mesh_arrays(0.5, 130, 256)
+        offset = len(outer_vertices) + 70000
+        vertices = np.vstack((outer_vertices, np.zeros((70000, 3)), inner_vertices))
+        inner_triangles = inner_triangles + offset
+
+        count = len(outer_triangles)
+        mixed = np.empty((2 * count, 3), dtype=np.int32)
+        mixed[0::2] = outer_triangles
+        mixed[1::2] = inner_triangles[:count]
+        triangles = np.vstack((mixed, inner_triangles[count:]))
+        self.assertGreater(len(triangles), 65535)
+
+        # the vertex normals of a sphere are the normalised vertices
+        normals = vertices / np.maximum(np.linalg.norm(vertices, axis=1), 1e-9)[:, None]
+        triangles = np.hstack((triangles, triangles))
+
+        mesh = Mesh(vertices, triangles, normals, quantise_vertices=True)
+        self.assertTrue(np.array_equal(mesh.data.triangles, triangles))
+        for index in (0, 1, 2 * count - 1, 2 * count, len(triangles) - 1):
+            self.assertTrue(np.array_equal(mesh.data.triangle(index), triangles[index]))
+
+        # the compact mesh traces exactly as a full size mesh built from the decoded vertices
+        decoded = Mesh(mesh.data.vertices, triangles, normals)
+        rays = _random_rays(200)
+        self.assert_same_intersections(mesh, decoded, rays)
+        for ray in rays[:20]:
+            a, b = mesh.hit(ray), decoded.hit(ray)
+            if a is not None:
+                self.assertEqual(a.normal, b.normal)
+
+        # the compact storage survives saving and pickling
+        stream = io.BytesIO()
+        mesh.save(stream)
+        stream.seek(0)
+        loaded = Mesh.from_file(stream)
+        self.assertTrue(np.array_equal(loaded.data.triangles, triangles))
+        self.assert_same_intersections(loaded, decoded, rays)
+
+        unpickled = pickle.loads(pickle.dumps(mesh.data))
+        self.assertTrue(np.array_equal(unpickled.triangles, triangles))
+        resaved = io.BytesIO()
+        unpickled.save(resaved)
+        self.assertEqual(resaved.getvalue(), stream.getvalue())
+
+        # vertex updates refit the compact kd-tree
+        mesh.update_vertices(vertices * 1.1)
+        loaded.data.packed_triangles = True
+        loaded.update_vertices(vertices * 1.1)
+        decoded = Mesh(mesh.data.vertices, triangles, normals)
+        self.assert_same_intersections(mesh, decoded, rays)
+        self.assert_same_intersections(loaded, decoded, rays)
+
+    def test_compressed_persistence(self):
+
+        vertices, triangles = _sphere_mesh_arrays()
+        for quantise in (False, True):
+            mesh = Mesh(vertices, triangles, quantise_vertices=quantise)
+
+            stream = io.BytesIO()
+            mesh.save(stream)
+            uncompressed_size = len(stream.getvalue())
+
+            stream = io.BytesIO()
+            mesh.save(stream, compress=True)
+            self.assertLess(len(stream.getvalue()), uncompressed_size)
+
+            # data following the mesh in the stream must not be consumed
+            stream.write(b"end")
+            stream.seek(0)
+            loaded = Mesh.from_file(stream)
+            self.assertEqual(stream.read(), b"end")
+
+            self.assertEqual(loaded.data.quantised, quantise)
+            self.assertTrue(np.array_equal(loaded.data.vertices, mesh.data.vertices))
+            self.assert_same_intersections(mesh, loaded, _random_rays(100))
+
+            unpickled = pickle.loads(pickle.dumps(mesh.data))
+            self.assertEqual(unpickled.quantised, quantise)
+            self.assertTrue(np.array_equal(unpickled.vertices, mesh.data.vertices))
+
+
+if __name__ == "__main__":
+    unittest.main()
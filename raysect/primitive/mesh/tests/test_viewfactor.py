@@ -0,0 +1,186 @@
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+
+import unittest
+
+import numpy as np
+
+from raysect.core import Point3D, World, SerialEngine, translate
+from raysect.primitive import Box
+from raysect.primitive.mesh import Mesh, view_factors
+
+
+def _disc_mesh(radius, segments, **kwargs):
+
+    angles = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    vertices = np.zeros((segments + 1, 3))
+    vertices[1:, 0] = radius * np.cos(angles)
+    vertices[1:, 1] = radius * np.sin(angles)
+
+    # anti-clockwise winding, the face normals point along +z
+    triangles = np.array([[0, i + 1, (i + 1) % segments + 1] for i in range(segments)])
+    return Mesh(vertices, triangles, **kwargs)
+
+
+def _triangle_areas(mesh):
+
+    vertices = mesh.data.vertices[mesh.data.triangles[:, :3]]
+    return 0.5 * np.linalg.norm(np.cross(vertices[:, 1] - vertices[:, 0], vertices[:, 2] - vertices[:, 0]), axis=1)
+
+
+class TestViewFactors(unittest.TestCase):
+
+    def test_coaxial_discs(self):
+
+        world = World()
+        source = _disc_mesh(1, 48, parent=world)
+        target = _disc_mesh(1, 48, parent=world, transform=translate(0, 0, 1))
+
+        f = view_factors(source, target, samples=2000, render_engine=SerialEngine())
+        self.assertEqual(f.shape, (48, 48))
+
+        # area weighted total compared with the analytic result for coaxial discs of equal radius and separation
+        areas = _triangle_areas(source)
+        total = (areas * np.asarray(f.sum(axis=1)).ravel()).sum() / areas.sum()
+        self.assertAlmostEqual(total, 0.5 * (3 - np.sqrt(5)), delta=0.01)
+
+        # by symmetry the view factors only depend on the relative angle between triangles
+        dense = f.toarray()
+        self.assertAlmostEqual(dense[0, 0], dense[10, 10], delta=0.01)
+        self.assertAlmostEqual(dense[3, 7], dense[20, 24], delta=0.01)
+
+    def test_occlusion(self):
+
+        world = World()
+        source = _disc_mesh(1, 48, parent=world)
+        target = _disc_mesh(1, 48, parent=world, transform=translate(0, 0, 1))
+        Box(Point3D(-5, -5, 0.4), Point3D(5, 5, 0.6), parent=world)
+
+        f = view_factors(source, target, samples=100, render_engine=SerialEngine())
+        self.assertEqual(f.nnz, 0)
+
+    def test_enclosure(self):
+
+        world = World()
+
+        # a cube with inward facing triangles, all emission must land on the cube itself
+        vertices = np.array([[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype=float)
+        triangles = np.array([
+            [0, 1, 3], [0, 3, 2], [4, 6, 7], [4, 7, 5],
+            [0, 4, 5], [0, 5, 1], [2, 3, 7], [2, 7, 6],
+            [0, 2, 6], [0, 6, 4], [1, 5, 7], [1, 7, 3]
+        ])
+        centroids = vertices[triangles].mean(axis=1)
+        normals = np.cross(vertices[triangles[:, 1]] - vertices[triangles[:, 0]], vertices[triangles[:, 2]] - vertices[triangles[:, 0]])
+        outward = np.sum(normals * (centroids - 0.5), axis=1) > 0
+        triangles[outward] = triangles[outward][:, ::-1]
+        cube = Mesh(vertices, triangles, parent=world)
+
+        f = view_factors(cube, samples=500, render_engine=SerialEngine())
+        np.testing.assert_allclose(np.asarray(f.sum(axis=1)).ravel(), 1.0)
+
+        # coplanar triangles cannot see each other
+        self.assertEqual(f[0, 1], 0)
+
+        # opposite faces of a unit cube, analytic view factor 0.19982
+        self.assertAlmostEqual(f[0:2, 2:4].sum() / 2, 0.19982, delta=0.03)
+
+        v = view_factors(cube, samples=500, visibility=True, render_engine=SerialEngine())
+        self.assertTrue((v.data == 1).all())
+        self.assertEqual(v.nnz, f.nnz)
+
+    def test_convergence(self):
+
+        world = World()
+        source = _disc_mesh(1, 48, parent=world)
+        target = _disc_mesh(1, 48, parent=world, transform=translate(0, 0, 1))
+
+        # a loose tolerance is satisfied by the first batch, a tight tolerance adds batches
+        coarse = view_factors(source, target, samples=100, max_samples=5000, tolerance=0.5, render_engine=SerialEngine())
+        fine = view_factors(source, target, samples=100, max_samples=5000, tolerance=0.002, render_engine=SerialEngine())
+
+        # by symmetry all the diagonal elements are equal, their spread measures the sampling noise
+        self.assertLess(fine.diagonal().std(), 0.5 * coarse.diagonal().std())
+
+    def test_degenerate_triangles(self):
+
+        world = World()
+        source = _disc_mesh(1, 24, parent=world)
+        target = _disc_mesh(1, 24, parent=world, transform=translate(0, 0, 1))
+
+        # degenerate triangles are removed by the tolerant meshes, the matrix is indexed by the remaining triangles
+        triangles = np.vstack(([[0, 0, 1], [1, 2, 2]], source.data.triangles))
+        degenerate_source = Mesh(source.data.vertices, triangles, parent=world, transform=translate(0, 0, -1))
+        degenerate_target = Mesh(target.data.vertices, triangles, parent=world, transform=translate(0, 0, 2))
+        self.assertEqual(len(degenerate_source.data.triangles), 24)
+
+        f = view_factors(degenerate_source, source, samples=500, render_engine=SerialEngine())
+        self.assertEqual(f.shape, (24, 24))
+        self.assertGreater(f.sum(), 0)
+
+        f = view_factors(target, degenerate_target, samples=500, render_engine=SerialEngine())
+        self.assertEqual(f.shape, (24, 24))
+        self.assertGreater(f.sum(), 0)
+
+    def test_quantised_meshes(self):
+
+        world = World()
+        source = _disc_mesh(1, 48, parent=world, quantise_vertices=True)
+        target = _disc_mesh(1, 48, parent=world, transform=translate(0, 0, 1), quantise_vertices=True)
+
+        f = view_factors(source, target, samples=2000, render_engine=SerialEngine())
+        self.assertEqual(f.shape, (48, 48))
+
+        areas = _triangle_areas(source)
+        total = (areas * np.asarray(f.sum(axis=1)).ravel()).sum() / areas.sum()
+        self.assertAlmostEqual(total, 0.5 * (3 - np.sqrt(5)), delta=0.01)
+
+    def test_invalid_arguments(self):
+
+        world = World()
+        source = _disc_mesh(1, 48, parent=world)
+        detached = _disc_mesh(1, 8)
+
+        with self.assertRaises(ValueError):
+            view_factors(detached)
+
+        with self.assertRaises(ValueError):
+            view_factors(source, detached)
+
+        with self.assertRaises(ValueError):
+            view_factors(source, samples=0)
+
+        with self.assertRaises(ValueError):
+            view_factors(source, samples=100, max_samples=10)
+
+        with self.assertRaises(ValueError):
+            view_factors(source, tolerance=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
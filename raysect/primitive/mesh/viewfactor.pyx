@@ -0,0 +1,315 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+from numpy import arange, concatenate, empty, float64, full_like, int32, int64, nonzero, sqrt as np_sqrt, zeros
+from raysect.core.workflow import MulticoreEngine
+
+from raysect.core cimport World, Intersection, Point3D, Vector3D, Normal3D, AffineMatrix3D, new_point3d, new_vector3d, new_ray
+from raysect.core.math.random cimport uniform
+from raysect.primitive.mesh.mesh cimport Mesh, MeshIntersection
+from libc.math cimport sqrt, sin, cos, M_PI, INFINITY
+from numpy cimport ndarray, float64_t, int32_t, int64_t
+cimport cython
+
+# bias applied to the ray launch points to avoid self intersection
+cdef const double EPSILON = 1e-6
+
+
+def view_factors(Mesh source not None, Mesh target=None, int samples=1000, max_samples=None, tolerance=None,
+                 bint visibility=False, render_engine=None):
+    """
+    Calculates the triangle to triangle view factor matrix between two meshes.
+
+    Element (i, j) of the returned matrix is the fraction of the radiation
+    emitted diffusely from the front face of source triangle i that arrives
+    directly at target triangle j. The front face of a triangle is the side its
+    face normal points towards. Radiation is counted on arrival at either side of
+    a target triangle.
+
+    The view factors are estimated by Monte Carlo ray tracing. Each source
+    triangle launches cosine weighted rays from points distributed uniformly
+    over its surface, the launch points and directions are stratified (Latin
+    hypercube sampled) to reduce the variance of the estimate. The rays are
+    traced with World.hit(), so every primitive in the scene-graph acts as an
+    occluder. Both meshes must therefore be attached to the same World.
+
+    Rays are launched in batches of the requested number of samples. If a
+    tolerance is specified, batches are added to a source triangle until the
+    largest standard error of the triangle's view factors falls below the
+    tolerance, or max_samples is reached.
+
+    The source triangles are distributed across the processes of the render
+    engine. The result is returned as a SciPy compressed sparse row matrix
+    with shape (source triangles, target triangles), SciPy must be installed
+    to use this function.
+
+    :param Mesh source: The emitting mesh.
+    :param Mesh target: The receiving mesh, if not specified the view factors
+      between the triangles of the source mesh are calculated (default=None).
+    :param int samples: Number of rays launched per source triangle in each batch (default=1000).
+    :param int max_samples: Maximum number of rays launched per source triangle (default=samples).
+    :param float tolerance: Target standard error of the view factors, if not set a single
+      batch of samples is traced (default=None).
+    :param bool visibility: If True, the returned matrix holds 1 for each pair of triangles
+      where at least one ray launched from source triangle i reached target triangle j,
+      instead of the view factor (default=False). The visibility is one way and sampled,
+      element (i, j) does not imply element (j, i) and rarely hit pairs may be missed.
+    :param object render_engine: The render engine used to distribute the work (default=MulticoreEngine()).
+    :return: A scipy.sparse.csr_matrix.
+
+    .. code-block:: pycon
+
+        >>> from raysect.primitive.mesh import view_factors
+        >>>
+        >>> f = view_factors(divertor, first_wall, samples=500, max_samples=20000, tolerance=0.001)
+        >>> f.sum(axis=1)  # fraction of each divertor triangle's emission reaching the first wall
+    """
+
+    cdef:
+        World world
+        int32_t i, j, count, target_count
+        int32_t[:, ::1] triangles_mv
+        ndarray vertices, normals
+        AffineMatrix3D to_world
+        Point3D vertex
+        Normal3D normal
+        list rows, columns, values
+        _ViewFactorWorker worker
+
+    try:
+        from scipy.sparse import csr_matrix
+    except ImportError:
+        raise ImportError("The view factor calculation requires SciPy to be installed.")
+
+    if target is None:
+        target = source
+
+    if not isinstance(source.root, World):
+        raise ValueError("The source mesh is not connected to a scene-graph containing a World object.")
+
+    if target.root is not source.root:
+        raise ValueError("The source and target meshes must be attached to the same World.")
+
+    if samples <= 0:
+        raise ValueError("The number of samples must be greater than zero.")
+
+    if max_samples is None:
+        max_samples = samples
+    if max_samples < samples:
+        raise ValueError("The maximum number of samples cannot be less than the number of samples per batch.")
+
+    if tolerance is None:
+        tolerance = 0
+    if tolerance < 0:
+        raise ValueError("The tolerance cannot be negative.")
+
+    render_engine = render_engine or MulticoreEngine()
+
+    world = source.root
+
+    # build the acceleration structure before any worker processes are spawned
+    world.build_accelerator()
+
+    # cache the source triangle geometry in world space, the triangles are
+    # those traced by the mesh, excluding any removed degenerate triangles
+    # (the triangles property also decodes the compact triangles of quantised meshes)
+    to_world = source.to_root()
+    triangles_mv = source.data.triangles
+    count = source.data.face_normals_mv.shape[0]
+    target_count = target.data.face_normals_mv.shape[0]
+
+    vertices = empty((count, 3, 3), dtype=float64)
+    normals = empty((count, 3), dtype=float64)
+    for i in range(count):
+
+        for j in range(3):
+            vertex = source.data.vertex(triangles_mv[i, j]).transform(to_world)
+            vertices[i, j, :] = (vertex.x, vertex.y, vertex.z)
+
+        normal = source.data.face_normal(i).transform(to_world).normalise()
+        normals[i, :] = (normal.x, normal.y, normal.z)
+
+    worker = _ViewFactorWorker(world, target, vertices, normals, samples, max_samples, tolerance)
+
+    rows = []
+    columns = []
+    values = []
+
+    def update(result):
+
+        triangle, hit_triangles, hit_counts, total = result
+        rows.append(full_like(hit_triangles, triangle))
+        columns.append(hit_triangles)
+        if visibility:
+            values.append(full_like(hit_triangles, 1.0, dtype=float64))
+        else:
+            values.append(hit_counts / total)
+
+    render_engine.run([(i, ) for i in range(count)], worker, update)
+
+    if not rows:
+        return csr_matrix((count, target_count), dtype=float64)
+
+    return csr_matrix(
+        (concatenate(values), (concatenate(rows), concatenate(columns))),
+        shape=(count, target_count)
+    )
+
+
+cdef class _ViewFactorWorker:
+    """
+    Traces the view factor rays for a single source triangle per task.
+    """
+
+    def __init__(self, World world, Mesh target, ndarray vertices, ndarray normals,
+                 int batch_samples, int max_samples, double tolerance):
+
+        self.world = world
+        self.target = target
+        self.target_count = target.data.face_normals_mv.shape[0]
+        self.vertices_mv = vertices
+        self.normals_mv = normals
+        self.batch_samples = batch_samples
+        self.max_samples = max_samples
+        self.tolerance = tolerance
+
+    def __call__(self, tuple task):
+
+        cdef:
+            int32_t triangle
+            int samples
+            int64_t total
+            ndarray counts, hits, fraction
+
+        triangle, = task
+        counts = zeros(self.target_count, dtype=int64)
+
+        total = 0
+        while total < self.max_samples:
+
+            samples = min(self.batch_samples, self.max_samples - total)
+            self._trace_batch(triangle, counts, samples)
+            total += samples
+
+            if self.tolerance == 0:
+                break
+
+            # binomial standard error of the least certain view factor
+            fraction = counts[counts > 0] / total
+            if fraction.size == 0 or np_sqrt(fraction * (1 - fraction) / total).max() < self.tolerance:
+                break
+
+        hits = nonzero(counts)[0].astype(int32)
+        return triangle, hits, counts[hits], total
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef void _trace_batch(self, int32_t triangle, int64_t[::1] counts, int samples):
+        """
+        Launches a batch of stratified rays from a source triangle.
+
+        Hits on the target mesh are accumulated into the counts array, indexed
+        by target triangle.
+        """
+
+        cdef:
+            int i
+            int32_t[::1] p1, p2, p3, p4
+            double u1, u2, u3, u4, temp, alpha, beta, gamma, radius, phi, height
+            Vector3D normal, tangent, bitangent, direction
+            Point3D origin
+            Intersection intersection
+
+        # a latin hypercube, each sample dimension is stratified independently
+        p1 = _permutation(samples)
+        p2 = _permutation(samples)
+        p3 = _permutation(samples)
+        p4 = _permutation(samples)
+
+        normal = new_vector3d(self.normals_mv[triangle, 0], self.normals_mv[triangle, 1], self.normals_mv[triangle, 2])
+        tangent = normal.orthogonal()
+        bitangent = normal.cross(tangent)
+
+        for i in range(samples):
+
+            u1 = (p1[i] + uniform()) / samples
+            u2 = (p2[i] + uniform()) / samples
+            u3 = (p3[i] + uniform()) / samples
+            u4 = (p4[i] + uniform()) / samples
+
+            # uniform point on the triangle, same mapping as TriangleSampler3D
+            temp = sqrt(u1)
+            alpha = 1 - temp
+            beta = u2 * temp
+            gamma = 1 - alpha - beta
+
+            origin = new_point3d(
+                alpha * self.vertices_mv[triangle, 0, 0] + beta * self.vertices_mv[triangle, 1, 0] + gamma * self.vertices_mv[triangle, 2, 0] + EPSILON * normal.x,
+                alpha * self.vertices_mv[triangle, 0, 1] + beta * self.vertices_mv[triangle, 1, 1] + gamma * self.vertices_mv[triangle, 2, 1] + EPSILON * normal.y,
+                alpha * self.vertices_mv[triangle, 0, 2] + beta * self.vertices_mv[triangle, 1, 2] + gamma * self.vertices_mv[triangle, 2, 2] + EPSILON * normal.z
+            )
+
+            # cosine weighted direction about the face normal
+            radius = sqrt(u3)
+            phi = 2 * M_PI * u4
+            height = sqrt(max(0.0, 1 - u3))
+            direction = new_vector3d(
+                radius * cos(phi) * tangent.x + radius * sin(phi) * bitangent.x + height * normal.x,
+                radius * cos(phi) * tangent.y + radius * sin(phi) * bitangent.y + height * normal.y,
+                radius * cos(phi) * tangent.z + radius * sin(phi) * bitangent.z + height * normal.z
+            )
+
+            intersection = self.world.hit(new_ray(origin, direction, INFINITY))
+            if intersection is not None and intersection.primitive is self.target:
+                counts[(<MeshIntersection> intersection).triangle] += 1
+
+
+cdef int32_t[::1] _permutation(int n):
+    """
+    Returns a random permutation of the integers [0, n).
+
+    Uses the Raysect random number generator, which is re-seeded in each
+    render engine worker.
+    """
+
+    cdef:
+        int i, j
+        int32_t swap
+        int32_t[::1] values
+
+    values = arange(n, dtype=int32)
+    for i in range(n - 1, 0, -1):
+        j = <int> (uniform() * (i + 1))
+        swap = values[i]
+        values[i] = values[j]
+        values[j] = swap
+    return values
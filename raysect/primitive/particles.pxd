@@ -0,0 +1,102 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+from raysect.core cimport Primitive, Material, Point3D, Ray, Intersection
+from raysect.core.math.spatial.kdtree3d cimport KDTree3DCore
+from libc.stdint cimport int32_t
+
+
+cdef class _ParticleKDTree(KDTree3DCore):
+
+    cdef ParticleArray particles
+
+
+cdef class ParticleArray(Primitive):
+
+    cdef:
+        int32_t _count
+        object _centres
+        object _transforms
+        object _indices
+        double[:, ::1] _centres_mv
+        double[:, :, ::1] _inverse_mv
+        int32_t[::1] _indices_mv
+        tuple _materials
+        _ParticleKDTree _tree
+        int32_t _active
+
+        # ray state
+        Ray _cached_ray
+        Ray _local_ray
+        double _origin[3]
+        double _direction[3]
+        double _min_distance
+        double _max_distance
+        bint _seek_next_intersection
+
+        # closest intersection found by the kd-tree traversal
+        int32_t _closest_particle
+        double _closest_distance
+        double _closest_normal[3]
+
+    cdef object _build(self)
+
+    cdef tuple _extents(self)
+
+    cdef bint _hit_leaf(self, int32_t *items, int32_t count, double max_range)
+
+    cdef bint _hit_particle(self, int32_t index, double origin[3], double direction[3], double min_distance, double max_distance, double *distance, double normal[3])
+
+    cdef bint _contains_particle(self, int32_t index, double point[3])
+
+    cdef void _to_particle_point(self, int32_t index, double point[3], double result[3])
+
+    cdef void _to_particle_vector(self, int32_t index, double vector[3], double result[3])
+
+    cdef Intersection _trace(self)
+
+
+cdef class SphereArray(ParticleArray):
+
+    cdef:
+        object _radii
+        double[::1] _radii_mv
+
+
+cdef class CylinderArray(ParticleArray):
+
+    cdef:
+        object _radii
+        object _heights
+        double[::1] _radii_mv
+        double[::1] _heights_mv
+
+    cdef void _cylinder_normal(self, double origin[3], double direction[3], double t, int surface, double normal[3])
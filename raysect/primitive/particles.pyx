@@ -0,0 +1,762 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import numpy as np
+cimport cython
+
+from raysect.core cimport AffineMatrix3D, BoundingBox3D, Normal3D, new_point3d, new_normal3d, new_ray, new_intersection
+from raysect.core.math.spatial.kdtree3d cimport Item3D
+from raysect.core.math.cython cimport solve_quadratic, swap_double
+from libc.math cimport sqrt, fabs, INFINITY
+
+# bounding box is padded by a small amount to avoid numerical accuracy issues
+cdef const double BOX_PADDING = 1e-9
+
+# additional ray distance to avoid re-hitting the same surface point
+cdef const double EPSILON = 1e-9
+
+cdef enum:
+
+    # no particle identifier
+    NO_PARTICLE = -1
+
+    # cylinder surface enumeration
+    NO_SURFACE = -1
+    BARREL_SURFACE = 0
+    LOWER_SURFACE = 1
+    UPPER_SURFACE = 2
+
+
+cdef class _ParticleKDTree(KDTree3DCore):
+    """
+    Specialised kd-tree over the particle bounding boxes of a ParticleArray.
+    """
+
+    def __init__(self, ParticleArray particles not None, list items):
+
+        super().__init__(items)
+        self.particles = particles
+
+    cdef bint _trace_leaf(self, int32_t id, Ray ray, double max_range):
+        return self.particles._hit_leaf(self._nodes[id].items, self._nodes[id].count, max_range)
+
+    cdef bint _is_contained_leaf(self, int32_t id, Point3D point):
+
+        cdef:
+            int32_t item, index
+            double p[3]
+
+        p[0] = point.x
+        p[1] = point.y
+        p[2] = point.z
+
+        for item in range(self._nodes[id].count):
+            index = self._nodes[id].items[item]
+            if self.particles._contains_particle(index, p):
+                self.particles._active = index
+                return True
+        return False
+
+
+cdef class ParticleArray(Primitive):
+    """
+    A primitive consisting of a large number of simple particles.
+
+    This is an abstract base class and can not be used directly.
+
+    A particle array replaces a large number of individual primitives, such as
+    dust grains or pellets, with a single primitive. The particle geometry is
+    held in arrays and an internal kd-tree is built over the particle bounding
+    boxes, avoiding the memory and scene-graph overhead of creating a node per
+    particle. The particles must not overlap.
+
+    Each particle is defined in its own coordinate space, positioned at its
+    centre. An optional affine transform may be supplied per particle, this
+    is applied in the particle space before the particle is translated to its
+    centre, e.g. to rotate or scale a particle.
+
+    By default all particles share the primitive material. Alternatively a list
+    of materials and a per-particle material index may be supplied. The
+    material returned for the primitive is that of the particle most recently
+    hit by a ray or found to contain a point.
+
+    :param object centres: An Nx3 array of particle centres.
+    :param object transforms: An optional Nx4x4 array or list of AffineMatrix3D
+      transforms, one per particle (default=None).
+    :param object material_indices: An optional array of N material indices
+      into the materials list (default=None).
+    :param list materials: An optional list of particle materials (default=None).
+    :param Node parent: Scene graph parent node (default=None).
+    :param AffineMatrix3D transform: An AffineMatrix3D defining the local coordinate system relative to the scene graph parent (default=identity matrix).
+    :param Material material: A Material object defining the particle material (default=None).
+    :param str name: A string specifying a user-friendly name for the particle array (default="").
+    """
+
+    def __init__(self, object centres not None, object transforms=None, object material_indices=None, list materials=None,
+                 object parent=None, AffineMatrix3D transform=None, Material material=None, str name=None):
+
+        super().__init__(parent, transform, material, name)
+
+        centres = np.array(centres, dtype=np.float64)
+        if centres.ndim != 2 or centres.shape[1] != 3:
+            raise ValueError("The particle centres must be an Nx3 array.")
+
+        self._count = centres.shape[0]
+        self._centres = centres
+        self._centres_mv = centres
+
+        # per particle transforms, the inverse is used to convert rays into particle space
+        self._transforms = None
+        self._inverse_mv = None
+        if transforms is not None:
+
+            if not isinstance(transforms, np.ndarray):
+                transforms = [[[(<AffineMatrix3D> m)[i, j] for j in range(4)] for i in range(4)] for m in transforms]
+
+            transforms = np.array(transforms, dtype=np.float64)
+            if transforms.shape != (self._count, 4, 4):
+                raise ValueError("The particle transforms must be an Nx4x4 array or a list of N AffineMatrix3D objects.")
+
+            self._transforms = transforms
+            self._inverse_mv = np.ascontiguousarray(np.linalg.inv(transforms)[:, :3, :])
+
+        # per particle materials
+        self._materials = None
+        self._indices = None
+        self._indices_mv = None
+        if materials is not None:
+
+            for item in materials:
+                if not isinstance(item, Material):
+                    raise TypeError("The particle materials must be Material objects.")
+
+            if material_indices is None:
+                material_indices = np.zeros(self._count, dtype=np.int32)
+            material_indices = np.array(material_indices, dtype=np.int32)
+
+            if material_indices.shape != (self._count,):
+                raise ValueError("The material indices array must contain one index per particle.")
+
+            if self._count > 0 and (material_indices.min() < 0 or material_indices.max() >= len(materials)):
+                raise ValueError("The material indices must lie in the range [0, number of materials - 1].")
+
+            self._materials = tuple(materials)
+            self._indices = material_indices
+            self._indices_mv = material_indices
+
+        elif material_indices is not None:
+            raise ValueError("Material indices can only be specified with a list of materials.")
+
+        self._tree = None
+        self._active = 0
+        self._seek_next_intersection = False
+
+    @property
+    def count(self):
+        """
+        The number of particles.
+
+        :rtype: int
+        """
+        return self._count
+
+    @property
+    def centres(self):
+        """
+        The particle centres.
+
+        :rtype: ndarray
+        """
+        return self._centres.copy()
+
+    @property
+    def transforms(self):
+        """
+        The per particle transforms or None.
+
+        :rtype: ndarray
+        """
+        if self._transforms is None:
+            return None
+        return self._transforms.copy()
+
+    @property
+    def material_indices(self):
+        """
+        The per particle material indices or None.
+
+        :rtype: ndarray
+        """
+        if self._indices is None:
+            return None
+        return self._indices.copy()
+
+    @property
+    def materials(self):
+        """
+        The per particle materials or None.
+
+        :rtype: tuple
+        """
+        return self._materials
+
+    cdef object _build(self):
+        """
+        Builds the particle kd-tree, must be called by derived classes once the particle geometry is configured.
+        """
+
+        cdef:
+            int32_t index
+            list items
+
+        if self._count == 0:
+            self._tree = None
+            return
+
+        lower, upper = self._extents()
+
+        # bounds of the transformed particle space boxes
+        if self._transforms is not None:
+            corners = np.stack(np.meshgrid([0, 1], [0, 1], [0, 1], indexing="ij"), axis=-1).reshape(8, 3)
+            corners = np.where(corners[None, :, :] == 0, lower[:, None, :], upper[:, None, :])
+            corners = np.einsum("nij,nkj->nki", self._transforms[:, :3, :3], corners) + self._transforms[:, None, :3, 3]
+            lower = corners.min(axis=1)
+            upper = corners.max(axis=1)
+
+        lower = lower + self._centres
+        upper = upper + self._centres
+
+        items = []
+        for index in range(self._count):
+            items.append(Item3D(index, BoundingBox3D(
+                new_point3d(lower[index, 0], lower[index, 1], lower[index, 2]),
+                new_point3d(upper[index, 0], upper[index, 1], upper[index, 2])
+            )))
+
+        self._tree = _ParticleKDTree(self, items)
+
+    cdef tuple _extents(self):
+        """
+        Returns the lower and upper corners of the particle space bounding boxes.
+
+        Virtual method - to be implemented by derived classes.
+
+        :return: A tuple of two Nx3 arrays.
+        """
+        raise NotImplementedError("Virtual method _extents() has not been implemented.")
+
+    cpdef Intersection hit(self, Ray ray):
+
+        self._seek_next_intersection = False
+
+        if self._tree is None:
+            return None
+
+        # convert ray to local space
+        self._cached_ray = ray
+        self._local_ray = new_ray(
+            ray.origin.transform(self.to_local()),
+            ray.direction.transform(self.to_local()),
+            ray.max_distance
+        )
+
+        self._origin[0] = self._local_ray.origin.x
+        self._origin[1] = self._local_ray.origin.y
+        self._origin[2] = self._local_ray.origin.z
+
+        self._direction[0] = self._local_ray.direction.x
+        self._direction[1] = self._local_ray.direction.y
+        self._direction[2] = self._local_ray.direction.z
+
+        self._min_distance = 0.0
+        self._max_distance = ray.max_distance
+
+        return self._trace()
+
+    cpdef Intersection next_intersection(self):
+
+        if not self._seek_next_intersection:
+            return None
+
+        return self._trace()
+
+    @cython.cdivision(True)
+    cdef Intersection _trace(self):
+        """
+        Finds the closest intersection beyond the last intersection.
+        """
+
+        cdef:
+            double t
+            Point3D hit_point, inside_point, outside_point
+            Normal3D normal
+
+        self._closest_particle = NO_PARTICLE
+        if not self._tree._trace(self._local_ray):
+            self._seek_next_intersection = False
+            return None
+
+        # subsequent searches start after this intersection
+        t = self._closest_distance
+        self._min_distance = t
+        self._seek_next_intersection = True
+        self._active = self._closest_particle
+
+        hit_point = new_point3d(
+            self._origin[0] + t * self._direction[0],
+            self._origin[1] + t * self._direction[1],
+            self._origin[2] + t * self._direction[2]
+        )
+
+        normal = new_normal3d(self._closest_normal[0], self._closest_normal[1], self._closest_normal[2]).normalise()
+
+        # displace hit_point away from surface to generate inner and outer points
+        inside_point = new_point3d(hit_point.x - EPSILON * normal.x,
+                                   hit_point.y - EPSILON * normal.y,
+                                   hit_point.z - EPSILON * normal.z)
+
+        outside_point = new_point3d(hit_point.x + EPSILON * normal.x,
+                                    hit_point.y + EPSILON * normal.y,
+                                    hit_point.z + EPSILON * normal.z)
+
+        return new_intersection(self._cached_ray, t, self, hit_point, inside_point, outside_point, normal,
+                                self._local_ray.direction.dot(normal) >= 0.0, self.to_local(), self.to_root())
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef bint _hit_leaf(self, int32_t *items, int32_t count, double max_range):
+        """
+        Finds the closest particle intersection in a kd-tree leaf.
+        """
+
+        cdef:
+            int32_t item, index
+            double distance, t
+            double origin[3]
+            double direction[3]
+            double normal[3]
+            double[:, ::1] inverse
+
+        # the search is limited to the leaf and ray range
+        distance = min(max_range, self._max_distance)
+        self._closest_particle = NO_PARTICLE
+
+        for item in range(count):
+
+            index = items[item]
+            self._to_particle_point(index, self._origin, origin)
+            self._to_particle_vector(index, self._direction, direction)
+
+            if self._hit_particle(index, origin, direction, self._min_distance, distance, &t, normal):
+                distance = t
+                self._closest_particle = index
+                self._closest_distance = t
+
+                # normals are transformed by the transpose of the inverse particle transform
+                if self._inverse_mv is None:
+                    self._closest_normal[0] = normal[0]
+                    self._closest_normal[1] = normal[1]
+                    self._closest_normal[2] = normal[2]
+                else:
+                    inverse = self._inverse_mv[index]
+                    self._closest_normal[0] = inverse[0, 0] * normal[0] + inverse[1, 0] * normal[1] + inverse[2, 0] * normal[2]
+                    self._closest_normal[1] = inverse[0, 1] * normal[0] + inverse[1, 1] * normal[1] + inverse[2, 1] * normal[2]
+                    self._closest_normal[2] = inverse[0, 2] * normal[0] + inverse[1, 2] * normal[1] + inverse[2, 2] * normal[2]
+
+        return self._closest_particle != NO_PARTICLE
+
+    cdef bint _hit_particle(self, int32_t index, double origin[3], double direction[3], double min_distance, double max_distance, double *distance, double normal[3]):
+        """
+        Calculates the first intersection of a particle space ray with a particle.
+
+        Virtual method - to be implemented by derived classes.
+
+        The intersection distance must lie in the range (min_distance, max_distance].
+        The normal does not need to be normalised.
+
+        :return: True if an intersection is found.
+        """
+        raise NotImplementedError("Virtual method _hit_particle() has not been implemented.")
+
+    cdef bint _contains_particle(self, int32_t index, double point[3]):
+        """
+        Tests if a local space point lies inside a particle.
+
+        Virtual method - to be implemented by derived classes.
+        """
+        raise NotImplementedError("Virtual method _contains_particle() has not been implemented.")
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _to_particle_point(self, int32_t index, double point[3], double result[3]):
+
+        cdef:
+            double x, y, z
+            double[:, ::1] inverse
+
+        x = point[0] - self._centres_mv[index, 0]
+        y = point[1] - self._centres_mv[index, 1]
+        z = point[2] - self._centres_mv[index, 2]
+
+        if self._inverse_mv is None:
+            result[0] = x
+            result[1] = y
+            result[2] = z
+        else:
+            inverse = self._inverse_mv[index]
+            result[0] = inverse[0, 0] * x + inverse[0, 1] * y + inverse[0, 2] * z + inverse[0, 3]
+            result[1] = inverse[1, 0] * x + inverse[1, 1] * y + inverse[1, 2] * z + inverse[1, 3]
+            result[2] = inverse[2, 0] * x + inverse[2, 1] * y + inverse[2, 2] * z + inverse[2, 3]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _to_particle_vector(self, int32_t index, double vector[3], double result[3]):
+
+        cdef double[:, ::1] inverse
+
+        if self._inverse_mv is None:
+            result[0] = vector[0]
+            result[1] = vector[1]
+            result[2] = vector[2]
+        else:
+            inverse = self._inverse_mv[index]
+            result[0] = inverse[0, 0] * vector[0] + inverse[0, 1] * vector[1] + inverse[0, 2] * vector[2]
+            result[1] = inverse[1, 0] * vector[0] + inverse[1, 1] * vector[1] + inverse[1, 2] * vector[2]
+            result[2] = inverse[2, 0] * vector[0] + inverse[2, 1] * vector[1] + inverse[2, 2] * vector[2]
+
+    cpdef bint contains(self, Point3D p) except -1:
+
+        if self._tree is None:
+            return False
+
+        return self._tree._is_contained(p.transform(self.to_local()))
+
+    cpdef BoundingBox3D bounding_box(self):
+
+        cdef:
+            Point3D point
+            BoundingBox3D box
+
+        if self._tree is None:
+            return BoundingBox3D()
+
+        # convert local bounds to world space and build an enclosing world space bounding box
+        # a small degree of padding is added to avoid potential numerical accuracy issues
+        box = BoundingBox3D()
+        for point in self._tree.bounds.vertices():
+            box.extend(point.transform(self.to_root()), BOX_PADDING)
+
+        return box
+
+    cdef Material get_material(self):
+
+        # the material of the particle most recently hit or found to contain a point
+        if self._materials is None or self._count == 0:
+            return self._material
+        return self._materials[self._indices_mv[self._active]]
+
+
+cdef class SphereArray(ParticleArray):
+    """
+    An array of spherical particles.
+
+    Each sphere is centred on the origin of its particle space.
+
+    :param object centres: An Nx3 array of sphere centres.
+    :param object radii: The sphere radii, either a single value or an array of N values.
+    :param object transforms: An optional Nx4x4 array or list of AffineMatrix3D
+      transforms, one per particle (default=None).
+    :param object material_indices: An optional array of N material indices
+      into the materials list (default=None).
+    :param list materials: An optional list of particle materials (default=None).
+    :param Node parent: Scene graph parent node (default=None).
+    :param AffineMatrix3D transform: An AffineMatrix3D defining the local coordinate system relative to the scene graph parent (default=identity matrix).
+    :param Material material: A Material object defining the particle material (default=None).
+    :param str name: A string specifying a user-friendly name for the particle array (default="").
+
+    .. code-block:: pycon
+
+        >>> import numpy as np
+        >>> from raysect.optical import World
+        >>> from raysect.optical.material import Lambert
+        >>> from raysect.primitive import SphereArray
+        >>>
+        >>> world = World()
+        >>>
+        >>> centres = np.random.uniform(-1, 1, (100000, 3))
+        >>> dust = SphereArray(centres, 0.001, parent=world, material=Lambert())
+    """
+
+    def __init__(self, object centres not None, object radii not None, object transforms=None, object material_indices=None,
+                 list materials=None, object parent=None, AffineMatrix3D transform=None, Material material=None, str name=None):
+
+        super().__init__(centres, transforms, material_indices, materials, parent, transform, material, name)
+
+        radii = np.array(np.broadcast_to(radii, (self._count,)), dtype=np.float64)
+        if (radii <= 0).any():
+            raise ValueError("The sphere radii must be greater than zero.")
+
+        self._radii = radii
+        self._radii_mv = radii
+        self._build()
+
+    @property
+    def radii(self):
+        """
+        The sphere radii.
+
+        :rtype: ndarray
+        """
+        return self._radii.copy()
+
+    cdef tuple _extents(self):
+        upper = np.repeat(self._radii[:, None], 3, axis=1)
+        return -upper, upper
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef bint _hit_particle(self, int32_t index, double origin[3], double direction[3], double min_distance, double max_distance, double *distance, double normal[3]):
+
+        cdef double radius, a, b, c, t0, t1, t
+
+        radius = self._radii_mv[index]
+
+        # coefficients of quadratic equation
+        a = direction[0] * direction[0] + direction[1] * direction[1] + direction[2] * direction[2]
+        b = 2 * (direction[0] * origin[0] + direction[1] * origin[1] + direction[2] * origin[2])
+        c = origin[0] * origin[0] + origin[1] * origin[1] + origin[2] * origin[2] - radius * radius
+
+        # ray misses if there are no real roots of the quadratic
+        if not solve_quadratic(a, b, c, &t0, &t1):
+            return False
+
+        # ensure t0 is always smaller than t1
+        if t0 > t1:
+            swap_double(&t0, &t1)
+
+        if min_distance < t0 <= max_distance:
+            t = t0
+        elif min_distance < t1 <= max_distance:
+            t = t1
+        else:
+            return False
+
+        distance[0] = t
+        normal[0] = origin[0] + t * direction[0]
+        normal[1] = origin[1] + t * direction[1]
+        normal[2] = origin[2] + t * direction[2]
+        return True
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef bint _contains_particle(self, int32_t index, double point[3]):
+
+        cdef double p[3]
+
+        self._to_particle_point(index, point, p)
+        return p[0] * p[0] + p[1] * p[1] + p[2] * p[2] <= self._radii_mv[index] * self._radii_mv[index]
+
+    cpdef object instance(self, object parent=None, AffineMatrix3D transform=None, Material material=None, str name=None):
+        return SphereArray(self._centres, self._radii, self._transforms, self._indices,
+                           None if self._materials is None else list(self._materials),
+                           parent, transform, material, name)
+
+
+cdef class CylinderArray(ParticleArray):
+    """
+    An array of cylindrical particles.
+
+    Each cylinder is centred on the origin of its particle space with its axis
+    aligned with the z-axis, the cylinder extends from z=-height/2 to z=height/2.
+
+    :param object centres: An Nx3 array of cylinder centres.
+    :param object radii: The cylinder radii, either a single value or an array of N values.
+    :param object heights: The cylinder heights, either a single value or an array of N values.
+    :param object transforms: An optional Nx4x4 array or list of AffineMatrix3D
+      transforms, one per particle (default=None).
+    :param object material_indices: An optional array of N material indices
+      into the materials list (default=None).
+    :param list materials: An optional list of particle materials (default=None).
+    :param Node parent: Scene graph parent node (default=None).
+    :param AffineMatrix3D transform: An AffineMatrix3D defining the local coordinate system relative to the scene graph parent (default=identity matrix).
+    :param Material material: A Material object defining the particle material (default=None).
+    :param str name: A string specifying a user-friendly name for the particle array (default="").
+    """
+
+    def __init__(self, object centres not None, object radii not None, object heights not None, object transforms=None,
+                 object material_indices=None, list materials=None, object parent=None, AffineMatrix3D transform=None,
+                 Material material=None, str name=None):
+
+        super().__init__(centres, transforms, material_indices, materials, parent, transform, material, name)
+
+        radii = np.array(np.broadcast_to(radii, (self._count,)), dtype=np.float64)
+        if (radii <= 0).any():
+            raise ValueError("The cylinder radii must be greater than zero.")
+
+        heights = np.array(np.broadcast_to(heights, (self._count,)), dtype=np.float64)
+        if (heights <= 0).any():
+            raise ValueError("The cylinder heights must be greater than zero.")
+
+        self._radii = radii
+        self._radii_mv = radii
+        self._heights = heights
+        self._heights_mv = heights
+        self._build()
+
+    @property
+    def radii(self):
+        """
+        The cylinder radii.
+
+        :rtype: ndarray
+        """
+        return self._radii.copy()
+
+    @property
+    def heights(self):
+        """
+        The cylinder heights.
+
+        :rtype: ndarray
+        """
+        return self._heights.copy()
+
+    cdef tuple _extents(self):
+        upper = np.stack((self._radii, self._radii, 0.5 * self._heights), axis=1)
+        return -upper, upper
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef bint _hit_particle(self, int32_t index, double origin[3], double direction[3], double min_distance, double max_distance, double *distance, double normal[3]):
+
+        cdef:
+            double radius, half_height
+            double near, far, a, b, c, t0, t1, temp
+            int near_surface, far_surface, s0, s1
+
+        radius = self._radii_mv[index]
+        half_height = 0.5 * self._heights_mv[index]
+
+        # intersection range with the infinite cylinder
+        if direction[0] == 0 and direction[1] == 0:
+
+            # ray is parallel to the cylinder axis
+            if origin[0] * origin[0] + origin[1] * origin[1] > radius * radius:
+                return False
+
+            near = -INFINITY
+            far = INFINITY
+            near_surface = NO_SURFACE
+            far_surface = NO_SURFACE
+
+        else:
+
+            a = direction[0] * direction[0] + direction[1] * direction[1]
+            b = 2.0 * (direction[0] * origin[0] + direction[1] * origin[1])
+            c = origin[0] * origin[0] + origin[1] * origin[1] - radius * radius
+            if not solve_quadratic(a, b, c, &near, &far):
+                return False
+
+            if near > far:
+                swap_double(&near, &far)
+
+            near_surface = BARREL_SURFACE
+            far_surface = BARREL_SURFACE
+
+        # intersect with the slab bounding the cylinder ends
+        if direction[2] == 0:
+
+            if fabs(origin[2]) > half_height:
+                return False
+
+        else:
+
+            temp = 1.0 / direction[2]
+            if direction[2] > 0:
+                t0 = (-half_height - origin[2]) * temp
+                t1 = (half_height - origin[2]) * temp
+                s0 = LOWER_SURFACE
+                s1 = UPPER_SURFACE
+            else:
+                t0 = (half_height - origin[2]) * temp
+                t1 = (-half_height - origin[2]) * temp
+                s0 = UPPER_SURFACE
+                s1 = LOWER_SURFACE
+
+            if t0 > near:
+                near = t0
+                near_surface = s0
+
+            if t1 < far:
+                far = t1
+                far_surface = s1
+
+        if near > far:
+            return False
+
+        if min_distance < near <= max_distance:
+            distance[0] = near
+            self._cylinder_normal(origin, direction, near, near_surface, normal)
+            return True
+
+        if min_distance < far <= max_distance:
+            distance[0] = far
+            self._cylinder_normal(origin, direction, far, far_surface, normal)
+            return True
+
+        return False
+
+    cdef void _cylinder_normal(self, double origin[3], double direction[3], double t, int surface, double normal[3]):
+
+        if surface == BARREL_SURFACE:
+            normal[0] = origin[0] + t * direction[0]
+            normal[1] = origin[1] + t * direction[1]
+            normal[2] = 0
+        else:
+            normal[0] = 0
+            normal[1] = 0
+            normal[2] = 1 if surface == UPPER_SURFACE else -1
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef bint _contains_particle(self, int32_t index, double point[3]):
+
+        cdef double p[3]
+
+        self._to_particle_point(index, point, p)
+        return (p[0] * p[0] + p[1] * p[1] <= self._radii_mv[index] * self._radii_mv[index]
+                and fabs(p[2]) <= 0.5 * self._heights_mv[index])
+
+    cpdef object instance(self, object parent=None, AffineMatrix3D transform=None, Material material=None, str name=None):
+        return CylinderArray(self._centres, self._radii, self._heights, self._transforms, self._indices,
+                             None if self._materials is None else list(self._materials),
+                             parent, transform, material, name)
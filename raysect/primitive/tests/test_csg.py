@@ -0,0 +1,161 @@
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+import numpy as np
+
+from raysect.core import Node, Point3D, Vector3D, translate
+from raysect.core.ray import Ray as CoreRay
+from raysect.primitive import Sphere, Box, Union, Intersect, Subtract, MultiUnion, MultiIntersect, MultiSubtract
+
+
+def _chain(cls, primitives):
+
+    result = primitives[0]
+    for primitive in primitives[1:]:
+        result = cls(result, primitive)
+    return result
+
+
+def _spheres(count, seed):
+
+    rng = np.random.default_rng(seed)
+    centres = rng.uniform(-1, 1, (count, 3))
+    radii = rng.uniform(0.2, 0.6, count)
+    return [Sphere(r, transform=translate(*c)) for c, r in zip(centres, radii)]
+
+
+def _rays(count, seed):
+
+    rng = np.random.default_rng(seed)
+    rays = []
+    for origin, target in zip(rng.uniform(-3, 3, (count, 3)), rng.uniform(-1, 1, (count, 3))):
+        origin = Point3D(*origin)
+        rays.append(CoreRay(origin, origin.vector_to(Point3D(*target)).normalise()))
+    return rays
+
+
+def _intersections(primitive, ray):
+
+    results = []
+    intersection = primitive.hit(ray)
+    while intersection is not None:
+        results.append(intersection)
+        intersection = primitive.next_intersection()
+    return results
+
+
+class TestMultiCSG(unittest.TestCase):
+
+    def assert_equivalent(self, multi, binary, rays):
+
+        for ray in rays:
+            expected = _intersections(binary, ray)
+            found = _intersections(multi, ray)
+            self.assertEqual(len(found), len(expected))
+            for a, b in zip(found, expected):
+                self.assertAlmostEqual(a.ray_distance, b.ray_distance, places=10)
+                self.assertEqual(a.exiting, b.exiting)
+                self.assertAlmostEqual(a.normal.dot(b.normal), 1.0, places=10)
+                self.assertIs(a.primitive, multi)
+
+    def test_union(self):
+
+        multi = MultiUnion(_spheres(30, 1))
+        binary = _chain(Union, _spheres(30, 1))
+        self.assert_equivalent(multi, binary, _rays(200, 2))
+
+    def test_intersect(self):
+
+        primitives = [Sphere(1.5, transform=translate(0.1 * i, 0.2, -0.1 * i)) for i in range(5)]
+        multi = MultiIntersect(primitives)
+        binary = _chain(Intersect, [Sphere(1.5, transform=translate(0.1 * i, 0.2, -0.1 * i)) for i in range(5)])
+        self.assert_equivalent(multi, binary, _rays(200, 3))
+
+    def test_subtract(self):
+
+        multi = MultiSubtract(Box(Point3D(-1, -1, -1), Point3D(1, 1, 1)), _spheres(30, 4))
+        binary = Subtract(Box(Point3D(-1, -1, -1), Point3D(1, 1, 1)), _chain(Union, _spheres(30, 4)))
+        self.assert_equivalent(multi, binary, _rays(200, 5))
+
+    def test_max_distance(self):
+
+        multi = MultiUnion(_spheres(30, 1))
+        binary = _chain(Union, _spheres(30, 1))
+        rays = _rays(200, 6)
+        for ray in rays:
+            ray.max_distance = 3.0
+        self.assert_equivalent(multi, binary, rays)
+
+    def test_contains(self):
+
+        rng = np.random.default_rng(7)
+        points = [Point3D(*p) for p in rng.uniform(-1.5, 1.5, (500, 3))]
+
+        multi = MultiSubtract(Box(Point3D(-1, -1, -1), Point3D(1, 1, 1)), _spheres(30, 4))
+        binary = Subtract(Box(Point3D(-1, -1, -1), Point3D(1, 1, 1)), _chain(Union, _spheres(30, 4)))
+        for point in points:
+            self.assertEqual(multi.contains(point), binary.contains(point))
+
+        multi = MultiUnion(_spheres(30, 1))
+        binary = _chain(Union, _spheres(30, 1))
+        for point in points:
+            self.assertEqual(multi.contains(point), binary.contains(point))
+
+    def test_bounding_box(self):
+
+        world = Node()
+        multi = MultiUnion([Sphere(0.5, transform=translate(i, 0, 0)) for i in range(10)], world, transform=translate(0, 1, 0))
+        box = multi.bounding_box()
+        self.assertAlmostEqual(box.lower.x, -0.5, places=6)
+        self.assertAlmostEqual(box.upper.x, 9.5, places=6)
+        self.assertAlmostEqual(box.lower.y, 0.5, places=6)
+        self.assertAlmostEqual(box.upper.y, 1.5, places=6)
+
+    def test_operand_change(self):
+
+        spheres = [Sphere(0.5, transform=translate(i, 0, 0)) for i in range(3)]
+        multi = MultiUnion(spheres)
+        ray = CoreRay(Point3D(5, 0, 0), Vector3D(-1, 0, 0))
+        self.assertAlmostEqual(multi.hit(ray).ray_distance, 2.5, places=10)
+
+        # moving an operand must rebuild the acceleration structure
+        spheres[2].transform = translate(10, 0, 0)
+        self.assertAlmostEqual(multi.hit(ray).ray_distance, 3.5, places=10)
+
+    def test_empty(self):
+
+        multi = MultiUnion([])
+        self.assertIsNone(multi.hit(CoreRay(Point3D(0, 0, -5), Vector3D(0, 0, 1))))
+        self.assertFalse(multi.contains(Point3D(0, 0, 0)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+import numpy as np
+
+from raysect.core import Point3D, Vector3D
+from raysect.core.ray import Ray as CoreRay
+from raysect.primitive import HeightField, Mesh
+
+
+def _closed_mesh(heights, width, length, base):
+    """
+    Triangulates a height field solid, matching the HeightField cell triangulation.
+    """
+
+    nx, ny = heights.shape
+    x = np.linspace(0, width, nx)
+    y = np.linspace(0, length, ny)
+    gx, gy = np.meshgrid(x, y, indexing="ij")
+
+    top = np.stack((gx, gy, heights), axis=-1).reshape(-1, 3)
+    bottom = np.stack((gx, gy, np.full_like(gx, base)), axis=-1).reshape(-1, 3)
+    vertices = np.concatenate((top, bottom))
+    offset = nx * ny
+
+    def index(i, j):
+        return i * ny + j
+
+    triangles = []
+    for i in range(nx - 1):
+        for j in range(ny - 1):
+            v00, v10, v01, v11 = index(i, j), index(i + 1, j), index(i, j + 1), index(i + 1, j + 1)
+            triangles += [(v00, v10, v11), (v00, v11, v01)]
+            triangles += [(offset + v00, offset + v11, offset + v10), (offset + v00, offset + v01, offset + v11)]
+
+    # side walls, wound so the normals point outwards
+    for j in range(ny - 1):
+        a, b = index(0, j), index(0, j + 1)
+        triangles += [(a, b, offset + b), (a, offset + b, offset + a)]
+        a, b = index(nx - 1, j), index(nx - 1, j + 1)
+        triangles += [(a, offset + b, b), (a, offset + a, offset + b)]
+
+    for i in range(nx - 1):
+        a, b = index(i, 0), index(i + 1, 0)
+        triangles += [(a, offset + b, b), (a, offset + a, offset + b)]
+        a, b = index(i, ny - 1), index(i + 1, ny - 1)
+        triangles += [(a, b, offset + b), (a, offset + b, offset + a)]
+
+    return Mesh(vertices, np.array(triangles), smoothing=False, closed=True)
+
+
+def _rays(count, seed):
+
+    rng = np.random.default_rng(seed)
+    rays = []
+    for origin, target in zip(rng.uniform((-1, -1, -1), (2, 2, 2), (count, 3)), rng.uniform((0, 0, -0.2), (1, 1, 0.4), (count, 3))):
+        origin = Point3D(*origin)
+        rays.append(CoreRay(origin, origin.vector_to(Point3D(*target)).normalise()))
+    return rays
+
+
+class TestHeightField(unittest.TestCase):
+
+    def setUp(self):
+
+        rng = np.random.default_rng(0)
+        self.heights = rng.uniform(0, 0.2, (37, 23)).astype(np.float32)
+        self.base = -0.1
+        self.field = HeightField(self.heights, 1.0, 0.8, self.base, smoothing=False)
+        self.mesh = _closed_mesh(self.heights.astype(np.float64), 1.0, 0.8, self.base)
+
+    def test_intersections(self):
+
+        for ray in _rays(500, 1):
+
+            expected = []
+            intersection = self.mesh.hit(ray)
+            while intersection is not None:
+                expected.append(intersection)
+                intersection = self.mesh.next_intersection()
+
+            intersection = self.field.hit(ray)
+            for reference in expected:
+                self.assertIsNotNone(intersection)
+                self.assertAlmostEqual(intersection.ray_distance, reference.ray_distance, places=5)
+                self.assertEqual(intersection.exiting, reference.exiting)
+                self.assertAlmostEqual(intersection.normal.dot(reference.normal), 1.0, places=5)
+                intersection = self.field.next_intersection()
+            self.assertIsNone(intersection)
+
+    def test_watertight(self):
+
+        # rays aimed exactly at the shared cell edges and cell diagonals must not pass through the surface
+        rng = np.random.default_rng(3)
+        nx, ny = self.heights.shape
+        dx, dy = 1.0 / (nx - 1), 0.8 / (ny - 1)
+        heights = self.heights.astype(np.float64)
+        for _ in range(3000):
+
+            i, j = rng.integers(0, nx - 1), rng.integers(0, ny - 1)
+            s = rng.uniform()
+            edge = rng.integers(0, 3)
+            if edge == 0:
+                # edge along x, shared with the neighbouring cell in y
+                x, y, z = (i + s) * dx, j * dy, (1 - s) * heights[i, j] + s * heights[i + 1, j]
+            elif edge == 1:
+                # edge along y, shared with the neighbouring cell in x
+                x, y, z = i * dx, (j + s) * dy, (1 - s) * heights[i, j] + s * heights[i, j + 1]
+            else:
+                # the diagonal shared by the cell's two triangles
+                x, y, z = (i + s) * dx, (j + s) * dy, (1 - s) * heights[i, j] + s * heights[i + 1, j + 1]
+
+            direction = Vector3D(*rng.uniform((-0.3, -0.3, -1), (0.3, 0.3, -0.5))).normalise()
+            target = Point3D(x, y, z)
+
+            # rays that only touch a ridge may legitimately miss, only test rays that enter the solid at the target
+            if self.mesh.contains(target - direction * 1e-4) or not self.mesh.contains(target + direction * 1e-4):
+                continue
+
+            origin = target - direction * 2
+            intersection = self.field.hit(CoreRay(origin, direction))
+            # the surface may occlude the target, but a ray must never be found beyond it
+            self.assertIsNotNone(intersection)
+            self.assertLessEqual(intersection.ray_distance, 2 + 1e-6)
+
+    def test_contains(self):
+
+        rng = np.random.default_rng(2)
+        for point in rng.uniform((-0.1, -0.1, -0.2), (1.1, 0.9, 0.3), (2000, 3)):
+            point = Point3D(*point)
+            self.assertEqual(self.field.contains(point), self.mesh.contains(point))
+
+    def test_smoothing(self):
+
+        # a plane tilted along x has the same normal everywhere
+        x = np.linspace(0, 1, 9)
+        heights = np.repeat((0.5 * x)[:, None], 5, axis=1)
+        field = HeightField(heights, 1.0, 1.0, smoothing=True)
+
+        intersection = field.hit(CoreRay(Point3D(0.37, 0.61, 2), Vector3D(0, 0, -1)))
+        self.assertAlmostEqual(intersection.ray_distance, 2 - 0.5 * 0.37, places=6)
+        normal = intersection.normal
+        self.assertAlmostEqual(normal.x, -0.5 / np.sqrt(1.25), places=6)
+        self.assertAlmostEqual(normal.y, 0.0, places=6)
+        self.assertAlmostEqual(normal.z, 1 / np.sqrt(1.25), places=6)
+
+    def test_bounding_box(self):
+
+        box = self.field.bounding_box()
+        self.assertAlmostEqual(box.lower.z, self.base, places=6)
+        self.assertAlmostEqual(box.upper.z, self.heights.max(), places=6)
+        self.assertAlmostEqual(box.upper.x, 1.0, places=6)
+        self.assertAlmostEqual(box.upper.y, 0.8, places=6)
+
+    def test_memory_mapped(self):
+
+        heights = np.ascontiguousarray(self.heights)
+        field = HeightField(heights, 1.0, 0.8)
+        self.assertTrue(np.shares_memory(field.heights, heights))
+
+    def test_invalid_arguments(self):
+
+        with self.assertRaises(ValueError):
+            HeightField(np.zeros(5), 1.0, 1.0)
+
+        with self.assertRaises(ValueError):
+            HeightField(np.zeros((5, 5)), 0.0, 1.0)
+
+        with self.assertRaises(ValueError):
+            HeightField(np.zeros((5, 5)), 1.0, 1.0, base=0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+# Copyright (c) 2014-2025, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+import unittest
+
+import numpy as np
+
+from raysect.core import World, Point3D, Vector3D, translate, rotate, AffineMatrix3D
+from raysect.core.ray import Ray as CoreRay
+from raysect.optical import World as OpticalWorld, Ray, ConstantSF
+from raysect.optical.material import UniformSurfaceEmitter
+from raysect.primitive import Sphere, Cylinder, SphereArray, CylinderArray
+
+
+def _rays(count, seed):
+
+    rng = np.random.default_rng(seed)
+    rays = []
+    for origin, target in zip(rng.uniform(-3, 3, (count, 3)), rng.uniform(-1, 1, (count, 3))):
+        origin = Point3D(*origin)
+        rays.append(CoreRay(origin, origin.vector_to(Point3D(*target)).normalise()))
+    return rays
+
+
+def _intersections(primitive, ray):
+
+    results = []
+    intersection = primitive.hit(ray)
+    while intersection is not None:
+        results.append(intersection)
+        intersection = primitive.next_intersection()
+    return results
+
+
+def _lattice(count):
+
+    # non-overlapping particle centres on a jittered lattice
+    rng = np.random.default_rng(0)
+    axis = np.linspace(-1, 1, count)
+    centres = np.stack(np.meshgrid(axis, axis, axis, indexing="ij"), axis=-1).reshape(-1, 3)
+    return centres + rng.uniform(-0.02, 0.02, centres.shape)
+
+
+class TestParticleArray(unittest.TestCase):
+
+    def assert_equivalent(self, particles, primitives, rays):
+
+        world = World()
+        for primitive in primitives:
+            primitive.parent = world
+
+        for ray in rays:
+            expected = world.hit(ray)
+            intersection = particles.hit(ray)
+            if expected is None:
+                self.assertIsNone(intersection)
+                continue
+
+            self.assertIsNotNone(intersection)
+            self.assertAlmostEqual(intersection.ray_distance, expected.ray_distance, places=10)
+            self.assertEqual(intersection.exiting, expected.exiting)
+            normal = expected.normal.transform(expected.primitive_to_world)
+            self.assertAlmostEqual(intersection.normal.dot(normal.normalise()), 1.0, places=8)
+
+    def test_spheres(self):
+
+        centres = _lattice(6)
+        rng = np.random.default_rng(1)
+        radii = rng.uniform(0.05, 0.18, len(centres))
+
+        particles = SphereArray(centres, radii)
+        primitives = [Sphere(r, transform=translate(*c)) for c, r in zip(centres, radii)]
+        self.assert_equivalent(particles, primitives, _rays(300, 2))
+
+    def test_cylinders(self):
+
+        centres = _lattice(5)
+        rng = np.random.default_rng(3)
+        transforms = [rotate(*angles) for angles in rng.uniform(0, 360, (len(centres), 3))]
+
+        particles = CylinderArray(centres, 0.08, 0.15, transforms=transforms)
+        primitives = [Cylinder(0.08, 0.15, transform=translate(*c) * m * translate(0, 0, -0.075)) for c, m in zip(centres, transforms)]
+        self.assert_equivalent(particles, primitives, _rays(300, 4))
+
+    def test_next_intersection(self):
+
+        particles = SphereArray([[0, 0, 0], [0, 0, 2], [0, 0, 4]], 0.5)
+        distances = [i.ray_distance for i in _intersections(particles, CoreRay(Point3D(0, 0, -5), Vector3D(0, 0, 1)))]
+        np.testing.assert_allclose(distances, [4.5, 5.5, 6.5, 7.5, 8.5, 9.5])
+
+        # the ray must stop at the maximum distance
+        distances = [i.ray_distance for i in _intersections(particles, CoreRay(Point3D(0, 0, -5), Vector3D(0, 0, 1), max_distance=7.0))]
+        np.testing.assert_allclose(distances, [4.5, 5.5, 6.5])
+
+    def test_contains(self):
+
+        centres = _lattice(6)
+        particles = SphereArray(centres, 0.15, transforms=[AffineMatrix3D() for _ in centres])
+
+        rng = np.random.default_rng(5)
+        for point in rng.uniform(-1.2, 1.2, (2000, 3)):
+            expected = (np.linalg.norm(centres - point, axis=1) <= 0.15).any()
+            self.assertEqual(particles.contains(Point3D(*point)), expected)
+
+    def test_bounding_box(self):
+
+        particles = CylinderArray([[0, 0, 0], [2, 0, 0]], 0.5, [1, 3])
+        box = particles.bounding_box()
+        self.assertAlmostEqual(box.lower.x, -0.5, places=6)
+        self.assertAlmostEqual(box.upper.x, 2.5, places=6)
+        self.assertAlmostEqual(box.lower.z, -1.5, places=6)
+        self.assertAlmostEqual(box.upper.z, 1.5, places=6)
+
+    def test_materials(self):
+
+        world = OpticalWorld()
+        materials = [UniformSurfaceEmitter(ConstantSF(1.0)), UniformSurfaceEmitter(ConstantSF(2.0))]
+        particles = SphereArray([[0, 0, 0], [0, 0, 2]], 0.5, material_indices=[0, 1], materials=materials, parent=world)
+        self.assertEqual(particles.materials, tuple(materials))
+        np.testing.assert_array_equal(particles.material_indices, [0, 1])
+
+        # the material of the particle hit by the ray is used
+        spectrum = Ray(Point3D(0, 0, -5), Vector3D(0, 0, 1)).trace(world)
+        self.assertAlmostEqual(spectrum.samples[0], 1.0)
+        spectrum = Ray(Point3D(0, 0, 5), Vector3D(0, 0, -1)).trace(world)
+        self.assertAlmostEqual(spectrum.samples[0], 2.0)
+
+        with self.assertRaises(ValueError):
+            SphereArray([[0, 0, 0]], 0.5, material_indices=[2], materials=materials)
+
+        with self.assertRaises(ValueError):
+            SphereArray([[0, 0, 0]], 0.5, material_indices=[0])
+
+    def test_invalid_arguments(self):
+
+        with self.assertRaises(ValueError):
+            SphereArray([0, 0, 0], 0.5)
+
+        with self.assertRaises(ValueError):
+            SphereArray([[0, 0, 0]], -1)
+
+        with self.assertRaises(ValueError):
+            CylinderArray([[0, 0, 0]], 1, 0)
+
+    def test_empty(self):
+
+        particles = SphereArray(np.zeros((0, 3)), 1.0)
+        self.assertIsNone(particles.hit(CoreRay(Point3D(0, 0, -5), Vector3D(0, 0, 1))))
+        self.assertFalse(particles.contains(Point3D(0, 0, 0)))
+
+
+if __name__ == "__main__":
+    unittest.main()